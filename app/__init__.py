@@ -6,11 +6,18 @@ from flask_wtf.csrf import CsrfProtect
 from flask_bootstrap import Bootstrap
 from flask_moment import Moment
 from config import config
+from .common.dispatcher import Dispatcher
+from .common.response_cache import ResponseCache
+from .common import compression
+from .common import logging as app_logging
+from .common import backends
 
 # instantiate modules
 bootstrap = Bootstrap()
 moment = Moment()
 csrf = CsrfProtect()
+dispatcher = Dispatcher()
+response_cache = ResponseCache()
 
 
 def create_app(config_name):
@@ -27,12 +34,23 @@ def create_app(config_name):
     bootstrap.init_app(app)
     moment.init_app(app)
     csrf.init_app(app)
+    # json logging through a background thread, first so that other modules
+    # log their setup.
+    app_logging.init_app(app)
+    dispatcher.init_app(app)
+    response_cache.init_app(app)
+    # compute backend (numpy or reference).
+    backends.init_app(app)
+    # gzip encoded requests and responses.
+    compression.init_app(app)
 
     # Register blueprint for web app. and restapi.
     from .web import web as web_blueprint
     app.register_blueprint(web_blueprint)
 
     from .api_v1_0 import api as api_blueprint
-    app.register_blueprint(api_blueprint, prefix='/api/v1.0/')
+    # json api does not use forms, exclude it from csrf protection.
+    csrf.exempt(api_blueprint)
+    app.register_blueprint(api_blueprint, url_prefix='/api/v1.0')
 
     return app
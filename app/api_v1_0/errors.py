@@ -1,3 +1,96 @@
 """
 This function handles the errors for restapi endpoints of dna-lceb application.
-"""
\ No newline at end of file
+"""
+from flask import jsonify
+from . import api
+from helpers.fasta_helpers import SequenceTooLong
+from ..common.dispatcher import Overloaded
+
+
+class ValidationError(ValueError):
+    """
+    Raised when request data for an api endpoint is invalid.
+    """
+    pass
+
+
+def error_data(e):
+    """
+    This function returns status, json body and headers of the response to
+    a rejected api request, used by the error handlers below and by the
+    asgi server (see app/asgi.py).
+    :param e: ValidationError, SequenceTooLong or Overloaded object.
+    :return: tuple (status code, dictionary object, list of (name, value)
+    headers)
+    """
+    if isinstance(e, SequenceTooLong):
+        return 413, {'error': 'request entity too large',
+                     'message': str(e)}, []
+    if isinstance(e, Overloaded):
+        return e.status_code, {'error': 'service unavailable' if
+                               e.status_code == 503 else 'too many requests',
+                               'message': str(e)}, \
+            [('Retry-After', str(e.retry_after))]
+    return 400, {'error': 'bad request', 'message': str(e)}, []
+
+
+def _error_response(e):
+    """
+    Generate json response for a rejected api request (see error_data).
+    :param e: exception object.
+    :return: response object.
+    """
+    status, data, headers = error_data(e)
+    response = jsonify(data)
+    response.status_code = status
+    response.headers.extend(headers)
+    return response
+
+
+def bad_request(message):
+    """
+    Generate json response for 400 errors.
+    :param message: error message.
+    :return: response object.
+    """
+    return _error_response(ValidationError(message))
+
+
+@api.errorhandler(ValidationError)
+def validation_error(e):
+    """
+    Generate 400 response for invalid request data.
+    :param e: ValidationError object.
+    :return:
+    """
+    return _error_response(e)
+
+
+def request_entity_too_large(message):
+    """
+    Generate json response for 413 errors.
+    :param message: error message.
+    :return: response object.
+    """
+    return _error_response(SequenceTooLong(message))
+
+
+@api.errorhandler(SequenceTooLong)
+def sequence_too_long(e):
+    """
+    Generate 413 response for uploaded sequences exceeding the limit.
+    :param e: SequenceTooLong object.
+    :return:
+    """
+    return _error_response(e)
+
+
+@api.errorhandler(Overloaded)
+def overloaded(e):
+    """
+    Generate 503 (or 429 for job submissions) response when worker pool has
+    too many waiting calls.
+    :param e: Overloaded object.
+    :return:
+    """
+    return _error_response(e)
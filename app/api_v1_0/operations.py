@@ -0,0 +1,190 @@
+"""
+This module handles embed, extract and capacity requests of the restapi
+once their parameters and sequence have been read, so that the Flask views
+and the asgi server (see app/asgi.py) answer them the same way.
+
+Operations are generators: they validate the request, look up the response
+cache and build the result, and yield the engine calls (EngineCall objects)
+to the caller, which runs them on the dispatcher and sends their results
+back. Flask views run them with run_operation in the request thread, the
+asgi server awaits the engine calls on its event loop.
+"""
+from collections import namedtuple
+from helpers.packed_sequence import PackedSequence
+from helpers import twobit_format
+from .. import dispatcher, response_cache
+from .errors import ValidationError
+from .params import get_params, get_backend
+from ..common.capacity_index import message_bits
+from ..common.response_cache import cache_key
+
+# Engine call yielded by operations: arguments of Dispatcher.run.
+EngineCall = namedtuple('EngineCall', 'operation length fn args kwargs')
+
+# Request of an operation: name ('embed', 'extract' or 'capacity'), compute
+# backend, sequence, watermark message (embed only), frame and genetic code.
+Operation = namedtuple('Operation', 'name backend seq message frame gc')
+
+
+def read_operation(name, params, sequence, app):
+    """
+    This function validates parameters of an operation.
+    :param name: name of operation i.e. 'embed', 'extract' or 'capacity'
+    :param params: request parameters.
+    :param sequence: DNA sequence (string or PackedSequence)
+    :param app: application object.
+    :return: Operation object.
+    """
+    frame, gc = get_params(params)
+    backend = get_backend(params, app)
+    msg = None
+    if name == 'embed':
+        msg = params.get('message')
+        if not isinstance(msg, str) or msg == '':
+            raise ValidationError('Please add a watermark message.')
+    if name == 'capacity':
+        seq = backend.clean(sequence)
+    else:
+        seq = PackedSequence.from_string(sequence)
+    return Operation(name, backend, seq, msg, frame, gc)
+
+
+def _engine_call(op, name, *args):
+    """
+    This function returns an engine call of the backend of an operation.
+    :param op: Operation object.
+    :param name: name of backend method i.e. 'embed', 'extract' or
+    'capacity'
+    :param args: arguments following the sequence.
+    :return: EngineCall object.
+    """
+    return EngineCall(op.backend.operation(name), len(op.seq),
+                      getattr(op.backend, name), (op.seq,) + args,
+                      dict(frame=op.frame, gc=op.gc))
+
+
+def check_capacity(op):
+    """
+    This function computes capacity of the sequence and makes sure that the
+    message (if any) fits in it.
+    :param op: Operation object.
+    :return: generator returning capacity (bits)
+    """
+    cap = yield _engine_call(op, 'capacity')
+    if cap is None:
+        raise ValidationError('Could not analyze given sequence.')
+    if op.message is not None and message_bits(op.message) > cap:
+        raise ValidationError('Watermark message length exceeds storage '
+                              'capacity.')
+    return cap
+
+
+def _watermark(op):
+    """
+    This function watermarks the sequence.
+    :param op: Operation object.
+    :return: generator returning watermarked sequence (PackedSequence)
+    """
+    yield from check_capacity(op)
+    wm_seq = yield _engine_call(op, 'embed', op.message)
+    if wm_seq is None:
+        raise ValidationError('Could not watermark given sequence.')
+    return PackedSequence.from_string(wm_seq)
+
+
+def _extract(op):
+    """
+    This function extracts watermark message from the sequence.
+    :param op: Operation object.
+    :return: generator returning message or None.
+    """
+    msg = yield _engine_call(op, 'extract')
+    return msg
+
+
+def _cached(op, compute):
+    """
+    This function returns cached result of an operation, computing and
+    caching it if it is not cached (see ResponseCache.get_or_compute).
+    :param op: Operation object.
+    :param compute: generator computing the result.
+    :return: generator returning tuple (result, 'HIT' or 'MISS')
+    """
+    params = dict(frame=op.frame, gc=op.gc, backend=op.backend.name)
+    if op.message is not None:
+        params['message'] = op.message
+    key = cache_key(op.name, op.seq, **params)
+    value = response_cache.get(key)
+    if value is not None:
+        compute.close()
+        return value, 'HIT'
+    value = yield from compute
+    if value is not None:
+        response_cache.put(key, value)
+    return value, 'MISS'
+
+
+def answer(op):
+    """
+    This function answers an operation. Watermarked sequence is not part of
+    the json result, it is returned as value so that the caller can send it
+    as text, 2 bit encoded or store it for download.
+    :param op: Operation object.
+    :return: generator returning tuple (json result (dictionary object),
+    value (capacity, watermarked sequence or message), list of (name, value)
+    response headers)
+    """
+    headers = [('X-Engine-Backend', op.backend.name)]
+    result = {'frame': op.frame, 'gc': int(op.gc)}
+    if op.name == 'capacity':
+        value = yield from check_capacity(op)
+        result['capacity'] = value
+        return result, value, headers
+    if op.name == 'embed':
+        value, cache_status = yield from _cached(op, _watermark(op))
+        result['length'] = len(value)
+    else:
+        value, cache_status = yield from _cached(op, _extract(op))
+        if value is None:
+            raise ValidationError('Could not extract watermark from given '
+                                  'sequence.')
+        result['message'] = value
+    headers.append(('X-Cache', cache_status))
+    return result, value, headers
+
+
+def run_operation(steps):
+    """
+    This function runs an operation in the request thread, waiting for its
+    engine calls (see Dispatcher.run).
+    :param steps: generator of an operation e.g. answer(op)
+    :return: return value of the generator.
+    """
+    result = None
+    try:
+        while True:
+            call = steps.send(result)
+            result = dispatcher.run(call.operation, call.length, call.fn,
+                                    *call.args, **call.kwargs)
+    except StopIteration as e:
+        return e.value
+
+
+def accepts_twobit(accept):
+    """
+    This function checks if client prefers 2 bit encoded sequences to json.
+    :param accept: accepted mimetypes (MIMEAccept object)
+    :return: True or False
+    """
+    return accept.best_match(['application/json', twobit_format.MIMETYPE]) \
+        == twobit_format.MIMETYPE
+
+
+def twobit_headers(wm_seq):
+    """
+    This function returns headers of a 2 bit encoded sequence response.
+    :param wm_seq: watermarked sequence (PackedSequence)
+    :return: list of (name, value) headers.
+    """
+    return [('Content-Length',
+             str(twobit_format.HEADER_SIZE + wm_seq.nbytes))]
@@ -0,0 +1,155 @@
+"""
+This module reads and validates parameters of restapi requests. Parameters
+are passed as dictionaries (json body, form or query string), so the same
+checks are used by the views and by the asgi server (see app/asgi.py).
+"""
+from helpers.fasta_helpers import SequenceTooLong
+from helpers.gc_file_helpers import gc_file_associations
+from helpers.helper_functions import load_sequence_choices
+from helpers.shared_corpus import load_sample_sequence
+from ..common import backends
+from .errors import ValidationError
+
+
+def check_json_body(data):
+    """
+    This function checks that json body of the request is an object.
+    :param data: decoded json body (None if it is not valid json)
+    :return: data
+    """
+    if not isinstance(data, dict):
+        raise ValidationError('Request body must be a json object.')
+    return data
+
+
+def check_sequence(sequence):
+    """
+    This function checks that the request carries a DNA sequence.
+    :param sequence: sequence read from the request.
+    :return: sequence
+    """
+    if not sequence:
+        raise ValidationError('Please choose or enter some DNA sequence.')
+    return sequence
+
+
+def get_params(data):
+    """
+    This function reads and validates frame and genetic code of request.
+    :param data: json body of the request.
+    :return: tuple (frame, gc)
+    """
+    try:
+        frame = int(data.get('frame', 1))
+    except (TypeError, ValueError):
+        raise ValidationError('Invalid frame number.')
+    if frame > 3 or frame < 1:
+        raise ValidationError('Invalid frame number.')
+    gc = str(data.get('gc', 1))
+    if gc not in gc_file_associations.keys():
+        raise ValidationError('Enter a valid genetic code.')
+    return frame, gc
+
+
+def get_sequence(data):
+    """
+    This function returns the DNA sequence of request, either given in
+    'sequence' field or chosen from samples with 'sample' field.
+    :param data: json body of the request.
+    :return: tuple (sequence, sample key or None)
+    """
+    if data.get('sample'):
+        try:
+            return load_sample_sequence(data['sample']), data['sample']
+        except (TypeError, KeyError, FileNotFoundError):
+            raise ValidationError('Requested file not found in db.')
+    sequence = data.get('sequence')
+    if not isinstance(sequence, str) or sequence == '':
+        raise ValidationError('Please choose or enter some DNA sequence.')
+    return sequence, None
+
+
+def check_total_length(records, max_bases=None):
+    """
+    This function checks total length of the sequences of a multi-sequence
+    request. Records are consumed one by one, so a too long request fails
+    before all of them are read.
+    :param records: iterable of tuples (name, sequence)
+    :param max_bases: maximum total length (characters of the sequences),
+    None for no limit.
+    :return: list of records.
+    :except SequenceTooLong: if sequences exceed max_bases in total.
+    """
+    checked = []
+    total = 0
+    for record in records:
+        total += len(record[1])
+        if max_bases is not None and total > max_bases:
+            raise SequenceTooLong('Sequences exceed maximum total length of '
+                                  '{0} bases.'.format(max_bases))
+        checked.append(record)
+    return checked
+
+
+def get_sequences(data, max_bases=None):
+    """
+    This function returns DNA sequences of request, either given in
+    'sequences' field (list of strings) or chosen from samples with
+    'samples' field (list of keys, or "all" for every sample of dataset).
+    :param data: json body of the request.
+    :param max_bases: maximum total length of the sequences, None for no
+    limit.
+    :return: list of tuples (name (sample key or None), sequence)
+    :except SequenceTooLong: if sequences exceed max_bases in total.
+    """
+    samples = data.get('samples')
+    if samples:
+        if samples == 'all':
+            samples = [key for key, name in load_sequence_choices()]
+        if not isinstance(samples, list):
+            raise ValidationError('Samples must be a list of keys.')
+        try:
+            return check_total_length(
+                ((key, load_sample_sequence(key)) for key in samples),
+                max_bases)
+        except (TypeError, KeyError, FileNotFoundError):
+            raise ValidationError('Requested file not found in db.')
+    sequences = data.get('sequences')
+    if not isinstance(sequences, list) or not sequences or \
+            not all(isinstance(s, str) and s for s in sequences):
+        raise ValidationError('Sequences must be a list of DNA sequences.')
+    return check_total_length([(None, sequence) for sequence in sequences],
+                              max_bases)
+
+
+def get_flag(params, name):
+    """
+    This function reads boolean parameter of the request.
+    :param params: request parameters.
+    :param name: name of parameter.
+    :return: True or False
+    """
+    value = params.get(name, False)
+    if isinstance(value, str):
+        return value.lower() in ('1', 'true', 'yes', 'on')
+    return bool(value)
+
+
+def get_backend(params, app):
+    """
+    This function returns compute backend of the request, backend of the
+    application unless 'backend' parameter chooses another one (allowed if
+    ENGINE_BACKEND_OVERRIDE is set).
+    :param params: request parameters.
+    :param app: application object.
+    :return: Backend object.
+    """
+    name = params.get('backend')
+    if not name:
+        return backends.app_backend(app)
+    if not app.config.get('ENGINE_BACKEND_OVERRIDE'):
+        raise ValidationError('Choosing a backend is not allowed.')
+    try:
+        return backends.get_backend(str(name))
+    except backends.BackendUnavailable as e:
+        raise ValidationError(str(e))
@@ -1,3 +1,471 @@
 """
 This module implements the views for dna-lceb restapi application.
 """
+import json
+from functools import partial
+from flask import request, jsonify, current_app, url_for, abort
+from . import api
+from .. import dispatcher
+from .errors import ValidationError
+from .params import get_params, get_sequence, get_sequences, get_flag, \
+    get_backend, check_total_length, check_json_body, check_sequence
+from .operations import read_operation, check_capacity, answer, \
+    run_operation, accepts_twobit, twobit_headers
+from helpers.codon_helpers import clean_bases, \
+    codon_indexes, codon_usage, codon_capacity, capacity_windows, \
+    index_to_codon
+from helpers.gc_file_helpers import gc_file_associations
+from helpers.shared_corpus import get_corpus
+from helpers.packed_sequence import PackedSequence
+from helpers import twobit_format
+from ..common.capacity_index import get_capacity_index, message_bits
+from ..common.result_store import store_result
+from ..common.uploads import has_uploaded_file, read_uploaded_sequence, \
+    is_fasta_request, read_request_sequence, is_twobit_request, \
+    read_twobit_sequence, read_uploaded_sequences, read_request_sequences
+from ..common.verifier import verify_protein
+from ..common.autodetect import detect_and_extract
+from ..common.dispatcher import read_job
+from ..common import framing, sharding
+
+
+def _get_json():
+    """
+    This function returns json body of the request.
+    :return: dictionary object.
+    """
+    return check_json_body(request.get_json(silent=True))
+
+
+def _read_request():
+    """
+    This function reads parameters and DNA sequence of the request. Sequence
+    can be sent in json body ('sequence' or 'sample' field), as FASTA file
+    in multipart form ('file' field, parameters as form fields), as raw
+    FASTA body or as 2 bit encoded body (parameters in query string). FASTA
+    files may be gzip compressed.
+    :return: tuple (parameters, sequence (string or PackedSequence), sample
+    key or None)
+    """
+    if request.files:
+        params = request.form
+        if not has_uploaded_file(request.files.get('file')):
+            raise ValidationError('Upload FASTA file in "file" field.')
+        sequence = read_uploaded_sequence(request.files['file'])
+        sample = None
+    elif is_fasta_request():
+        params = request.args
+        sequence = read_request_sequence()
+        sample = None
+    elif is_twobit_request():
+        params = request.args
+        try:
+            sequence = read_twobit_sequence()
+        except twobit_format.FormatError as e:
+            raise ValidationError(str(e))
+        sample = None
+    else:
+        params = _get_json()
+        sequence, sample = get_sequence(params)
+    return params, check_sequence(sequence), sample
+
+
+def _submit_job(name, backend, length, *args):
+    """
+    This function submits an engine call as a job (see Dispatcher).
+    :param name: name of operation i.e. 'embed', 'extract' or 'capacity'
+    :param backend: compute backend running the operation.
+    :param length: length of sequence (bases)
+    :param args: arguments of the operation.
+    :return: 202 response pointing to the job.
+    """
+    job_id = dispatcher.submit_job(current_app._get_current_object(), name,
+                                   backend.operation(name), length,
+                                   getattr(backend, name), *args)
+    url = url_for('api.job_status', job_id=job_id, _external=True)
+    response = jsonify({'id': job_id, 'status': 'pending', 'url': url})
+    response.status_code = 202
+    response.headers['Location'] = url
+    response.headers['X-Engine-Backend'] = backend.name
+    return response
+
+
+@api.route('/jobs/<job_id>', methods=['GET'])
+def job_status(job_id):
+    """
+    This function returns state of a job submitted with 'async' parameter.
+    Result of a finished embed job contains url of the watermarked sequence.
+    :param job_id: job id.
+    :return:
+    """
+    job = read_job(current_app, job_id)
+    if job is None:
+        abort(404)
+    result = job.get('result')
+    if job['operation'] == 'embed' and isinstance(result, dict):
+        result['download_url'] = url_for('web.download_result',
+                                         token=result.pop('token'),
+                                         _external=True)
+    job['id'] = job_id
+    return jsonify(job)
+
+
+@api.route('/capacity', methods=['POST'])
+def capacity():
+    """
+    This function returns storage capacity (bits) of given sequence, i.e.
+    number of bits which can be embedded. If 'async' parameter is set, it
+    is computed as a job.
+    :return:
+    """
+    params, seq, sample = _read_request()
+    op = read_operation('capacity', params, seq, current_app)
+    if get_flag(params, 'async'):
+        return _submit_job('capacity', op.backend, len(op.seq), op.seq,
+                           op.frame, op.gc)
+    result, cap, headers = run_operation(answer(op))
+    response = jsonify(result)
+    response.headers.extend(headers)
+    return response
+
+
+@api.route('/embed', methods=['POST'])
+def embed():
+    """
+    This function embeds watermark message in given sequence. Watermarked
+    sequence is returned in the response, or stored for download if
+    'download' parameter is set. If 'verify' parameter is set, response
+    includes result of protein preservation check. If 'async' parameter is
+    set, sequence is watermarked as a job and stored for download. Clients
+    accepting application/x-dna-2bit receive 2 bit encoded watermarked
+    sequence instead of json.
+    Results are cached, X-Cache header tells whether the result was cached.
+    X-Engine-Backend header tells which compute backend was used.
+    :return:
+    """
+    params, seq, sample = _read_request()
+    op = read_operation('embed', params, seq, current_app)
+    if get_flag(params, 'async'):
+        run_operation(check_capacity(op))
+        return _submit_job('embed', op.backend, len(op.seq), op.seq,
+                           op.message, op.frame, op.gc)
+    result, wm_seq, headers = run_operation(answer(op))
+    if accepts_twobit(request.accept_mimetypes):
+        response = current_app.response_class(
+            twobit_format.iter_encode(wm_seq),
+            mimetype=twobit_format.MIMETYPE)
+        response.headers.extend(twobit_headers(wm_seq) + headers)
+        return response
+    if get_flag(params, 'verify'):
+        result['verification'] = verify_protein(op.seq, wm_seq,
+                                                frame=op.frame, gc=op.gc)
+    if get_flag(params, 'download'):
+        token = store_result(current_app, wm_seq)
+        result['download_url'] = url_for('web.download_result', token=token,
+                                         _external=True)
+    else:
+        result['sequence'] = wm_seq.to_string()
+    response = jsonify(result)
+    response.headers.extend(headers)
+    return response
+
+
+@api.route('/extract', methods=['POST'])
+def extract():
+    """
+    This function extracts watermark message from given sequence. If
+    'autodetect' parameter is set, all reading frames, both strands and
+    genetic codes given in 'gcs' (default AUTODETECT_GCS) are tried and
+    ranked candidates are returned. If 'async' parameter is set, message is
+    extracted as a job. Results are cached, X-Cache header tells whether the
+    result was cached.
+    :return:
+    """
+    params, seq, sample = _read_request()
+    if get_flag(params, 'autodetect'):
+        gcs = params.get('gcs') or current_app.config['AUTODETECT_GCS']
+        if isinstance(gcs, str):
+            gcs = gcs.split(',')
+        gcs = [str(g).strip() for g in gcs]
+        if not all(g in gc_file_associations.keys() for g in gcs):
+            raise ValidationError('Enter valid genetic codes.')
+        # 'gc' parameter is preferred among equally plausible candidates.
+        gc = get_params(params)[1]
+        return jsonify({'candidates': detect_and_extract(wm_dna=seq, gcs=gcs,
+                                                         gc=gc)})
+    op = read_operation('extract', params, seq, current_app)
+    if get_flag(params, 'async'):
+        return _submit_job('extract', op.backend, len(op.seq), op.seq,
+                           op.frame, op.gc)
+    result, msg, headers = run_operation(answer(op))
+    response = jsonify(result)
+    response.headers.extend(headers)
+    return response
+
+
+def _read_sequences():
+    """
+    This function reads parameters and DNA sequences of a multi-sequence
+    request. Sequences can be sent in json body ('sequences' or 'samples'
+    field, see get_sequences), as multi-FASTA file in multipart form ('file'
+    field) or as raw multi-FASTA body (parameters in query string).
+    Sequences are limited to MAX_SHARDED_BASES in total.
+    :return: tuple (parameters, list of names (FASTA headers, sample keys or
+    None), list of sequences (PackedSequence))
+    :except SequenceTooLong: if sequences exceed MAX_SHARDED_BASES.
+    """
+    max_bases = current_app.config.get('MAX_SHARDED_BASES')
+    if request.files:
+        params = request.form
+        if not has_uploaded_file(request.files.get('file')):
+            raise ValidationError('Upload FASTA file in "file" field.')
+        records = check_total_length(
+            read_uploaded_sequences(request.files['file']), max_bases)
+    elif is_fasta_request():
+        params = request.args
+        records = check_total_length(read_request_sequences(), max_bases)
+    else:
+        params = _get_json()
+        records = get_sequences(params, max_bases)
+    records = [(name, seq) for name, seq in records if seq]
+    if not records:
+        raise ValidationError('Please choose or enter some DNA sequence.')
+    return params, [name for name, seq in records], \
+        [PackedSequence.from_string(seq) for name, seq in records]
+
+
+def _get_frame_size(params):
+    """
+    This function reads frame size (bytes) of framed payload.
+    :param params: request parameters.
+    :return: integer
+    """
+    try:
+        frame_size = int(params.get('frame_size',
+                                    framing.DEFAULT_FRAME_SIZE))
+    except (TypeError, ValueError):
+        raise ValidationError('Invalid frame size.')
+    if not 0 < frame_size <= framing.MAX_FRAME_SIZE:
+        raise ValidationError('Frame size must be 1 to {0} bytes.'.format(
+            framing.MAX_FRAME_SIZE))
+    return frame_size
+
+
+@api.route('/embed/sharded', methods=['POST'])
+def embed_sharded():
+    """
+    This function embeds a watermark message too large for a single
+    sequence across a set of sequences (see app/common/sharding.py).
+    Request: {"sequences": ["...", ...] or "samples": ["ypt7", ...] or
+              "all", "message": "...", "frame": 1, "gc": 1,
+              "frame_size": 256}
+    (sequences may also be uploaded as multi-FASTA file, see
+    _read_sequences)
+    Capacities are computed and shards embedded in parallel. Response lists
+    all sequences in request order with index of their shard (null for
+    sequences left unchanged), clients accepting text/x-fasta receive
+    multi-FASTA file instead of json.
+    :return:
+    """
+    params, names, sequences = _read_sequences()
+    frame, gc = get_params(params)
+    frame_size = _get_frame_size(params)
+    msg = params.get('message')
+    if not isinstance(msg, str) or msg == '':
+        raise ValidationError('Please add a watermark message.')
+    map_fn = partial(dispatcher.map, 'embed', sum(map(len, sequences)))
+    result = sharding.embed_shards(sequences, msg, frame=frame, gc=gc,
+                                   frame_size=frame_size, map_fn=map_fn)
+    if result is None:
+        raise ValidationError('Watermark message length exceeds storage '
+                              'capacity of the sequences.')
+    wm_sequences, shards = result
+    if request.accept_mimetypes.best_match(
+            ['application/json', 'text/x-fasta']) == 'text/x-fasta':
+        body = ''.join('>{0}\n{1}\n'.format(
+            name or 'sequence_{0}'.format(i + 1), seq.to_string())
+            for i, (name, seq) in enumerate(zip(names, wm_sequences)))
+        return current_app.response_class(body, mimetype='text/x-fasta')
+    return jsonify({'frame': frame, 'gc': int(gc), 'frame_size': frame_size,
+                    'shards': sum(1 for index in shards if index is not None),
+                    'sequences': [dict(name=name, shard=index,
+                                       sequence=seq.to_string())
+                                  for name, index, seq in
+                                  zip(names, shards, wm_sequences)]})
+
+
+@api.route('/extract/sharded', methods=['POST'])
+def extract_sharded():
+    """
+    This function extracts a watermark message embedded across a set of
+    sequences by embed_sharded. Sequences may be sent in any order, shards
+    are extracted in parallel and reassembled in order.
+    Request: {"sequences": ["...", ...], "frame": 1, "gc": 1}
+    (sequences may also be uploaded as multi-FASTA file)
+    :return:
+    """
+    params, names, sequences = _read_sequences()
+    frame, gc = get_params(params)
+    map_fn = partial(dispatcher.map, 'extract', sum(map(len, sequences)))
+    try:
+        payload = sharding.extract_shards(sequences, frame=frame, gc=gc,
+                                          map_fn=map_fn)
+    except framing.FramingError as e:
+        raise ValidationError(str(e))
+    return jsonify({'message': payload.decode('utf-8', 'replace'),
+                    'length': len(payload), 'frame': frame, 'gc': int(gc)})
+
+
+@api.route('/capacity/index', methods=['POST'])
+def capacity_index():
+    """
+    This function answers capacity queries for a sequence using its capacity
+    index, the index is built once and reused for subsequent queries on the
+    same sequence.
+    Request: {"sequence": "..." or "sample": "ypt7", "frame": 1, "gc": 1,
+              "queries": [{"start": 0, "end": 300}, {"bits": 128},
+                          {"message": "..."}]}
+    (sequence may also be uploaded as FASTA file, see _read_request)
+    Range queries return capacity of the range, bits/message queries return
+    shortest prefix and shortest range which can hold them.
+    :return:
+    """
+    data, seq, sample = _read_request()
+    frame, gc = get_params(data)
+    codons = None
+    corpus = get_corpus()
+    if sample is not None and corpus is not None and sample in corpus:
+        codons = corpus.codon_indexes(sample, frame)
+    index = get_capacity_index(
+        seq, frame=frame, gc=gc, codons=codons,
+        key=None if sample is None else 'sample:' + sample)
+    if index is None:
+        raise ValidationError('Could not analyze given sequence.')
+
+    results = []
+    queries = data.get('queries') or []
+    if isinstance(queries, str):
+        # queries sent as form field or query string parameter.
+        try:
+            queries = json.loads(queries)
+        except ValueError:
+            raise ValidationError('Queries must be a json list.')
+    if not isinstance(queries, list):
+        raise ValidationError('Queries must be a list.')
+    for query in queries:
+        if not isinstance(query, dict):
+            raise ValidationError('Each query must be a json object.')
+        try:
+            if 'bits' in query or 'message' in query:
+                bits = int(query['bits']) if 'bits' in query else \
+                    message_bits(str(query['message']))
+                span = index.min_span(bits)
+                results.append(dict(bits=bits,
+                                    fits=index.fits(bits),
+                                    min_prefix=index.min_prefix(bits),
+                                    min_span=None if span is None
+                                    else list(span)))
+            else:
+                start = int(query.get('start', 0))
+                end = query.get('end')
+                end = index.length if end is None else int(end)
+                results.append(dict(start=start, end=end,
+                                    capacity=index.capacity(start, end)))
+        except (TypeError, ValueError):
+            raise ValidationError('Invalid query: ' + str(query))
+    return jsonify({'capacity': index.total, 'length': index.length,
+                    'frame': frame, 'gc': int(gc), 'results': results})
+
+
+@api.route('/translate', methods=['POST'])
+def translate():
+    """
+    This function translates a sequence (or a batch of sequences) to
+    protein, e.g. for checking that watermarking preserved the protein.
+    Request: {"sequence": "..." or "sequences": ["...", ...],
+              "frame": 1 (1, 2, 3 or -1, -2, -3 for reverse strand),
+              "gc": 1, "letters": 1 or 3}
+    (a single sequence may also be uploaded as FASTA file)
+    :return:
+    """
+    if request.files or is_fasta_request():
+        params, seq, sample = _read_request()
+        sequences = None
+    else:
+        params = _get_json()
+        sequences = params.get('sequences')
+        if sequences is None:
+            seq, sample = get_sequence(params)
+        elif not isinstance(sequences, list) or \
+                not all(isinstance(s, str) for s in sequences):
+            raise ValidationError('Sequences must be a list of strings.')
+    try:
+        frame = int(params.get('frame', 1))
+        letters = int(params.get('letters', 1))
+    except (TypeError, ValueError):
+        raise ValidationError('Invalid frame number or letters.')
+    if frame not in (1, 2, 3, -1, -2, -3):
+        raise ValidationError('Invalid frame number.')
+    if letters not in (1, 3):
+        raise ValidationError('Letters must be 1 or 3.')
+    gc = str(params.get('gc', 1))
+    if gc not in gc_file_associations.keys():
+        raise ValidationError('Enter a valid genetic code.')
+
+    backend = get_backend(params, current_app)
+    proteins = backend.translate_batch(
+        [seq] if sequences is None else sequences, frame=frame, gc=gc,
+        letters=letters)
+    if proteins is None:
+        raise ValidationError('Enter a valid genetic code.')
+    result = {'frame': frame, 'gc': int(gc), 'letters': letters}
+    if sequences is None:
+        result['protein'] = proteins[0]
+    else:
+        result['proteins'] = proteins
+    return jsonify(result)
+
+
+@api.route('/profile', methods=['POST'])
+def profile():
+    """
+    This function returns codon usage histogram and sliding window capacity
+    map of a sequence, showing where watermark capacity is concentrated.
+    Request: {"sequence": "..." or "sample": "ypt7", "frame": 1, "gc": 1,
+              "window": 100, "step": 100} (window and step in codons)
+    Response is json, or binary if client accepts application/octet-stream:
+    64 codon counts followed by capacity of each window, all unsigned 32 bit
+    little endian integers.
+    :return:
+    """
+    params, seq, sample = _read_request()
+    frame, gc = get_params(params)
+    try:
+        window = int(params.get('window', 100))
+        step = int(params.get('step', window))
+    except (TypeError, ValueError):
+        raise ValidationError('Invalid window or step.')
+    if window < 1 or step < 1:
+        raise ValidationError('Window and step must be positive.')
+    corpus = get_corpus()
+    if sample is not None and corpus is not None and sample in corpus:
+        codons = corpus.codon_indexes(sample, frame)
+    else:
+        codons = codon_indexes(clean_bases(seq), frame)
+    usage = codon_usage(codons)
+    windows = capacity_windows(codon_capacity(codons, gc), window, step)
+
+    if request.accept_mimetypes.best_match(
+            ['application/json', 'application/octet-stream']) == \
+            'application/octet-stream':
+        body = usage.astype('<u4').tobytes() + windows.astype('<u4').tobytes()
+        response = current_app.response_class(
+            body, mimetype='application/octet-stream')
+        response.headers['X-Window'] = str(window)
+        response.headers['X-Step'] = str(step)
+        return response
+    return jsonify({'frame': frame, 'gc': int(gc), 'codons': len(codons),
+                    'usage': dict((index_to_codon(i), int(count))
+                                  for i, count in enumerate(usage)),
+                    'window': window, 'step': step,
+                    'capacity': windows.tolist()})
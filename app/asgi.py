@@ -0,0 +1,508 @@
+"""
+This module serves the application with an asgi server (e.g. uvicorn) as an
+alternative to sync gunicorn workers, where every slow upload or long embed
+occupies a whole worker.
+
+Request bodies are received and responses are sent on the event loop, so
+slow clients do not hold a thread. Embed, extract and capacity requests of
+the json api are handled here and their engine calls are awaited on the
+process pool of the dispatcher (see Dispatcher.run_async), the requests
+are answered by the same functions as in the Flask views (see
+app/api_v1_0/operations.py) with their other steps run in a small thread
+pool. Request ids are assigned as by the Flask application. All other
+requests (web views, job polling, result downloads and api requests using
+multipart uploads or the async, download, verify or autodetect options) are
+passed to the Flask application in the thread pool. Streamed responses
+are read from it piece by piece, so a slow download holds a thread only
+while its next piece is read.
+
+usage: uvicorn asgi:app
+       gunicorn -c gunicorn_config.py -k uvicorn.workers.UvicornWorker \
+           asgi:app
+"""
+import os
+import sys
+import json
+import zlib
+import asyncio
+import logging
+import tempfile
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qsl
+from werkzeug.datastructures import MIMEAccept
+from werkzeug.http import parse_accept_header, parse_options_header
+from helpers.fasta_helpers import read_first_sequence, SequenceTooLong
+from helpers import twobit_format
+from . import dispatcher
+from .api_v1_0.errors import ValidationError, error_data
+from .api_v1_0.operations import read_operation, answer, accepts_twobit, \
+    twobit_headers
+from .api_v1_0.params import get_sequence, get_flag, check_json_body, \
+    check_sequence
+from .common.compression import accepts_gzip, gzip_bytes
+from .common.dispatcher import Overloaded
+from .common.logging import request_id_from, set_request_id
+from .common.uploads import FASTA_CONTENT_TYPES
+
+logger = logging.getLogger(__name__)
+
+# Options of api requests which are handled by the Flask views.
+FLASK_OPTIONS = ('async', 'download', 'verify', 'autodetect')
+
+# wbits value making zlib read gzip header and trailer.
+_GZIP_WBITS = 16 + zlib.MAX_WBITS
+
+
+class _HttpError(Exception):
+    """
+    Raised when a request is rejected before it reaches a handler.
+    """
+    def __init__(self, status, message):
+        super(_HttpError, self).__init__(message)
+        self.status = status
+
+
+def _header_dict(scope):
+    """
+    This function returns request headers of an asgi scope.
+    :param scope: asgi connection scope.
+    :return: dictionary object, lower case names, repeated headers joined
+    with commas.
+    """
+    headers = {}
+    for name, value in scope.get('headers', ()):
+        name = name.decode('latin-1').lower()
+        value = value.decode('latin-1')
+        headers[name] = headers[name] + ',' + value if name in headers \
+            else value
+    return headers
+
+
+def _path_info(scope):
+    """
+    This function returns path of request within the application.
+    :param scope: asgi connection scope.
+    :return: string
+    """
+    root_path = scope.get('root_path', '')
+    path = scope['path']
+    if root_path and path.startswith(root_path):
+        return path[len(root_path):]
+    return path
+
+
+def _inflate(decompressor, data, size=1 << 16):
+    """
+    This function decompresses data in limited pieces, so that a small
+    compressed body can not expand in memory at once.
+    :param decompressor: zlib decompress object.
+    :param data: compressed bytes.
+    :param size: maximum size (bytes) of pieces.
+    :return: generator of bytes.
+    """
+    while data:
+        block = decompressor.decompress(data, size)
+        if block:
+            yield block
+        data = decompressor.unconsumed_tail
+
+
+def _send_value(steps, value):
+    """
+    This function sends a value to a generator handling a request (see
+    app/api_v1_0/operations.py), StopIteration can not pass an asyncio
+    future.
+    :param steps: generator.
+    :param value: value sent.
+    :return: tuple (next EngineCall object or None when generator has
+    finished, return value of generator)
+    """
+    try:
+        return steps.send(value), None
+    except StopIteration as e:
+        return None, e.value
+
+
+class AsgiApp(object):
+    """
+    Asgi application serving a Flask application of dna-lceb.
+    """
+
+    def __init__(self, flask_app):
+        """
+        :param flask_app: application object (see create_app)
+        """
+        self.flask_app = flask_app
+        self.config = flask_app.config
+        self.max_size = self.config.get('MAX_CONTENT_LENGTH')
+        self.spool_size = self.config.get('UPLOAD_SPOOL_SIZE', 1 << 20)
+        self.threads = self.config.get('ASGI_THREADS', 16)
+        # operations answered on the event loop.
+        self.operations = {
+            '/api/v1.0/embed': 'embed',
+            '/api/v1.0/extract': 'extract',
+            '/api/v1.0/capacity': 'capacity',
+        }
+        self._pool = None
+        self._pool_pid = None
+
+    def _executor(self):
+        """
+        This function returns thread pool of current process, used for
+        Flask requests and blocking steps of api requests.
+        :return: ThreadPoolExecutor object.
+        """
+        if self._pool is None or self._pool_pid != os.getpid():
+            self._pool = ThreadPoolExecutor(max_workers=self.threads)
+            self._pool_pid = os.getpid()
+        return self._pool
+
+    def _in_thread(self, fn, *args):
+        # context carries the request id to the logging calls of fn.
+        context = contextvars.copy_context()
+        return asyncio.get_running_loop().run_in_executor(
+            self._executor(), context.run, fn, *args)
+
+    def shutdown(self):
+        """
+        This function stops thread pool and worker pool of current process.
+        :return:
+        """
+        if self._pool is not None and self._pool_pid == os.getpid():
+            self._pool.shutdown(wait=False)
+        self._pool = None
+        dispatcher.shutdown(wait=False)
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self._lifespan(receive, send)
+            return
+        if scope['type'] != 'http':
+            raise ValueError('Unsupported connection type: ' + scope['type'])
+        headers = _header_dict(scope)
+        request_id = request_id_from(headers.get('x-request-id'))
+        headers['x-request-id'] = request_id
+        set_request_id(request_id)
+        try:
+            body, size = await self._receive_body(receive, headers)
+        except _HttpError as e:
+            await self._send(send, e.status, 'text/plain',
+                             str(e).encode('utf-8'),
+                             [('X-Request-ID', request_id)])
+            return
+        if body is None:
+            # client disconnected.
+            return
+        try:
+            name = self.operations.get(_path_info(scope)) \
+                if scope['method'] == 'POST' else None
+            if name is not None and \
+                    await self._handle(name, scope, headers, body, send):
+                return
+            body.seek(0)
+            await self._call_flask(scope, headers, body, size, send)
+        finally:
+            body.close()
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                self.shutdown()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    async def _receive_body(self, receive, headers):
+        """
+        This function receives request body into a spooled temporary file,
+        decompressing gzip encoded bodies.
+        :param receive: asgi receive callable.
+        :param headers: request headers.
+        :return: tuple (file object, size in bytes), (None, 0) if client
+        disconnected.
+        :except _HttpError: if body is too large or is not valid gzip data.
+        """
+        length = headers.get('content-length')
+        if self.max_size is not None and length and length.isdigit() and \
+                int(length) > self.max_size:
+            raise _HttpError(413, 'Request body is too large.')
+        decompressor = zlib.decompressobj(_GZIP_WBITS) \
+            if headers.get('content-encoding', '').lower() == 'gzip' \
+            else None
+        spool = tempfile.SpooledTemporaryFile(max_size=self.spool_size)
+        size = 0
+        more_body = True
+        try:
+            while more_body:
+                message = await receive()
+                if message['type'] == 'http.disconnect':
+                    spool.close()
+                    return None, 0
+                data = message.get('body', b'')
+                more_body = message.get('more_body', False)
+                blocks = _inflate(decompressor, data) \
+                    if decompressor is not None else (data,)
+                for block in blocks:
+                    size += len(block)
+                    if self.max_size is not None and size > self.max_size:
+                        raise _HttpError(413, 'Request body is too large.')
+                    spool.write(block)
+            if decompressor is not None and size and not decompressor.eof:
+                raise _HttpError(400, 'Request body is not valid gzip data.')
+        except zlib.error:
+            spool.close()
+            raise _HttpError(400, 'Request body is not valid gzip data.')
+        except _HttpError:
+            spool.close()
+            raise
+        spool.seek(0)
+        return spool, size
+
+    async def _send(self, send, status, content_type, body, headers=()):
+        """
+        This function sends a response.
+        :param send: asgi send callable.
+        :param status: http status code.
+        :param content_type: content type of the body.
+        :param body: bytes or iterable of bytes-like objects.
+        :param headers: list of other (name, value) headers.
+        :return:
+        """
+        response_headers = [('Content-Type', content_type)] + list(headers)
+        if isinstance(body, bytes):
+            response_headers.append(('Content-Length', str(len(body))))
+            body = (body,)
+        await send({'type': 'http.response.start', 'status': status,
+                    'headers': [(name.lower().encode('latin-1'),
+                                 value.encode('latin-1'))
+                                for name, value in response_headers]})
+        for block in body:
+            await send({'type': 'http.response.body', 'body': bytes(block),
+                        'more_body': True})
+        await send({'type': 'http.response.body', 'body': b''})
+
+    async def _send_json(self, send, status, data, headers, extra=()):
+        """
+        This function sends a json response, gzip compressed if client
+        accepts it.
+        :param send: asgi send callable.
+        :param status: http status code.
+        :param data: json serializable object.
+        :param headers: request headers.
+        :param extra: list of other (name, value) response headers.
+        :return:
+        """
+        body = json.dumps(data).encode('utf-8')
+        extra = list(extra)
+        # same as compress_response of the Flask application.
+        if 200 <= status < 300 and \
+                len(body) >= self.config.get('COMPRESS_MIN_SIZE', 500) and \
+                accepts_gzip(headers.get('accept-encoding', '')):
+            body = await self._in_thread(
+                gzip_bytes, body, self.config.get('COMPRESS_LEVEL', 6))
+            extra.append(('Content-Encoding', 'gzip'))
+        await self._send(send, status, 'application/json', body, extra)
+
+    async def _handle(self, name, scope, headers, body, send):
+        """
+        This function handles an api request, same as the Flask view of the
+        endpoint (see app/api_v1_0/views.py).
+        :param name: name of operation i.e. 'embed', 'extract' or 'capacity'
+        :param scope: asgi connection scope.
+        :param headers: request headers.
+        :param body: request body (file object)
+        :param send: asgi send callable.
+        :return: True if response has been sent, False if request has to be
+        handled by Flask.
+        """
+        try:
+            query = dict(parse_qsl(
+                scope.get('query_string', b'').decode('latin-1')))
+            request = await self._in_thread(
+                self._read_request, headers.get('content-type', ''), query,
+                body)
+            if request is None:
+                return False
+            status, data, extra = await self._run(
+                self._answer(name, headers, *request))
+        except (ValidationError, SequenceTooLong, Overloaded) as e:
+            status, data, extra = error_data(e)
+        except Exception:
+            logger.exception('%s failed', scope['path'])
+            status, extra = 500, []
+            data = {'error': 'internal server error',
+                    'message': 'Internal server error.'}
+        extra = [('Vary', 'Accept-Encoding'),
+                 ('X-Request-ID', headers['x-request-id'])] + extra
+        if isinstance(data, dict):
+            await self._send_json(send, status, data, headers, extra)
+        else:
+            await self._send(send, status, twobit_format.MIMETYPE, data,
+                             extra)
+        return True
+
+    def _read_request(self, content_type, query, body):
+        """
+        This function reads parameters and DNA sequence of an api request:
+        json body, raw FASTA body or 2 bit encoded body (parameters in query
+        string). Runs in the thread pool.
+        :param content_type: content type of request.
+        :param query: query string parameters.
+        :param body: request body (file object)
+        :return: tuple (parameters, sequence) or None if request has to be
+        handled by Flask.
+        """
+        mimetype = parse_options_header(content_type)[0]
+        max_length = self.config.get('MAX_SEQUENCE_LENGTH')
+        if mimetype in (twobit_format.MIMETYPE,) + FASTA_CONTENT_TYPES:
+            params = query
+            if any(get_flag(params, option) for option in FLASK_OPTIONS):
+                return None
+            if mimetype == twobit_format.MIMETYPE:
+                try:
+                    sequence = twobit_format.read(body, max_length=max_length)
+                except twobit_format.FormatError as e:
+                    raise ValidationError(str(e))
+            else:
+                sequence = read_first_sequence(body, max_length=max_length)
+        elif mimetype == 'application/json' or \
+                (mimetype.startswith('application/') and
+                 mimetype.endswith('+json')):
+            try:
+                params = json.loads(body.read().decode('utf-8'))
+            except ValueError:
+                params = None
+            check_json_body(params)
+            if any(get_flag(params, option) for option in FLASK_OPTIONS):
+                return None
+            sequence = get_sequence(params)[0]
+        elif mimetype == 'multipart/form-data':
+            return None
+        else:
+            check_json_body(None)
+        return params, check_sequence(sequence)
+
+    async def _run(self, steps):
+        """
+        This function runs a generator handling a request: engine calls it
+        yields are awaited on the event loop (see Dispatcher.run_async),
+        other steps run in the thread pool.
+        :param steps: generator e.g. _answer.
+        :return: return value of the generator.
+        """
+        value = None
+        while True:
+            call, result = await self._in_thread(_send_value, steps, value)
+            if call is None:
+                return result
+            value = await dispatcher.run_async(
+                call.operation, call.length, call.fn, *call.args,
+                **call.kwargs)
+
+    def _answer(self, name, headers, params, seq):
+        """
+        This function answers an embed, extract or capacity request (see
+        answer), watermarked sequences are sent in 2 bit encoding to clients
+        preferring it.
+        :param name: name of operation.
+        :param headers: request headers.
+        :param params: request parameters.
+        :param seq: DNA sequence.
+        :return: generator returning tuple (status, json result or
+        iterable of bytes, list of (name, value) headers)
+        """
+        op = read_operation(name, params, seq, self.flask_app)
+        result, value, extra = yield from answer(op)
+        if name == 'embed':
+            accept = parse_accept_header(headers.get('accept', ''),
+                                         MIMEAccept)
+            if accepts_twobit(accept):
+                return 200, twobit_format.iter_encode(value), \
+                    twobit_headers(value) + extra
+            result['sequence'] = value.to_string()
+        return 200, result, extra
+
+    def _environ(self, scope, headers, body, size):
+        """
+        This function builds wsgi environment of a request. Body has already
+        been decompressed, so Content-Encoding header is not passed on.
+        :param scope: asgi connection scope.
+        :param headers: request headers.
+        :param body: request body (file object)
+        :param size: size of body (bytes)
+        :return: dictionary object.
+        """
+        server = scope.get('server') or ('localhost', 80)
+        client = scope.get('client') or ('', 0)
+        root_path = scope.get('root_path', '')
+        path = _path_info(scope)
+        environ = {
+            'REQUEST_METHOD': scope['method'],
+            'SCRIPT_NAME': root_path.encode('utf-8').decode('latin-1'),
+            'PATH_INFO': path.encode('utf-8').decode('latin-1'),
+            'QUERY_STRING': scope.get('query_string', b'').decode('latin-1'),
+            'SERVER_NAME': server[0],
+            'SERVER_PORT': str(server[1]),
+            'SERVER_PROTOCOL': 'HTTP/' + scope.get('http_version', '1.1'),
+            'REMOTE_ADDR': client[0],
+            'CONTENT_LENGTH': str(size),
+            'wsgi.version': (1, 0),
+            'wsgi.url_scheme': scope.get('scheme', 'http'),
+            'wsgi.input': body,
+            'wsgi.errors': sys.stderr,
+            'wsgi.multithread': True,
+            'wsgi.multiprocess': True,
+            'wsgi.run_once': False,
+        }
+        for name, value in headers.items():
+            if name in ('content-length', 'content-encoding'):
+                continue
+            name = name.upper().replace('-', '_')
+            if name != 'CONTENT_TYPE':
+                name = 'HTTP_' + name
+            environ[name] = value
+        return environ
+
+    async def _call_flask(self, scope, headers, body, size, send):
+        """
+        This function passes a request to the Flask application, response
+        is read piece by piece in the thread pool and sent on event loop.
+        :param scope: asgi connection scope.
+        :param headers: request headers.
+        :param body: request body (file object)
+        :param size: size of body (bytes)
+        :param send: asgi send callable.
+        :return:
+        """
+        started = []
+
+        def start_response(status, response_headers, exc_info=None):
+            if exc_info is not None and started:
+                raise exc_info[1].with_traceback(exc_info[2])
+            started[:] = [status, response_headers]
+            return None
+
+        environ = self._environ(scope, headers, body, size)
+        iterable = await self._in_thread(self.flask_app, environ,
+                                         start_response)
+        try:
+            iterator = iter(iterable)
+            block = await self._in_thread(next, iterator, None)
+            status, response_headers = started
+            await send({'type': 'http.response.start',
+                        'status': int(status.split(' ', 1)[0]),
+                        'headers': [(name.lower().encode('latin-1'),
+                                     value.encode('latin-1'))
+                                    for name, value in response_headers]})
+            while block is not None:
+                if block:
+                    await send({'type': 'http.response.body', 'body': block,
+                                'more_body': True})
+                block = await self._in_thread(next, iterator, None)
+            await send({'type': 'http.response.body', 'body': b''})
+        finally:
+            if hasattr(iterable, 'close'):
+                await self._in_thread(iterable.close)
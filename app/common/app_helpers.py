@@ -2,9 +2,13 @@
 Helper functions for rest api and web application.
 """
 import json
+import logging
 from helpers.gc_file_helpers import gc_file_associations
 from helpers.gc_data_helpers import get_aa_using_codon_gct, get_gc_table, \
     codon_to_aa_gct
+from .regions import CodingRegions
+
+logger = logging.getLogger(__name__)
 
 
 def find_capacity(dna_seq=None, frame=1, gc=1):
@@ -18,11 +22,11 @@ def find_capacity(dna_seq=None, frame=1, gc=1):
     """
     if dna_seq is None or type(dna_seq) is not str:
         # Bad dna_seq value
-        print("find capacity dna_seq is none or type is not str")
+        logger.debug("find capacity dna_seq is none or type is not str")
         return None
     if frame > 3 or frame < 1:
         # Bad value for frame
-        print("find capacity frame number invalid ")
+        logger.debug("find capacity frame number invalid %s", frame)
         return None
     # Read the genetic code table data.
     try:
@@ -41,28 +45,30 @@ def find_capacity(dna_seq=None, frame=1, gc=1):
             if aa["key"] == 'met' and not start:
                 start = True
             elif aa["key"] == 'stop' and start:
-                if aa["count"] > 3:
+                if _fold(aa) > 3:
                     capacity += 2
-                elif aa["count"] > 1:
+                elif _fold(aa) > 1:
                     capacity += 1
                 start = False
             # include stop codon in watermarking region
             if start:
-                if aa["count"] > 3:
+                if _fold(aa) > 3:
                     capacity += 2
-                elif aa["count"] > 1:
+                elif _fold(aa) > 1:
                     capacity += 1
         return capacity
     except Exception as e:
-        print(e)
+        logger.warning("find capacity failed: %s", e)
         return None
 
 
-def find_capacity_for_coding_region(dna_seq=None, region={}, frame=1, gc=1):
+def find_capacity_for_coding_region(dna_seq=None, region=None, frame=1, gc=1):
     """
-    This function returns the capacity for given sequence.
+    This function returns the capacity for given coding regions of a
+    sequence, i.e. number of bits which embed_data can embed in them.
     :param dna_seq: dna sequence string.
-    :param region: dictionary object containing indexes of start and stop codon.
+    :param region: CodingRegions object (or dictionary object containing
+    indexes of start and stop codon), it is not modified.
     :param frame: open reading frame number e.g. 1, 2, 3, default=1
     :param gc: genetic code (integer). default=None
     :return capacity: number of bits we can store in given dna sequence.
@@ -70,11 +76,12 @@ def find_capacity_for_coding_region(dna_seq=None, region={}, frame=1, gc=1):
     """
     if dna_seq is None or type(dna_seq) is not str:
         # Bad dna_seq value
-        print("find_capacity_for_coding_region dna_seq is none")
+        logger.debug("find_capacity_for_coding_region dna_seq is none")
         return None
     if frame > 3 or frame < 1:
         # Bad value for frame
-        print("find_capacity_for_coding_region frame number invalid ")
+        logger.debug("find_capacity_for_coding_region frame number invalid "
+                     "%s", frame)
         return None
     # Read the genetic code table data.
     try:
@@ -83,28 +90,35 @@ def find_capacity_for_coding_region(dna_seq=None, region={}, frame=1, gc=1):
         dna_seq = _clean_dna(dna_seq)
         dna = dna_seq[
               (frame - 1):(len(dna_seq) - (len(dna_seq) % 3) + (frame - 1))]
+        region = _coerce_region(region)
         capacity = 0
-        # TODO: Break down the dna sequencing over a pool of processes.
-        for i in range(len(region["start"])):
-            if i < len(region["stop"]):
-                dna_portion = dna[region["start"][i]: region["stop"][i]]
-            else:
-                dna_portion = dna[region["start"][i]: len(dna)]
-
-            # calculate capacity
-            for j in range(0, len(dna_portion), 3):
+        for i in range(len(region)):
+            # same codons as used by embed_data, i.e. without stop codon.
+            for j in range(region.starts[i], region.stop(i, len(dna)) - 3, 3):
                 aa = get_aa_using_codon_gct(gct=gct, codon=dna[j: j+3])
-                if aa["count"] > 3:
+                if _fold(aa) > 3:
                     capacity += 2
-                elif aa["count"] > 1:
+                elif _fold(aa) > 1:
                     capacity += 1
         return capacity
     except Exception as e:
         # given GC value does not have any associated file.
-        print(e)
+        logger.warning("find_capacity_for_coding_region failed: %s", e)
         return None
 
 
+def _coerce_region(region):
+    """
+    This function returns CodingRegions object for given region data.
+    :param region: CodingRegions object, dictionary containing position of
+    start, stop codons or None (no coding regions).
+    :return: CodingRegions object.
+    """
+    if region is None:
+        return CodingRegions()
+    return CodingRegions.coerce(region)
+
+
 def _clean_dna(dna_seq):
     """
     This function removes any characters from the dna string if it is not A,
@@ -243,6 +257,17 @@ def _extract_lsb_4fold(codon):
         return None
 
 
+def _fold(aa):
+    """
+    This function returns degeneracy of an amino acid used for embedding,
+    amino acids with more than 3 codons whose popular codon prefix does not
+    end in all four bases are 2 fold (see build_gc_tables.embedding_fold).
+    :param aa: dictionary containing amino acid information.
+    :return: integer
+    """
+    return aa.get("fold", aa["count"])
+
+
 def _find_popular_codon(aa):
     """
     This function returns popular codon from a 4+ fold degenerative codon.
@@ -292,15 +317,15 @@ def _bin_str_to_int(bin_str):
         None
 
 
-def embed_data(dna_seq=None, message=None, frame=1, region={}, gc=1):
+def embed_data(dna_seq=None, message=None, frame=1, region=None, gc=1):
     """
     This function embeds the given message in given DNA sequence.
     :param dna_seq: DNA sequence (string) to be watermarked.
     :param message: watermark message (string)
     :param frame: open reading frame number in which data will be
     watermarked.
-    :param region: dictionary containing position of start, stop codons
-    for coding regions.
+    :param region: CodingRegions object (or dictionary containing position
+    of start, stop codons) for coding regions, it is not modified.
     :param gc: genetic code.
     :return: DNA sequence (string) watermarked.
     """
@@ -320,21 +345,21 @@ def embed_data(dna_seq=None, message=None, frame=1, region={}, gc=1):
         dna = dna_seq[
               (frame-1): (len(dna_seq) - (len(dna_seq) % 3) + (frame - 1))]
 
-        # Finish last coding region at the end of DNA.
-        if len(region.get("start")) < len(region.get("stop")):
-            region.get("stop").append(len(dna))
+        # Last coding region without stop position is finished at the end
+        # of DNA.
+        region = _coerce_region(region)
         rc = 0
         i = 0
         while i < len(dna):
             # Loop through whole DNA sequence with step size = 3 (i.e. length
             #  of codon)
-            if rc < len(region.get("start")) and i >= region.get("start")[rc]:
+            if rc < len(region) and i >= region.starts[rc]:
                 # Loop through coding region.
                 j = i
-                while j < region.get("stop")[rc] - 3:
+                while j < region.stop(rc, len(dna)) - 3:
                     # embed data
                     aa = get_aa_using_codon_gct(gct=gct, codon=dna[j: j+3])
-                    if aa["count"] > 3 and wmc < len(wm_data):
+                    if _fold(aa) > 3 and wmc < len(wm_data):
                         # embedding in 4+ fold codons
                         if wmc == len(wm_data) - 1:
                             # fail safe condition if we have one bit left to
@@ -345,7 +370,7 @@ def embed_data(dna_seq=None, message=None, frame=1, region={}, gc=1):
                         else:
                             wm_dna += _lsb_4fold(aa=aa, bits=wm_data[wmc:wmc+2])
                             wmc += 2
-                    elif aa["count"] > 1 and wmc < len(wm_data):
+                    elif _fold(aa) > 1 and wmc < len(wm_data):
                         # embedding in 2/3 fold codons
                         wm_dna += _lsb_2fold(aa=aa, bit=wm_data[wmc])
                         wmc += 1
@@ -366,14 +391,14 @@ def embed_data(dna_seq=None, message=None, frame=1, region={}, gc=1):
         return None
 
 
-def extract_data(wm_dna=None, frame=1, region={}, gc=1):
+def extract_data(wm_dna=None, frame=1, region=None, gc=1):
     """
     This function embeds the given message in given DNA sequence.
     :param wm_dna: watermarked DNA sequence (string) to be watermarked.
     :param frame: open reading frame number in which data will be
     watermarked.
-    :param region: dictionary containing position of start, stop codons
-    for coding regions.
+    :param region: CodingRegions object (or dictionary containing position
+    of start, stop codons) for coding regions, it is not modified.
     :param gc: genetic code.
     :return: DNA sequence (string) watermarked.
     """
@@ -389,24 +414,24 @@ def extract_data(wm_dna=None, frame=1, region={}, gc=1):
         dna = dna_seq[
               (frame-1): (len(dna_seq) - (len(dna_seq) % 3) + (frame - 1))]
 
-        # Finish last coding region at the end of DNA.
-        if len(region.get("start")) < len(region.get("stop")):
-            region.get("stop").append(len(dna))
+        # Last coding region without stop position is finished at the end
+        # of DNA.
+        region = _coerce_region(region)
         rc = 0
         i = 0
         while i < len(dna):
             # Loop through whole DNA sequence with step size = 3 (i.e. length
             #  of codon)
-            if rc < len(region.get("start")) and i >= region.get("start")[rc]:
+            if rc < len(region) and i >= region.starts[rc]:
                 # Loop through coding region.
                 j = i
-                while j < region.get("stop")[rc] - 3:
+                while j < region.stop(rc, len(dna)) - 3:
                     # extract data
                     aa = get_aa_using_codon_gct(gct=gct, codon=dna[j: j+3])
-                    if aa["count"] > 3:
+                    if _fold(aa) > 3:
                         # extract from 4+ fold codons
                         wm_msg += _extract_lsb_4fold(codon=dna[j: j+3])
-                    elif aa["count"] > 1:
+                    elif _fold(aa) > 1:
                         # extract from 2/3 fold codons
                         wm_msg += _extract_2fold(codon=dna[j:j+3], aa=aa)
                     else:
@@ -431,7 +456,7 @@ def find_coding_region(dna_seq=None, frame=1, gc=1):
     :param dna_seq: dna sequence string.
     :param frame: open reading frame number i.e. 1, 2, 3 default=1
     :param gc: genetic code (integer). default=None
-    :return: dictionary object containing list of indexes for start and stop
+    :return: CodingRegions object containing indexes for start and stop
     codons.
     """
     # TODO: Take open reading frames into account.
@@ -467,6 +492,6 @@ def find_coding_region(dna_seq=None, frame=1, gc=1):
                 start = False
         if len(stop_index) < len(start_index):
             stop_index.append((len(dna)-len(dna) % 3) + 1)
-        return dict(start=start_index, stop=stop_index)
+        return CodingRegions(start_index, stop_index)
     except Exception as e:
         return None
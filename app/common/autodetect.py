@@ -0,0 +1,125 @@
+"""
+This module implements extraction with automatic detection of reading
+frame, strand and genetic code.
+
+All candidates (frames x strands x genetic codes) are evaluated
+concurrently. For each candidate only the 16 bit length header is decoded
+first, full extraction is done just for candidates whose length fits in
+their capacity, and the extracted messages are ranked by how plausible they
+are: how much they look like text, whether they have a reasonable length,
+how unlikely random codons are to decode to them (see _evidence) and
+whether they use the requested (or standard) genetic code.
+"""
+import math
+import string
+from concurrent.futures import ThreadPoolExecutor
+from helpers.codon_helpers import clean_bases, strand_codons, codon_capacity
+from helpers.packed_sequence import PackedSequence
+from .vector_engine import HEADER_BITS, extract_bits, decode_length, \
+    decode_message
+
+_PRINTABLE = set(string.printable)
+
+# Messages shorter than this (characters) are ranked after longer ones, a
+# single printable character is decoded from random codons quite often.
+MIN_MESSAGE_LENGTH = 2
+
+
+def _candidate_header(bases, frame, gc):
+    """
+    This function decodes length header of a candidate.
+    :param bases: numpy array of base indexes.
+    :param frame: reading frame number 1, 2, 3, -1, -2, -3
+    :param gc: genetic code.
+    :return: dictionary object describing the candidate or None if it can
+    not hold a watermark.
+    """
+    codons = strand_codons(bases, frame)
+    capacity = codon_capacity(codons, gc)
+    if capacity is None:
+        return None
+    total = int(capacity.sum())
+    length = decode_length(extract_bits(codons, gc, limit=HEADER_BITS))
+    if length is None or length < 1 or HEADER_BITS + 8 * length > total:
+        return None
+    return dict(frame=abs(frame), strand='+' if frame > 0 else '-',
+                gc=int(gc), length=length, capacity=total,
+                _codons=codons)
+
+
+def _candidate_message(candidate):
+    """
+    This function extracts message of a plausible candidate and scores it.
+    :param candidate: dictionary object returned by _candidate_header.
+    :return: candidate with 'message' and 'score' (fraction of printable
+    characters in message).
+    """
+    bits = extract_bits(candidate.pop('_codons'), candidate['gc'],
+                        limit=HEADER_BITS + 8 * candidate['length'])
+    message = decode_message(bits)
+    candidate['message'] = message
+    candidate['score'] = sum(1 for c in message if c in _PRINTABLE) / \
+        float(len(message)) if message else 0.0
+    return candidate
+
+
+def _evidence(candidate):
+    """
+    This function measures how unlikely random codons are to decode to a
+    candidate: a random length header fits in the capacity with probability
+    of about (capacity - HEADER_BITS) / 8 / 2 ** HEADER_BITS, and a random
+    character is printable with probability len(_PRINTABLE) / 256.
+    :param candidate: dictionary object returned by _candidate_message.
+    :return: log odds (float), higher is more plausible.
+    """
+    fitting = max((candidate['capacity'] - HEADER_BITS) // 8, 1)
+    printable = sum(1 for c in candidate['message'] if c in _PRINTABLE)
+    return math.log(2.0 ** HEADER_BITS / fitting) + \
+        printable * math.log(256.0 / len(_PRINTABLE))
+
+
+def _rank(candidate, gc):
+    """
+    This function returns sort key of a candidate, best first.
+    :param candidate: dictionary object returned by _candidate_message.
+    :param gc: requested genetic code.
+    :return: tuple
+    """
+    return (-candidate['score'],
+            len(candidate['message']) < MIN_MESSAGE_LENGTH,
+            -_evidence(candidate),
+            candidate['gc'] != gc, candidate['gc'] != 1)
+
+
+def detect_and_extract(wm_dna=None, gcs=(1,), frames=(1, 2, 3),
+                       strands=('+', '-'), max_workers=None, gc=1):
+    """
+    This function extracts watermark from a sequence whose reading frame,
+    strand and genetic code are not known.
+    :param wm_dna: watermarked DNA sequence (string or PackedSequence)
+    :param gcs: genetic codes to try.
+    :param frames: reading frames to try.
+    :param strands: strands to try, '+' (given) and '-' (reverse
+    complement)
+    :param max_workers: number of threads evaluating candidates.
+    :param gc: requested genetic code, preferred over other codes (and the
+    standard code over the rest) among equally plausible candidates.
+    :return: list of candidates (dictionary objects with 'frame', 'strand',
+    'gc', 'length', 'capacity', 'message' and 'score'), best first, or None
+    if sequence is invalid.
+    """
+    if not isinstance(wm_dna, (str, PackedSequence)):
+        return None
+    bases = clean_bases(wm_dna)
+    candidates = [(frame if strand == '+' else -frame, gc)
+                  for gc in gcs for strand in strands for frame in frames]
+    if not candidates:
+        return []
+    with ThreadPoolExecutor(max_workers=max_workers or
+                            min(len(candidates), 8)) as pool:
+        headers = list(pool.map(lambda c: _candidate_header(bases, *c),
+                                candidates))
+        plausible = [h for h in headers if h is not None]
+        results = list(pool.map(_candidate_message, plausible))
+    results.sort(key=lambda c: _rank(c, int(gc)))
+    return results
@@ -0,0 +1,104 @@
+"""
+This package contains the compute backends running the core operations of
+watermarking (clean, encode, region detection, capacity, embed, extract and
+translate), see base.Backend for the interface:
+    numpy: vectorized engine working on 2 bit packed sequences (fast path)
+    reference: pure python implementation of app_helpers
+
+ENGINE_BACKEND configuration (or environment variable) chooses the backend,
+'auto' picks the first available one in order of BACKENDS, i.e. the numpy
+backend. numpy is a requirement of the application as a whole (sequences
+are handled as PackedSequence objects everywhere), the reference backend
+is not a fallback for environments without numpy but a slow oracle for
+checking results. If ENGINE_BACKEND_OVERRIDE is set,
+a request can choose another backend with 'backend' parameter, e.g. for
+checking a suspected discrepancy against the reference.
+"""
+import logging
+from .base import Backend
+from .reference import ReferenceBackend
+from .vectorized import NumpyBackend
+
+logger = logging.getLogger(__name__)
+
+# Backends in order of preference for automatic selection.
+BACKENDS = (NumpyBackend, ReferenceBackend)
+
+AUTO = 'auto'
+
+_instances = {}
+
+
+class BackendUnavailable(ValueError):
+    """
+    Raised if requested backend is unknown or can not run in current
+    environment.
+    """
+
+
+def backend_names():
+    """
+    This function returns names of all backends.
+    :return: list of strings.
+    """
+    return [backend.name for backend in BACKENDS]
+
+
+def available_backends():
+    """
+    This function returns names of backends which can run in current
+    environment.
+    :return: list of strings.
+    """
+    return [backend.name for backend in BACKENDS if backend.is_available()]
+
+
+def get_backend(name=AUTO):
+    """
+    This function returns a backend, instances are shared.
+    :param name: name of backend, 'auto' (or None) for the first available
+    one.
+    :return: Backend object.
+    """
+    if not name or name == AUTO:
+        available = available_backends()
+        if not available:
+            raise BackendUnavailable('No compute backend is available.')
+        name = available[0]
+    for backend in BACKENDS:
+        if backend.name == name:
+            break
+    else:
+        raise BackendUnavailable('Unknown backend "{0}", choose one of '
+                                 '{1}.'.format(name,
+                                               ', '.join(backend_names())))
+    if not backend.is_available():
+        raise BackendUnavailable('Backend "{0}" is not available.'
+                                 .format(name))
+    if name not in _instances:
+        _instances[name] = backend()
+    return _instances[name]
+
+
+def init_app(app):
+    """
+    This function selects backend of the application (ENGINE_BACKEND), an
+    unknown or unavailable backend fails application startup.
+    :param app: application object.
+    :return: Backend object.
+    """
+    backend = get_backend(app.config.get('ENGINE_BACKEND', AUTO))
+    logger.info('Using %s compute backend (available: %s).', backend.name,
+                ', '.join(available_backends()))
+    app.extensions['engine_backend'] = backend
+    return backend
+
+
+def app_backend(app):
+    """
+    This function returns backend selected for the application.
+    :param app: application object.
+    :return: Backend object.
+    """
+    backend = app.extensions.get('engine_backend')
+    return backend if backend is not None else get_backend()
@@ -0,0 +1,128 @@
+"""
+This module defines the interface of compute backends.
+"""
+
+
+class Backend(object):
+    """
+    Core operations of watermarking. Sequences are accepted as strings or
+    PackedSequence objects, any character other than A, G, C, T is ignored.
+    Operations return None for inputs which can not be processed (e.g. an
+    invalid genetic code or an empty message), same as the functions of
+    app_helpers.
+    """
+    # name used in configuration and requests.
+    name = None
+    # name of dispatcher operation used for cost of every call (see
+    # OPERATION_COST), None if cost depends on the operation.
+    cost_operation = None
+
+    @classmethod
+    def is_available(cls):
+        """
+        This function tells whether the backend can run in current
+        environment, e.g. whether its libraries can be imported.
+        :return: True or False
+        """
+        return True
+
+    def operation(self, name):
+        """
+        This function returns name of dispatcher operation for estimating
+        cost of a call (see Dispatcher).
+        :param name: name of operation e.g. 'embed'
+        :return: string
+        """
+        return self.cost_operation or name
+
+    def clean(self, dna_seq):
+        """
+        This function removes any characters other than A, G, C, T.
+        :param dna_seq: DNA sequence.
+        :return: cleaned sequence, in the form used by the backend.
+        """
+        raise NotImplementedError
+
+    def encode(self, message):
+        """
+        This function encodes watermark message as length header (16 bits)
+        followed by 8 bits per character.
+        :param message: watermark message (string)
+        :return: string of '0' and '1' characters or None if message is
+        empty or too long.
+        """
+        raise NotImplementedError
+
+    def find_regions(self, dna_seq, frame=1, gc=1):
+        """
+        This function finds coding regions of a sequence.
+        :param dna_seq: DNA sequence.
+        :param frame: open reading frame number i.e. 1, 2, 3 default=1
+        :param gc: genetic code (integer or string) default=1
+        :return: CodingRegions object.
+        """
+        raise NotImplementedError
+
+    def capacity(self, dna_seq, frame=1, gc=1):
+        """
+        This function returns number of bits which embed can store in a
+        sequence (codons of coding regions, without their stop codons).
+        :param dna_seq: DNA sequence.
+        :param frame: open reading frame number i.e. 1, 2, 3 default=1
+        :param gc: genetic code (integer or string) default=1
+        :return: capacity (bits)
+        """
+        raise NotImplementedError
+
+    def embed(self, dna_seq, message, frame=1, gc=1):
+        """
+        This function embeds watermark message in a sequence. Bases before
+        and after complete codons of the reading frame are kept in place.
+        :param dna_seq: DNA sequence.
+        :param message: watermark message (string)
+        :param frame: open reading frame number i.e. 1, 2, 3 default=1
+        :param gc: genetic code (integer or string) default=1
+        :return: watermarked sequence (string or PackedSequence)
+        """
+        raise NotImplementedError
+
+    def extract(self, wm_dna, frame=1, gc=1):
+        """
+        This function extracts watermark message from a sequence.
+        :param wm_dna: watermarked DNA sequence.
+        :param frame: open reading frame number i.e. 1, 2, 3 default=1
+        :param gc: genetic code (integer or string) default=1
+        :return: message (string)
+        """
+        raise NotImplementedError
+
+    def translate(self, dna_seq, frame=1, gc=1, letters=1):
+        """
+        This function translates a sequence to protein.
+        :param dna_seq: DNA sequence.
+        :param frame: reading frame number 1, 2, 3, -1, -2, -3 default=1
+        :param gc: genetic code (integer or string) default=1
+        :param letters: 1 (e.g. 'MF*') or 3 (e.g. 'MetPheTer') letter
+        notation.
+        :return: protein (string)
+        """
+        raise NotImplementedError
+
+    def translate_batch(self, dna_seqs, frame=1, gc=1, letters=1):
+        """
+        This function translates a batch of sequences to proteins.
+        :param dna_seqs: list of DNA sequences.
+        :param frame: reading frame number 1, 2, 3, -1, -2, -3 default=1
+        :param gc: genetic code (integer or string) default=1
+        :param letters: 1 or 3 letter notation.
+        :return: list of proteins (strings) or None if genetic code or frame
+        is invalid.
+        """
+        proteins = [self.translate(dna_seq, frame, gc, letters)
+                    for dna_seq in dna_seqs]
+        if any(protein is None for protein in proteins):
+            return None
+        return proteins
+
+    def __repr__(self):
+        return '<{0} backend>'.format(self.name)
@@ -0,0 +1,125 @@
+"""
+Pure python backend running the reference implementation of app_helpers. It
+does not need numpy and serves as the oracle for the other backends.
+"""
+from helpers.gc_file_helpers import gc_file_associations
+from helpers.gc_data_helpers import get_gc_table, codon_to_aa_gct
+from helpers.gc_tables_compiled import AA_KEYS, AA_SYMBOLS
+from .. import app_helpers
+from .base import Backend
+
+_COMPLEMENT = str.maketrans('acgt', 'tgca')
+
+# 1 letter notation of amino acids ('symbol' of gc tables is not unique,
+# e.g. 'S' for ser, thr and stop).
+_SYMBOLS = dict(zip(AA_KEYS, AA_SYMBOLS))
+
+
+def _text(dna_seq):
+    """
+    This function returns sequence as text, the reference functions work
+    on strings only.
+    :param dna_seq: DNA sequence (string or PackedSequence)
+    :return: string
+    """
+    return dna_seq if isinstance(dna_seq, str) else str(dna_seq)
+
+
+def _reading_frame(dna_seq, frame):
+    """
+    This function cleans a sequence and finds complete codons of a reading
+    frame. The reference functions slice frames 2 and 3 past the end of
+    sequence and fail on the partial codon, so they are given the complete
+    codons as frame 1.
+    :param dna_seq: DNA sequence (string or PackedSequence)
+    :param frame: open reading frame number i.e. 1, 2, 3
+    :return: tuple (cleaned sequence, start, end) of codons of the frame or
+    None if frame number is invalid.
+    """
+    if frame not in (1, 2, 3):
+        return None
+    dna_seq = app_helpers._clean_dna(_text(dna_seq))
+    start = frame - 1
+    end = start + max(len(dna_seq) - start, 0) // 3 * 3
+    return dna_seq, start, end
+
+
+class ReferenceBackend(Backend):
+    """
+    Backend running find_coding_region, embed_data, extract_data etc. of
+    app_helpers.
+    """
+    name = 'reference'
+    cost_operation = 'reference'
+
+    def clean(self, dna_seq):
+        return app_helpers._clean_dna(_text(dna_seq))
+
+    def encode(self, message):
+        if not isinstance(message, str) or not message or \
+                len(message) >= 2 ** 16:
+            return None
+        return app_helpers._int_to_bin_str(len(message)) + \
+            app_helpers.str_to_bin(message)
+
+    def find_regions(self, dna_seq, frame=1, gc=1):
+        reading_frame = _reading_frame(dna_seq, frame)
+        if reading_frame is None:
+            return None
+        dna_seq, start, end = reading_frame
+        return app_helpers.find_coding_region(dna_seq[start:end], 1, gc)
+
+    def capacity(self, dna_seq, frame=1, gc=1):
+        reading_frame = _reading_frame(dna_seq, frame)
+        if reading_frame is None:
+            return None
+        dna_seq, start, end = reading_frame
+        codons = dna_seq[start:end]
+        region = app_helpers.find_coding_region(codons, 1, gc)
+        if region is None:
+            return None
+        return app_helpers.find_capacity_for_coding_region(
+            codons, region=region, frame=1, gc=gc)
+
+    def embed(self, dna_seq, message, frame=1, gc=1):
+        reading_frame = _reading_frame(dna_seq, frame)
+        if reading_frame is None or self.encode(message) is None:
+            return None
+        dna_seq, start, end = reading_frame
+        codons = dna_seq[start:end]
+        region = app_helpers.find_coding_region(codons, 1, gc)
+        if region is None:
+            return None
+        wm_codons = app_helpers.embed_data(codons, message, 1, region, gc)
+        if wm_codons is None:
+            return None
+        # bases around complete codons of the frame are kept in place.
+        return dna_seq[:start] + wm_codons + dna_seq[end:]
+
+    def extract(self, wm_dna, frame=1, gc=1):
+        reading_frame = _reading_frame(wm_dna, frame)
+        if reading_frame is None:
+            return None
+        wm_dna, start, end = reading_frame
+        codons = wm_dna[start:end]
+        region = app_helpers.find_coding_region(codons, 1, gc)
+        if region is None:
+            return None
+        return app_helpers.extract_data(codons, 1, region, gc)
+
+    def translate(self, dna_seq, frame=1, gc=1, letters=1):
+        gct = get_gc_table(gc_file_associations.get(str(gc)))
+        if gct is None or frame not in (1, 2, 3, -1, -2, -3):
+            return None
+        dna_seq = self.clean(dna_seq)
+        if frame < 0:
+            dna_seq = dna_seq.translate(_COMPLEMENT)[::-1]
+            frame = -frame
+        protein = []
+        for i in range(frame - 1, len(dna_seq) - 2, 3):
+            key = codon_to_aa_gct(gct=gct, codon=dna_seq[i:i + 3])
+            if letters == 3:
+                protein.append('Ter' if key == 'stop' else key.capitalize())
+            else:
+                protein.append(_SYMBOLS[key])
+        return ''.join(protein)
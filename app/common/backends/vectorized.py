@@ -0,0 +1,59 @@
+"""
+Backend running the vectorized engine (vector_engine) on 2 bit packed
+sequences.
+"""
+from helpers.codon_helpers import translate, translate_batch
+from helpers.packed_sequence import PackedSequence
+from .. import vector_engine
+from .base import Backend
+
+_FRAMES = (1, 2, 3)
+
+
+class NumpyBackend(Backend):
+    """
+    Backend running vector_engine, sequences are cleaned to PackedSequence
+    objects and embed returns a PackedSequence.
+    """
+    name = 'numpy'
+
+    def clean(self, dna_seq):
+        return PackedSequence.from_string(dna_seq)
+
+    def encode(self, message):
+        if not isinstance(message, str):
+            return None
+        bits = vector_engine.message_to_bits(message)
+        if bits is None:
+            return None
+        return (bits + ord('0')).tobytes().decode('ascii')
+
+    def find_regions(self, dna_seq, frame=1, gc=1):
+        if frame not in _FRAMES:
+            return None
+        return vector_engine.find_regions(dna_seq, frame, gc)
+
+    def capacity(self, dna_seq, frame=1, gc=1):
+        if frame not in _FRAMES:
+            return None
+        return vector_engine.capacity(dna_seq, frame, gc)
+
+    def embed(self, dna_seq, message, frame=1, gc=1):
+        if frame not in _FRAMES:
+            return None
+        return vector_engine.embed(dna_seq, message, frame, gc)
+
+    def extract(self, wm_dna, frame=1, gc=1):
+        if frame not in _FRAMES:
+            return None
+        return vector_engine.extract(wm_dna, frame, gc)
+
+    def translate(self, dna_seq, frame=1, gc=1, letters=1):
+        if frame not in (1, 2, 3, -1, -2, -3):
+            return None
+        return translate(dna_seq, gc=gc, frame=frame, letters=letters)
+
+    def translate_batch(self, dna_seqs, frame=1, gc=1, letters=1):
+        if frame not in (1, 2, 3, -1, -2, -3):
+            return None
+        return translate_batch(dna_seqs, gc=gc, frame=frame, letters=letters)
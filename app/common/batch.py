@@ -0,0 +1,285 @@
+"""
+This module runs capacity, embed or extract over many sequences offline,
+e.g. overnight over a multi-FASTA file of hundreds of thousands of records
+or over the dataset samples.
+
+Records are read one by one and processed in a pool of worker processes.
+At most `window` records are in flight, and results are written in input
+order as soon as they are ready. Memory therefore stays bounded whatever
+the number of records is. Embed writes watermarked records as FASTA.
+Capacity and extract write one TSV line per record. Progress and
+throughput are reported periodically.
+
+usage: python manage.py batch embed -i genes.fa.gz -o out.fa -m message
+"""
+import os
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from helpers.fasta_helpers import read_fasta
+from helpers.helper_functions import load_sequence_choices, \
+    get_filenames_from_directory, dna_from_mat
+from helpers.packed_sequence import PackedSequence
+from helpers.shared_corpus import load_sample_sequence
+from .backends import get_backend, AUTO
+from .capacity_index import message_bits
+
+OPERATIONS = ('capacity', 'embed', 'extract')
+
+# Sources of dataset records.
+DATASETS = ('json', 'mat')
+
+# Columns of TSV output (after name and length).
+_TSV_COLUMNS = {'capacity': 'capacity', 'extract': 'message'}
+
+
+def fasta_records(path, max_length=None):
+    """
+    This function reads records of a (multi) FASTA file one by one.
+    :param path: path of FASTA file, may be gzip compressed.
+    :param max_length: maximum length of a sequence (bases), default=None
+    :return: generator of tuples (header or None, sequence)
+    """
+    with open(path, 'rb') as stream:
+        for record in read_fasta(stream, max_length=max_length):
+            yield record
+
+
+def dataset_records(source='json'):
+    """
+    This function reads samples of the dataset one by one.
+    :param source: 'json' (samples listed in dataset/json/directory.json)
+    or 'mat' (files of dataset/mat)
+    :return: generator of tuples (name, sequence)
+    """
+    if source == 'json':
+        for key, name in load_sequence_choices():
+            yield key, load_sample_sequence(key)
+    elif source == 'mat':
+        for filename in sorted(get_filenames_from_directory('dataset/mat')):
+            if filename.endswith('.mat'):
+                yield filename[:-4], dna_from_mat(filename=filename)
+    else:
+        raise ValueError('Unknown dataset: ' + str(source))
+
+
+def process_record(operation, backend_name, dna_seq, frame=1, gc=1,
+                   message=None):
+    """
+    This function runs an operation on a record, it runs in the worker
+    processes.
+    :param operation: 'capacity', 'embed' or 'extract'
+    :param backend_name: name of compute backend.
+    :param dna_seq: DNA sequence (string)
+    :param frame: open reading frame number i.e. 1, 2, 3
+    :param gc: genetic code.
+    :param message: watermark message (embed only)
+    :return: tuple (length of cleaned sequence, result): capacity (bits),
+    watermarked sequence (PackedSequence) or message.
+    :except ValueError: if the record can not be processed.
+    """
+    backend = get_backend(backend_name)
+    seq = backend.clean(dna_seq)
+    if operation == 'capacity':
+        result = backend.capacity(seq, frame=frame, gc=gc)
+        if result is None:
+            raise ValueError('Could not analyze sequence.')
+    elif operation == 'extract':
+        result = backend.extract(seq, frame=frame, gc=gc)
+        if result is None:
+            raise ValueError('Could not extract watermark from sequence.')
+    elif operation == 'embed':
+        capacity = backend.capacity(seq, frame=frame, gc=gc)
+        if capacity is None or message_bits(message) > capacity:
+            raise ValueError('Watermark message length exceeds storage '
+                             'capacity.')
+        result = backend.embed(seq, message, frame=frame, gc=gc)
+        if result is None:
+            raise ValueError('Could not watermark sequence.')
+        result = PackedSequence.from_string(result)
+    else:
+        raise ValueError('Unknown operation: ' + str(operation))
+    return len(seq), result
+
+
+def tsv_field(value):
+    """
+    This function escapes a value for a TSV field.
+    :param value: any value.
+    :return: string without tabs and line breaks.
+    """
+    return str(value).replace('\\', '\\\\').replace('\t', '\\t') \
+        .replace('\n', '\\n').replace('\r', '\\r')
+
+
+def write_fasta(out, header, seq, width=70):
+    """
+    This function writes a FASTA record, sequence is written block by block.
+    :param out: text file object.
+    :param header: FASTA header line (without '>')
+    :param seq: PackedSequence object.
+    :param width: characters per line, 0 disables wrapping.
+    :return:
+    """
+    out.write('>' + header + '\n')
+    # Whole lines per block.
+    size = width * 1000 if width else 1 << 16
+    for text in seq.iter_text(size):
+        if width:
+            out.write(''.join(text[i:i + width] + '\n'
+                              for i in range(0, len(text), width)))
+        else:
+            out.write(text)
+    if not width:
+        out.write('\n')
+
+
+class Progress(object):
+    """
+    Counts processed records and reports throughput every `interval`
+    seconds.
+    """
+
+    def __init__(self, stream=None, interval=10):
+        """
+        :param stream: text file object for reports, None for no reports.
+        :param interval: seconds between reports.
+        """
+        self.stream = stream
+        self.interval = interval
+        self.records = 0
+        self.failed = 0
+        self.bases = 0
+        self.started = time.monotonic()
+        self._reported = self.started
+
+    def update(self, length, failed=False):
+        """
+        This function counts a processed record.
+        :param length: length of the record (bases)
+        :param failed: whether the record failed.
+        :return:
+        """
+        self.records += 1
+        self.bases += length
+        self.failed += bool(failed)
+        now = time.monotonic()
+        if self.stream is not None and now - self._reported >= self.interval:
+            self._reported = now
+            self.stream.write(self.format() + '\n')
+            self.stream.flush()
+
+    def summary(self):
+        """
+        This function returns counts and throughput.
+        :return: dictionary object.
+        """
+        elapsed = time.monotonic() - self.started
+        return dict(records=self.records, failed=self.failed,
+                    bases=self.bases, seconds=elapsed,
+                    records_per_second=self.records / elapsed if elapsed
+                    else 0.0,
+                    bases_per_second=self.bases / elapsed if elapsed
+                    else 0.0)
+
+    def format(self):
+        """
+        This function formats counts and throughput as a line of text.
+        :return: string
+        """
+        summary = self.summary()
+        return ('{records} records ({failed} failed), {bases} bases in '
+                '{seconds:.1f}s: {records_per_second:.1f} records/s, '
+                '{mbases:.2f} Mbases/s').format(
+                    mbases=summary['bases_per_second'] / 1e6, **summary)
+
+
+def _inline(fn, *args):
+    """
+    This function runs a call in current process.
+    :return: Future object, already finished.
+    """
+    future = Future()
+    try:
+        future.set_result(fn(*args))
+    except Exception as e:
+        future.set_exception(e)
+    return future
+
+
+def run(records, operation, out, frame=1, gc=1, message=None,
+        backend=AUTO, workers=None, window=None, width=70, progress=None,
+        errors=None):
+    """
+    This function processes records and writes the results in input order.
+    :param records: iterable of tuples (header or None, sequence)
+    :param operation: 'capacity', 'embed' or 'extract'
+    :param out: text file object for results, FASTA for embed and TSV (with
+    header line) for capacity and extract.
+    :param frame: open reading frame number i.e. 1, 2, 3 default=1
+    :param gc: genetic code default=1
+    :param message: watermark message (embed only)
+    :param backend: name of compute backend.
+    :param workers: number of worker processes, default=number of CPUs, 0
+    processes records in current process.
+    :param window: maximum number of records in flight, default=4 per
+    worker.
+    :param width: characters per line of FASTA output.
+    :param progress: Progress object, default=no reports.
+    :param errors: text file object for failed records, TSV of name and
+    error (embed writes failed records there instead of the output)
+    :return: Progress object.
+    """
+    if operation not in OPERATIONS:
+        raise ValueError('Unknown operation: ' + str(operation))
+    if operation == 'embed' and not message:
+        raise ValueError('Please add a watermark message.')
+    # fail before reading any record if the backend is not available.
+    backend = get_backend(backend).name
+    progress = progress or Progress()
+    if workers is None:
+        workers = os.cpu_count() or 1
+    pool = ProcessPoolExecutor(max_workers=workers) if workers else None
+    window = window or 4 * max(workers, 1)
+    if operation != 'embed':
+        out.write('name\tlength\tstatus\t{0}\n'.format(
+            _TSV_COLUMNS[operation]))
+    pending = deque()
+
+    def write(name, future):
+        try:
+            length, result = future.result()
+        except Exception as e:
+            progress.update(0, failed=True)
+            if operation != 'embed':
+                out.write('{0}\t\t{1}\t\n'.format(tsv_field(name),
+                                                  tsv_field(e)))
+            if errors is not None:
+                errors.write('{0}\t{1}\n'.format(tsv_field(name),
+                                                 tsv_field(e)))
+            return
+        progress.update(length)
+        if operation == 'embed':
+            write_fasta(out, name, result, width)
+        else:
+            out.write('{0}\t{1}\tok\t{2}\n'.format(
+                tsv_field(name), length, tsv_field(result)))
+
+    try:
+        for i, (header, dna_seq) in enumerate(records):
+            name = header or 'sequence_{0}'.format(i + 1)
+            args = (process_record, operation, backend, dna_seq, frame, gc,
+                    message)
+            pending.append((name, pool.submit(*args) if pool is not None
+                            else _inline(*args)))
+            while len(pending) >= window or \
+                    (pending and pending[0][1].done()):
+                write(*pending.popleft())
+        while pending:
+            write(*pending.popleft())
+    finally:
+        for name, future in pending:
+            future.cancel()
+        if pool is not None:
+            pool.shutdown(wait=True)
+    return progress
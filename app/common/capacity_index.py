@@ -0,0 +1,239 @@
+"""
+This module implements capacity index for answering capacity queries over
+arbitrary ranges of an analyzed sequence without scanning it again.
+
+Index is a prefix sum array over per codon capacity (restricted to coding
+regions, see codon_capacity), so capacity of any range is a difference of two
+entries and the smallest prefix holding N bits is a binary search. Shortest
+ranges are searched from the codons carrying capacity, which are found once
+per index, and answers are kept per number of bits.
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+import numpy as np
+from helpers.codon_helpers import clean_bases, codon_indexes, codon_capacity
+from helpers.packed_sequence import PackedSequence
+
+# Number of bits used by the length header in front of watermark message.
+HEADER_BITS = 16
+
+# Number of shortest range answers kept by an index.
+_SPAN_CACHE_SIZE = 256
+
+
+def message_bits(message):
+    """
+    This function returns number of bits needed for watermarking given
+    message (including length header).
+    :param message: watermark message (string)
+    :return: number of bits (integer)
+    """
+    return HEADER_BITS + 8 * len(message)
+
+
+class CapacityIndex(object):
+    """
+    Prefix sum index over capacity of codons in one reading frame. All the
+    positions are 0-based base positions in cleaned DNA sequence and ranges
+    are half open i.e. [start, end).
+    """
+    __slots__ = ('frame', 'gc', 'length', 'prefix', '_starts', '_spans')
+
+    def __init__(self, capacity, length, frame=1, gc=1):
+        """
+        :param capacity: numpy array of capacity (bits) per codon.
+        :param length: length of cleaned DNA sequence.
+        :param frame: open reading frame number of codons.
+        :param gc: genetic code.
+        """
+        self.frame = frame
+        self.gc = gc
+        self.length = length
+        self.prefix = np.zeros(len(capacity) + 1, dtype=np.int64)
+        np.cumsum(capacity, out=self.prefix[1:])
+        # Shortest range always starts at a codon with some capacity.
+        self._starts = np.flatnonzero(np.diff(self.prefix))
+        self._spans = {}
+
+    @property
+    def total(self):
+        """Total capacity (bits) of the sequence."""
+        return int(self.prefix[-1])
+
+    def _first_codon(self, position):
+        """Index of first codon starting at or after base position."""
+        codon = -(-(position - (self.frame - 1)) // 3)
+        return min(max(codon, 0), len(self.prefix) - 1)
+
+    def _last_codon(self, position):
+        """Index after the last codon ending at or before base position."""
+        codon = (position - (self.frame - 1)) // 3
+        return min(max(codon, 0), len(self.prefix) - 1)
+
+    def _codon_end(self, codon):
+        """Base position after the end of given number of codons."""
+        return (self.frame - 1) + 3 * codon
+
+    def capacity(self, start=0, end=None):
+        """
+        This function returns capacity of codons lying completely inside the
+        given range.
+        :param start: start position of range.
+        :param end: end position of range, default=end of sequence.
+        :return: capacity in bits (integer)
+        """
+        if end is None:
+            end = self.length
+        first = self._first_codon(start)
+        last = self._last_codon(end)
+        if last <= first:
+            return 0
+        return int(self.prefix[last] - self.prefix[first])
+
+    def fits(self, bits, start=0, end=None):
+        """
+        This function checks if given number of bits can be watermarked in
+        the given range.
+        :param bits: number of bits e.g. message_bits(message)
+        :param start: start position of range.
+        :param end: end position of range, default=end of sequence.
+        :return: True or False
+        """
+        return self.capacity(start, end) >= bits
+
+    def min_prefix(self, bits):
+        """
+        This function returns length of the shortest prefix of the sequence
+        which can hold given number of bits.
+        :param bits: number of bits.
+        :return: end position of prefix or None if sequence is too small.
+        """
+        if bits <= 0:
+            return 0
+        codon = int(np.searchsorted(self.prefix, bits, side='left'))
+        if codon >= len(self.prefix):
+            return None
+        return self._codon_end(codon)
+
+    def bit_codons(self, start, end):
+        """
+        This function finds the codons carrying a range of watermark bits,
+        i.e. bits from start to end of the bit stream embedded in the
+        sequence.
+        :param start: first bit.
+        :param end: bit after the last bit.
+        :return: tuple (first, last) of codon indexes, last is excluded.
+        First codon carries bits from prefix[first] on.
+        """
+        first = int(np.searchsorted(self.prefix, start, side='right')) - 1
+        last = int(np.searchsorted(self.prefix, end, side='left'))
+        return max(first, 0), min(last, len(self.prefix) - 1)
+
+    def min_span(self, bits):
+        """
+        This function returns the shortest range of the sequence which can
+        hold given number of bits.
+        :param bits: number of bits.
+        :return: tuple (start, end) or None if sequence is too small.
+        """
+        if bits <= 0:
+            return 0, 0
+        if bits > self.total:
+            return None
+        span = self._spans.get(bits)
+        if span is None:
+            firsts = self._starts
+            lasts = np.searchsorted(self.prefix, self.prefix[firsts] + bits,
+                                    side='left')
+            valid = lasts < len(self.prefix)
+            firsts, lasts = firsts[valid], lasts[valid]
+            best = int(np.argmin(lasts - firsts))
+            span = self._codon_end(int(firsts[best])), \
+                self._codon_end(int(lasts[best]))
+            if len(self._spans) >= _SPAN_CACHE_SIZE:
+                self._spans.clear()
+            self._spans[bits] = span
+        return span
+
+
+def build_capacity_index(dna_seq=None, frame=1, gc=1, codons=None):
+    """
+    This function builds capacity index for given sequence.
+    :param dna_seq: DNA sequence (string or PackedSequence)
+    :param frame: open reading frame number e.g. 1, 2, 3, default=1
+    :param gc: genetic code (integer). default=1
+    :param codons: precomputed codon indexes of the sequence in given frame
+    (e.g. from shared corpus), dna_seq is only used for its length then.
+    :return: CapacityIndex object or None if inputs are invalid.
+    """
+    if dna_seq is None or frame > 3 or frame < 1:
+        return None
+    bases = clean_bases(dna_seq)
+    if codons is None:
+        codons = codon_indexes(bases, frame)
+    capacity = codon_capacity(codons, gc)
+    if capacity is None:
+        return None
+    return CapacityIndex(capacity, len(bases), frame=frame, gc=gc)
+
+
+class _IndexCache(object):
+    """
+    Small thread-safe LRU cache of capacity indexes keyed by sequence
+    digest, frame and genetic code.
+    """
+
+    def __init__(self, size=32):
+        self.size = size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            index = self._entries.get(key)
+            if index is not None:
+                self._entries.move_to_end(key)
+            return index
+
+    def put(self, key, index):
+        with self._lock:
+            self._entries[key] = index
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+
+
+_index_cache = _IndexCache()
+
+
+def get_capacity_index(dna_seq=None, frame=1, gc=1, key=None, codons=None):
+    """
+    This function returns capacity index for given sequence, building it
+    only if the same sequence has not been indexed recently.
+    :param dna_seq: DNA sequence (string or PackedSequence)
+    :param frame: open reading frame number e.g. 1, 2, 3, default=1
+    :param gc: genetic code (integer). default=1
+    :param key: cache key for the sequence (e.g. key of sample sequence),
+    default is digest of the sequence.
+    :param codons: precomputed codon indexes, see build_capacity_index.
+    :return: CapacityIndex object or None if inputs are invalid.
+    """
+    if dna_seq is None:
+        return None
+    if key is None:
+        # digest of cleaned (packed) sequence, same for both input types.
+        seq = PackedSequence.from_string(dna_seq)
+        digest = hashlib.sha1(str(len(seq)).encode('ascii') + b'\0')
+        for block in seq.packed_blocks():
+            digest.update(block)
+        key = digest.hexdigest()
+        dna_seq = seq
+    cache_key = (key, frame, str(gc))
+    index = _index_cache.get(cache_key)
+    if index is None:
+        index = build_capacity_index(dna_seq, frame=frame, gc=gc,
+                                     codons=codons)
+        if index is not None:
+            _index_cache.put(cache_key, index)
+    return index
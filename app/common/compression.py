@@ -0,0 +1,190 @@
+"""
+This module negotiates gzip compression of requests and responses.
+
+Request bodies sent with 'Content-Encoding: gzip' are decompressed before
+the application reads them, responses are compressed when the client sends
+'Accept-Encoding: gzip'. Streamed responses (e.g. downloads of stored
+results) are compressed piece by piece.
+"""
+import zlib
+import tempfile
+from gzip import GzipFile
+from werkzeug.exceptions import ClientDisconnected
+from werkzeug.wsgi import LimitedStream
+
+# Content types which are compressed, 2 bit encoded sequences are already
+# dense and are sent as they are.
+COMPRESSIBLE_TYPES = ('text/html', 'text/plain', 'text/x-fasta', 'text/css',
+                      'application/json', 'application/javascript',
+                      'application/octet-stream')
+
+# wbits value making zlib write gzip header and trailer.
+_GZIP_WBITS = 16 + zlib.MAX_WBITS
+
+
+class GzipRequestMiddleware(object):
+    """
+    WSGI middleware decompressing gzip encoded request bodies. Body is
+    spooled to a temporary file, so that its (decompressed) length is known,
+    and rejected with 413 if it exceeds max_size. Compressed body is read up
+    to its Content-Length only: GzipFile looks for another gzip member after
+    the first one, which would block on a keep-alive connection. Bodies
+    without Content-Length (e.g. chunked) are rejected with 411.
+    """
+
+    def __init__(self, wsgi_app, max_size=None, spool_size=1 << 20):
+        """
+        :param wsgi_app: wrapped WSGI application.
+        :param max_size: maximum size (bytes) of decompressed body,
+        default=None i.e. unlimited.
+        :param spool_size: size (bytes) up to which body is kept in memory.
+        """
+        self.wsgi_app = wsgi_app
+        self.max_size = max_size
+        self.spool_size = spool_size
+
+    def __call__(self, environ, start_response):
+        if environ.get('HTTP_CONTENT_ENCODING', '').lower() != 'gzip':
+            return self.wsgi_app(environ, start_response)
+        length = environ.get('CONTENT_LENGTH', '')
+        if 'chunked' in environ.get('HTTP_TRANSFER_ENCODING', '').lower() or \
+                not length.isdigit():
+            return self._error(start_response, '411 LENGTH REQUIRED',
+                               'Gzip encoded request body needs '
+                               'Content-Length header.')
+        stream = LimitedStream(environ['wsgi.input'], int(length))
+        spool = tempfile.SpooledTemporaryFile(max_size=self.spool_size)
+        try:
+            size = self._decompress(stream, spool)
+        except ClientDisconnected:
+            spool.close()
+            return self._error(start_response, '400 BAD REQUEST',
+                               'Request body is incomplete.')
+        except (OSError, EOFError, zlib.error):
+            spool.close()
+            return self._error(start_response, '400 BAD REQUEST',
+                               'Request body is not valid gzip data.')
+        if size is None:
+            spool.close()
+            return self._error(start_response,
+                               '413 REQUEST ENTITY TOO LARGE',
+                               'Decompressed request body is too large.')
+        spool.seek(0)
+        environ['wsgi.input'] = spool
+        environ['CONTENT_LENGTH'] = str(size)
+        del environ['HTTP_CONTENT_ENCODING']
+        return self.wsgi_app(environ, start_response)
+
+    def _decompress(self, stream, spool):
+        """
+        This function decompresses request body to the spool.
+        :param stream: request body (wsgi.input limited to Content-Length)
+        :param spool: file object.
+        :return: size (bytes) of decompressed body or None if it exceeds
+        max_size.
+        """
+        size = 0
+        with GzipFile(fileobj=stream, mode='rb') as body:
+            while True:
+                block = body.read(1 << 16)
+                if not block:
+                    return size
+                size += len(block)
+                if self.max_size is not None and size > self.max_size:
+                    return None
+                spool.write(block)
+
+    @staticmethod
+    def _error(start_response, status, message):
+        body = message.encode('utf-8')
+        start_response(status, [('Content-Type', 'text/plain'),
+                                ('Content-Length', str(len(body)))])
+        return [body]
+
+
+def _gzip_stream(chunks, level):
+    """
+    This function compresses a streamed response.
+    :param chunks: iterable of response pieces (bytes or strings)
+    :param level: compression level.
+    :return: generator of compressed bytes.
+    """
+    compressor = zlib.compressobj(level, zlib.DEFLATED, _GZIP_WBITS)
+    for chunk in chunks:
+        if isinstance(chunk, str):
+            chunk = chunk.encode('utf-8')
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def accepts_gzip(accept_encoding):
+    """
+    This function checks if client accepts gzip encoded responses.
+    :param accept_encoding: value of Accept-Encoding header of the request.
+    :return: True or False
+    """
+    for encoding in accept_encoding.split(','):
+        name, _, params = encoding.strip().partition(';')
+        if name.strip().lower() in ('gzip', '*'):
+            return params.replace(' ', '') not in ('q=0', 'q=0.0')
+    return False
+
+
+def compress_response(response, request, min_size=500, level=6):
+    """
+    This function gzip compresses response if client accepts it.
+    :param response: response object.
+    :param request: request object.
+    :param min_size: smallest body (bytes) worth compressing.
+    :param level: compression level.
+    :return: response object.
+    """
+    response.vary.add('Accept-Encoding')
+    if response.direct_passthrough or \
+            response.mimetype not in COMPRESSIBLE_TYPES or \
+            'Content-Encoding' in response.headers or \
+            not 200 <= response.status_code < 300 or \
+            not accepts_gzip(request.headers.get('Accept-Encoding', '')):
+        return response
+    if response.is_streamed:
+        response.response = _gzip_stream(response.response, level)
+        response.headers.pop('Content-Length', None)
+    else:
+        data = response.get_data()
+        if len(data) < min_size:
+            return response
+        response.set_data(gzip_bytes(data, level))
+    response.headers['Content-Encoding'] = 'gzip'
+    return response
+
+
+def gzip_bytes(data, level):
+    """
+    This function compresses bytes in gzip format.
+    :param data: bytes
+    :param level: compression level.
+    :return: bytes
+    """
+    compressor = zlib.compressobj(level, zlib.DEFLATED, _GZIP_WBITS)
+    return compressor.compress(data) + compressor.flush()
+
+
+def init_app(app):
+    """
+    This function enables gzip negotiation for the application.
+    :param app: application object.
+    :return:
+    """
+    from flask import request
+    app.wsgi_app = GzipRequestMiddleware(
+        app.wsgi_app, max_size=app.config.get('MAX_CONTENT_LENGTH'),
+        spool_size=app.config.get('UPLOAD_SPOOL_SIZE', 1 << 20))
+    min_size = app.config.get('COMPRESS_MIN_SIZE', 500)
+    level = app.config.get('COMPRESS_LEVEL', 6)
+
+    @app.after_request
+    def gzip_response(response):
+        return compress_response(response, request, min_size=min_size,
+                                 level=level)
@@ -0,0 +1,261 @@
+"""
+This module dispatches engine calls (embed, extract, capacity) according to
+their estimated cost. Cheap calls (e.g. sample sequences) run inline in the
+request thread, expensive calls run in a bounded pool of worker processes so
+that they do not hold up small requests. Once more than DISPATCH_MAX_PENDING
+calls are waiting for the pool, new ones are rejected with Overloaded.
+
+Calls can also be submitted as jobs: job state is kept as a json file in the
+result store (see result_store) so any worker of the application can report
+it.
+"""
+import os
+import asyncio
+import threading
+import uuid
+from concurrent.futures import Future, ProcessPoolExecutor
+from .result_store import store_result, write_json, read_json
+
+# Relative cost per base of operations, pure python (reference) operations
+# are much slower than vectorized ones.
+OPERATION_COST = {
+    'embed': 1,
+    'extract': 1,
+    'capacity': 1,
+    'reference': 50,
+}
+
+_JOB_STATES = ('pending', 'done', 'failed')
+
+
+class Overloaded(Exception):
+    """
+    Raised when there are too many calls waiting for the worker pool.
+    """
+    def __init__(self, message, status_code=503, retry_after=5):
+        """
+        :param message: error message.
+        :param status_code: http status code of the response, 503 for
+        requests waiting for the result and 429 for job submissions.
+        :param retry_after: seconds after which client may retry.
+        """
+        super(Overloaded, self).__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+def estimate_cost(operation, length):
+    """
+    This function estimates cost of an operation.
+    :param operation: name of operation (see OPERATION_COST)
+    :param length: length of sequence (bases)
+    :return: cost (integer), roughly number of bases processed by the
+    vectorized engine in the same time.
+    """
+    return OPERATION_COST.get(operation, 1) * length
+
+
+class Dispatcher(object):
+    """
+    Runs engine calls inline or in the worker pool. Pool is created on first
+    use in each process, so it is not shared by forked gunicorn workers.
+    """
+
+    def __init__(self, app=None):
+        self.pool_size = None
+        self.inline_threshold = 0
+        self.max_pending = 0
+        self._pool = None
+        self._pool_pid = None
+        self._pending = 0
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """
+        This function reads dispatcher settings of the application.
+        :param app: application object.
+        :return:
+        """
+        self.pool_size = app.config.get('DISPATCH_POOL_SIZE') or \
+            os.cpu_count() or 1
+        self.inline_threshold = app.config.get('DISPATCH_INLINE_THRESHOLD', 0)
+        self.max_pending = app.config.get('DISPATCH_MAX_PENDING', 0)
+        app.extensions['dispatcher'] = self
+
+    @property
+    def pending(self):
+        """Number of calls submitted to the pool and not finished yet."""
+        return self._pending
+
+    def _executor(self):
+        """
+        This function returns worker pool of current process.
+        :return: ProcessPoolExecutor object.
+        """
+        if self._pool is None or self._pool_pid != os.getpid():
+            self._pool = ProcessPoolExecutor(max_workers=self.pool_size)
+            self._pool_pid = os.getpid()
+        return self._pool
+
+    def _finished(self, future):
+        with self._lock:
+            self._pending -= 1
+
+    def is_inline(self, operation, length):
+        """
+        This function tells whether an operation runs in the request thread.
+        :param operation: name of operation (see OPERATION_COST)
+        :param length: length of sequence (bases)
+        :return: True or False
+        """
+        return estimate_cost(operation, length) <= self.inline_threshold
+
+    def submit(self, operation, length, fn, *args, **kwargs):
+        """
+        This function starts an engine call.
+        :param operation: name of operation (see OPERATION_COST)
+        :param length: length of sequence (bases)
+        :param fn: engine function, must be a module level function (or a
+        method of a backend) so it can be sent to worker processes.
+        :param args: arguments of fn.
+        :param kwargs: keyword arguments of fn.
+        :return: Future object, already finished for inline calls.
+        """
+        if self.is_inline(operation, length):
+            future = Future()
+            try:
+                future.set_result(fn(*args, **kwargs))
+            except Exception as e:
+                future.set_exception(e)
+            return future
+        with self._lock:
+            if self.max_pending and self._pending >= self.max_pending:
+                raise Overloaded('Server is busy, try again later.')
+            self._pending += 1
+        try:
+            future = self._executor().submit(fn, *args, **kwargs)
+        except Exception:
+            with self._lock:
+                self._pending -= 1
+            raise
+        future.add_done_callback(self._finished)
+        return future
+
+    def run(self, operation, length, fn, *args, **kwargs):
+        """
+        This function runs an engine call and waits for its result.
+        :param operation: name of operation (see OPERATION_COST)
+        :param length: length of sequence (bases)
+        :param fn: engine function (see submit)
+        :param args: arguments of fn.
+        :param kwargs: keyword arguments of fn.
+        :return: result of fn.
+        """
+        return self.submit(operation, length, fn, *args, **kwargs).result()
+
+    def map(self, operation, length, fn, *iterables):
+        """
+        This function runs an engine call for every set of arguments (like
+        builtin map) and waits for the results, e.g. for every sequence of a
+        multi-FASTA file. Calls run inline if the whole batch is cheap,
+        otherwise they run concurrently in the pool taking a single slot of
+        the backlog.
+        :param operation: name of operation (see OPERATION_COST)
+        :param length: total length of sequences of the batch (bases)
+        :param fn: engine function (see submit)
+        :param iterables: arguments of fn.
+        :return: list of results of fn.
+        """
+        if self.is_inline(operation, length):
+            return list(map(fn, *iterables))
+        with self._lock:
+            if self.max_pending and self._pending >= self.max_pending:
+                raise Overloaded('Server is busy, try again later.')
+            self._pending += 1
+        try:
+            return list(self._executor().map(fn, *iterables))
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    def run_async(self, operation, length, fn, *args, **kwargs):
+        """
+        This function runs an engine call without blocking the event loop
+        of the asgi server (see app/asgi.py), pool calls are awaited instead
+        of waited for.
+        :param operation: name of operation (see OPERATION_COST)
+        :param length: length of sequence (bases)
+        :param fn: engine function (see submit)
+        :param args: arguments of fn.
+        :param kwargs: keyword arguments of fn.
+        :return: asyncio future of result of fn.
+        """
+        return asyncio.wrap_future(
+            self.submit(operation, length, fn, *args, **kwargs))
+
+    def submit_job(self, app, name, operation, length, fn, *args, **kwargs):
+        """
+        This function submits an engine call as a job. Job is rejected (429)
+        instead of queued when the pool backlog is full. Result of the job
+        is a json object, watermarked sequences of embed jobs are written to
+        the result store and replaced by their token.
+        :param app: application object.
+        :param name: name of job i.e. 'embed', 'extract' or 'capacity'
+        :param operation: name of operation (see OPERATION_COST)
+        :param length: length of sequence (bases)
+        :param fn: engine function (see submit)
+        :param args: arguments of fn.
+        :param kwargs: keyword arguments of fn.
+        :return: job id (string)
+        """
+        job_id = uuid.uuid4().hex
+        write_json(app, job_id, dict(status='pending', operation=name))
+        try:
+            future = self.submit(operation, length, fn, *args, **kwargs)
+        except Overloaded as e:
+            write_json(app, job_id, dict(status='failed', operation=name,
+                                         error=str(e)))
+            raise Overloaded(str(e), status_code=429,
+                             retry_after=e.retry_after)
+
+        def job_done(done):
+            try:
+                result = done.result()
+                if name == 'embed' and result is not None:
+                    result = dict(token=store_result(app, result),
+                                  length=len(result))
+                state = dict(status='done', operation=name,
+                             result=result)
+            except Exception as e:
+                state = dict(status='failed', operation=name,
+                             error=str(e))
+            write_json(app, job_id, state)
+
+        future.add_done_callback(job_done)
+        return job_id
+
+    def shutdown(self, wait=True):
+        """
+        This function stops worker pool of current process.
+        :param wait: wait for running calls to finish.
+        :return:
+        """
+        if self._pool is not None and self._pool_pid == os.getpid():
+            self._pool.shutdown(wait=wait)
+        self._pool = None
+
+
+def read_job(app, job_id):
+    """
+    This function returns state of a job.
+    :param app: application object.
+    :param job_id: job id returned by submit_job.
+    :return: dictionary object with 'status' (pending, done or failed),
+    'operation' and 'result' or 'error', None if job is not found.
+    """
+    state = read_json(app, job_id)
+    if state is None or state.get('status') not in _JOB_STATES:
+        return None
+    return state
@@ -0,0 +1,334 @@
+"""
+This module implements framed payloads for watermarking large payloads
+(e.g. signed manifests) which do not fit in the 16 bit length header used
+by embed_data.
+
+Payload (bytes) is embedded in the watermark bit stream as a header
+followed by fixed size frames:
+    header: 16 zero bits (a length header of embed_data is never 0, so
+            extract_data reads a framed payload as empty message), version
+            (8 bits), number of fields and fields (frame size, payload
+            length) as unsigned LEB128 varints, CRC-32 of the header (32
+            bits)
+    frame:  length of data in the frame (16 bits), data padded to frame
+            size with zeros, CRC-32 of frame index, length and data
+            (32 bits)
+Every frame has the same size, so frame N starts at a known bit offset and
+is read from the codons found through capacity prefix sums (see
+CapacityIndex.bit_codons) without decoding the frames before it.
+"""
+import zlib
+import numpy as np
+from helpers.codon_helpers import codon_capacity
+from helpers.packed_sequence import PackedSequence
+from .capacity_index import CapacityIndex
+from . import vector_engine
+
+VERSION = 1
+# Bits marking a framed payload (length header of embed_data is never 0).
+MARKER_BITS = 16
+# Size (bytes) of data carried by a frame.
+DEFAULT_FRAME_SIZE = 256
+MAX_FRAME_SIZE = 2 ** 16 - 1
+# Bits of length and checksum fields of a frame.
+FRAME_OVERHEAD_BITS = 16 + 32
+# Header fields are read from this many bytes at most (marker, version,
+# number of fields, up to 16 fields of at most 10 bytes, checksum).
+_MAX_HEADER_BYTES = 2 + 1 + 1 + 16 * 10 + 4
+
+
+class FramingError(ValueError):
+    """
+    Raised if a framed payload is missing or corrupted.
+    """
+
+
+def _varint(value):
+    """
+    This function encodes unsigned integer as LEB128 varint.
+    :param value: integer >= 0
+    :return: bytes
+    """
+    data = bytearray()
+    while True:
+        byte = value & 0x7f
+        value >>= 7
+        if value:
+            data.append(byte | 0x80)
+        else:
+            data.append(byte)
+            return bytes(data)
+
+
+def _read_varint(data, offset):
+    """
+    This function decodes LEB128 varint.
+    :param data: bytes
+    :param offset: position of the varint.
+    :return: tuple (value, position after the varint)
+    """
+    value = 0
+    shift = 0
+    while True:
+        if offset >= len(data) or shift > 63:
+            raise FramingError('Header of framed payload is truncated.')
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7f) << shift
+        shift += 7
+        if not byte & 0x80:
+            return value, offset
+
+
+def _crc(*parts):
+    crc = 0
+    for part in parts:
+        crc = zlib.crc32(part, crc)
+    return crc & 0xffffffff
+
+
+def _to_bits(data):
+    """
+    This function converts bytes to bits, most significant bit first.
+    :param data: bytes
+    :return: numpy array (uint8) of bits.
+    """
+    return np.unpackbits(np.frombuffer(data, dtype=np.uint8))
+
+
+def _to_bytes(bits):
+    """
+    This function converts bits (most significant bit first) to bytes.
+    :param bits: numpy array of bits.
+    :return: bytes
+    """
+    return np.packbits(bits).tobytes()
+
+
+def encode_header(length, frame_size=DEFAULT_FRAME_SIZE, fields=()):
+    """
+    This function encodes header of a framed payload.
+    :param length: length of payload (bytes)
+    :param frame_size: size of data carried by a frame (bytes)
+    :param fields: additional fields (integers) following frame size and
+    length.
+    :return: bytes
+    """
+    fields = (frame_size, length) + tuple(fields)
+    header = bytes([0, 0, VERSION]) + _varint(len(fields)) + \
+        b''.join(_varint(field) for field in fields)
+    return header + _crc(header).to_bytes(4, 'big')
+
+
+def decode_header(data):
+    """
+    This function decodes header of a framed payload.
+    :param data: bytes starting with the header.
+    :return: tuple (list of fields, size of header in bytes)
+    """
+    if data[:2] != b'\x00\x00':
+        raise FramingError('Sequence does not carry a framed payload.')
+    if len(data) < 3 or data[2] != VERSION:
+        raise FramingError('Unsupported version of framed payload.')
+    count, offset = _read_varint(data, 3)
+    fields = []
+    for _ in range(count):
+        field, offset = _read_varint(data, offset)
+        fields.append(field)
+    if len(fields) < 2 or offset + 4 > len(data):
+        raise FramingError('Header of framed payload is truncated.')
+    if _crc(data[:offset]) != int.from_bytes(data[offset:offset + 4], 'big'):
+        raise FramingError('Header of framed payload is corrupted.')
+    return fields, offset + 4
+
+
+def frame_count(length, frame_size=DEFAULT_FRAME_SIZE):
+    """
+    This function returns number of frames of a payload.
+    :param length: length of payload (bytes)
+    :param frame_size: size of data carried by a frame (bytes)
+    :return: integer
+    """
+    return -(-length // frame_size)
+
+
+def frame_bits(frame_size=DEFAULT_FRAME_SIZE):
+    """
+    This function returns number of bits taken by a frame.
+    :param frame_size: size of data carried by a frame (bytes)
+    :return: integer
+    """
+    return 8 * frame_size + FRAME_OVERHEAD_BITS
+
+
+def payload_bits(length, frame_size=DEFAULT_FRAME_SIZE, fields=()):
+    """
+    This function returns number of bits needed for watermarking a payload.
+    :param length: length of payload (bytes)
+    :param frame_size: size of data carried by a frame (bytes)
+    :param fields: additional header fields (see encode_header)
+    :return: integer
+    """
+    return 8 * len(encode_header(length, frame_size, fields)) + \
+        frame_count(length, frame_size) * frame_bits(frame_size)
+
+
+def _frame(index, data, frame_size):
+    """
+    This function encodes a frame.
+    :param index: index of frame.
+    :param data: data of frame (at most frame_size bytes)
+    :param frame_size: size of data carried by a frame (bytes)
+    :return: bytes
+    """
+    length = len(data).to_bytes(2, 'big')
+    data = data + bytes(frame_size - len(data))
+    return length + data + _crc(index.to_bytes(4, 'big'), length,
+                                data).to_bytes(4, 'big')
+
+
+def encode_payload(payload, frame_size=DEFAULT_FRAME_SIZE, fields=()):
+    """
+    This function encodes payload as header followed by frames.
+    :param payload: bytes (or string, encoded as UTF-8)
+    :param frame_size: size of data carried by a frame (bytes)
+    :param fields: additional header fields (see encode_header)
+    :return: numpy array (uint8) of bits.
+    """
+    if isinstance(payload, str):
+        payload = payload.encode('utf-8')
+    if not 0 < frame_size <= MAX_FRAME_SIZE:
+        raise ValueError('Frame size must be 1 to {0} bytes.'.format(
+            MAX_FRAME_SIZE))
+    parts = [encode_header(len(payload), frame_size, fields)]
+    for index in range(frame_count(len(payload), frame_size)):
+        start = index * frame_size
+        parts.append(_frame(index, payload[start:start + frame_size],
+                            frame_size))
+    return _to_bits(b''.join(parts))
+
+
+def embed_payload(dna_seq, payload, frame=1, gc=1,
+                  frame_size=DEFAULT_FRAME_SIZE, fields=()):
+    """
+    This function embeds a framed payload in a sequence.
+    :param dna_seq: DNA sequence (PackedSequence or string)
+    :param payload: bytes (or string, encoded as UTF-8)
+    :param frame: open reading frame number i.e. 1, 2, 3 default=1
+    :param gc: genetic code (integer or string) default=1
+    :param frame_size: size of data carried by a frame (bytes)
+    :param fields: additional header fields (see encode_header)
+    :return: watermarked sequence (PackedSequence) or None if payload does
+    not fit in the sequence or genetic code is not available.
+    """
+    seq = PackedSequence.from_string(dna_seq)
+    codons = seq.codon_indexes(frame)
+    capacity = codon_capacity(codons, gc)
+    bits = encode_payload(payload, frame_size, fields)
+    if capacity is None or len(bits) > int(capacity.sum()):
+        return None
+    codons = vector_engine.embed_bits(codons, bits, gc)
+    return seq.with_codons(codons, frame)
+
+
+class FramedPayload(object):
+    """
+    Reader of a framed payload embedded in a sequence. Header is decoded
+    when the reader is created, frames are decoded on demand, in order by
+    iterating the reader or at random by read_frame.
+    """
+
+    def __init__(self, wm_dna, frame=1, gc=1):
+        """
+        :param wm_dna: watermarked DNA sequence (PackedSequence or string)
+        :param frame: open reading frame number i.e. 1, 2, 3 default=1
+        :param gc: genetic code (integer or string) default=1
+        """
+        seq = PackedSequence.from_string(wm_dna)
+        self.gc = gc
+        self.codons = seq.codon_indexes(frame)
+        self.capacity = codon_capacity(self.codons, gc)
+        if self.capacity is None:
+            raise FramingError('Genetic code is not available.')
+        self.index = CapacityIndex(self.capacity, len(seq), frame, gc)
+        header = self.read_bits(0, min(8 * _MAX_HEADER_BYTES,
+                                       self.index.total))
+        fields, size = decode_header(_to_bytes(header))
+        self.frame_size, self.length = fields[:2]
+        self.fields = fields[2:]
+        if not 0 < self.frame_size <= MAX_FRAME_SIZE:
+            raise FramingError('Invalid frame size of framed payload.')
+        self.header_bits = 8 * size
+
+    def __len__(self):
+        return frame_count(self.length, self.frame_size)
+
+    def read_bits(self, start, count):
+        """
+        This function extracts bits of the watermark bit stream, only the
+        codons carrying them are read.
+        :param start: first bit.
+        :param count: number of bits.
+        :return: numpy array (uint8) of bits, shorter than count if the
+        sequence ends before.
+        """
+        first, last = self.index.bit_codons(start, start + count)
+        bits = vector_engine.extract_bits(self.codons[first:last], self.gc,
+                                          capacity=self.capacity[first:last])
+        skip = start - int(self.index.prefix[first])
+        return bits[skip:skip + count]
+
+    def frame_offset(self, index):
+        """
+        This function returns position of a frame in the bit stream.
+        :param index: index of frame.
+        :return: bit offset (integer)
+        """
+        return self.header_bits + index * frame_bits(self.frame_size)
+
+    def read_frame(self, index):
+        """
+        This function decodes a frame.
+        :param index: index of frame (0 to len(self) - 1)
+        :return: data of the frame (bytes)
+        """
+        if not 0 <= index < len(self):
+            raise IndexError('Frame index out of range.')
+        size = frame_bits(self.frame_size)
+        bits = self.read_bits(self.frame_offset(index), size)
+        if len(bits) < size:
+            raise FramingError('Frame {0} is truncated.'.format(index))
+        data = _to_bytes(bits)
+        length = data[:2]
+        body = data[2:2 + self.frame_size]
+        if _crc(index.to_bytes(4, 'big'), length, body) != \
+                int.from_bytes(data[-4:], 'big'):
+            raise FramingError('Frame {0} is corrupted.'.format(index))
+        length = int.from_bytes(length, 'big')
+        expected = min(self.frame_size,
+                       self.length - index * self.frame_size)
+        if length != expected:
+            raise FramingError('Frame {0} has invalid length.'.format(index))
+        return body[:length]
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self.read_frame(index)
+
+    def read(self):
+        """
+        This function decodes the whole payload.
+        :return: bytes
+        """
+        return b''.join(self)
+
+
+def extract_payload(wm_dna, frame=1, gc=1):
+    """
+    This function extracts a framed payload from a sequence.
+    :param wm_dna: watermarked DNA sequence (PackedSequence or string)
+    :param frame: open reading frame number i.e. 1, 2, 3 default=1
+    :param gc: genetic code (integer or string) default=1
+    :return: payload (bytes)
+    """
+    return FramedPayload(wm_dna, frame, gc).read()
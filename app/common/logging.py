@@ -1,21 +1,247 @@
 """
 This modules contains helping functionalities for setting up logging mechanism
+
+Records are put on a queue by the logging calls and written by a background
+thread (QueueListener), so request threads never wait for disk or console
+I/O. Records are written as json lines carrying the id of the request which
+logged them, and debug records can be sampled to keep their volume low.
 """
+import os
+import copy
+import json
+import time
+import uuid
+import queue
+import random
+import atexit
+import logging
+import threading
+import contextvars
+from logging.handlers import QueueHandler, QueueListener, \
+    RotatingFileHandler
+
+# Loggers of the application packages.
+LOGGER_NAMES = ('app', 'helpers')
+
+# Attributes of every LogRecord, anything else is an 'extra' field.
+_RECORD_ATTRIBUTES = frozenset(logging.LogRecord(
+    '', 0, '', 0, '', (), None).__dict__) | {'message', 'asctime',
+                                             'request_id', 'sample'}
+
+# Id of the request handled outside of Flask (see app/asgi.py).
+_request_id = contextvars.ContextVar('request_id', default=None)
+
+
+def request_id_from(header):
+    """
+    This function returns id of a request, taken from its X-Request-ID
+    header or generated.
+    :param header: value of X-Request-ID header or None.
+    :return: request id (string)
+    """
+    return header or uuid.uuid4().hex
+
+
+def set_request_id(request_id):
+    """
+    This function sets id of the request handled in current context, for
+    requests which are not handled by Flask. Context is copied to threads
+    running steps of the request.
+    :param request_id: request id (string)
+    :return:
+    """
+    _request_id.set(request_id)
+
+
+def current_request_id():
+    """
+    This function returns id of the request being handled by current
+    thread.
+    :return: request id (string) or None outside of requests.
+    """
+    try:
+        from flask import g, has_request_context
+    except ImportError:
+        return _request_id.get()
+    if not has_request_context():
+        return _request_id.get()
+    return getattr(g, 'request_id', None)
+
+
+class RequestIdFilter(logging.Filter):
+    """
+    Adds request_id attribute to records.
+    """
+    def filter(self, record):
+        if not hasattr(record, 'request_id'):
+            record.request_id = current_request_id()
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Passes only a sample of records at or below given level. A record can
+    set its own rate with extra={'sample': rate}.
+    """
+    def __init__(self, rate=1.0, level=logging.DEBUG):
+        """
+        :param rate: fraction of records passed (0 to 1)
+        :param level: records above this level are always passed.
+        """
+        super(SamplingFilter, self).__init__()
+        self.rate = rate
+        self.level = level
+
+    def filter(self, record):
+        rate = getattr(record, 'sample', None)
+        if rate is None:
+            if record.levelno > self.level:
+                return True
+            rate = self.rate
+        return rate >= 1 or random.random() < rate
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Formats records as json lines.
+    """
+    def format(self, record):
+        entry = dict(time=time.strftime('%Y-%m-%dT%H:%M:%S',
+                                        time.gmtime(record.created)) +
+                     '.{0:03d}Z'.format(int(record.msecs)),
+                     level=record.levelname,
+                     logger=record.name,
+                     message=record.getMessage(),
+                     request_id=getattr(record, 'request_id', None),
+                     pid=record.process)
+        for name, value in record.__dict__.items():
+            if name not in _RECORD_ATTRIBUTES:
+                entry[name] = value
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class BackgroundQueueHandler(QueueHandler):
+    """
+    Puts records on a queue written by a QueueListener thread. The listener
+    is started in every process using the handler, e.g. in each gunicorn
+    worker forked after the application has been loaded.
+    """
+    def __init__(self, handlers):
+        """
+        :param handlers: handlers writing the records.
+        """
+        super(BackgroundQueueHandler, self).__init__(queue.Queue(-1))
+        self.handlers = handlers
+        self._listener = None
+        self._pid = None
+        self._start_lock = threading.Lock()
+
+    def prepare(self, record):
+        # request id is only known in the thread logging the record, message
+        # is formatted here as its arguments may change later. Records stay
+        # in this process so exception info is kept for the formatter.
+        RequestIdFilter().filter(record)
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def _ensure_listener(self):
+        if self._pid == os.getpid():
+            return
+        with self._start_lock:
+            if self._pid == os.getpid():
+                return
+            # queue may hold records copied from parent process.
+            self.queue = queue.Queue(-1)
+            self._listener = QueueListener(self.queue, *self.handlers,
+                                           respect_handler_level=True)
+            self._listener.start()
+            self._pid = os.getpid()
+            atexit.register(self.stop)
+
+    def emit(self, record):
+        self._ensure_listener()
+        super(BackgroundQueueHandler, self).emit(record)
+
+    def stop(self):
+        """
+        This function writes queued records and stops the listener thread.
+        :return:
+        """
+        if self._listener is not None and self._pid == os.getpid():
+            self._listener.stop()
+            self._listener = None
+            self._pid = None
+
+
+def init_app(app):
+    """
+    This function sets up logging of the application: json lines written
+    by a background thread to LOG_FILE (rotated) or to stderr, request ids
+    taken from X-Request-ID header (or generated) and returned in responses.
+    :param app: application object.
+    :return: BackgroundQueueHandler object.
+    """
+    from flask import g, request
+    if app.config.get('LOG_FILE'):
+        log_dir = os.path.dirname(app.config['LOG_FILE'])
+        if log_dir:
+            super_make_dirs(log_dir, 0o775)
+        target = RotatingFileHandler(
+            app.config['LOG_FILE'],
+            maxBytes=app.config.get('LOG_MAX_BYTES', 10 * 1024 * 1024),
+            backupCount=app.config.get('LOG_BACKUP_COUNT', 5))
+    else:
+        target = logging.StreamHandler()
+    target.setFormatter(JsonFormatter())
+
+    level = logging.getLevelName(app.config.get('LOG_LEVEL', 'INFO'))
+    handler = BackgroundQueueHandler([target])
+    handler.addFilter(SamplingFilter(app.config.get('LOG_SAMPLE_RATE', 1.0)))
+    # Flask creates app.logger lazily (e.g. when logging the first
+    # exception) and removes all handlers of the logger named after the
+    # application ('app') when doing so, create it before adding ours.
+    app.logger
+    for name in LOGGER_NAMES:
+        logger = logging.getLogger(name)
+        logger.setLevel(level)
+        # replace handler of a previous call (e.g. another application
+        # instance) instead of writing every record twice.
+        for previous in [h for h in logger.handlers
+                         if isinstance(h, BackgroundQueueHandler)]:
+            logger.removeHandler(previous)
+            previous.stop()
+        logger.addHandler(handler)
+        logger.propagate = False
+
+    @app.before_request
+    def assign_request_id():
+        g.request_id = request_id_from(request.headers.get('X-Request-ID'))
+
+    @app.after_request
+    def add_request_id(response):
+        request_id = getattr(g, 'request_id', None)
+        if request_id:
+            response.headers['X-Request-ID'] = request_id
+        return response
+
+    app.extensions['log_handler'] = handler
+    return handler
 
 
 def setup_logging(name, filename, maxFilesize, backup_count):
     """
-    This function sets up logging for class
+    This function sets up logging for class, records are written by a
+    background thread.
     :param name: name of the module calling logging setup function
     :param filename: filename for storing log information
     :param maxFilesize: Maximum size of file in bytes
     :param backup_count: Number of files used for backup logs.
     :return:
     """
-    import os
-    import logging
-    from logging.handlers import RotatingFileHandler
-
     logger = logging.getLogger(name)
     logger.setLevel(logging.INFO)
 
@@ -36,8 +262,7 @@ def setup_logging(name, filename, maxFilesize, backup_count):
     log_stream.setLevel(logging.ERROR)
 
     # Add handlers
-    logger.addHandler(log_fh)
-    logger.addHandler(log_stream)
+    logger.addHandler(BackgroundQueueHandler([log_fh, log_stream]))
 
     return logger
 
@@ -49,7 +274,6 @@ def super_make_dirs(path, mode):
     :param mode: permissions for the directory
     :return:
     """
-    import os
     if not path or os.path.exists(path):
         return []
     (head, tail) = os.path.split(path)
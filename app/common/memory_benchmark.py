@@ -0,0 +1,286 @@
+"""
+This module measures peak memory of the engine stages (cleaning, region
+finding, capacity, embed and extract) per base of input, for the reference
+engine (app_helpers) and the vectorized engine (vector_engine).
+
+Each measurement runs in a forked process, after the inputs have been built
+and the engine has been warmed up on a small input, so that only memory
+allocated by the stage itself is counted. Two values are measured in
+separate processes:
+    traced: peak of python allocations (tracemalloc), including numpy arrays
+    rss: growth of peak resident set size (VmHWM, reset via clear_refs)
+tracemalloc is not running while RSS is measured, as it allocates memory
+for every traced block.
+
+Budgets (bytes per base) are kept in tests/memory_budget.json and checked by
+tests/test_memory.py; python manage.py membench prints the measurements and
+updates the budget file with --update.
+"""
+import os
+import json
+import random
+import tracemalloc
+import multiprocessing
+from helpers import resource_path
+from helpers.codon_helpers import STOP_CODONS, random_codons
+from helpers.packed_sequence import PackedSequence
+from . import app_helpers, vector_engine
+
+STAGES = ('clean', 'regions', 'capacity', 'embed', 'extract')
+ENGINES = ('reference', 'vector')
+
+BUDGET_FILE = resource_path('tests', 'memory_budget.json')
+
+# Number of bases of input used for warming up an engine.
+_WARM_UP_LENGTH = 3000
+
+
+def synthetic_input(length, seed=1):
+    """
+    This function generates raw input of about given length: coding regions
+    (start codon, random codons, stop codon) separated by random bases,
+    upper case and wrapped in lines of 70 characters like FASTA files.
+    :param length: number of bases.
+    :param seed: seed of random generator.
+    :return: string
+    """
+    rnd = random.Random(seed)
+    parts = []
+    size = 0
+    while size < length:
+        gap = ''.join(rnd.choice('ACGT') for _ in range(rnd.randint(0, 60)))
+        codons = 'atg' + random_codons(rnd, rnd.randint(50, 500)) + \
+            rnd.choice(STOP_CODONS)
+        parts.append(gap + codons.upper())
+        size += len(parts[-1])
+    bases = ''.join(parts)[:length]
+    return '\n'.join(bases[i:i + 70] for i in range(0, len(bases), 70))
+
+
+def _message(raw):
+    """
+    This function returns watermark message filling about half of the
+    capacity of the input (at most 65535 characters, see embed_data).
+    :param raw: raw input.
+    :return: string
+    """
+    cap = vector_engine.capacity(raw)
+    return 'm' * max(1, min((cap - 16) // 16, 65535))
+
+
+def _stage(engine, stage, raw):
+    """
+    This function prepares a stage for measurement.
+    :param engine: 'reference' or 'vector'
+    :param stage: name of stage (see STAGES)
+    :param raw: raw input (string)
+    :return: tuple (function, arguments), arguments are built beforehand and
+    are not counted.
+    """
+    if engine == 'reference':
+        if stage == 'clean':
+            return app_helpers._clean_dna, (raw,)
+        if stage == 'regions':
+            return app_helpers.find_coding_region, (raw,)
+        if stage == 'capacity':
+            return app_helpers.find_capacity, (raw,)
+        region = app_helpers.find_coding_region(raw)
+        msg = _message(raw)
+        if stage == 'embed':
+            return app_helpers.embed_data, (raw, msg, 1, region)
+        wm_raw = app_helpers.embed_data(raw, msg, region=region)
+        return app_helpers.extract_data, (wm_raw, 1, region)
+    if stage == 'clean':
+        return PackedSequence.from_string, (raw,)
+    seq = PackedSequence.from_string(raw)
+    if stage == 'regions':
+        return vector_engine.find_regions, (seq,)
+    if stage == 'capacity':
+        return vector_engine.capacity, (seq,)
+    msg = _message(raw)
+    if stage == 'embed':
+        return vector_engine.embed, (seq, msg)
+    return vector_engine.extract, (vector_engine.embed(seq, msg),)
+
+
+def _read_status(name):
+    with open('/proc/self/status') as status:
+        for line in status:
+            if line.startswith(name + ':'):
+                return int(line.split()[1]) * 1024
+    return None
+
+
+def _reset_peak_rss():
+    """
+    This function resets peak resident set size of current process.
+    :return: True if it has been reset (Linux 4.0+)
+    """
+    try:
+        with open('/proc/self/clear_refs', 'w') as clear_refs:
+            clear_refs.write('5')
+        return True
+    except OSError:
+        return False
+
+
+def _measure(engine, stage, length, traced, conn):
+    """
+    This function measures a stage, runs in a forked process.
+    :param engine: 'reference' or 'vector'
+    :param stage: name of stage.
+    :param length: number of bases of input.
+    :param traced: measure python allocations instead of RSS.
+    :param conn: pipe for sending the result (bytes or None)
+    :return:
+    """
+    try:
+        fn, args = _stage(engine, stage, synthetic_input(_WARM_UP_LENGTH))
+        fn(*args)
+        fn, args = _stage(engine, stage, synthetic_input(length))
+        if traced:
+            tracemalloc.start()
+            result = fn(*args)
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+        else:
+            if not _reset_peak_rss():
+                conn.send(None)
+                return
+            before = _read_status('VmRSS')
+            result = fn(*args)
+            peak = _read_status('VmHWM') - before
+        del result
+        conn.send(max(peak, 0))
+    except Exception as e:
+        conn.send(e)
+    finally:
+        conn.close()
+
+
+def measure(engine, stage, length, traced=True):
+    """
+    This function measures peak memory of a stage in a forked process.
+    :param engine: 'reference' or 'vector'
+    :param stage: name of stage (see STAGES)
+    :param length: number of bases of input.
+    :param traced: measure python allocations (tracemalloc) if True, growth
+    of peak RSS otherwise.
+    :return: bytes, None if RSS can not be measured.
+    """
+    context = multiprocessing.get_context('fork')
+    receiver, sender = context.Pipe(duplex=False)
+    process = context.Process(target=_measure,
+                              args=(engine, stage, length, traced, sender))
+    process.start()
+    sender.close()
+    try:
+        result = receiver.recv()
+    except EOFError:
+        result = RuntimeError('Measurement of {0} {1} failed.'.format(
+            engine, stage))
+    process.join()
+    if isinstance(result, Exception):
+        raise result
+    return result
+
+
+def run(sizes, engines=ENGINES, stages=STAGES):
+    """
+    This function measures all stages.
+    :param sizes: dictionary object, input lengths (bases) for each engine.
+    :param engines: engines to measure.
+    :param stages: stages to measure.
+    :return: list of dictionaries with 'engine', 'stage', 'length',
+    'traced' and 'rss' (bytes per base, rss is None if it can not be
+    measured)
+    """
+    results = []
+    for engine in engines:
+        for stage in stages:
+            for length in sizes[engine]:
+                rss = measure(engine, stage, length, traced=False)
+                results.append(dict(
+                    engine=engine, stage=stage, length=length,
+                    traced=measure(engine, stage, length) / length,
+                    rss=None if rss is None else rss / length))
+    return results
+
+
+def load_budget(path=BUDGET_FILE):
+    """
+    This function reads the budget file.
+    :param path: path of budget file.
+    :return: dictionary object with 'sizes' (input lengths for each engine),
+    'headroom', 'slack' (bytes allowed above the budget for any input size,
+    absorbing allocator noise) and 'budgets' (bytes per base for each
+    engine and stage)
+    """
+    with open(path) as budget_file:
+        return json.load(budget_file)
+
+
+def check_budget(results, budget):
+    """
+    This function compares measurements with the budget.
+    :param results: list returned by run.
+    :param budget: dictionary object returned by load_budget.
+    :return: list of strings describing exceeded budgets.
+    """
+    failures = []
+    slack = budget.get('slack', {})
+    for result in results:
+        limits = budget['budgets'][result['engine']][result['stage']]
+        for kind in ('traced', 'rss'):
+            if result[kind] is None or limits.get(kind) is None:
+                continue
+            if result[kind] > limits[kind] + \
+                    slack.get(kind, 0) / result['length']:
+                failures.append(
+                    '{engine} {stage} ({length} bases): {kind} {value:.1f} '
+                    'bytes/base exceeds budget of {limit:.1f}'.format(
+                        kind=kind, value=result[kind], limit=limits[kind],
+                        **result))
+    return failures
+
+
+def update_budget(results, budget, path=BUDGET_FILE):
+    """
+    This function writes measurements (largest value over input sizes,
+    multiplied by headroom) as new budget.
+    :param results: list returned by run.
+    :param budget: dictionary object returned by load_budget.
+    :param path: path of budget file.
+    :return:
+    """
+    headroom = budget.get('headroom', 1.25)
+    budgets = {}
+    for result in results:
+        limits = budgets.setdefault(result['engine'], {}).setdefault(
+            result['stage'], {})
+        for kind in ('traced', 'rss'):
+            if result[kind] is not None:
+                limits[kind] = round(max(limits.get(kind, 0),
+                                         result[kind] * headroom), 1)
+    budget['budgets'] = budgets
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as budget_file:
+        json.dump(budget, budget_file, indent=2, sort_keys=True)
+        budget_file.write('\n')
+    os.rename(tmp_path, path)
+
+
+def format_results(results):
+    """
+    This function formats measurements as a table.
+    :param results: list returned by run.
+    :return: string
+    """
+    lines = ['{0:<10}{1:<10}{2:>10}{3:>14}{4:>14}'.format(
+        'engine', 'stage', 'bases', 'traced B/base', 'rss B/base')]
+    for result in results:
+        lines.append('{0:<10}{1:<10}{2:>10}{3:>14.1f}{4:>14}'.format(
+            result['engine'], result['stage'], result['length'],
+            result['traced'], '-' if result['rss'] is None
+            else '{0:.1f}'.format(result['rss'])))
+    return '\n'.join(lines)
@@ -0,0 +1,168 @@
+"""
+This module implements immutable representation of coding regions.
+
+Start and stop positions are kept in read-only memoryviews over packed 64 bit
+integers, so a CodingRegions object can be cached and shared between
+requests and threads, and slicing it does not copy the positions. For
+compatibility with the dictionary returned by find_coding_region in the
+past, region["start"] and region.get("stop") return the positions as well.
+"""
+from array import array
+from bisect import bisect_left, bisect_right
+
+
+def _packed(values):
+    """
+    This function packs integers in a read-only memoryview.
+    :param values: iterable of integers.
+    :return: memoryview of format 'q'
+    """
+    return memoryview(array('q', values).tobytes()).cast('q')
+
+
+class CodingRegions(object):
+    """
+    Immutable list of coding regions. Positions are base offsets in the
+    reading frame, a region covers [start, stop) where stop is the position
+    after its stop codon (or a position past the end of sequence if the
+    region is not terminated). If there are fewer stops than starts, the
+    last regions run till the end of sequence.
+    """
+    __slots__ = ('starts', 'stops')
+
+    def __init__(self, starts=(), stops=()):
+        """
+        :param starts: start positions (iterable of integers)
+        :param stops: stop positions (iterable of integers)
+        """
+        object.__setattr__(self, 'starts',
+                           starts if _is_packed(starts) else _packed(starts))
+        object.__setattr__(self, 'stops',
+                           stops if _is_packed(stops) else _packed(stops))
+
+    @classmethod
+    def coerce(cls, region):
+        """
+        This function returns CodingRegions object for given region data.
+        :param region: CodingRegions object or dictionary with 'start' and
+        'stop' lists.
+        :return: CodingRegions object (given object if it is one already)
+        """
+        if isinstance(region, cls):
+            return region
+        return cls(region.get("start", ()), region.get("stop", ()))
+
+    def __setattr__(self, name, value):
+        raise AttributeError('CodingRegions object is immutable')
+
+    def __delattr__(self, name):
+        raise AttributeError('CodingRegions object is immutable')
+
+    def __reduce__(self):
+        return CodingRegions, (self.starts.tolist(), self.stops.tolist())
+
+    def __len__(self):
+        return len(self.starts)
+
+    def __iter__(self):
+        """Iterate over (start, stop) pairs, stop is None if missing."""
+        for i in range(len(self.starts)):
+            yield self.starts[i], self.stop(i)
+
+    def __eq__(self, other):
+        if not isinstance(other, CodingRegions):
+            return NotImplemented
+        return self.starts == other.starts and self.stops == other.stops
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    def __hash__(self):
+        return hash((self.starts.tobytes(), self.stops.tobytes()))
+
+    def __repr__(self):
+        return 'CodingRegions(start={0}, stop={1})'.format(
+            self.starts.tolist(), self.stops.tolist())
+
+    def __getitem__(self, key):
+        if key == "start":
+            return self.starts
+        if key == "stop":
+            return self.stops
+        raise KeyError(key)
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def stop(self, i, default=None):
+        """
+        This function returns stop position of i-th region.
+        :param i: index of region.
+        :param default: value returned if region has no stop position.
+        :return: integer
+        """
+        return self.stops[i] if i < len(self.stops) else default
+
+    def to_dict(self):
+        """
+        This function returns regions as dictionary of lists.
+        :return: dictionary object with 'start' and 'stop' lists.
+        """
+        return dict(start=self.starts.tolist(), stop=self.stops.tolist())
+
+    def overlapping(self, start, end):
+        """
+        This function returns regions overlapping range [start, end),
+        regions must be sorted and non overlapping (as returned by
+        find_coding_region). Positions are not copied.
+        :param start: start position of range.
+        :param end: end position of range.
+        :return: CodingRegions object.
+        """
+        first = bisect_right(self.stops, start)
+        last = bisect_left(self.starts, end)
+        if last <= first:
+            return CodingRegions()
+        stops = self.stops[first:min(last, len(self.stops))]
+        return CodingRegions(self.starts[first:last], stops)
+
+    def contains(self, position):
+        """
+        This function checks if given position lies in a coding region.
+        :param position: base position in the reading frame.
+        :return: True or False
+        """
+        i = bisect_right(self.starts, position) - 1
+        if i < 0:
+            return False
+        stop = self.stop(i)
+        return stop is None or position < stop
+
+    def mask(self, length):
+        """
+        This function returns mask of positions lying in coding regions.
+        :param length: number of positions (bases in reading frame)
+        :return: numpy array (bool)
+        """
+        import numpy as np
+        starts = np.frombuffer(self.starts, dtype=np.int64)
+        stops = np.full(len(starts), length, dtype=np.int64)
+        stops[:len(self.stops)] = np.frombuffer(self.stops, dtype=np.int64)
+        delta = np.zeros(length + 1, dtype=np.int64)
+        np.add.at(delta, np.clip(starts, 0, length), 1)
+        np.add.at(delta, np.clip(stops, 0, length), -1)
+        return np.cumsum(delta[:-1]) > 0
+
+
+def _is_packed(values):
+    """
+    This function checks if values are already a packed read-only view.
+    :param values: iterable of integers.
+    :return: True or False
+    """
+    return isinstance(values, memoryview) and values.readonly and \
+        values.format == 'q'
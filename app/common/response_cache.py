@@ -0,0 +1,249 @@
+"""
+This module caches results of embed and extract calls, so that requests
+which are retried or submitted again are answered without recomputing them.
+
+Results are keyed by a hash of the operation, its parameters and the cleaned
+(2 bit packed) sequence. They are kept in memory in a least recently used
+cache bounded by RESPONSE_CACHE_SIZE bytes and, if RESPONSE_CACHE_DIR is set,
+in files in that directory shared by all workers of the application. Results
+expire after RESPONSE_CACHE_TTL seconds in both tiers.
+"""
+import os
+import json
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from helpers.packed_sequence import PackedSequence
+
+# Seconds between removals of expired files from the disk tier.
+PURGE_INTERVAL = 60
+
+# Approximate memory (bytes) used by an entry besides its value.
+_ENTRY_OVERHEAD = 200
+
+
+def cache_key(operation, seq, **params):
+    """
+    This function returns cache key of an operation. Every part is length
+    prefixed, so that e.g. a message can not run into the sequence.
+    :param operation: name of operation e.g. 'embed'
+    :param seq: cleaned sequence (PackedSequence)
+    :param params: other parameters of the operation (e.g. message, frame,
+    gc), converted to strings.
+    :return: key (hexadecimal string)
+    """
+    header = json.dumps([operation, dict((name, str(value)) for name, value
+                                         in params.items())],
+                        sort_keys=True).encode('utf-8')
+    digest = hashlib.sha256()
+    digest.update('{0}:'.format(len(header)).encode('ascii'))
+    digest.update(header)
+    digest.update('{0}:'.format(len(seq)).encode('ascii'))
+    for block in seq.packed_blocks():
+        digest.update(block)
+    return digest.hexdigest()
+
+
+def _value_size(value):
+    """
+    This function estimates memory used by a cached value.
+    :param value: PackedSequence or string.
+    :return: size (bytes)
+    """
+    if isinstance(value, PackedSequence):
+        return value.nbytes + _ENTRY_OVERHEAD
+    return len(value) * 4 + _ENTRY_OVERHEAD
+
+
+class ResponseCache(object):
+    """
+    Two tier (memory and optional disk) cache of engine results, values are
+    PackedSequence objects or strings.
+    """
+
+    def __init__(self, app=None):
+        self.max_bytes = 0
+        self.ttl = 0
+        self.directory = None
+        self._entries = OrderedDict()
+        self._size = 0
+        self._last_purge = 0
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """
+        This function reads cache settings of the application.
+        :param app: application object.
+        :return:
+        """
+        self.max_bytes = app.config.get('RESPONSE_CACHE_SIZE', 0)
+        self.ttl = app.config.get('RESPONSE_CACHE_TTL', 600)
+        self.directory = app.config.get('RESPONSE_CACHE_DIR')
+        if self.directory and not os.path.isdir(self.directory):
+            os.makedirs(self.directory, mode=0o700, exist_ok=True)
+        app.extensions['response_cache'] = self
+
+    @property
+    def size(self):
+        """Memory (bytes) used by cached values."""
+        return self._size
+
+    def get(self, key):
+        """
+        This function returns cached value.
+        :param key: cache key (see cache_key)
+        :return: value or None if it is not cached (or has expired)
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires, value, size = entry
+                if expires > time.time():
+                    self._entries.move_to_end(key)
+                    return value
+                self._remove(key)
+        value, expires = self._read_file(key)
+        if value is not None:
+            self._store(key, value, expires)
+        return value
+
+    def put(self, key, value):
+        """
+        This function caches a value in both tiers.
+        :param key: cache key (see cache_key)
+        :param value: PackedSequence or string.
+        :return:
+        """
+        self._store(key, value)
+        self._write_file(key, value)
+
+    def get_or_compute(self, key, compute):
+        """
+        This function returns cached value, computing and caching it if it
+        is not cached. None results are not cached.
+        :param key: cache key (see cache_key)
+        :param compute: function computing the value.
+        :return: tuple (value, 'HIT' or 'MISS')
+        """
+        value = self.get(key)
+        if value is not None:
+            return value, 'HIT'
+        value = compute()
+        if value is not None:
+            self.put(key, value)
+        return value, 'MISS'
+
+    def clear(self):
+        """
+        This function removes all values from memory tier.
+        :return:
+        """
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def _remove(self, key):
+        expires, value, size = self._entries.pop(key)
+        self._size -= size
+
+    def _store(self, key, value, expires=None):
+        """
+        This function caches a value in memory, evicting least recently used
+        values above the size limit.
+        :param key: cache key.
+        :param value: PackedSequence or string.
+        :param expires: expiry time, default=None i.e. RESPONSE_CACHE_TTL
+        seconds from now.
+        :return:
+        """
+        size = _value_size(value)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (expires or time.time() + self.ttl, value,
+                                  size)
+            self._size += size
+            while self._size > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + '.cache')
+
+    def _read_file(self, key):
+        """
+        This function reads a value from disk tier.
+        :param key: cache key.
+        :return: tuple (value, expiry time), value is None if it is not
+        cached (or has expired)
+        """
+        if not self.directory:
+            return None, None
+        path = self._path(key)
+        try:
+            expires = os.path.getmtime(path) + self.ttl
+            if expires < time.time():
+                os.remove(path)
+                return None, None
+            with open(path, 'rb') as cache_file:
+                kind, length = cache_file.readline().split()
+                data = cache_file.read()
+            if kind == b'seq':
+                return PackedSequence.from_packed(data, int(length)), expires
+            return data.decode('utf-8'), expires
+        except (OSError, ValueError):
+            return None, None
+
+    def _write_file(self, key, value):
+        """
+        This function writes a value to disk tier, file starts with a line
+        giving type and length of value followed by packed bases or utf-8
+        text.
+        :param key: cache key.
+        :param value: PackedSequence or string.
+        :return:
+        """
+        if not self.directory:
+            return
+        path = self._path(key)
+        tmp_path = '{0}.{1}.{2}.tmp'.format(path, os.getpid(),
+                                            threading.get_ident())
+        try:
+            with open(tmp_path, 'wb') as cache_file:
+                if isinstance(value, PackedSequence):
+                    cache_file.write('seq {0}\n'.format(len(value))
+                                     .encode('ascii'))
+                    for block in value.packed_blocks():
+                        cache_file.write(block)
+                else:
+                    cache_file.write('text {0}\n'.format(len(value))
+                                     .encode('ascii'))
+                    cache_file.write(value.encode('utf-8'))
+            os.rename(tmp_path, path)
+        except OSError:
+            # disk tier is only an optimization.
+            return
+        self._purge_files()
+
+    def _purge_files(self):
+        """
+        This function removes expired files from disk tier, at most once
+        every PURGE_INTERVAL seconds.
+        :return:
+        """
+        now = time.time()
+        if now - self._last_purge < PURGE_INTERVAL:
+            return
+        self._last_purge = now
+        for filename in os.listdir(self.directory):
+            path = os.path.join(self.directory, filename)
+            try:
+                if os.path.getmtime(path) + self.ttl < now:
+                    os.remove(path)
+            except OSError:
+                # removed by another worker.
+                pass
@@ -0,0 +1,192 @@
+"""
+This module stores results (e.g. watermarked sequences) on disk so that they
+can be downloaded as a stream instead of being rendered inside html pages.
+
+Results are plain text files named by a random token in RESULT_STORE_DIR,
+the directory is shared by all workers of the application. Small json
+documents (e.g. state of jobs) are kept in the same directory. Results older
+than RESULT_TTL seconds are removed when a new result is stored.
+"""
+import os
+import re
+import json
+import time
+import uuid
+import tempfile
+from helpers.packed_sequence import PackedSequence
+from helpers import twobit_format
+
+# Size (characters) of pieces in which results are written and read.
+CHUNK_SIZE = 1 << 20
+
+_TOKEN_RE = re.compile(r'^[0-9a-f]{32}$')
+
+
+def _store_dir(app):
+    """
+    This function returns directory for stored results, creating it if
+    needed.
+    :param app: application object.
+    :return: path to directory.
+    """
+    path = app.config.get('RESULT_STORE_DIR') or \
+        os.path.join(tempfile.gettempdir(), 'dna-lceb-results')
+    if not os.path.isdir(path):
+        os.makedirs(path, mode=0o700, exist_ok=True)
+    return path
+
+
+def result_path(app, token):
+    """
+    This function returns path of stored result for given token.
+    :param app: application object.
+    :param token: token returned by store_result.
+    :return: path of result file or None if token is invalid or result has
+    expired.
+    """
+    if not isinstance(token, str) or not _TOKEN_RE.match(token):
+        return None
+    path = os.path.join(_store_dir(app), token + '.txt')
+    if not os.path.exists(path):
+        return None
+    return path
+
+
+def store_result(app, text):
+    """
+    This function writes result to the store.
+    :param app: application object.
+    :param text: result (string or PackedSequence, which is converted to
+    text piece by piece)
+    :return: token (string) for retrieving the result.
+    """
+    directory = _store_dir(app)
+    purge_expired(app)
+    token = uuid.uuid4().hex
+    tmp_path = os.path.join(directory, token + '.tmp')
+    if isinstance(text, PackedSequence):
+        pieces = text.iter_text(CHUNK_SIZE)
+    else:
+        pieces = (text[i:i + CHUNK_SIZE]
+                  for i in range(0, len(text), CHUNK_SIZE))
+    with open(tmp_path, 'w') as result_file:
+        for piece in pieces:
+            result_file.write(piece)
+    os.rename(tmp_path, os.path.join(directory, token + '.txt'))
+    return token
+
+
+def write_json(app, token, data):
+    """
+    This function writes (or replaces) a json document in the store.
+    :param app: application object.
+    :param token: name of document (32 hexadecimal characters)
+    :param data: json serializable object.
+    :return:
+    """
+    directory = _store_dir(app)
+    tmp_path = os.path.join(directory, token + '.json.tmp')
+    with open(tmp_path, 'w') as json_file:
+        json.dump(data, json_file)
+    os.rename(tmp_path, os.path.join(directory, token + '.json'))
+
+
+def read_json(app, token):
+    """
+    This function reads a json document from the store.
+    :param app: application object.
+    :param token: name of document.
+    :return: stored object or None if token is invalid or document has
+    expired.
+    """
+    if not isinstance(token, str) or not _TOKEN_RE.match(token):
+        return None
+    try:
+        with open(os.path.join(_store_dir(app), token + '.json')) as \
+                json_file:
+            return json.load(json_file)
+    except (OSError, ValueError):
+        return None
+
+
+def purge_expired(app):
+    """
+    This function removes results older than RESULT_TTL seconds.
+    :param app: application object.
+    :return: number of removed results.
+    """
+    ttl = app.config.get('RESULT_TTL', 3600)
+    directory = _store_dir(app)
+    deadline = time.time() - ttl
+    removed = 0
+    for filename in os.listdir(directory):
+        path = os.path.join(directory, filename)
+        try:
+            if os.path.getmtime(path) < deadline:
+                os.remove(path)
+                removed += 1
+        except OSError:
+            # removed by another worker.
+            pass
+    return removed
+
+
+def read_preview(path, length):
+    """
+    This function returns beginning of stored result.
+    :param path: path of result file.
+    :param length: number of characters.
+    :return: string
+    """
+    with open(path) as result_file:
+        return result_file.read(length)
+
+
+def result_size(path):
+    """
+    This function returns size of stored result in characters.
+    :param path: path of result file.
+    :return: integer
+    """
+    return os.path.getsize(path)
+
+
+def stream_lines(path, width=70, header=None):
+    """
+    This function generates the stored result wrapped in lines of given
+    width, reading it piece by piece.
+    :param path: path of result file.
+    :param width: characters per line, 0 disables wrapping.
+    :param header: FASTA header line (without '>'), None for plain text.
+    :return: generator of strings.
+    """
+    if header is not None:
+        yield '>' + header + '\n'
+    # Read whole lines worth of characters per piece.
+    piece_size = max(CHUNK_SIZE - CHUNK_SIZE % width, width) if width \
+        else CHUNK_SIZE
+    with open(path) as result_file:
+        while True:
+            piece = result_file.read(piece_size)
+            if not piece:
+                break
+            if width:
+                yield ''.join(piece[i:i + width] + '\n'
+                              for i in range(0, len(piece), width))
+            else:
+                yield piece
+    if not width:
+        yield '\n'
+
+
+def stream_packed(path):
+    """
+    This function generates the stored result (sequence) 2 bit encoded (see
+    helpers/twobit_format.py), reading it piece by piece.
+    :param path: path of result file.
+    :return: generator of bytes.
+    """
+    with open(path) as result_file:
+        for block in twobit_format.iter_encode_text(
+                result_file, result_size(path), size=CHUNK_SIZE):
+            yield bytes(block)
@@ -0,0 +1,203 @@
+"""
+This module shards a payload which does not fit in a single sequence across
+a set of sequences (e.g. records of a multi-FASTA file or the dataset
+corpus).
+
+Capacities of all sequences are computed in parallel and the payload is
+split in shards proportional to the capacities. Every shard is embedded in
+its sequence as a framed payload (see framing.py) whose header carries the
+shard index, number of shards and payload length, so shards can be
+extracted in parallel and reassembled in order whatever the order of the
+sequences is. Sequences which get no shard are not changed.
+
+Parallel calls go through map_fn, which has the signature of builtin map
+(e.g. map of an executor or Dispatcher.map), functions passed to it are
+module level so they can be sent to worker processes.
+"""
+from itertools import repeat
+from helpers.codon_helpers import codon_capacity
+from helpers.packed_sequence import PackedSequence
+from . import framing
+
+# Header fields of a shard following frame size and shard length.
+SHARD_FIELDS = ('index', 'count', 'payload_length')
+
+
+def sequence_capacity(dna_seq, frame=1, gc=1):
+    """
+    This function returns capacity of a sequence.
+    :param dna_seq: DNA sequence (PackedSequence or string)
+    :param frame: open reading frame number i.e. 1, 2, 3
+    :param gc: genetic code.
+    :return: capacity (bits) or None if genetic code is not available.
+    """
+    codons = PackedSequence.from_string(dna_seq).codon_indexes(frame)
+    capacity = codon_capacity(codons, gc)
+    return None if capacity is None else int(capacity.sum())
+
+
+def usable_bytes(capacity, length, frame_size=framing.DEFAULT_FRAME_SIZE):
+    """
+    This function returns number of payload bytes a sequence can carry as a
+    shard.
+    :param capacity: capacity of the sequence (bits)
+    :param length: length of whole payload (bytes), bounds size of header.
+    :param frame_size: size of data carried by a frame (bytes)
+    :return: integer
+    """
+    # header of the largest possible shard.
+    header = 8 * len(framing.encode_header(length, frame_size,
+                                           (length, length, length)))
+    if capacity < header:
+        return 0
+    return (capacity - header) // framing.frame_bits(frame_size) * frame_size
+
+
+def shard_sizes(capacities, length, frame_size=framing.DEFAULT_FRAME_SIZE):
+    """
+    This function splits a payload in shards proportional to capacities of
+    sequences (largest remainder method).
+    :param capacities: list of capacities (bits)
+    :param length: length of payload (bytes)
+    :param frame_size: size of data carried by a frame (bytes)
+    :return: list of shard sizes (bytes, 0 for sequences without shard) or
+    None if payload does not fit.
+    """
+    usable = [usable_bytes(capacity or 0, length, frame_size)
+              for capacity in capacities]
+    total = sum(usable)
+    if total < length or not usable:
+        return None
+    sizes = [size * length // total for size in usable]
+    remainder = length - sum(sizes)
+    # largest fractional parts first.
+    order = sorted(range(len(usable)),
+                   key=lambda i: -(usable[i] * length % total))
+    for i in order:
+        if not remainder:
+            break
+        extra = min(usable[i] - sizes[i], remainder)
+        sizes[i] += extra
+        remainder -= extra
+    return sizes
+
+
+def embed_shard(dna_seq, shard, index, count, payload_length, frame=1, gc=1,
+                frame_size=framing.DEFAULT_FRAME_SIZE):
+    """
+    This function embeds a shard in a sequence.
+    :param dna_seq: DNA sequence (PackedSequence or string)
+    :param shard: data of the shard (bytes)
+    :param index: index of the shard.
+    :param count: number of shards.
+    :param payload_length: length of whole payload (bytes)
+    :param frame: open reading frame number i.e. 1, 2, 3
+    :param gc: genetic code.
+    :param frame_size: size of data carried by a frame (bytes)
+    :return: watermarked sequence (PackedSequence) or None if shard does
+    not fit.
+    """
+    return framing.embed_payload(dna_seq, shard, frame, gc, frame_size,
+                                 fields=(index, count, payload_length))
+
+
+def read_shard(wm_dna, frame=1, gc=1):
+    """
+    This function extracts a shard from a sequence.
+    :param wm_dna: watermarked DNA sequence (PackedSequence or string)
+    :param frame: open reading frame number i.e. 1, 2, 3
+    :param gc: genetic code.
+    :return: tuple (index, count, payload length, data) or None if sequence
+    does not carry a shard.
+    """
+    try:
+        reader = framing.FramedPayload(wm_dna, frame, gc)
+    except framing.FramingError:
+        return None
+    if len(reader.fields) < len(SHARD_FIELDS):
+        return None
+    index, count, payload_length = reader.fields[:len(SHARD_FIELDS)]
+    return index, count, payload_length, reader.read()
+
+
+def embed_shards(sequences, payload, frame=1, gc=1,
+                 frame_size=framing.DEFAULT_FRAME_SIZE, map_fn=map):
+    """
+    This function shards a payload across sequences.
+    :param sequences: list of DNA sequences (PackedSequence or string)
+    :param payload: bytes (or string, encoded as UTF-8)
+    :param frame: open reading frame number i.e. 1, 2, 3 default=1
+    :param gc: genetic code default=1
+    :param frame_size: size of data carried by a frame (bytes)
+    :param map_fn: function running calls in parallel (see module doc)
+    :return: tuple (list of sequences, watermarked ones replaced by
+    PackedSequence objects, list of shard indexes of the sequences, None for
+    sequences without shard) or None if payload does not fit.
+    """
+    if isinstance(payload, str):
+        payload = payload.encode('utf-8')
+    capacities = list(map_fn(sequence_capacity, sequences, repeat(frame),
+                             repeat(gc)))
+    sizes = shard_sizes(capacities, len(payload), frame_size)
+    if sizes is None:
+        return None
+    jobs = []
+    offset = 0
+    count = sum(1 for size in sizes if size)
+    indexes = []
+    for i, size in enumerate(sizes):
+        if size:
+            indexes.append(len(jobs))
+            jobs.append((i, payload[offset:offset + size]))
+            offset += size
+        else:
+            indexes.append(None)
+    watermarked = list(map_fn(
+        embed_shard, [sequences[i] for i, _ in jobs],
+        [shard for _, shard in jobs], range(len(jobs)), repeat(count),
+        repeat(len(payload)), repeat(frame), repeat(gc), repeat(frame_size)))
+    if any(seq is None for seq in watermarked):
+        return None
+    results = list(sequences)
+    for (i, _), seq in zip(jobs, watermarked):
+        results[i] = seq
+    return results, indexes
+
+
+def extract_shards(sequences, frame=1, gc=1, map_fn=map):
+    """
+    This function extracts shards from sequences and reassembles the
+    payload.
+    :param sequences: list of watermarked DNA sequences, in any order,
+    sequences without shard are ignored.
+    :param frame: open reading frame number i.e. 1, 2, 3 default=1
+    :param gc: genetic code default=1
+    :param map_fn: function running calls in parallel (see module doc)
+    :return: payload (bytes)
+    :except FramingError: if shards are missing, duplicated or corrupted.
+    """
+    shards = {}
+    count = length = None
+    for shard in map_fn(read_shard, sequences, repeat(frame), repeat(gc)):
+        if shard is None:
+            continue
+        index, shard_count, payload_length, data = shard
+        if count is None:
+            count, length = shard_count, payload_length
+        elif (count, length) != (shard_count, payload_length):
+            raise framing.FramingError('Shards belong to different '
+                                       'payloads.')
+        if index in shards or index >= count:
+            raise framing.FramingError('Duplicate or invalid shard '
+                                       '{0}.'.format(index))
+        shards[index] = data
+    if count is None:
+        raise framing.FramingError('Sequences do not carry shards.')
+    missing = [index for index in range(count) if index not in shards]
+    if missing:
+        raise framing.FramingError('Missing shards: {0}.'.format(
+            ', '.join(map(str, missing))))
+    payload = b''.join(shards[index] for index in range(count))
+    if len(payload) != length:
+        raise framing.FramingError('Payload length does not match.')
+    return payload
@@ -0,0 +1,121 @@
+"""
+This module contains helpers for reading DNA sequences uploaded as FASTA
+files (optionally gzip compressed), either as multipart form files or as
+raw request body. Raw request body may also be a 2 bit encoded sequence
+(see helpers/twobit_format.py).
+"""
+import shutil
+import tempfile
+from flask import request, current_app
+from helpers.fasta_helpers import read_fasta, read_first_sequence
+from helpers import twobit_format
+
+# Content types accepted as raw FASTA request body.
+FASTA_CONTENT_TYPES = ('text/x-fasta', 'text/plain', 'application/gzip',
+                       'application/x-gzip', 'application/octet-stream')
+
+
+def has_uploaded_file(file_storage):
+    """
+    This function checks if a file has been uploaded in a form field.
+    :param file_storage: data of file field (werkzeug FileStorage or None)
+    :return: True or False
+    """
+    return file_storage is not None and hasattr(file_storage, 'stream') and \
+        bool(file_storage.filename)
+
+
+def read_uploaded_sequence(file_storage):
+    """
+    This function parses the first sequence of uploaded FASTA file. Werkzeug
+    spools large uploads to a temporary file, so the raw file is never held
+    in memory as a whole.
+    :param file_storage: werkzeug FileStorage object.
+    :return: cleaned DNA sequence (string) or None if file is empty.
+    :except SequenceTooLong: if sequence exceeds MAX_SEQUENCE_LENGTH.
+    """
+    stream = file_storage.stream
+    stream.seek(0)
+    return read_first_sequence(
+        stream, max_length=current_app.config.get('MAX_SEQUENCE_LENGTH'))
+
+
+def is_fasta_request():
+    """
+    This function checks if request body is a raw FASTA file.
+    :return: True or False
+    """
+    return request.mimetype in FASTA_CONTENT_TYPES
+
+
+def is_twobit_request():
+    """
+    This function checks if request body is a 2 bit encoded sequence.
+    :return: True or False
+    """
+    return request.mimetype == twobit_format.MIMETYPE
+
+
+def read_twobit_sequence():
+    """
+    This function decodes 2 bit encoded sequence of request body, packed
+    data is read directly into the sequence buffer.
+    :return: PackedSequence object.
+    :except FormatError: if body is not a valid 2 bit encoded sequence.
+    :except SequenceTooLong: if sequence exceeds MAX_SEQUENCE_LENGTH.
+    """
+    return twobit_format.read(
+        request.stream,
+        max_length=current_app.config.get('MAX_SEQUENCE_LENGTH'))
+
+
+def read_uploaded_sequences(file_storage):
+    """
+    This function parses all sequences of uploaded (multi) FASTA file.
+    :param file_storage: werkzeug FileStorage object.
+    :return: list of tuples (header or None, cleaned DNA sequence)
+    :except SequenceTooLong: if a sequence exceeds MAX_SEQUENCE_LENGTH.
+    """
+    stream = file_storage.stream
+    stream.seek(0)
+    return list(read_fasta(
+        stream, max_length=current_app.config.get('MAX_SEQUENCE_LENGTH')))
+
+
+def _read_request_body(parse):
+    """
+    This function spools raw request body (FASTA, optionally gzip
+    compressed) to a temporary file and parses it.
+    :param parse: function parsing FASTA file, called with the file and
+    maximum length of a sequence.
+    :return: result of parse.
+    """
+    spool = tempfile.SpooledTemporaryFile(
+        max_size=current_app.config.get('UPLOAD_SPOOL_SIZE', 1 << 20))
+    try:
+        shutil.copyfileobj(request.stream, spool, 1 << 16)
+        spool.seek(0)
+        return parse(
+            spool, max_length=current_app.config.get('MAX_SEQUENCE_LENGTH'))
+    finally:
+        spool.close()
+
+
+def read_request_sequence():
+    """
+    This function spools raw request body (FASTA, optionally gzip
+    compressed) to a temporary file and parses its first sequence.
+    :return: cleaned DNA sequence (string) or None if body is empty.
+    :except SequenceTooLong: if sequence exceeds MAX_SEQUENCE_LENGTH.
+    """
+    return _read_request_body(read_first_sequence)
+
+
+def read_request_sequences():
+    """
+    This function parses all sequences of raw (multi) FASTA request body.
+    :return: list of tuples (header or None, cleaned DNA sequence)
+    :except SequenceTooLong: if a sequence exceeds MAX_SEQUENCE_LENGTH.
+    """
+    return _read_request_body(
+        lambda stream, max_length: list(read_fasta(stream, max_length)))
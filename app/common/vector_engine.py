@@ -0,0 +1,223 @@
+"""
+Vectorized (numpy) implementation of watermarking working on arrays of codon
+indexes of 2 bit packed sequences (see helpers/packed_sequence.py). Results
+match find_coding_region, embed_data and extract_data of app_helpers.
+"""
+import numpy as np
+from helpers.gc_registry import get_genetic_code
+from helpers.codon_helpers import codon_capacity, coding_region_bounds
+from helpers.packed_sequence import PackedSequence
+from .regions import CodingRegions
+
+# Number of bits used by the length header in front of watermark message.
+HEADER_BITS = 16
+
+
+def extract_bits(codons, gc=1, limit=None, capacity=None):
+    """
+    This function extracts watermark bits from codons in coding regions,
+    2 bits (LSB) from 4+ fold codons and 1 bit from 2/3 fold codons.
+    :param codons: numpy array of codon indexes.
+    :param gc: genetic code (integer or string) default=1
+    :param limit: stop after (at least) this many bits, default=None i.e.
+    extract from all codons.
+    :param capacity: capacity of the codons (see codon_capacity), needed if
+    codons are a slice of a sequence as coding regions can not be found in
+    a slice. default=None i.e. computed from codons.
+    :return: numpy array (uint8) of bits or None if genetic code is not
+    available.
+    """
+    code = get_genetic_code(gc)
+    if capacity is None:
+        capacity = codon_capacity(codons, gc)
+    if code is None or capacity is None:
+        return None
+    positions = np.flatnonzero(capacity)
+    if limit is not None:
+        # every codon carries at least one bit.
+        positions = positions[:limit]
+    used = codons[positions]
+    four_fold = capacity[positions] == 2
+    # 4+ fold codon carries 2 bits in its last base, 2/3 fold codon carries
+    # 0 if it is the first codon of its amino acid and 1 otherwise.
+    high = np.where(four_fold, (used >> 1) & 1,
+                    (used != code.preferred[used]).astype(np.uint8))
+    low = used & 1
+    bits = np.empty(len(used) * 2, dtype=np.uint8)
+    bits[0::2] = high
+    bits[1::2] = low
+    keep = np.ones(len(bits), dtype=bool)
+    keep[1::2] = four_fold
+    bits = bits[keep]
+    if limit is not None:
+        bits = bits[:limit]
+    return bits
+
+
+def bits_to_int(bits):
+    """
+    This function converts array of bits (most significant first) to integer.
+    :param bits: numpy array of bits.
+    :return: integer
+    """
+    value = 0
+    for bit in bits.tolist():
+        value = (value << 1) | bit
+    return value
+
+
+def decode_length(bits):
+    """
+    This function decodes watermark length from header bits.
+    :param bits: numpy array of extracted bits.
+    :return: length of message (characters) or None if there are no bits.
+    """
+    if len(bits) == 0:
+        return None
+    return bits_to_int(bits[:HEADER_BITS])
+
+
+def decode_message(bits):
+    """
+    This function decodes watermark message from extracted bits (length
+    header followed by 8 bits per character).
+    :param bits: numpy array of extracted bits.
+    :return: message (string) or None if there are no bits.
+    """
+    length = decode_length(bits)
+    if length is None:
+        return None
+    payload = bits[HEADER_BITS:HEADER_BITS + length * 8]
+    whole = len(payload) - len(payload) % 8
+    weights = np.array([128, 64, 32, 16, 8, 4, 2, 1], dtype=np.uint32)
+    chars = payload[:whole].reshape(-1, 8).astype(np.uint32).dot(weights)
+    message = ''.join(map(chr, chars.tolist()))
+    if whole < len(payload):
+        # incomplete last character, same as bin_to_str.
+        message += chr(bits_to_int(payload[whole:]))
+    return message
+
+
+def message_to_bits(message):
+    """
+    This function encodes watermark message as length header followed by 8
+    bits per character, same as embed_data.
+    :param message: watermark message (string)
+    :return: numpy array (uint8) of bits or None if message is empty or too
+    long for the header.
+    """
+    if not message or len(message) >= 2 ** HEADER_BITS:
+        return None
+    bits = format(len(message), '0{0}b'.format(HEADER_BITS)) + \
+        ''.join(format(ord(ch), '08b') for ch in message)
+    return np.frombuffer(bits.encode('ascii'), dtype=np.uint8) - ord('0')
+
+
+def embed_bits(codons, bits, gc=1):
+    """
+    This function embeds bits in codons of coding regions, 2 bits in last
+    base of popular codon of 4+ fold amino acids (last bit padded with 0)
+    and 1 bit as choice of first or second codon of 2/3 fold amino acids.
+    Codons left after all bits are embedded are not changed.
+    :param codons: numpy array of codon indexes.
+    :param bits: numpy array of bits.
+    :param gc: genetic code (integer or string) default=1
+    :return: numpy array (uint8) of watermarked codon indexes or None if
+    genetic code is not available.
+    """
+    code = get_genetic_code(gc)
+    capacity = codon_capacity(codons, gc)
+    if code is None or capacity is None:
+        return None
+    # every codon carries at least one bit.
+    positions = np.flatnonzero(capacity)[:len(bits)]
+    carried = capacity[positions]
+    offsets = np.cumsum(carried) - carried
+    used = offsets < len(bits)
+    positions = positions[used]
+    offsets = offsets[used]
+    four_fold = carried[used] == 2
+    padded = np.zeros(len(bits) + 1, dtype=np.uint8)
+    padded[:len(bits)] = bits
+    high = padded[offsets]
+    low = padded[offsets + 1]
+    preferred = code.preferred[codons[positions]]
+    alternate = code.alternate[codons[positions]]
+    watermarked = codons.copy()
+    watermarked[positions] = np.where(
+        four_fold, (preferred & 0xfc) | (high << 1) | low,
+        np.where(high == 0, preferred, alternate))
+    return watermarked
+
+
+def find_regions(dna_seq, frame=1, gc=1):
+    """
+    This function finds coding regions of a sequence, same as
+    find_coding_region.
+    :param dna_seq: DNA sequence (PackedSequence or string)
+    :param frame: open reading frame number i.e. 1, 2, 3 default=1
+    :param gc: genetic code (integer or string) default=1
+    :return: CodingRegions object or None if genetic code is not available.
+    """
+    code = get_genetic_code(gc)
+    if code is None:
+        return None
+    codons = PackedSequence.from_string(dna_seq).codon_indexes(frame)
+    starts, ends = coding_region_bounds(codons, code.met, code.stop)
+    stops = ends[ends < len(codons)] * 3 + 3
+    if len(stops) < len(starts):
+        # region which is not terminated, marked past the last codon.
+        stops = np.append(stops, len(codons) * 3 + 1)
+    return CodingRegions(starts * 3, stops)
+
+
+def capacity(dna_seq, frame=1, gc=1):
+    """
+    This function returns number of bits which can be embedded in a
+    sequence.
+    :param dna_seq: DNA sequence (PackedSequence or string)
+    :param frame: open reading frame number i.e. 1, 2, 3 default=1
+    :param gc: genetic code (integer or string) default=1
+    :return: capacity (bits) or None if genetic code is not available.
+    """
+    codons = PackedSequence.from_string(dna_seq).codon_indexes(frame)
+    per_codon = codon_capacity(codons, gc)
+    if per_codon is None:
+        return None
+    return int(per_codon.sum())
+
+
+def embed(dna_seq, message, frame=1, gc=1):
+    """
+    This function embeds watermark message in a sequence. Bases before and
+    after complete codons of the reading frame are kept in place.
+    :param dna_seq: DNA sequence (PackedSequence or string)
+    :param message: watermark message (string)
+    :param frame: open reading frame number i.e. 1, 2, 3 default=1
+    :param gc: genetic code (integer or string) default=1
+    :return: watermarked sequence (PackedSequence) or None if message or
+    genetic code is invalid.
+    """
+    seq = PackedSequence.from_string(dna_seq)
+    bits = message_to_bits(message)
+    if bits is None:
+        return None
+    codons = embed_bits(seq.codon_indexes(frame), bits, gc)
+    if codons is None:
+        return None
+    return seq.with_codons(codons, frame)
+
+
+def extract(wm_dna, frame=1, gc=1):
+    """
+    This function extracts watermark message from a sequence.
+    :param wm_dna: watermarked DNA sequence (PackedSequence or string)
+    :param frame: open reading frame number i.e. 1, 2, 3 default=1
+    :param gc: genetic code (integer or string) default=1
+    :return: message (string) or None if nothing can be extracted.
+    """
+    codons = PackedSequence.from_string(wm_dna).codon_indexes(frame)
+    bits = extract_bits(codons, gc)
+    if bits is None:
+        return None
+    return decode_message(bits)
@@ -0,0 +1,77 @@
+"""
+This module verifies that watermarking preserved the protein encoded by a
+sequence, by comparing amino acid ids of original and watermarked codons in
+one vectorized comparison.
+"""
+import os
+import numpy as np
+from helpers.codon_helpers import clean_bases, strand_codons, aa_ids
+from helpers.fasta_helpers import read_first_sequence
+
+
+def verify_protein(original=None, watermarked=None, frame=1, gc=1):
+    """
+    This function compares proteins of original and watermarked sequences.
+    :param original: original DNA sequence (string)
+    :param watermarked: watermarked DNA sequence (string)
+    :param frame: reading frame number 1, 2, 3 (or -1, -2, -3) default=1
+    :param gc: genetic code (integer). default=1
+    :return: dictionary object with 'preserved' (True if proteins are same),
+    'codons' (number of compared codons), 'changed_codons' (codons changed
+    by watermarking), 'mismatches' (codons coding a different amino acid)
+    and 'first_mismatch' (base position of first mismatching codon in the
+    reading frame or None), None if inputs are invalid.
+    """
+    if original is None or watermarked is None:
+        return None
+    codons = strand_codons(clean_bases(original), frame)
+    wm_codons = strand_codons(clean_bases(watermarked), frame)
+    ids = aa_ids(codons, gc)
+    wm_ids = aa_ids(wm_codons, gc)
+    if ids is None or wm_ids is None:
+        return None
+    n = min(len(ids), len(wm_ids))
+    mismatch = ids[:n] != wm_ids[:n]
+    positions = np.flatnonzero(mismatch)
+    mismatches = len(positions)
+    if len(ids) != len(wm_ids):
+        # Extra or missing codons are mismatches as well.
+        mismatches += abs(len(ids) - len(wm_ids))
+        positions = np.append(positions, n)
+    first = None
+    if len(positions):
+        first = int(positions[0]) * 3 + abs(frame) - 1
+    return dict(preserved=mismatches == 0,
+                codons=n,
+                changed_codons=int(np.count_nonzero(codons[:n] !=
+                                                    wm_codons[:n])),
+                mismatches=int(mismatches),
+                first_mismatch=first)
+
+
+def verify_directory(original_dir, watermarked_dir, frame=1, gc=1):
+    """
+    This function verifies watermarked sequences in a directory against
+    original sequences having same file names in another directory. Files
+    are read as FASTA (first record) and may be gzip compressed.
+    :param original_dir: directory containing original sequences.
+    :param watermarked_dir: directory containing watermarked sequences.
+    :param frame: reading frame number default=1
+    :param gc: genetic code (integer). default=1
+    :return: generator of tuples (file name, result of verify_protein or
+    None if original is missing or unreadable)
+    """
+    for filename in sorted(os.listdir(watermarked_dir)):
+        wm_path = os.path.join(watermarked_dir, filename)
+        path = os.path.join(original_dir, filename)
+        if not os.path.isfile(wm_path):
+            continue
+        if not os.path.isfile(path):
+            yield filename, None
+            continue
+        with open(path, 'rb') as original_file:
+            original = read_first_sequence(original_file)
+        with open(wm_path, 'rb') as wm_file:
+            watermarked = read_first_sequence(wm_file)
+        yield filename, verify_protein(original, watermarked, frame=frame,
+                                       gc=gc)
@@ -2,8 +2,9 @@
 This module provides the errors handling for web application.
 """
 
-from flask import render_template, request, jsonify
+from flask import render_template, request, jsonify, make_response
 from . import web
+from ..common.dispatcher import Overloaded
 
 
 @web.app_errorhandler(404)
@@ -37,3 +38,25 @@ def internal_server_error(e):
         return response
     return render_template('errors/500.html',
                            error_message='Internal server error'), 500
+
+
+@web.app_errorhandler(Overloaded)
+def service_unavailable(e):
+    """
+    Generate web api level error handlers for requests rejected because the
+    worker pool is busy. Checks for return type and generates response
+    according i.e. html or json response.
+    :param e: Overloaded object.
+    :return:
+    """
+    if request.accept_mimetypes.accept_json and \
+            not request.accept_mimetypes.accept_html:
+        response = jsonify({'error': 'service unavailable',
+                            'message': str(e)})
+        response.status_code = e.status_code
+    else:
+        response = make_response(render_template('errors/503.html',
+                                                 message=str(e)),
+                                 e.status_code)
+    response.headers['Retry-After'] = str(e.retry_after)
+    return response
@@ -2,10 +2,15 @@
 This module contains the declarations for the Forms used in web application.
 """
 from flask_wtf import FlaskForm
-from wtforms import SubmitField, StringField, IntegerField, SelectField
+from flask_wtf.file import FileField, FileAllowed
+from wtforms import SubmitField, StringField, IntegerField, SelectField, \
+    BooleanField
 from wtforms.validators import number_range, input_required
 from helpers.helper_functions import load_sequence_choices
 
+# Extensions accepted for uploaded sequence files.
+SEQUENCE_FILE_EXTENSIONS = ['fa', 'fasta', 'fna', 'txt', 'gz']
+
 
 class EmbedForm(FlaskForm):
     """
@@ -15,9 +20,14 @@ class EmbedForm(FlaskForm):
         'Choose a sequence',
         choices=[('#', 'Select')] + load_sequence_choices())
     dna_field = StringField('DNA string', validators=[])
+    dna_file_field = FileField(
+        'Or upload FASTA file (may be gzip compressed)',
+        validators=[FileAllowed(SEQUENCE_FILE_EXTENSIONS,
+                                'Upload a FASTA file.')])
     gc_field = IntegerField('Genetic code', validators=[input_required(),
                                                         number_range(1, 42)])
     msg_field = StringField('Enter message', validators=[input_required()])
+    verify_field = BooleanField('Verify that protein is preserved')
     submit = SubmitField('Embed')
 
 
@@ -25,9 +35,15 @@ class ExtractForm(FlaskForm):
     """
     Form for extraction of Data from DNA sequence
     """
-    dna_field = StringField('Watermarked DNA', validators=[input_required()])
+    dna_field = StringField('Watermarked DNA', validators=[])
+    dna_file_field = FileField(
+        'Or upload FASTA file (may be gzip compressed)',
+        validators=[FileAllowed(SEQUENCE_FILE_EXTENSIONS,
+                                'Upload a FASTA file.')])
     gc_field = IntegerField('Genetic code', validators=[input_required(),
                                                         number_range(1, 42)])
+    autodetect_field = BooleanField(
+        'Detect reading frame, strand and genetic code')
     submit = SubmitField('Extract')
 
 
@@ -39,6 +55,10 @@ class CapacityCalculateForm(FlaskForm):
         'Choose a sequence',
         choices=[('#', 'Select')] + load_sequence_choices())
     dna_field = StringField('DNA Sequence', validators=[])
+    dna_file_field = FileField(
+        'Or upload FASTA file (may be gzip compressed)',
+        validators=[FileAllowed(SEQUENCE_FILE_EXTENSIONS,
+                                'Upload a FASTA file.')])
     gc_field = IntegerField('Genetic code', validators=[input_required(),
                                                         number_range(1, 42)])
 
@@ -3,14 +3,24 @@ This module implements view functions for web application.
 """
 import unicodedata
 from . import web
+from .. import dispatcher, response_cache
 from .forms import EmbedForm, ExtractForm, CapacityCalculateForm
 from helpers.gc_file_helpers import gc_file_associations
 from flask import flash, redirect, render_template, url_for, abort, request, \
-    current_app
-from ..common.app_helpers import find_coding_region, find_capacity,\
-    embed_data, extract_data
-from helpers.helper_functions import dna_from_json, load_sequence_choices, \
-    get_chosen_file_path
+    current_app, Response, make_response
+from ..common.backends import app_backend
+from ..common.capacity_index import message_bits
+from ..common.result_store import store_result, result_path, stream_lines, \
+    stream_packed
+from ..common.uploads import has_uploaded_file, read_uploaded_sequence
+from ..common.verifier import verify_protein
+from ..common.autodetect import detect_and_extract
+from ..common.dispatcher import Overloaded
+from ..common.response_cache import cache_key
+from helpers.helper_functions import load_sequence_choices
+from helpers.shared_corpus import load_sample_sequence
+from helpers.packed_sequence import PackedSequence
+from helpers import twobit_format
 
 
 @web.route('/shutdown')
@@ -55,14 +65,19 @@ def embed():
             if form.dna_choice_field.data != '#':
                 # load sequence
                 gc = str(form.gc_field.data)
-                seq = dna_from_json(file_path=get_chosen_file_path(
-                    key=form.dna_choice_field.data))['dna']
+                seq = load_sample_sequence(form.dna_choice_field.data)
                 if form.msg_field.data is None or form.msg_field.data == '':
                     flash('Please add a watermark message')
                     return render_template('embed.html', form=form)
                 else:
                     msg = str(form.msg_field.data)
-                print('here0')
+            elif has_uploaded_file(form.dna_file_field.data):
+                msg = str(form.msg_field.data)
+                seq = read_uploaded_sequence(form.dna_file_field.data)
+                gc = str(form.gc_field.data)
+                if not seq:
+                    flash("Uploaded file does not contain a DNA sequence")
+                    return render_template('embed.html', form=form)
             elif form.dna_field.data != '':
                 msg = str(form.msg_field.data)
                 seq = str(form.dna_field.data)
@@ -70,22 +85,90 @@ def embed():
             else:
                 flash("Please choose or enter some DNA sequence")
                 return render_template('embed.html', form=form)
-            coding_regions = find_coding_region(dna_seq=seq, frame=1, gc=gc)
-            cap = find_capacity(dna_seq=seq, frame=1, gc=gc)
-            if (len(msg)*8)+2 > cap:
-                flash('Watermark message length exceeds storage capacity.')
-                return render_template('embed.html', form=form)
-            wm_seq = embed_data(dna_seq=seq, frame=1, message=msg,
-                                region=coding_regions, gc=gc)
-            # Present results to the user.
-            return render_template('result.html',
-                                   message='Watermarked DNA:\n'+wm_seq)
+            seq = PackedSequence.from_string(seq)
+            backend = app_backend(current_app)
+            key = cache_key('embed', seq, message=msg, frame=1, gc=gc,
+                            backend=backend.name)
+            wm_seq = response_cache.get(key)
+            cache_status = 'HIT'
+            if wm_seq is None:
+                cache_status = 'MISS'
+                cap = dispatcher.run(backend.operation('capacity'), len(seq),
+                                     backend.capacity, seq, frame=1, gc=gc)
+                if message_bits(msg) > cap:
+                    flash('Watermark message length exceeds storage '
+                          'capacity.')
+                    return render_template('embed.html', form=form)
+                wm_seq = dispatcher.run(backend.operation('embed'), len(seq),
+                                        backend.embed, seq, msg, frame=1,
+                                        gc=gc)
+                if wm_seq is not None:
+                    wm_seq = PackedSequence.from_string(wm_seq)
+                    response_cache.put(key, wm_seq)
+            # Store the result for download and present only its summary
+            # and a short preview to the user.
+            token = store_result(current_app, wm_seq)
+            preview_length = current_app.config['RESULT_PREVIEW_LENGTH']
+            preview = wm_seq.slice(0, preview_length).to_string()
+            if len(wm_seq) > preview_length:
+                preview += '...'
+            message = 'Watermarked DNA: {bases} bases, {ltr} alphabets ' \
+                      'embedded.'.format(bases=len(wm_seq), ltr=len(msg))
+            if form.verify_field.data:
+                check = verify_protein(seq, wm_seq, frame=1, gc=gc)
+                if check['preserved']:
+                    message += ' Protein preserved ({changed} codons ' \
+                               'changed).'.format(
+                                   changed=check['changed_codons'])
+                else:
+                    message += ' Protein NOT preserved: {n} codons differ, ' \
+                               'first at base {pos}.'.format(
+                                   n=check['mismatches'],
+                                   pos=check['first_mismatch'])
+            response = make_response(render_template(
+                'result.html',
+                message=message,
+                preview=preview,
+                download_url=url_for('web.download_result', token=token)))
+            response.headers['X-Cache'] = cache_status
+            return response
+        except Overloaded:
+            raise
         except Exception as e:
             return render_template('errors/400.html', message=str(e))
     # on get request, present the form
     return render_template('embed.html', form=form)
 
 
+@web.route('/results/<token>', methods=['GET'])
+def download_result(token):
+    """
+    This function streams a stored result (e.g. watermarked sequence) to the
+    user as FASTA file (default), plain text (?format=txt) or 2 bit encoded
+    sequence (?format=2bit).
+    :param token: token of the stored result.
+    :return:
+    """
+    path = result_path(current_app, token)
+    if path is None:
+        abort(404)
+    if request.args.get('format') == 'txt':
+        lines = stream_lines(path, width=0)
+        mimetype, extension = 'text/plain', 'txt'
+    elif request.args.get('format') == '2bit':
+        lines = stream_packed(path)
+        mimetype, extension = twobit_format.MIMETYPE, '2bit'
+    else:
+        lines = stream_lines(path,
+                             width=current_app.config['FASTA_LINE_WIDTH'],
+                             header='watermarked_dna ' + token)
+        mimetype, extension = 'text/x-fasta', 'fasta'
+    response = Response(lines, mimetype=mimetype)
+    response.headers['Content-Disposition'] = \
+        'attachment; filename=watermarked_dna.' + extension
+    return response
+
+
 @web.route('/extract', methods=['GET', 'POST'])
 def extract():
     """
@@ -104,15 +187,41 @@ def extract():
                                    message='Enter a valid genetic code.')
         try:
             # extract the data.
-            wm_seq = str(form.dna_field.data)
-            coding_regions = find_coding_region(dna_seq=wm_seq, frame=1,
-                                                gc=str(form.gc_field.data))
-            e_msg = extract_data(wm_dna=wm_seq, frame=1,
-                                 region=coding_regions,
-                                 gc=str(form.gc_field.data))
+            if has_uploaded_file(form.dna_file_field.data):
+                wm_seq = read_uploaded_sequence(form.dna_file_field.data)
+            else:
+                wm_seq = str(form.dna_field.data or '')
+            if not wm_seq:
+                flash("Please enter or upload watermarked DNA sequence")
+                return render_template('extract.html', form=form)
+            if form.autodetect_field.data:
+                candidates = detect_and_extract(
+                    wm_dna=wm_seq, gcs=current_app.config['AUTODETECT_GCS'],
+                    gc=form.gc_field.data or 1)
+                if not candidates:
+                    return render_template(
+                        'result.html', message='No watermark detected.')
+                return render_template(
+                    'result.html',
+                    message='Extracted message:\n' +
+                            candidates[0]['message'],
+                    candidates=candidates)
+            wm_seq = PackedSequence.from_string(wm_seq)
+            gc = str(form.gc_field.data)
+            backend = app_backend(current_app)
+            e_msg, cache_status = response_cache.get_or_compute(
+                cache_key('extract', wm_seq, frame=1, gc=gc,
+                          backend=backend.name),
+                lambda: dispatcher.run(backend.operation('extract'),
+                                       len(wm_seq), backend.extract, wm_seq,
+                                       frame=1, gc=gc))
             # Present results to the user.
-            return render_template('result.html',
-                                   message='Extracted message:\n'+e_msg)
+            response = make_response(render_template(
+                'result.html', message='Extracted message:\n'+e_msg))
+            response.headers['X-Cache'] = cache_status
+            return response
+        except Overloaded:
+            raise
         except Exception as e:
             return render_template('errors/400.html', message=str(e))
     # on GET request, present the form.
@@ -138,9 +247,14 @@ def cap_calculate():
                                    message='Enter a valid genetic code.')
         try:
             if form.dna_choice_field.data != '#':
-                seq = dna_from_json(file_path=get_chosen_file_path(
-                    key=form.dna_choice_field.data))['dna']
+                seq = load_sample_sequence(form.dna_choice_field.data)
+                gc = str(form.gc_field.data)
+            elif has_uploaded_file(form.dna_file_field.data):
+                seq = read_uploaded_sequence(form.dna_file_field.data)
                 gc = str(form.gc_field.data)
+                if not seq:
+                    flash("Uploaded file does not contain a DNA sequence")
+                    return render_template('capacitycalc.html', form=form)
             elif form.dna_field.data != '':
                 seq = str(form.dna_field.data)
                 gc = str(form.gc_field.data)
@@ -148,7 +262,10 @@ def cap_calculate():
                 flash("Please choose or enter some DNA sequence")
                 return render_template('embed.html', form=form)
             # calculate capacity for the form.
-            cap = find_capacity(dna_seq=seq, frame=1, gc=gc)
+            backend = app_backend(current_app)
+            seq = backend.clean(seq)
+            cap = dispatcher.run(backend.operation('capacity'), len(seq),
+                                 backend.capacity, seq, frame=1, gc=gc)
             # Present results to the user.
             return render_template(
                 'result.html',
@@ -157,6 +274,8 @@ def cap_calculate():
         except FileNotFoundError:
             return render_template('errors/400.html',
                                    message='Requested file not found in db.')
+        except Overloaded:
+            raise
         except Exception as e:
             return render_template('errors/400.html', message=str(e))
     # on GET request, present the form.
@@ -0,0 +1,9 @@
+"""
+Module for serving the application with an asgi server (see app/asgi.py).
+usage: uvicorn asgi:app
+"""
+import os
+from app import create_app
+from app.asgi import AsgiApp
+
+app = AsgiApp(create_app(os.getenv('FLASK_CONFIG') or 'default'))
@@ -10,6 +10,65 @@ class Config:
     SECRET_KEY = os.environ.get('SECRET_KEY') or generate_secret_key()
     SSL_DISABLE = False
     CSRF_ENABLED = False
+    # Maximum time (seconds) for application startup including warm up.
+    STARTUP_TIME_BUDGET = float(os.environ.get('STARTUP_TIME_BUDGET') or 5.0)
+    # Directory for results offered as downloads (shared by workers) and
+    # time (seconds) for which they are kept.
+    RESULT_STORE_DIR = os.environ.get('RESULT_STORE_DIR')
+    RESULT_TTL = int(os.environ.get('RESULT_TTL') or 3600)
+    # Characters per line in downloaded FASTA files.
+    FASTA_LINE_WIDTH = 70
+    # Number of bases of watermarked sequence shown on result page.
+    RESULT_PREVIEW_LENGTH = 300
+    # Limits for uploaded sequences: request size (bytes), sequence length
+    # (bases) and size (bytes) up to which raw uploads are spooled in memory
+    # before moving to a temporary file.
+    MAX_CONTENT_LENGTH = int(os.environ.get('MAX_CONTENT_LENGTH') or
+                             256 * 1024 * 1024)
+    MAX_SEQUENCE_LENGTH = int(os.environ.get('MAX_SEQUENCE_LENGTH') or
+                              100 * 1000 * 1000)
+    UPLOAD_SPOOL_SIZE = 1024 * 1024
+    # Limit for total length (bases) of the sequences of a sharded request
+    # (see app/common/sharding.py), including "samples": "all".
+    MAX_SHARDED_BASES = int(os.environ.get('MAX_SHARDED_BASES') or
+                            100 * 1000 * 1000)
+    # Genetic codes tried when extracting with automatic detection.
+    AUTODETECT_GCS = [int(gc) for gc in (os.environ.get('AUTODETECT_GCS') or
+                                         '1,2,4,6,10,11').split(',')]
+    # Engine calls costing up to DISPATCH_INLINE_THRESHOLD (roughly bases
+    # processed by vectorized engine) run in the request thread, larger ones
+    # in a pool of DISPATCH_POOL_SIZE processes (default: number of cpus).
+    # Calls are rejected once DISPATCH_MAX_PENDING are waiting for the pool.
+    DISPATCH_POOL_SIZE = int(os.environ.get('DISPATCH_POOL_SIZE') or 0)
+    DISPATCH_INLINE_THRESHOLD = int(
+        os.environ.get('DISPATCH_INLINE_THRESHOLD') or 1000 * 1000)
+    DISPATCH_MAX_PENDING = int(os.environ.get('DISPATCH_MAX_PENDING') or 16)
+    # Cache of embed/extract results: memory limit (bytes), time (seconds)
+    # for which results are kept and directory shared by workers (disk tier
+    # is disabled if it is not set).
+    RESPONSE_CACHE_SIZE = int(os.environ.get('RESPONSE_CACHE_SIZE') or
+                              64 * 1024 * 1024)
+    RESPONSE_CACHE_TTL = int(os.environ.get('RESPONSE_CACHE_TTL') or 600)
+    RESPONSE_CACHE_DIR = os.environ.get('RESPONSE_CACHE_DIR')
+    # Gzip compression of responses: smallest body (bytes) compressed and
+    # compression level.
+    COMPRESS_MIN_SIZE = 500
+    COMPRESS_LEVEL = int(os.environ.get('COMPRESS_LEVEL') or 6)
+    # Logging: level, file (rotated, stderr if not set) and fraction of
+    # debug records which are written.
+    LOG_LEVEL = os.environ.get('LOG_LEVEL') or 'INFO'
+    LOG_FILE = os.environ.get('LOG_FILE')
+    LOG_MAX_BYTES = 10 * 1024 * 1024
+    LOG_BACKUP_COUNT = 5
+    LOG_SAMPLE_RATE = float(os.environ.get('LOG_SAMPLE_RATE') or 0.01)
+    # Threads running Flask views and blocking steps of requests when served
+    # by an asgi server (see app/asgi.py).
+    ASGI_THREADS = int(os.environ.get('ASGI_THREADS') or 16)
+    # Compute backend: 'numpy', 'reference' or 'auto' (numpy, see
+    # app/common/backends). If ENGINE_BACKEND_OVERRIDE is set, requests
+    # may choose a backend with 'backend' parameter, for debugging.
+    ENGINE_BACKEND = os.environ.get('ENGINE_BACKEND') or 'auto'
+    ENGINE_BACKEND_OVERRIDE = bool(os.environ.get('ENGINE_BACKEND_OVERRIDE'))
 
     @staticmethod
     def init_app(app):
@@ -19,10 +78,12 @@ class Config:
 class TestingConfig(Config):
     TESTING = True
     WTF_CSRF_ENABLED = False
+    ENGINE_BACKEND_OVERRIDE = True
 
 
 class DevelopmentConfig(Config):
     DEBUG = True
+    ENGINE_BACKEND_OVERRIDE = True
 
 
 class ProductionConfig(Config):
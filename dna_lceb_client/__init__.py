@@ -0,0 +1,11 @@
+"""
+Python client for the dna-lceb json api (/api/v1.0).
+
+    from dna_lceb_client import Client
+    with Client('http://localhost:5000/api/v1.0') as client:
+        wm = client.embed(sequence, 'message')['sequence']
+        results = client.map('extract', [dict(sequence=s) for s in seqs])
+"""
+from .client import Client, ClientError, JobFailed
+
+__all__ = ['Client', 'ClientError', 'JobFailed']
@@ -0,0 +1,289 @@
+"""
+This module implements the client for dna-lceb json api.
+
+All requests share one keep-alive session with a connection pool as large as
+the number of concurrent requests. Large request bodies are gzip compressed
+and sequences longer than job_threshold are processed as jobs (see
+/api/v1.0/jobs) which are polled until they finish, so long running calls do
+not hold a connection open.
+"""
+import gzip
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from requests_futures.sessions import FuturesSession
+
+_OPERATIONS = ('capacity', 'embed', 'extract', 'translate')
+
+# Errors of direct calls whose engine call returns no result, raised for
+# jobs without result as well.
+_NO_RESULT_ERRORS = {
+    'capacity': 'Could not analyze given sequence.',
+    'embed': 'Could not watermark given sequence.',
+    'extract': 'Could not extract watermark from given sequence.',
+}
+
+
+class ClientError(Exception):
+    """
+    Raised when the api rejects a request.
+    """
+    def __init__(self, message, status_code=None):
+        """
+        :param message: error message returned by the api.
+        :param status_code: http status code of the response.
+        """
+        super(ClientError, self).__init__(message)
+        self.status_code = status_code
+
+
+class JobFailed(ClientError):
+    """
+    Raised when a job finishes with an error.
+    """
+    pass
+
+
+class Client(object):
+    """
+    Client for dna-lceb json api.
+    """
+
+    def __init__(self, base_url='http://localhost:5000/api/v1.0',
+                 max_workers=8, job_threshold=1000 * 1000,
+                 compress_threshold=64 * 1024, poll_interval=0.5,
+                 timeout=300, retries=3):
+        """
+        :param base_url: url of the api.
+        :param max_workers: number of concurrent requests (and size of
+        connection pool)
+        :param job_threshold: sequences longer than this (bases) are
+        submitted as jobs.
+        :param compress_threshold: request bodies larger than this (bytes)
+        are gzip compressed, None disables compression.
+        :param poll_interval: seconds between polls of a job.
+        :param timeout: seconds to wait for a response or a job.
+        :param retries: number of retries of requests rejected because the
+        server is busy (429, 503).
+        """
+        self.base_url = base_url.rstrip('/')
+        self.job_threshold = job_threshold
+        self.compress_threshold = compress_threshold
+        self.poll_interval = poll_interval
+        self.timeout = timeout
+        self.retries = retries
+        self.session = FuturesSession(max_workers=max_workers)
+        self.session.headers['Accept'] = 'application/json'
+        # runs calls submitted with submit/map, which wait on the session.
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """
+        This function stops worker threads and closes pooled connections.
+        :return:
+        """
+        self._executor.shutdown(wait=True)
+        self.session.executor.shutdown(wait=True)
+        self.session.close()
+
+    def _url(self, path):
+        if path.startswith('http://') or path.startswith('https://'):
+            return path
+        return self.base_url + '/' + path.lstrip('/')
+
+    def _request(self, method, path, payload=None, **kwargs):
+        """
+        This function sends a request, retrying while the server is busy.
+        :param method: http method.
+        :param path: path relative to base_url or absolute url.
+        :param payload: json body.
+        :param kwargs: other arguments of requests.
+        :return: response object.
+        :except ClientError: if api returns an error.
+        """
+        headers = kwargs.pop('headers', {})
+        if payload is not None:
+            body = json.dumps(payload).encode('utf-8')
+            headers['Content-Type'] = 'application/json'
+            if self.compress_threshold is not None and \
+                    len(body) > self.compress_threshold:
+                body = gzip.compress(body)
+                headers['Content-Encoding'] = 'gzip'
+            kwargs['data'] = body
+        for attempt in range(self.retries + 1):
+            response = self.session.request(
+                method, self._url(path), headers=headers,
+                timeout=self.timeout, **kwargs).result()
+            if response.status_code not in (429, 503) or \
+                    attempt == self.retries:
+                break
+            time.sleep(float(response.headers.get('Retry-After') or 1))
+        if response.status_code >= 400:
+            try:
+                message = response.json().get('message') or \
+                    response.json().get('error')
+            except ValueError:
+                message = response.text
+            raise ClientError(message, status_code=response.status_code)
+        return response
+
+    def _call(self, operation, payload):
+        """
+        This function calls an api operation, as a job if sequence is longer
+        than job_threshold.
+        :param operation: name of operation (endpoint)
+        :param payload: json body.
+        :return: json result of the operation.
+        """
+        sequence = payload.get('sequence')
+        if operation != 'translate' and sequence is not None and \
+                len(sequence) > self.job_threshold:
+            if payload.get('verify'):
+                raise ValueError('Verification is not available for '
+                                 'sequences longer than job_threshold, '
+                                 'which are processed as jobs.')
+            payload['async'] = True
+        response = self._request('POST', operation, payload)
+        if response.status_code != 202:
+            return response.json()
+        job = self.wait_job(response.json()['url'])
+        return self._job_result(operation, job, payload)
+
+    def wait_job(self, url):
+        """
+        This function polls a job until it finishes.
+        :param url: url of the job.
+        :return: json state of the finished job.
+        :except JobFailed: if job fails or does not finish within timeout.
+        """
+        deadline = time.time() + self.timeout
+        while True:
+            job = self._request('GET', url).json()
+            if job['status'] == 'done':
+                return job
+            if job['status'] == 'failed':
+                raise JobFailed(job.get('error', 'Job failed.'))
+            if time.time() > deadline:
+                raise JobFailed('Job did not finish in {0} seconds.'.format(
+                    self.timeout))
+            time.sleep(self.poll_interval)
+
+    def _job_result(self, operation, job, payload):
+        """
+        This function converts result of a job to result of the operation,
+        same as returned by a direct call.
+        :param operation: name of operation.
+        :param job: json state of the finished job.
+        :param payload: json body of the request.
+        :return: json result of the operation.
+        :except ClientError: if job has no result, same as a direct call.
+        """
+        if job.get('result') is None:
+            raise ClientError(_NO_RESULT_ERRORS[operation], status_code=400)
+        result = dict(frame=int(payload.get('frame', 1)),
+                      gc=int(payload.get('gc', 1)))
+        if operation == 'embed':
+            response = self._request('GET', job['result']['download_url'],
+                                     params={'format': 'txt'})
+            result['sequence'] = response.text.strip()
+            result['length'] = job['result']['length']
+        elif operation == 'extract':
+            result['message'] = job['result']
+        else:
+            result[operation] = job['result']
+        return result
+
+    @staticmethod
+    def _payload(sequence=None, sample=None, **params):
+        payload = dict((name, value) for name, value in params.items()
+                       if value is not None)
+        if sample is not None:
+            payload['sample'] = sample
+        else:
+            payload['sequence'] = sequence
+        return payload
+
+    def capacity(self, sequence=None, sample=None, frame=1, gc=1):
+        """
+        This function returns storage capacity of a sequence.
+        :param sequence: DNA sequence (string)
+        :param sample: key of sample sequence (instead of sequence)
+        :param frame: open reading frame number.
+        :param gc: genetic code.
+        :return: dictionary object with 'capacity' (bits), 'frame', 'gc'
+        """
+        return self._call('capacity', self._payload(
+            sequence, sample, frame=frame, gc=gc))
+
+    def embed(self, sequence=None, message=None, sample=None, frame=1, gc=1,
+              verify=None):
+        """
+        This function watermarks a sequence.
+        :param sequence: DNA sequence (string)
+        :param message: watermark message.
+        :param sample: key of sample sequence (instead of sequence)
+        :param frame: open reading frame number.
+        :param gc: genetic code.
+        :param verify: check that protein is preserved, not available for
+        sequences processed as jobs (see job_threshold)
+        :return: dictionary object with 'sequence' (watermarked), 'length',
+        'frame', 'gc' and 'verification' if requested.
+        :except ValueError: if verify is set for a sequence processed as a
+        job.
+        """
+        return self._call('embed', self._payload(
+            sequence, sample, message=message, frame=frame, gc=gc,
+            verify=verify))
+
+    def extract(self, sequence=None, sample=None, frame=1, gc=1):
+        """
+        This function extracts watermark message from a sequence.
+        :param sequence: watermarked DNA sequence (string)
+        :param sample: key of sample sequence (instead of sequence)
+        :param frame: open reading frame number.
+        :param gc: genetic code.
+        :return: dictionary object with 'message', 'frame', 'gc'
+        """
+        return self._call('extract', self._payload(
+            sequence, sample, frame=frame, gc=gc))
+
+    def translate(self, sequences, frame=1, gc=1, letters=1):
+        """
+        This function translates a batch of sequences to proteins.
+        :param sequences: list of DNA sequences.
+        :param frame: reading frame number (1, 2, 3, -1, -2, -3)
+        :param gc: genetic code.
+        :param letters: 1 or 3 letter amino acid notation.
+        :return: list of proteins.
+        """
+        return self._call('translate', dict(sequences=list(sequences),
+                                            frame=frame, gc=gc,
+                                            letters=letters))['proteins']
+
+    def submit(self, operation, **kwargs):
+        """
+        This function starts an operation without waiting for its result.
+        :param operation: 'capacity', 'embed', 'extract' or 'translate'
+        :param kwargs: arguments of the operation method.
+        :return: Future object of the result.
+        """
+        if operation not in _OPERATIONS:
+            raise ValueError('Unknown operation: ' + str(operation))
+        return self._executor.submit(getattr(self, operation), **kwargs)
+
+    def map(self, operation, items):
+        """
+        This function runs an operation for many items concurrently.
+        :param operation: 'capacity', 'embed', 'extract' or 'translate'
+        :param items: iterable of dictionaries of arguments of the operation.
+        :return: list of results in order of items.
+        :except ClientError: first error of the operations.
+        """
+        futures = [self.submit(operation, **item) for item in items]
+        return [future.result() for future in futures]
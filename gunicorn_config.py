@@ -0,0 +1,53 @@
+"""
+Configuration file for serving the application with gunicorn.
+usage: gunicorn -c gunicorn_config.py manage:app
+"""
+import time
+
+# Time at which gunicorn read this file, used for measuring startup time.
+_started = time.time()
+
+# Load the application in master process, so that warmed up state is shared
+# copy-on-write with forked workers.
+preload_app = True
+
+
+def on_starting(server):
+    """
+    Warm up genetic code tables, dataset catalog and shared sample corpus in
+    master process before workers are forked.
+    :param server: gunicorn arbiter instance.
+    :return:
+    """
+    from helpers.preload import warm_up
+    timings = warm_up()
+    server.log.info('Warm up finished in %.3fs (gc tables: %.3fs, '
+                    'catalog: %.3fs, corpus: %.3fs)', timings['total'],
+                    timings['gc_tables'], timings['catalog'],
+                    timings['corpus'])
+
+
+def when_ready(server):
+    """
+    Report startup time and check it against the configured budget.
+    :param server: gunicorn arbiter instance.
+    :return:
+    """
+    from config import Config
+    elapsed = time.time() - _started
+    budget = Config.STARTUP_TIME_BUDGET
+    if budget and elapsed > budget:
+        server.log.warning('Startup took %.3fs, exceeds budget of %.3fs',
+                           elapsed, budget)
+    else:
+        server.log.info('Startup took %.3fs (budget %.3fs)', elapsed, budget)
+
+
+def on_exit(server):
+    """
+    Remove shared corpus file created by master process.
+    :param server: gunicorn arbiter instance.
+    :return:
+    """
+    from helpers.shared_corpus import release
+    release(unlink=True)
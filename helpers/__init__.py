@@ -1,5 +1,25 @@
 """
 Initialization file for Helper module in the application.
 """
+import os
 
-# TODO: setup logging here
\ No newline at end of file
+# TODO: setup logging here
+
+# Root directory of the application, all bundled resources (gc_files/,
+# dataset/) are resolved against it so that the helpers do not depend on the
+# working directory of the process.
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+
+
+def resource_path(*parts):
+    """
+    This function returns absolute path for a resource bundled with the
+    application. Absolute paths are returned unchanged.
+    :param parts: path components relative to application directory e.g.
+    'gc_files', 'standard_gc_table.json'
+    :return: absolute path (string)
+    """
+    path = os.path.join(*parts)
+    if os.path.isabs(path):
+        return path
+    return os.path.join(BASE_DIR, path)
@@ -0,0 +1,234 @@
+"""
+This module is the build step for genetic code tables.
+
+It reads NCBI translation tables from gc_files/ncbi_translation_tables.json
+(amino acid and start codon strings in NCBI order i.e. TCAG) and writes:
+    - gc_files/gc_table_<id>.json, one table per genetic code in the same
+      format as standard_gc_table.json (which is kept as it is),
+    - gc_files/gc_file_associations.json,
+    - helpers/gc_tables_compiled.py, all the tables compiled to 64-entry
+      arrays (see helpers/gc_registry.py).
+usage: python -m helpers.build_gc_tables (or python manage.py compile_gc)
+"""
+import json
+from collections import OrderedDict
+from helpers import resource_path
+from helpers.codon_helpers import codon_to_index
+
+NCBI_BASES = 'TCAG'
+
+# One letter amino acid notation used by NCBI and the keys of amino acids
+# in gc table files.
+SYMBOL_KEYS = OrderedDict([
+    ('F', 'phe'), ('L', 'leu'), ('I', 'ile'), ('M', 'met'), ('V', 'val'),
+    ('S', 'ser'), ('P', 'pro'), ('T', 'thr'), ('A', 'ala'), ('D', 'asp'),
+    ('E', 'glu'), ('K', 'lys'), ('N', 'asn'), ('Q', 'gln'), ('H', 'his'),
+    ('*', 'stop'), ('Y', 'tyr'), ('C', 'cys'), ('W', 'trp'), ('R', 'arg'),
+    ('G', 'gly')])
+
+# Flags of codons in compiled tables.
+FLAG_START = 1
+FLAG_STOP = 2
+FLAG_MET = 4
+
+# Order of 64-entry arrays of a compiled table.
+FIELDS = ('aa', 'degeneracy', 'flags', 'preferred', 'alternate')
+
+
+def ncbi_codons():
+    """
+    This function returns codons in NCBI order (TTT, TTC, TTA, TTG, ...).
+    :return: list of codons (upper case strings)
+    """
+    return [a + b + c for a in NCBI_BASES for b in NCBI_BASES
+            for c in NCBI_BASES]
+
+
+def embedding_fold(codons):
+    """
+    This function returns degeneracy of an amino acid as used for
+    embedding. Amino acids with more than 3 codons carry 2 bits in the
+    third base of their popular codon, which is only possible if codons
+    with that prefix end in all four bases. Other amino acids with more
+    than 3 codons (e.g. gln CAA, CAG, TAA, TAG in table 6) are used as 2
+    fold amino acids, choosing between their first two codons.
+    :param codons: list of codons of the amino acid.
+    :return: number of codons or 2.
+    """
+    if len(codons) <= 3:
+        return len(codons)
+    prefix = _popular_codon(codons)[:2].upper()
+    if set(c[2].upper() for c in codons if c[:2].upper() == prefix) == \
+            set(NCBI_BASES):
+        return len(codons)
+    return 2
+
+
+def build_gc_table(ncbi_table, standard):
+    """
+    This function builds gc table (same format as standard_gc_table.json)
+    from NCBI translation table. Codons of an amino acid keep their order in
+    standard table, codons reassigned to it are appended in NCBI order.
+    'fold' is degeneracy used for embedding (see embedding_fold), standard
+    table does not need it as its 4+ fold amino acids are complete.
+    :param ncbi_table: dictionary object with 'aas' string.
+    :param standard: standard gc table (dictionary object)
+    :return: ordered dictionary object containing gc table data.
+    """
+    assigned = dict(zip(ncbi_codons(), ncbi_table['aas']))
+    table = OrderedDict()
+    for symbol, key in SYMBOL_KEYS.items():
+        codons = [c for c in standard[key]['codons'] if assigned[c] == symbol]
+        codons += [c for c in ncbi_codons()
+                   if assigned[c] == symbol and c not in codons]
+        if not codons:
+            continue
+        table[key] = OrderedDict([('name', standard[key]['name']),
+                                  ('codons', codons),
+                                  ('count', len(codons)),
+                                  ('fold', embedding_fold(codons)),
+                                  ('key', key),
+                                  ('symbol', symbol)])
+    return table
+
+
+def _popular_codon(codons):
+    """
+    This function returns popular codon of an amino acid, same as
+    _find_popular_codon in app helpers.
+    :param codons: list of codons.
+    :return: codon (string)
+    """
+    prefixes = [c[:2] for c in codons]
+    counts = [prefixes.count(p) for p in prefixes]
+    return codons[counts.index(max(counts))]
+
+
+def compile_gc_table(gc_table, ncbi_table):
+    """
+    This function compiles gc table to 64-entry arrays indexed by codon
+    index (see codon_helpers).
+    :param gc_table: dictionary object containing gc table data.
+    :param ncbi_table: dictionary object with 'starts' string.
+    :return: bytes, arrays of FIELDS concatenated.
+    """
+    keys = list(SYMBOL_KEYS.values())
+    starts = dict(zip(ncbi_codons(), ncbi_table['starts']))
+    arrays = dict((field, bytearray(64)) for field in FIELDS)
+    for key, aa_data in gc_table.items():
+        codons = aa_data['codons']
+        fold = embedding_fold(codons)
+        if fold > 3:
+            preferred = _popular_codon(codons)
+            alternate = preferred
+        else:
+            preferred = codons[0]
+            alternate = codons[1] if len(codons) > 1 else codons[0]
+        for codon in codons:
+            index = codon_to_index(codon)
+            arrays['aa'][index] = keys.index(key)
+            arrays['degeneracy'][index] = fold
+            arrays['flags'][index] = \
+                (FLAG_START if starts[codon] == 'M' else 0) | \
+                (FLAG_STOP if key == 'stop' else 0) | \
+                (FLAG_MET if key == 'met' else 0)
+            arrays['preferred'][index] = codon_to_index(preferred)
+            arrays['alternate'][index] = codon_to_index(alternate)
+    return b''.join(bytes(arrays[field]) for field in FIELDS)
+
+
+def _bytes_literal(data, indent):
+    """
+    This function formats bytes as python literal split in lines.
+    :param data: bytes
+    :param indent: indentation (string) of lines.
+    :return: string
+    """
+    lines = []
+    for i in range(0, len(data), 16):
+        lines.append(indent + "b'" + ''.join(
+            '\\x{0:02x}'.format(b) for b in data[i:i + 16]) + "'")
+    return '\n'.join(lines)
+
+
+def write_compiled_module(path, names, compiled):
+    """
+    This function writes python module containing compiled tables.
+    :param path: path of module.
+    :param names: dictionary object mapping genetic code to table name.
+    :param compiled: dictionary object mapping genetic code to compiled
+    table (bytes)
+    :return:
+    """
+    codes = sorted(compiled)
+    table_size = len(FIELDS) * 64
+    out = ['"""',
+           'Genetic code tables compiled by helpers/build_gc_tables.py, do '
+           'not edit.',
+           '"""',
+           '',
+           'FIELDS = ' + repr(FIELDS),
+           'TABLE_SIZE = {0}'.format(table_size),
+           'AA_KEYS = ' + repr(tuple(SYMBOL_KEYS.values())),
+           "AA_SYMBOLS = '" + ''.join(SYMBOL_KEYS.keys()) + "'",
+           '',
+           'NAMES = {']
+    for code in codes:
+        out.append('    {0}: {1},'.format(code, repr(names[code])))
+    out += ['}', '', 'OFFSETS = {']
+    for i, code in enumerate(codes):
+        out.append('    {0}: {1},'.format(code, i * table_size))
+    out += ['}', '', 'BLOB = (']
+    for code in codes:
+        out.append('    # {0}: {1}'.format(code, names[code]))
+        out.append(_bytes_literal(compiled[code], '    '))
+    out += [')', '']
+    with open(path, 'w') as module_file:
+        module_file.write('\n'.join(out))
+
+
+def build(source='gc_files/ncbi_translation_tables.json'):
+    """
+    This function runs the build step.
+    :param source: path of NCBI translation tables file.
+    :return: list of genetic codes which have been built.
+    """
+    with open(resource_path(source)) as source_file:
+        ncbi_tables = json.load(source_file)
+    with open(resource_path('gc_files', 'standard_gc_table.json')) as \
+            standard_file:
+        standard = json.load(standard_file)
+
+    associations = OrderedDict()
+    names = {}
+    compiled = {}
+    for code in sorted(ncbi_tables, key=int):
+        ncbi_table = ncbi_tables[code]
+        gc_table = build_gc_table(ncbi_table, standard)
+        if code == '1':
+            # Standard table file is the reference, it must agree with NCBI.
+            for key, aa_data in gc_table.items():
+                if aa_data['codons'] != standard[key]['codons']:
+                    raise ValueError('Standard table does not match NCBI '
+                                     'table 1 for ' + key)
+            gc_table = standard
+            filename = 'standard_gc_table.json'
+        else:
+            filename = 'gc_table_{0}.json'.format(code)
+            with open(resource_path('gc_files', filename), 'w') as gc_file:
+                json.dump(gc_table, gc_file, indent=4)
+                gc_file.write('\n')
+        associations[code] = filename
+        names[int(code)] = ncbi_table['name']
+        compiled[int(code)] = compile_gc_table(gc_table, ncbi_table)
+
+    with open(resource_path('gc_files', 'gc_file_associations.json'), 'w') \
+            as associations_file:
+        json.dump(associations, associations_file, indent=2)
+    write_compiled_module(resource_path('helpers', 'gc_tables_compiled.py'),
+                          names, compiled)
+    return list(associations.keys())
+
+
+if __name__ == '__main__':
+    print('Built genetic codes: ' + ', '.join(build()))
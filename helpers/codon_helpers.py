@@ -0,0 +1,323 @@
+"""
+This module contains the helper functions for converting DNA sequences to
+numpy arrays of base and codon indexes.
+
+Bases are numbered A=0, C=1, G=2, T=3 (same as bin_to_nucleotide) and codon
+index is 16 * first + 4 * second + third base i.e. 0 (AAA) to 63 (TTT).
+"""
+import numpy as np
+
+BASES = 'acgt'
+
+# Stop codons of the standard genetic code.
+STOP_CODONS = ('taa', 'tag', 'tga')
+
+# Lookup table for converting ascii characters to base indexes, characters
+# which are not A, C, G, T (either case) are marked with 255.
+_BASE_LOOKUP = np.full(256, 255, dtype=np.uint8)
+for _i, _base in enumerate(BASES):
+    _BASE_LOOKUP[ord(_base)] = _i
+    _BASE_LOOKUP[ord(_base.upper())] = _i
+
+_BASE_CHARS = np.frombuffer(BASES.encode('ascii'), dtype=np.uint8)
+
+
+def clean_bases(dna_seq):
+    """
+    This function converts DNA sequence to an array of base indexes. Any
+    character other than A, G, C, T is removed (same as _clean_dna).
+    :param dna_seq: DNA sequence (string, bytes or PackedSequence)
+    :return: numpy array (uint8) of base indexes.
+    """
+    from helpers.packed_sequence import PackedSequence
+    if isinstance(dna_seq, PackedSequence):
+        return dna_seq.bases()
+    if isinstance(dna_seq, str):
+        dna_seq = dna_seq.encode('ascii', 'ignore')
+    bases = _BASE_LOOKUP[np.frombuffer(dna_seq, dtype=np.uint8)]
+    return bases[bases != 255]
+
+
+def bases_to_str(bases):
+    """
+    This function converts array of base indexes to (lower case) DNA string.
+    :param bases: numpy array of base indexes.
+    :return: DNA sequence (string)
+    """
+    return _BASE_CHARS[bases].tobytes().decode('ascii')
+
+
+def frame_length(length, frame=1):
+    """
+    This function returns number of complete codons in given open reading
+    frame of a sequence.
+    :param length: length of (cleaned) DNA sequence.
+    :param frame: open reading frame number e.g. 1, 2, 3
+    :return: number of codons (integer)
+    """
+    return max(length - (frame - 1), 0) // 3
+
+
+def codon_indexes(bases, frame=1):
+    """
+    This function returns codon indexes for all complete codons in given
+    open reading frame.
+    :param bases: numpy array of base indexes (see clean_bases).
+    :param frame: open reading frame number e.g. 1, 2, 3 default=1
+    :return: numpy array (uint8) of codon indexes.
+    """
+    n = frame_length(len(bases), frame)
+    codons = bases[(frame - 1):(frame - 1) + 3 * n].reshape(n, 3)
+    return (codons[:, 0] << 4) | (codons[:, 1] << 2) | codons[:, 2]
+
+
+def index_to_codon(index):
+    """
+    This function returns codon string for given codon index.
+    :param index: integer between 0 and 63
+    :return: Codon (lower case string) e.g. aaa
+    """
+    return BASES[index >> 4] + BASES[(index >> 2) & 3] + BASES[index & 3]
+
+
+def codon_to_index(codon):
+    """
+    This function returns codon index for given codon string.
+    :param codon: Codon (string) e.g. AAA
+    :return: integer between 0 and 63
+    """
+    index = 0
+    for base in codon.lower():
+        index = (index << 2) | BASES.index(base)
+    return index
+
+
+def coding_region_bounds(codons, met, stop):
+    """
+    This function finds coding regions in array of codon indexes. A region
+    starts at first MET codon after a stop codon (or at the first MET codon)
+    and ends at next stop codon, same as find_coding_region.
+    :param codons: numpy array of codon indexes.
+    :param met: boolean lookup array of MET codons.
+    :param stop: boolean lookup array of stop codons.
+    :return: tuple of numpy arrays (starts, ends) containing codon positions,
+    end is position of the stop codon (excluded from watermarking) or
+    len(codons) for a region which is not terminated.
+    """
+    met_pos = np.flatnonzero(met[codons])
+    stop_pos = np.flatnonzero(stop[codons])
+    # A MET codon opens a new region only if a stop codon has been seen
+    # after the previous MET codon.
+    stops_before = np.searchsorted(stop_pos, met_pos)
+    opens = np.ones(len(met_pos), dtype=bool)
+    opens[1:] = stops_before[1:] != stops_before[:-1]
+    starts = met_pos[opens]
+    following = stops_before[opens]
+    ends = np.full(len(starts), len(codons), dtype=np.int64)
+    terminated = following < len(stop_pos)
+    ends[terminated] = stop_pos[following[terminated]]
+    return starts, ends
+
+
+def region_mask(starts, ends, length):
+    """
+    This function returns boolean mask of codons inside coding regions.
+    :param starts: numpy array of region start positions.
+    :param ends: numpy array of region end positions (exclusive)
+    :param length: number of codons.
+    :return: numpy array (bool) of given length.
+    """
+    delta = np.zeros(length + 1, dtype=np.int64)
+    np.add.at(delta, starts, 1)
+    np.add.at(delta, ends, -1)
+    return np.cumsum(delta[:-1]) > 0
+
+
+def codon_capacity(codons, gc=1):
+    """
+    This function returns number of bits which can be watermarked in each
+    codon, codons outside coding regions have no capacity.
+    :param codons: numpy array of codon indexes.
+    :param gc: genetic code (integer or string) default=1
+    :return: numpy array (uint8) of capacity per codon or None if gc table
+    is not found.
+    """
+    from helpers.gc_registry import get_genetic_code
+    code = get_genetic_code(gc)
+    if code is None:
+        return None
+    starts, ends = coding_region_bounds(codons, code.met, code.stop)
+    capacity = code.capacity[codons]
+    capacity[~region_mask(starts, ends, len(codons))] = 0
+    return capacity
+
+
+def reverse_complement(bases):
+    """
+    This function returns reverse complement of array of base indexes.
+    :param bases: numpy array of base indexes.
+    :return: numpy array (uint8) of base indexes.
+    """
+    return 3 - bases[::-1]
+
+
+def strand_codons(bases, frame=1):
+    """
+    This function returns codon indexes of given reading frame, negative
+    frames (-1, -2, -3) are read on reverse complement strand.
+    :param bases: numpy array of base indexes.
+    :param frame: reading frame number 1, 2, 3, -1, -2, -3
+    :return: numpy array (uint8) of codon indexes.
+    """
+    if frame < 0:
+        return codon_indexes(reverse_complement(bases), -frame)
+    return codon_indexes(bases, frame)
+
+
+def _aa_letters():
+    """
+    This function returns lookup arrays of 1 and 3 letter amino acid
+    notations indexed by amino acid id.
+    :return: tuple of numpy arrays (uint8) of shape (n,) and (n, 3)
+    """
+    from helpers.gc_tables_compiled import AA_KEYS, AA_SYMBOLS
+    one = np.frombuffer(AA_SYMBOLS.encode('ascii'), dtype=np.uint8)
+    three = [('ter' if key == 'stop' else key).capitalize()
+             for key in AA_KEYS]
+    three = np.frombuffer(''.join(three).encode('ascii'),
+                          dtype=np.uint8).reshape(-1, 3)
+    return one, three
+
+
+_AA_ONE_LETTER, _AA_THREE_LETTER = _aa_letters()
+
+
+def aa_ids(codons, gc=1):
+    """
+    This function returns amino acid ids of codons.
+    :param codons: numpy array of codon indexes.
+    :param gc: genetic code (integer or string) default=1
+    :return: numpy array (uint8) of amino acid ids (see gc_registry) or None
+    if genetic code is not available.
+    """
+    from helpers.gc_registry import get_genetic_code
+    code = get_genetic_code(gc)
+    if code is None:
+        return None
+    return code.aa[codons]
+
+
+def _aa_string(ids, letters=1):
+    """
+    This function converts amino acid ids to protein string.
+    :param ids: numpy array of amino acid ids.
+    :param letters: 1 or 3 letter notation.
+    :return: string
+    """
+    if letters == 3:
+        return _AA_THREE_LETTER[ids].tobytes().decode('ascii')
+    return _AA_ONE_LETTER[ids].tobytes().decode('ascii')
+
+
+def translate(dna_seq, gc=1, frame=1, letters=1):
+    """
+    This function translates DNA sequence to protein.
+    :param dna_seq: DNA sequence (string or bytes)
+    :param gc: genetic code (integer or string) default=1
+    :param frame: reading frame number 1, 2, 3, -1, -2, -3 default=1
+    :param letters: 1 (e.g. 'MF*') or 3 (e.g. 'MetPheTer') letter notation.
+    :return: protein (string) or None if genetic code is not available.
+    """
+    proteins = translate_batch([dna_seq], gc=gc, frame=frame, letters=letters)
+    return None if proteins is None else proteins[0]
+
+
+def translate_batch(dna_seqs, gc=1, frame=1, letters=1):
+    """
+    This function translates a batch of DNA sequences to proteins with one
+    lookup over concatenated codon indexes of all sequences.
+    :param dna_seqs: list of DNA sequences (strings or bytes)
+    :param gc: genetic code (integer or string) default=1
+    :param frame: reading frame number 1, 2, 3, -1, -2, -3 default=1
+    :param letters: 1 or 3 letter notation.
+    :return: list of proteins (strings) or None if genetic code is not
+    available.
+    """
+    codons = [strand_codons(clean_bases(seq), frame) for seq in dna_seqs]
+    if not codons:
+        return []
+    ids = aa_ids(np.concatenate(codons), gc)
+    if ids is None:
+        return None
+    width = 3 if letters == 3 else 1
+    protein = _aa_string(ids, letters)
+    proteins = []
+    offset = 0
+    for seq_codons in codons:
+        end = offset + len(seq_codons)
+        proteins.append(protein[offset * width:end * width])
+        offset = end
+    return proteins
+
+
+def codon_usage(codons):
+    """
+    This function returns codon usage histogram.
+    :param codons: numpy array of codon indexes.
+    :return: numpy array of 64 counts indexed by codon index.
+    """
+    return np.bincount(codons, minlength=64)
+
+
+def capacity_windows(capacity, window=100, step=None):
+    """
+    This function returns capacity of sliding windows over codons i.e.
+    convolution of per codon capacity with a box of given width, computed as
+    difference of prefix sums so its cost does not depend on window width.
+    :param capacity: numpy array of capacity (bits) per codon, see
+    codon_capacity.
+    :param window: width of window in codons.
+    :param step: distance between starts of consecutive windows in codons,
+    default=window i.e. non overlapping windows.
+    :return: numpy array (uint32) of capacity (bits) of each window, windows
+    start at codon 0, step, 2 * step, ...
+    """
+    if step is None:
+        step = window
+    if window < 1 or step < 1:
+        raise ValueError('Window and step must be positive.')
+    prefix = np.zeros(len(capacity) + 1, dtype=np.int64)
+    np.cumsum(capacity, out=prefix[1:])
+    starts = np.arange(0, max(len(capacity) - window, 0) + 1, step)
+    ends = np.minimum(starts + window, len(capacity))
+    return (prefix[ends] - prefix[starts]).astype(np.uint32)
+
+
+def random_codons(rnd, count, choices=None):
+    """
+    This function generates random codons which are not stop codons (of the
+    standard genetic code), e.g. for synthetic coding regions.
+    :param rnd: random.Random object.
+    :param count: number of codons.
+    :param choices: codons to choose from, default=any codon.
+    :return: DNA sequence (lower case string)
+    """
+    codons = []
+    while len(codons) < count:
+        codon = rnd.choice(choices) if choices else \
+            ''.join(rnd.choice(BASES) for _ in range(3))
+        if codon not in STOP_CODONS:
+            codons.append(codon)
+    return ''.join(codons)
+
+
+def coding_sequence(count, rnd, stop='taa'):
+    """
+    This function generates a synthetic coding region: start codon, random
+    codons (no stop codons) and stop codon.
+    :param count: number of codons between start and stop codon.
+    :param rnd: random.Random object.
+    :param stop: stop codon, '' for a region without stop codon.
+    :return: DNA sequence (lower case string)
+    """
+    return 'atg' + random_codons(rnd, count) + stop
@@ -0,0 +1,106 @@
+"""
+This module contains the helper functions for reading DNA sequences from
+FASTA (or plain text) files, optionally gzip compressed.
+
+Files are read line by line and only the cleaned sequence (lower case A, C,
+G, T) is kept in memory, so large uploads can be parsed from a spooled
+temporary file without holding the raw text.
+"""
+import gzip
+
+_GZIP_MAGIC = b'\x1f\x8b'
+
+# Maximum number of bytes read at once.
+_BLOCK_SIZE = 1 << 16
+
+# Translation tables for cleaning a line of bytes in one pass.
+_LOWER = bytes.maketrans(b'ACGT', b'acgt')
+_NOT_DNA = bytes(c for c in range(256) if chr(c) not in 'acgtACGT')
+
+
+class SequenceTooLong(ValueError):
+    """
+    Raised when a sequence in file exceeds the allowed length.
+    """
+    pass
+
+
+def open_sequence_file(stream):
+    """
+    This function returns a binary file object for reading sequence file,
+    decompressing it if it is gzip compressed.
+    :param stream: seekable binary file object (e.g. spooled upload)
+    :return: binary file object.
+    """
+    magic = stream.read(2)
+    stream.seek(0)
+    if magic == _GZIP_MAGIC:
+        return gzip.GzipFile(fileobj=stream, mode='rb')
+    return stream
+
+
+def clean_line(line):
+    """
+    This function removes any characters from line of bytes if it is not A,
+    G, C, T and converts it to lower case (same as _clean_dna).
+    :param line: bytes
+    :return: bytes
+    """
+    return line.translate(_LOWER, _NOT_DNA)
+
+
+def read_fasta(stream, max_length=None):
+    """
+    This function reads records from FASTA file. Lines before the first
+    header (or whole file if it has no header) are read as one record without
+    header.
+    :param stream: seekable binary file object, may be gzip compressed.
+    :param max_length: maximum length of a sequence (bases), default=None
+    i.e. unlimited.
+    :return: generator of tuples (header, sequence) where header is a string
+    (without '>') or None and sequence is a cleaned DNA string.
+    :except SequenceTooLong: if a sequence exceeds max_length.
+    """
+    stream = open_sequence_file(stream)
+    header = None
+    chunks = []
+    length = 0
+    at_line_start = True
+    while True:
+        # Long lines (e.g. unwrapped sequences) are read in pieces.
+        line = stream.readline(_BLOCK_SIZE)
+        if not line:
+            break
+        if at_line_start and line.startswith(b'>'):
+            while not line.endswith(b'\n'):
+                rest = stream.readline(_BLOCK_SIZE)
+                if not rest:
+                    break
+                line += rest
+            if chunks or header is not None:
+                yield header, b''.join(chunks).decode('ascii')
+            header = line[1:].strip().decode('utf-8', 'replace')
+            chunks = []
+            length = 0
+            continue
+        at_line_start = line.endswith(b'\n')
+        chunk = clean_line(line)
+        length += len(chunk)
+        if max_length is not None and length > max_length:
+            raise SequenceTooLong('Sequence exceeds maximum length of '
+                                  '{0} bases.'.format(max_length))
+        chunks.append(chunk)
+    if chunks or header is not None:
+        yield header, b''.join(chunks).decode('ascii')
+
+
+def read_first_sequence(stream, max_length=None):
+    """
+    This function returns the first sequence of FASTA file.
+    :param stream: seekable binary file object, may be gzip compressed.
+    :param max_length: maximum length of sequence (bases), default=None
+    :return: cleaned DNA sequence (string) or None if file is empty.
+    """
+    for header, sequence in read_fasta(stream, max_length=max_length):
+        return sequence
+    return None
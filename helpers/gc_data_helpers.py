@@ -4,16 +4,27 @@ information from json/dictionary object.
 """
 
 import json
+import logging
+from helpers import resource_path
+
+logger = logging.getLogger(__name__)
 
 # Read the list of genetic codes and associated files in a dictionary.
-with open("gc_files/gc_file_associations.json") as gc_directory:
+with open(resource_path("gc_files", "gc_file_associations.json")) as \
+        gc_directory:
     gc_file_associations = json.load(gc_directory)
 
+# Parsed gc tables keyed by absolute path of their json file. Tables are
+# read-only for all helpers, so a single parsed copy is shared by every
+# request (and by every worker forked after warm up).
+_gc_table_cache = {}
+
 
 def get_gc_table(filename=None, path=None):
     """
     This function read the gc table from a json file and returns it to as a
-    dictionary.
+    dictionary. Parsed tables are cached, the returned dictionary must not be
+    modified by the caller.
     :param filename: name of the file  gc table file. default folder to look
     into = gc_files/.
     :param path: fully qualified path for gc table json file. if both name and
@@ -22,18 +33,12 @@ def get_gc_table(filename=None, path=None):
     """
     if path is not None:
         try:
-            with open(path) as gc_file:
-                gc_table_data = json.load(gc_file)
-                if gc_table_data is not None:
-                    return gc_table_data
+            return _load_gc_table(resource_path(path))
         except:
             pass
     elif filename is not None:
         try:
-            with open('gc_files/' + filename) as gc_file:
-                gc_table_data = json.load(gc_file)
-                if gc_table_data is not None:
-                    return gc_table_data
+            return _load_gc_table(resource_path('gc_files', filename))
         except:
             return None
     else:
@@ -41,6 +46,32 @@ def get_gc_table(filename=None, path=None):
         return None
 
 
+def _load_gc_table(file_path):
+    """
+    This function reads gc table from given json file, using cached copy
+    if the file has been read before.
+    :param file_path: absolute path of gc table json file.
+    :return: dictionary object containing gc table data.
+    """
+    gc_table_data = _gc_table_cache.get(file_path)
+    if gc_table_data is None:
+        with open(file_path) as gc_file:
+            gc_table_data = json.load(gc_file)
+        if gc_table_data is not None:
+            _gc_table_cache[file_path] = gc_table_data
+    return gc_table_data
+
+
+def load_all_gc_tables():
+    """
+    This function reads all the gc tables listed in gc file associations
+    into the cache.
+    :return: dictionary object mapping genetic code (string) to gc table.
+    """
+    return dict((gc, get_gc_table(filename))
+                for gc, filename in gc_file_associations.items())
+
+
 def codon_to_aa_gct(gct=None, codon=None):
     """
     This functions returns 3 letter notation e.g. 'ala' for amino acid
@@ -62,7 +93,7 @@ def codon_to_aa_gct(gct=None, codon=None):
         # Could not find this codon in any AA's data.
         return None
     except Exception as e:
-        print(e)
+        logger.warning("codon lookup failed: %s", e)
         return None
 
 
@@ -147,7 +178,7 @@ def get_aa_using_codon_gct(gct=None, codon=None):
         # Could not find this codon in any AA's data.
         return None
     except Exception as e:
-        print(e)
+        logger.warning("codon lookup failed: %s", e)
         return None
 
 
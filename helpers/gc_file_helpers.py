@@ -3,11 +3,7 @@ This module contains the helpers functions for reading genetic code table
 information from json file.
 """
 
-import json
-
-# Read the list of genetic codes and associated files in a dictionary.
-with open("gc_files/gc_file_associations.json") as gc_directory:
-    gc_file_associations = json.load(gc_directory)
+from helpers.gc_data_helpers import gc_file_associations, get_gc_table
 
 
 def codon_to_aa(codon, gc=1):
@@ -23,8 +19,7 @@ def codon_to_aa(codon, gc=1):
             # No entry for the required genetic code
             return None
         # Read the file
-        with open(gc_file_associations.get(str(gc))) as gc_file:
-            gc_data = json.load(gc_file)
+        gc_data = get_gc_table(gc_file_associations.get(str(gc)))
 
         for key in gc_data.keys():
             aa_data = gc_data.get(key)
@@ -51,8 +46,7 @@ def aa_to_codon(aa, gc=1):
             # No entry for the required genetic code
             return None
         # Read the file for genetic code table information
-        with open(gc_file_associations.get(str(gc))) as gc_file:
-            gc_data = json.load(gc_file)
+        gc_data = get_gc_table(gc_file_associations.get(str(gc)))
 
         # if notation is given
         if len(aa) == 3:
@@ -85,8 +79,7 @@ def get_aa_using_name(aa, gc=1):
             # No entry for the required genetic code
             return None
         # Read the file for genetic code table information
-        with open(gc_file_associations.get(str(gc))) as gc_file:
-            gc_data = json.load(gc_file)
+        gc_data = get_gc_table(gc_file_associations.get(str(gc)))
 
         # if notation is given
         if len(aa) == 3:
@@ -119,8 +112,7 @@ def get_aa_using_codon(codon, gc=1):
             # No entry for the required genetic code
             return None
         # Read the file
-        with open(gc_file_associations.get(str(gc))) as gc_file:
-            gc_data = json.load(gc_file)
+        gc_data = get_gc_table(gc_file_associations.get(str(gc)))
 
         for key in gc_data.keys():
             aa_data = gc_data.get(key)
@@ -146,8 +138,7 @@ def get_synonymous_codons(codon, gc=1):
             # No entry for the required genetic code
             return None
         # Read the file
-        with open(gc_file_associations.get(str(gc))) as gc_file:
-            gc_data = json.load(gc_file)
+        gc_data = get_gc_table(gc_file_associations.get(str(gc)))
 
         for key in gc_data.keys():
             aa_data = gc_data.get(key)
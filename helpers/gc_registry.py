@@ -0,0 +1,101 @@
+"""
+This module provides access to compiled genetic code tables (see
+helpers/build_gc_tables.py).
+
+Every table is a slice of one precomputed blob, made of 64-entry arrays
+indexed by codon index (see codon_helpers):
+    aa          amino acid id (index in AA_KEYS / AA_SYMBOLS)
+    degeneracy  number of codons for the amino acid, 2 for amino acids with
+                more than 3 codons which can not carry 2 bits (see
+                build_gc_tables.embedding_fold)
+    flags       FLAG_START (NCBI initiation codon), FLAG_STOP, FLAG_MET
+    preferred   codon used for embedding, popular codon for 4+ fold amino
+                acids and codon carrying bit 0 for 2/3 fold amino acids
+    alternate   codon carrying bit 1 for 2/3 fold amino acids
+Loading a table does not parse any json file.
+"""
+import numpy as np
+from helpers.gc_tables_compiled import BLOB, OFFSETS, NAMES, FIELDS, \
+    TABLE_SIZE, AA_KEYS, AA_SYMBOLS
+
+FLAG_START = 1
+FLAG_STOP = 2
+FLAG_MET = 4
+
+
+class GeneticCode(object):
+    """
+    Compiled genetic code table. Arrays are read-only views of the blob.
+    """
+    __slots__ = ('id', 'name', 'aa', 'degeneracy', 'flags', 'preferred',
+                 'alternate', 'capacity', 'start', 'stop', 'met')
+
+    def __init__(self, gc):
+        self.id = gc
+        self.name = NAMES[gc]
+        offset = OFFSETS[gc]
+        for i, field in enumerate(FIELDS):
+            setattr(self, field, np.frombuffer(
+                BLOB, dtype=np.uint8, count=64, offset=offset + i * 64))
+        # bits which can be watermarked in each codon.
+        self.capacity = np.where(self.degeneracy > 3, 2,
+                                 np.where(self.degeneracy > 1, 1, 0)
+                                 ).astype(np.uint8)
+        self.start = (self.flags & FLAG_START) != 0
+        self.stop = (self.flags & FLAG_STOP) != 0
+        self.met = (self.flags & FLAG_MET) != 0
+
+
+# Tables which have been loaded, keyed by genetic code (integer)
+_codes = {}
+
+
+def get_genetic_code(gc=1):
+    """
+    This function returns compiled table for given genetic code.
+    :param gc: genetic code (integer or string) default=1
+    :return: GeneticCode object or None if genetic code is not available.
+    """
+    try:
+        gc = int(gc)
+    except (TypeError, ValueError):
+        return None
+    code = _codes.get(gc)
+    if code is None and gc in OFFSETS:
+        code = GeneticCode(gc)
+        _codes[gc] = code
+    return code
+
+
+def available_codes():
+    """
+    This function returns list of available genetic codes.
+    :return: sorted list of integers.
+    """
+    return sorted(OFFSETS)
+
+
+def load_all_codes():
+    """
+    This function loads all the compiled tables.
+    :return: dictionary object mapping genetic code to GeneticCode object.
+    """
+    return dict((gc, get_genetic_code(gc)) for gc in available_codes())
+
+
+def aa_key(aa_id):
+    """
+    This function returns key (3 letter notation) of amino acid id.
+    :param aa_id: amino acid id.
+    :return: string e.g. 'ala'
+    """
+    return AA_KEYS[aa_id]
+
+
+def aa_symbol(aa_id):
+    """
+    This function returns 1 letter notation of amino acid id.
+    :param aa_id: amino acid id.
+    :return: string e.g. 'A'
+    """
+    return AA_SYMBOLS[aa_id]
@@ -0,0 +1,523 @@
+"""
+Genetic code tables compiled by helpers/build_gc_tables.py, do not edit.
+"""
+
+FIELDS = ('aa', 'degeneracy', 'flags', 'preferred', 'alternate')
+TABLE_SIZE = 320
+AA_KEYS = ('phe', 'leu', 'ile', 'met', 'val', 'ser', 'pro', 'thr', 'ala', 'asp', 'glu', 'lys', 'asn', 'gln', 'his', 'stop', 'tyr', 'cys', 'trp', 'arg', 'gly')
+AA_SYMBOLS = 'FLIMVSPTADEKNQH*YCWRG'
+
+NAMES = {
+    1: 'Standard',
+    2: 'Vertebrate Mitochondrial',
+    3: 'Yeast Mitochondrial',
+    4: 'Mold, Protozoan, and Coelenterate Mitochondrial and Mycoplasma/Spiroplasma',
+    5: 'Invertebrate Mitochondrial',
+    6: 'Ciliate, Dasycladacean and Hexamita Nuclear',
+    9: 'Echinoderm and Flatworm Mitochondrial',
+    10: 'Euplotid Nuclear',
+    11: 'Bacterial, Archaeal and Plant Plastid',
+    12: 'Alternative Yeast Nuclear',
+    13: 'Ascidian Mitochondrial',
+    14: 'Alternative Flatworm Mitochondrial',
+    16: 'Chlorophycean Mitochondrial',
+    21: 'Trematode Mitochondrial',
+    22: 'Scenedesmus obliquus Mitochondrial',
+    23: 'Thraustochytrium Mitochondrial',
+    24: 'Rhabdopleuridae Mitochondrial',
+    25: 'Candidate Division SR1 and Gracilibacteria',
+    26: 'Pachysolen tannophilus Nuclear',
+    29: 'Mesodinium Nuclear',
+    30: 'Peritrich Nuclear',
+    33: 'Cephalodiscidae Mitochondrial',
+}
+
+OFFSETS = {
+    1: 0,
+    2: 320,
+    3: 640,
+    4: 960,
+    5: 1280,
+    6: 1600,
+    9: 1920,
+    10: 2240,
+    11: 2560,
+    12: 2880,
+    13: 3200,
+    14: 3520,
+    16: 3840,
+    21: 4160,
+    22: 4480,
+    23: 4800,
+    24: 5120,
+    25: 5440,
+    26: 5760,
+    29: 6080,
+    30: 6400,
+    33: 6720,
+}
+
+BLOB = (
+    # 1: Standard
+    b'\x0b\x0c\x0b\x0c\x07\x07\x07\x07\x13\x05\x13\x05\x02\x02\x03\x02'
+    b'\x0d\x0e\x0d\x0e\x06\x06\x06\x06\x13\x13\x13\x13\x01\x01\x01\x01'
+    b'\x0a\x09\x0a\x09\x08\x08\x08\x08\x14\x14\x14\x14\x04\x04\x04\x04'
+    b'\x0f\x10\x0f\x10\x05\x05\x05\x05\x0f\x11\x12\x11\x01\x00\x01\x00'
+    b'\x02\x02\x02\x02\x04\x04\x04\x04\x06\x06\x06\x06\x03\x03\x01\x03'
+    b'\x02\x02\x02\x02\x04\x04\x04\x04\x06\x06\x06\x06\x06\x06\x06\x06'
+    b'\x02\x02\x02\x02\x04\x04\x04\x04\x04\x04\x04\x04\x04\x04\x04\x04'
+    b'\x03\x02\x03\x02\x06\x06\x06\x06\x03\x02\x01\x02\x06\x02\x06\x02'
+    b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x05\x00'
+    b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x01\x00'
+    b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00'
+    b'\x02\x00\x02\x00\x00\x00\x00\x00\x02\x00\x00\x00\x00\x00\x01\x00'
+    b'\x00\x03\x00\x03\x07\x07\x07\x07\x1b\x37\x1b\x37\x0f\x0f\x0e\x0f'
+    b'\x10\x13\x10\x13\x17\x17\x17\x17\x1b\x1b\x1b\x1b\x1f\x1f\x1f\x1f'
+    b'\x20\x23\x20\x23\x27\x27\x27\x27\x2b\x2b\x2b\x2b\x2f\x2f\x2f\x2f'
+    b'\x30\x33\x30\x33\x37\x37\x37\x37\x30\x3b\x3a\x3b\x1f\x3f\x1f\x3f'
+    b'\x02\x01\x02\x01\x07\x07\x07\x07\x1b\x37\x1b\x37\x0d\x0d\x0e\x0d'
+    b'\x12\x11\x12\x11\x17\x17\x17\x17\x1b\x1b\x1b\x1b\x1f\x1f\x1f\x1f'
+    b'\x22\x21\x22\x21\x27\x27\x27\x27\x2b\x2b\x2b\x2b\x2f\x2f\x2f\x2f'
+    b'\x32\x31\x32\x31\x37\x37\x37\x37\x32\x39\x3a\x39\x1f\x3d\x1f\x3d'
+    # 2: Vertebrate Mitochondrial
+    b'\x0b\x0c\x0b\x0c\x07\x07\x07\x07\x0f\x05\x0f\x05\x03\x02\x03\x02'
+    b'\x0d\x0e\x0d\x0e\x06\x06\x06\x06\x13\x13\x13\x13\x01\x01\x01\x01'
+    b'\x0a\x09\x0a\x09\x08\x08\x08\x08\x14\x14\x14\x14\x04\x04\x04\x04'
+    b'\x0f\x10\x0f\x10\x05\x05\x05\x05\x12\x11\x12\x11\x01\x00\x01\x00'
+    b'\x02\x02\x02\x02\x04\x04\x04\x04\x02\x06\x02\x06\x02\x02\x02\x02'
+    b'\x02\x02\x02\x02\x04\x04\x04\x04\x04\x04\x04\x04\x06\x06\x06\x06'
+    b'\x02\x02\x02\x02\x04\x04\x04\x04\x04\x04\x04\x04\x04\x04\x04\x04'
+    b'\x02\x02\x02\x02\x06\x06\x06\x06\x02\x02\x02\x02\x06\x02\x06\x02'
+    b'\x00\x00\x00\x00\x00\x00\x00\x00\x02\x00\x02\x00\x05\x01\x05\x01'
+    b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00'
+    b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x01\x00'
+    b'\x02\x00\x02\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00'
+    b'\x00\x03\x00\x03\x07\x07\x07\x07\x30\x37\x30\x37\x0e\x0f\x0e\x0f'
+    b'\x10\x13\x10\x13\x17\x17\x17\x17\x1b\x1b\x1b\x1b\x1f\x1f\x1f\x1f'
+    b'\x20\x23\x20\x23\x27\x27\x27\x27\x2b\x2b\x2b\x2b\x2f\x2f\x2f\x2f'
+    b'\x30\x33\x30\x33\x37\x37\x37\x37\x3a\x3b\x3a\x3b\x1f\x3f\x1f\x3f'
+    b'\x02\x01\x02\x01\x07\x07\x07\x07\x32\x37\x32\x37\x0c\x0d\x0c\x0d'
+    b'\x12\x11\x12\x11\x17\x17\x17\x17\x1b\x1b\x1b\x1b\x1f\x1f\x1f\x1f'
+    b'\x22\x21\x22\x21\x27\x27\x27\x27\x2b\x2b\x2b\x2b\x2f\x2f\x2f\x2f'
+    b'\x32\x31\x32\x31\x37\x37\x37\x37\x38\x39\x38\x39\x1f\x3d\x1f\x3d'
+    # 3: Yeast Mitochondrial
+    b'\x0b\x0c\x0b\x0c\x07\x07\x07\x07\x13\x05\x13\x05\x03\x02\x03\x02'
+    b'\x0d\x0e\x0d\x0e\x06\x06\x06\x06\x13\x13\x13\x13\x07\x07\x07\x07'
+    b'\x0a\x09\x0a\x09\x08\x08\x08\x08\x14\x14\x14\x14\x04\x04\x04\x04'
+    b'\x0f\x10\x0f\x10\x05\x05\x05\x05\x12\x11\x12\x11\x01\x00\x01\x00'
+    b'\x02\x02\x02\x02\x08\x08\x08\x08\x06\x06\x06\x06\x02\x02\x02\x02'
+    b'\x02\x02\x02\x02\x04\x04\x04\x04\x06\x06\x06\x06\x08\x08\x08\x08'
+    b'\x02\x02\x02\x02\x04\x04\x04\x04\x04\x04\x04\x04\x04\x04\x04\x04'
+    b'\x02\x02\x02\x02\x06\x06\x06\x06\x02\x02\x02\x02\x02\x02\x02\x02'
+    b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x05\x00\x05\x00'
+    b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00'
+    b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x01\x00'
+    b'\x02\x00\x02\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00'
+    b'\x00\x03\x00\x03\x07\x07\x07\x07\x1b\x37\x1b\x37\x0e\x0f\x0e\x0f'
+    b'\x10\x13\x10\x13\x17\x17\x17\x17\x1b\x1b\x1b\x1b\x07\x07\x07\x07'
+    b'\x20\x23\x20\x23\x27\x27\x27\x27\x2b\x2b\x2b\x2b\x2f\x2f\x2f\x2f'
+    b'\x30\x33\x30\x33\x37\x37\x37\x37\x3a\x3b\x3a\x3b\x3c\x3f\x3c\x3f'
+    b'\x02\x01\x02\x01\x07\x07\x07\x07\x1b\x37\x1b\x37\x0c\x0d\x0c\x0d'
+    b'\x12\x11\x12\x11\x17\x17\x17\x17\x1b\x1b\x1b\x1b\x07\x07\x07\x07'
+    b'\x22\x21\x22\x21\x27\x27\x27\x27\x2b\x2b\x2b\x2b\x2f\x2f\x2f\x2f'
+    b'\x32\x31\x32\x31\x37\x37\x37\x37\x38\x39\x38\x39\x3e\x3d\x3e\x3d'
+    # 4: Mold, Protozoan, and Coelenterate Mitochondrial and Mycoplasma/Spiroplasma
+    b'\x0b\x0c\x0b\x0c\x07\x07\x07\x07\x13\x05\x13\x05\x02\x02\x03\x02'
+    b'\x0d\x0e\x0d\x0e\x06\x06\x06\x06\x13\x13\x13\x13\x01\x01\x01\x01'
+    b'\x0a\x09\x0a\x09\x08\x08\x08\x08\x14\x14\x14\x14\x04\x04\x04\x04'
+    b'\x0f\x10\x0f\x10\x05\x05\x05\x05\x12\x11\x12\x11\x01\x00\x01\x00'
+    b'\x02\x02\x02\x02\x04\x04\x04\x04\x06\x06\x06\x06\x03\x03\x01\x03'
+    b'\x02\x02\x02\x02\x04\x04\x04\x04\x06\x06\x06\x06\x06\x06\x06\x06'
+    b'\x02\x02\x02\x02\x04\x04\x04\x04\x04\x04\x04\x04\x04\x04\x04\x04'
+    b'\x02\x02\x02\x02\x06\x06\x06\x06\x02\x02\x02\x02\x06\x02\x06\x02'
+    b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x01\x01\x05\x01'
+    b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x01\x00'
+    b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x01\x00'
+    b'\x02\x00\x02\x00\x00\x00\x00\x00\x00\x00\x00\x00\x01\x00\x01\x00'
+    b'\x00\x03\x00\x03\x07\x07\x07\x07\x1b\x37\x1b\x37\x0f\x0f\x0e\x0f'
+    b'\x10\x13\x10\x13\x17\x17\x17\x17\x1b\x1b\x1b\x1b\x1f\x1f\x1f\x1f'
+    b'\x20\x23\x20\x23\x27\x27\x27\x27\x2b\x2b\x2b\x2b\x2f\x2f\x2f\x2f'
+    b'\x30\x33\x30\x33\x37\x37\x37\x37\x3a\x3b\x3a\x3b\x1f\x3f\x1f\x3f'
+    b'\x02\x01\x02\x01\x07\x07\x07\x07\x1b\x37\x1b\x37\x0d\x0d\x0e\x0d'
+    b'\x12\x11\x12\x11\x17\x17\x17\x17\x1b\x1b\x1b\x1b\x1f\x1f\x1f\x1f'
+    b'\x22\x21\x22\x21\x27\x27\x27\x27\x2b\x2b\x2b\x2b\x2f\x2f\x2f\x2f'
+    b'\x32\x31\x32\x31\x37\x37\x37\x37\x38\x39\x38\x39\x1f\x3d\x1f\x3d'
+    # 5: Invertebrate Mitochondrial
+    b'\x0b\x0c\x0b\x0c\x07\x07\x07\x07\x05\x05\x05\x05\x03\x02\x03\x02'
+    b'\x0d\x0e\x0d\x0e\x06\x06\x06\x06\x13\x13\x13\x13\x01\x01\x01\x01'
+    b'\x0a\x09\x0a\x09\x08\x08\x08\x08\x14\x14\x14\x14\x04\x04\x04\x04'
+    b'\x0f\x10\x0f\x10\x05\x05\x05\x05\x12\x11\x12\x11\x01\x00\x01\x00'
+    b'\x02\x02\x02\x02\x04\x04\x04\x04\x08\x08\x08\x08\x02\x02\x02\x02'
+    b'\x02\x02\x02\x02\x04\x04\x04\x04\x04\x04\x04\x04\x06\x06\x06\x06'
+    b'\x02\x02\x02\x02\x04\x04\x04\x04\x04\x04\x04\x04\x04\x04\x04\x04'
+    b'\x02\x02\x02\x02\x08\x08\x08\x08\x02\x02\x02\x02\x06\x02\x06\x02'
+    b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x05\x01\x05\x01'
+    b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00'
+    b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x01\x00'
+    b'\x02\x00\x02\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x01\x00'
+    b'\x00\x03\x00\x03\x07\x07\x07\x07\x37\x37\x37\x37\x0e\x0f\x0e\x0f'
+    b'\x10\x13\x10\x13\x17\x17\x17\x17\x1b\x1b\x1b\x1b\x1f\x1f\x1f\x1f'
+    b'\x20\x23\x20\x23\x27\x27\x27\x27\x2b\x2b\x2b\x2b\x2f\x2f\x2f\x2f'
+    b'\x30\x33\x30\x33\x37\x37\x37\x37\x3a\x3b\x3a\x3b\x1f\x3f\x1f\x3f'
+    b'\x02\x01\x02\x01\x07\x07\x07\x07\x37\x37\x37\x37\x0c\x0d\x0c\x0d'
+    b'\x12\x11\x12\x11\x17\x17\x17\x17\x1b\x1b\x1b\x1b\x1f\x1f\x1f\x1f'
+    b'\x22\x21\x22\x21\x27\x27\x27\x27\x2b\x2b\x2b\x2b\x2f\x2f\x2f\x2f'
+    b'\x32\x31\x32\x31\x37\x37\x37\x37\x38\x39\x38\x39\x1f\x3d\x1f\x3d'
+    # 6: Ciliate, Dasycladacean and Hexamita Nuclear
+    b'\x0b\x0c\x0b\x0c\x07\x07\x07\x07\x13\x05\x13\x05\x02\x02\x03\x02'
+    b'\x0d\x0e\x0d\x0e\x06\x06\x06\x06\x13\x13\x13\x13\x01\x01\x01\x01'
+    b'\x0a\x09\x0a\x09\x08\x08\x08\x08\x14\x14\x14\x14\x04\x04\x04\x04'
+    b'\x0d\x10\x0d\x10\x05\x05\x05\x05\x0f\x11\x12\x11\x01\x00\x01\x00'
+    b'\x02\x02\x02\x02\x04\x04\x04\x04\x06\x06\x06\x06\x03\x03\x01\x03'
+    b'\x02\x02\x02\x02\x04\x04\x04\x04\x06\x06\x06\x06\x06\x06\x06\x06'
+    b'\x02\x02\x02\x02\x04\x04\x04\x04\x04\x04\x04\x04\x04\x04\x04\x04'
+    b'\x02\x02\x02\x02\x06\x06\x06\x06\x01\x02\x01\x02\x06\x02\x06\x02'
+    b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x05\x00'
+    b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00'
+    b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00'
+    b'\x00\x00\x00\x00\x00\x00\x00\x00\x02\x00\x00\x00\x00\x00\x00\x00'
+    b'\x00\x03\x00\x03\x07\x07\x07\x07\x1b\x37\x1b\x37\x0f\x0f\x0e\x0f'
+    b'\x10\x13\x10\x13\x17\x17\x17\x17\x1b\x1b\x1b\x1b\x1f\x1f\x1f\x1f'
+    b'\x20\x23\x20\x23\x27\x27\x27\x27\x2b\x2b\x2b\x2b\x2f\x2f\x2f\x2f'
+    b'\x10\x33\x10\x33\x37\x37\x37\x37\x38\x3b\x3a\x3b\x1f\x3f\x1f\x3f'
+    b'\x02\x01\x02\x01\x07\x07\x07\x07\x1b\x37\x1b\x37\x0d\x0d\x0e\x0d'
+    b'\x12\x11\x12\x11\x17\x17\x17\x17\x1b\x1b\x1b\x1b\x1f\x1f\x1f\x1f'
+    b'\x22\x21\x22\x21\x27\x27\x27\x27\x2b\x2b\x2b\x2b\x2f\x2f\x2f\x2f'
+    b'\x12\x31\x12\x31\x37\x37\x37\x37\x38\x39\x3a\x39\x1f\x3d\x1f\x3d'
+    # 9: Echinoderm and Flatworm Mitochondrial
+    b'\x0c\x0c\x0b\x0c\x07\x07\x07\x07\x05\x05\x05\x05\x02\x02\x03\x02'
+    b'\x0d\x0e\x0d\x0e\x06\x06\x06\x06\x13\x13\x13\x13\x01\x01\x01\x01'
+    b'\x0a\x09\x0a\x09\x08\x08\x08\x08\x14\x14\x14\x14\x04\x04\x04\x04'
+    b'\x0f\x10\x0f\x10\x05\x05\x05\x05\x12\x11\x12\x11\x01\x00\x01\x00'
+    b'\x03\x03\x01\x03\x04\x04\x04\x04\x08\x08\x08\x08\x03\x03\x01\x03'
+    b'\x02\x02\x02\x02\x04\x04\x04\x04\x04\x04\x04\x04\x06\x06\x06\x06'
+    b'\x02\x02\x02\x02\x04\x04\x04\x04\x04\x04\x04\x04\x04\x04\x04\x04'
+    b'\x02\x02\x02\x02\x08\x08\x08\x08\x02\x02\x02\x02\x06\x02\x06\x02'
+    b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x05\x00'
+    b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00'
+    b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x01\x00'
+    b'\x02\x00\x02\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00'
+    b'\x03\x03\x02\x03\x07\x07\x07\x07\x37\x37\x37\x37\x0f\x0f\x0e\x0f'
+    b'\x10\x13\x10\x13\x17\x17\x17\x17\x1b\x1b\x1b\x1b\x1f\x1f\x1f\x1f'
+    b'\x20\x23\x20\x23\x27\x27\x27\x27\x2b\x2b\x2b\x2b\x2f\x2f\x2f\x2f'
+    b'\x30\x33\x30\x33\x37\x37\x37\x37\x3a\x3b\x3a\x3b\x1f\x3f\x1f\x3f'
+    b'\x01\x01\x02\x01\x07\x07\x07\x07\x37\x37\x37\x37\x0d\x0d\x0e\x0d'
+    b'\x12\x11\x12\x11\x17\x17\x17\x17\x1b\x1b\x1b\x1b\x1f\x1f\x1f\x1f'
+    b'\x22\x21\x22\x21\x27\x27\x27\x27\x2b\x2b\x2b\x2b\x2f\x2f\x2f\x2f'
+    b'\x32\x31\x32\x31\x37\x37\x37\x37\x38\x39\x38\x39\x1f\x3d\x1f\x3d'
+    # 10: Euplotid Nuclear
+    b'\x0b\x0c\x0b\x0c\x07\x07\x07\x07\x13\x05\x13\x05\x02\x02\x03\x02'
+    b'\x0d\x0e\x0d\x0e\x06\x06\x06\x06\x13\x13\x13\x13\x01\x01\x01\x01'
+    b'\x0a\x09\x0a\x09\x08\x08\x08\x08\x14\x14\x14\x14\x04\x04\x04\x04'
+    b'\x0f\x10\x0f\x10\x05\x05\x05\x05\x11\x11\x12\x11\x01\x00\x01\x00'
+    b'\x02\x02\x02\x02\x04\x04\x04\x04\x06\x06\x06\x06\x03\x03\x01\x03'
+    b'\x02\x02\x02\x02\x04\x04\x04\x04\x06\x06\x06\x06\x06\x06\x06\x06'
+    b'\x02\x02\x02\x02\x04\x04\x04\x04\x04\x04\x04\x04\x04\x04\x04\x04'
+    b'\x02\x02\x02\x02\x06\x06\x06\x06\x03\x03\x01\x03\x06\x02\x06\x02'
+    b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x05\x00'
+    b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00'
+    b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00'
+    b'\x02\x00\x02\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00'
+    b'\x00\x03\x00\x03\x07\x07\x07\x07\x1b\x37\x1b\x37\x0f\x0f\x0e\x0f'
+    b'\x10\x13\x10\x13\x17\x17\x17\x17\x1b\x1b\x1b\x1b\x1f\x1f\x1f\x1f'
+    b'\x20\x23\x20\x23\x27\x27\x27\x27\x2b\x2b\x2b\x2b\x2f\x2f\x2f\x2f'
+    b'\x30\x33\x30\x33\x37\x37\x37\x37\x3b\x3b\x3a\x3b\x1f\x3f\x1f\x3f'
+    b'\x02\x01\x02\x01\x07\x07\x07\x07\x1b\x37\x1b\x37\x0d\x0d\x0e\x0d'
+    b'\x12\x11\x12\x11\x17\x17\x17\x17\x1b\x1b\x1b\x1b\x1f\x1f\x1f\x1f'
+    b'\x22\x21\x22\x21\x27\x27\x27\x27\x2b\x2b\x2b\x2b\x2f\x2f\x2f\x2f'
+    b'\x32\x31\x32\x31\x37\x37\x37\x37\x39\x39\x3a\x39\x1f\x3d\x1f\x3d'
+    # 11: Bacterial, Archaeal and Plant Plastid
+    b'\x0b\x0c\x0b\x0c\x07\x07\x07\x07\x13\x05\x13\x05\x02\x02\x03\x02'
+    b'\x0d\x0e\x0d\x0e\x06\x06\x06\x06\x13\x13\x13\x13\x01\x01\x01\x01'
+    b'\x0a\x09\x0a\x09\x08\x08\x08\x08\x14\x14\x14\x14\x04\x04\x04\x04'
+    b'\x0f\x10\x0f\x10\x05\x05\x05\x05\x0f\x11\x12\x11\x01\x00\x01\x00'
+    b'\x02\x02\x02\x02\x04\x04\x04\x04\x06\x06\x06\x06\x03\x03\x01\x03'
+    b'\x02\x02\x02\x02\x04\x04\x04\x04\x06\x06\x06\x06\x06\x06\x06\x06'
+    b'\x02\x02\x02\x02\x04\x04\x04\x04\x04\x04\x04\x04\x04\x04\x04\x04'
+    b'\x03\x02\x03\x02\x06\x06\x06\x06\x03\x02\x01\x02\x06\x02\x06\x02'
+    b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x01\x01\x05\x01'
+    b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x01\x00'
+    b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x01\x00'
+    b'\x02\x00\x02\x00\x00\x00\x00\x00\x02\x00\x00\x00\x00\x00\x01\x00'
+    b'\x00\x03\x00\x03\x07\x07\x07\x07\x1b\x37\x1b\x37\x0f\x0f\x0e\x0f'
+    b'\x10\x13\x10\x13\x17\x17\x17\x17\x1b\x1b\x1b\x1b\x1f\x1f\x1f\x1f'
+    b'\x20\x23\x20\x23\x27\x27\x27\x27\x2b\x2b\x2b\x2b\x2f\x2f\x2f\x2f'
+    b'\x30\x33\x30\x33\x37\x37\x37\x37\x30\x3b\x3a\x3b\x1f\x3f\x1f\x3f'
+    b'\x02\x01\x02\x01\x07\x07\x07\x07\x1b\x37\x1b\x37\x0d\x0d\x0e\x0d'
+    b'\x12\x11\x12\x11\x17\x17\x17\x17\x1b\x1b\x1b\x1b\x1f\x1f\x1f\x1f'
+    b'\x22\x21\x22\x21\x27\x27\x27\x27\x2b\x2b\x2b\x2b\x2f\x2f\x2f\x2f'
+    b'\x32\x31\x32\x31\x37\x37\x37\x37\x32\x39\x3a\x39\x1f\x3d\x1f\x3d'
+    # 12: Alternative Yeast Nuclear
+    b'\x0b\x0c\x0b\x0c\x07\x07\x07\x07\x13\x05\x13\x05\x02\x02\x03\x02'
+    b'\x0d\x0e\x0d\x0e\x06\x06\x06\x06\x13\x13\x13\x13\x01\x01\x05\x01'
+    b'\x0a\x09\x0a\x09\x08\x08\x08\x08\x14\x14\x14\x14\x04\x04\x04\x04'
+    b'\x0f\x10\x0f\x10\x05\x05\x05\x05\x0f\x11\x12\x11\x01\x00\x01\x00'
+    b'\x02\x02\x02\x02\x04\x04\x04\x04\x06\x07\x06\x07\x03\x03\x01\x03'
+    b'\x02\x02\x02\x02\x04\x04\x04\x04\x06\x06\x06\x06\x02\x02\x07\x02'
+    b'\x02\x02\x02\x02\x04\x04\x04\x04\x04\x04\x04\x04\x04\x04\x04\x04'
+    b'\x03\x02\x03\x02\x07\x07\x07\x07\x03\x02\x01\x02\x02\x02\x02\x02'
+    b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x05\x00'
+    b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x01\x00'
+    b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00'
+    b'\x02\x00\x02\x00\x00\x00\x00\x00\x02\x00\x00\x00\x00\x00\x00\x00'
+    b'\x00\x03\x00\x03\x07\x07\x07\x07\x1b\x37\x1b\x37\x0f\x0f\x0e\x0f'
+    b'\x10\x13\x10\x13\x17\x17\x17\x17\x1b\x1b\x1b\x1b\x3c\x3c\x37\x3c'
+    b'\x20\x23\x20\x23\x27\x27\x27\x27\x2b\x2b\x2b\x2b\x2f\x2f\x2f\x2f'
+    b'\x30\x33\x30\x33\x37\x37\x37\x37\x30\x3b\x3a\x3b\x3c\x3f\x3c\x3f'
+    b'\x02\x01\x02\x01\x07\x07\x07\x07\x1b\x37\x1b\x37\x0d\x0d\x0e\x0d'
+    b'\x12\x11\x12\x11\x17\x17\x17\x17\x1b\x1b\x1b\x1b\x3e\x3e\x37\x3e'
+    b'\x22\x21\x22\x21\x27\x27\x27\x27\x2b\x2b\x2b\x2b\x2f\x2f\x2f\x2f'
+    b'\x32\x31\x32\x31\x37\x37\x37\x37\x32\x39\x3a\x39\x3e\x3d\x3e\x3d'
+    # 13: Ascidian Mitochondrial
+    b'\x0b\x0c\x0b\x0c\x07\x07\x07\x07\x14\x05\x14\x05\x03\x02\x03\x02'
+    b'\x0d\x0e\x0d\x0e\x06\x06\x06\x06\x13\x13\x13\x13\x01\x01\x01\x01'
+    b'\x0a\x09\x0a\x09\x08\x08\x08\x08\x14\x14\x14\x14\x04\x04\x04\x04'
+    b'\x0f\x10\x0f\x10\x05\x05\x05\x05\x12\x11\x12\x11\x01\x00\x01\x00'
+    b'\x02\x02\x02\x02\x04\x04\x04\x04\x06\x06\x06\x06\x02\x02\x02\x02'
+    b'\x02\x02\x02\x02\x04\x04\x04\x04\x04\x04\x04\x04\x06\x06\x06\x06'
+    b'\x02\x02\x02\x02\x04\x04\x04\x04\x06\x06\x06\x06\x04\x04\x04\x04'
+    b'\x02\x02\x02\x02\x06\x06\x06\x06\x02\x02\x02\x02\x06\x02\x06\x02'
+    b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x05\x00\x05\x00'
+    b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00'
+    b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x01\x00'
+    b'\x02\x00\x02\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x01\x00'
+    b'\x00\x03\x00\x03\x07\x07\x07\x07\x2b\x37\x2b\x37\x0e\x0f\x0e\x0f'
+    b'\x10\x13\x10\x13\x17\x17\x17\x17\x1b\x1b\x1b\x1b\x1f\x1f\x1f\x1f'
+    b'\x20\x23\x20\x23\x27\x27\x27\x27\x2b\x2b\x2b\x2b\x2f\x2f\x2f\x2f'
+    b'\x30\x33\x30\x33\x37\x37\x37\x37\x3a\x3b\x3a\x3b\x1f\x3f\x1f\x3f'
+    b'\x02\x01\x02\x01\x07\x07\x07\x07\x2b\x37\x2b\x37\x0c\x0d\x0c\x0d'
+    b'\x12\x11\x12\x11\x17\x17\x17\x17\x1b\x1b\x1b\x1b\x1f\x1f\x1f\x1f'
+    b'\x22\x21\x22\x21\x27\x27\x27\x27\x2b\x2b\x2b\x2b\x2f\x2f\x2f\x2f'
+    b'\x32\x31\x32\x31\x37\x37\x37\x37\x38\x39\x38\x39\x1f\x3d\x1f\x3d'
+    # 14: Alternative Flatworm Mitochondrial
+    b'\x0c\x0c\x0b\x0c\x07\x07\x07\x07\x05\x05\x05\x05\x02\x02\x03\x02'
+    b'\x0d\x0e\x0d\x0e\x06\x06\x06\x06\x13\x13\x13\x13\x01\x01\x01\x01'
+    b'\x0a\x09\x0a\x09\x08\x08\x08\x08\x14\x14\x14\x14\x04\x04\x04\x04'
+    b'\x10\x10\x0f\x10\x05\x05\x05\x05\x12\x11\x12\x11\x01\x00\x01\x00'
+    b'\x03\x03\x01\x03\x04\x04\x04\x04\x08\x08\x08\x08\x03\x03\x01\x03'
+    b'\x02\x02\x02\x02\x04\x04\x04\x04\x04\x04\x04\x04\x06\x06\x06\x06'
+    b'\x02\x02\x02\x02\x04\x04\x04\x04\x04\x04\x04\x04\x04\x04\x04\x04'
+    b'\x03\x03\x01\x03\x08\x08\x08\x08\x02\x02\x02\x02\x06\x02\x06\x02'
+    b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x05\x00'
+    b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00'
+    b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00'
+    b'\x00\x00\x02\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00'
+    b'\x03\x03\x02\x03\x07\x07\x07\x07\x37\x37\x37\x37\x0f\x0f\x0e\x0f'
+    b'\x10\x13\x10\x13\x17\x17\x17\x17\x1b\x1b\x1b\x1b\x1f\x1f\x1f\x1f'
+    b'\x20\x23\x20\x23\x27\x27\x27\x27\x2b\x2b\x2b\x2b\x2f\x2f\x2f\x2f'
+    b'\x33\x33\x32\x33\x37\x37\x37\x37\x3a\x3b\x3a\x3b\x1f\x3f\x1f\x3f'
+    b'\x01\x01\x02\x01\x07\x07\x07\x07\x37\x37\x37\x37\x0d\x0d\x0e\x0d'
+    b'\x12\x11\x12\x11\x17\x17\x17\x17\x1b\x1b\x1b\x1b\x1f\x1f\x1f\x1f'
+    b'\x22\x21\x22\x21\x27\x27\x27\x27\x2b\x2b\x2b\x2b\x2f\x2f\x2f\x2f'
+    b'\x31\x31\x32\x31\x37\x37\x37\x37\x38\x39\x38\x39\x1f\x3d\x1f\x3d'
+    # 16: Chlorophycean Mitochondrial
+    b'\x0b\x0c\x0b\x0c\x07\x07\x07\x07\x13\x05\x13\x05\x02\x02\x03\x02'
+    b'\x0d\x0e\x0d\x0e\x06\x06\x06\x06\x13\x13\x13\x13\x01\x01\x01\x01'
+    b'\x0a\x09\x0a\x09\x08\x08\x08\x08\x14\x14\x14\x14\x04\x04\x04\x04'
+    b'\x0f\x10\x01\x10\x05\x05\x05\x05\x0f\x11\x12\x11\x01\x00\x01\x00'
+    b'\x02\x02\x02\x02\x04\x04\x04\x04\x06\x06\x06\x06\x03\x03\x01\x03'
+    b'\x02\x02\x02\x02\x04\x04\x04\x04\x06\x06\x06\x06\x07\x07\x07\x07'
+    b'\x02\x02\x02\x02\x04\x04\x04\x04\x04\x04\x04\x04\x04\x04\x04\x04'
+    b'\x02\x02\x07\x02\x06\x06\x06\x06\x02\x02\x01\x02\x07\x02\x07\x02'
+    b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x05\x00'
+    b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00'
+    b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00'
+    b'\x02\x00\x00\x00\x00\x00\x00\x00\x02\x00\x00\x00\x00\x00\x00\x00'
+    b'\x00\x03\x00\x03\x07\x07\x07\x07\x1b\x37\x1b\x37\x0f\x0f\x0e\x0f'
+    b'\x10\x13\x10\x13\x17\x17\x17\x17\x1b\x1b\x1b\x1b\x1f\x1f\x1f\x1f'
+    b'\x20\x23\x20\x23\x27\x27\x27\x27\x2b\x2b\x2b\x2b\x2f\x2f\x2f\x2f'
+    b'\x30\x33\x1f\x33\x37\x37\x37\x37\x30\x3b\x3a\x3b\x1f\x3f\x1f\x3f'
+    b'\x02\x01\x02\x01\x07\x07\x07\x07\x1b\x37\x1b\x37\x0d\x0d\x0e\x0d'
+    b'\x12\x11\x12\x11\x17\x17\x17\x17\x1b\x1b\x1b\x1b\x1f\x1f\x1f\x1f'
+    b'\x22\x21\x22\x21\x27\x27\x27\x27\x2b\x2b\x2b\x2b\x2f\x2f\x2f\x2f'
+    b'\x38\x31\x1f\x31\x37\x37\x37\x37\x38\x39\x3a\x39\x1f\x3d\x1f\x3d'
+    # 21: Trematode Mitochondrial
+    b'\x0c\x0c\x0b\x0c\x07\x07\x07\x07\x05\x05\x05\x05\x03\x02\x03\x02'
+    b'\x0d\x0e\x0d\x0e\x06\x06\x06\x06\x13\x13\x13\x13\x01\x01\x01\x01'
+    b'\x0a\x09\x0a\x09\x08\x08\x08\x08\x14\x14\x14\x14\x04\x04\x04\x04'
+    b'\x0f\x10\x0f\x10\x05\x05\x05\x05\x12\x11\x12\x11\x01\x00\x01\x00'
+    b'\x03\x03\x01\x03\x04\x04\x04\x04\x08\x08\x08\x08\x02\x02\x02\x02'
+    b'\x02\x02\x02\x02\x04\x04\x04\x04\x04\x04\x04\x04\x06\x06\x06\x06'
+    b'\x02\x02\x02\x02\x04\x04\x04\x04\x04\x04\x04\x04\x04\x04\x04\x04'
+    b'\x02\x02\x02\x02\x08\x08\x08\x08\x02\x02\x02\x02\x06\x02\x06\x02'
+    b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x04\x00\x05\x00'
+    b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00'
+    b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x01\x00'
+    b'\x02\x00\x02\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00'
+    b'\x03\x03\x02\x03\x07\x07\x07\x07\x37\x37\x37\x37\x0e\x0f\x0e\x0f'
+    b'\x10\x13\x10\x13\x17\x17\x17\x17\x1b\x1b\x1b\x1b\x1f\x1f\x1f\x1f'
+    b'\x20\x23\x20\x23\x27\x27\x27\x27\x2b\x2b\x2b\x2b\x2f\x2f\x2f\x2f'
+    b'\x30\x33\x30\x33\x37\x37\x37\x37\x3a\x3b\x3a\x3b\x1f\x3f\x1f\x3f'
+    b'\x01\x01\x02\x01\x07\x07\x07\x07\x37\x37\x37\x37\x0c\x0d\x0c\x0d'
+    b'\x12\x11\x12\x11\x17\x17\x17\x17\x1b\x1b\x1b\x1b\x1f\x1f\x1f\x1f'
+    b'\x22\x21\x22\x21\x27\x27\x27\x27\x2b\x2b\x2b\x2b\x2f\x2f\x2f\x2f'
+    b'\x32\x31\x32\x31\x37\x37\x37\x37\x38\x39\x38\x39\x1f\x3d\x1f\x3d'
+    # 22: Scenedesmus obliquus Mitochondrial
+    b'\x0b\x0c\x0b\x0c\x07\x07\x07\x07\x13\x05\x13\x05\x02\x02\x03\x02'
+    b'\x0d\x0e\x0d\x0e\x06\x06\x06\x06\x13\x13\x13\x13\x01\x01\x01\x01'
+    b'\x0a\x09\x0a\x09\x08\x08\x08\x08\x14\x14\x14\x14\x04\x04\x04\x04'
+    b'\x0f\x10\x01\x10\x0f\x05\x05\x05\x0f\x11\x12\x11\x01\x00\x01\x00'
+    b'\x02\x02\x02\x02\x04\x04\x04\x04\x06\x02\x06\x02\x03\x03\x01\x03'
+    b'\x02\x02\x02\x02\x04\x04\x04\x04\x06\x06\x06\x06\x07\x07\x07\x07'
+    b'\x02\x02\x02\x02\x04\x04\x04\x04\x04\x04\x04\x04\x04\x04\x04\x04'
+    b'\x03\x02\x07\x02\x03\x02\x02\x02\x03\x02\x01\x02\x07\x02\x07\x02'
+    b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x05\x00'
+    b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00'
+    b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00'
+    b'\x02\x00\x00\x00\x02\x00\x00\x00\x02\x00\x00\x00\x00\x00\x00\x00'
+    b'\x00\x03\x00\x03\x07\x07\x07\x07\x1b\x37\x1b\x37\x0f\x0f\x0e\x0f'
+    b'\x10\x13\x10\x13\x17\x17\x17\x17\x1b\x1b\x1b\x1b\x1f\x1f\x1f\x1f'
+    b'\x20\x23\x20\x23\x27\x27\x27\x27\x2b\x2b\x2b\x2b\x2f\x2f\x2f\x2f'
+    b'\x30\x33\x1f\x33\x30\x37\x37\x37\x30\x3b\x3a\x3b\x1f\x3f\x1f\x3f'
+    b'\x02\x01\x02\x01\x07\x07\x07\x07\x1b\x35\x1b\x35\x0d\x0d\x0e\x0d'
+    b'\x12\x11\x12\x11\x17\x17\x17\x17\x1b\x1b\x1b\x1b\x1f\x1f\x1f\x1f'
+    b'\x22\x21\x22\x21\x27\x27\x27\x27\x2b\x2b\x2b\x2b\x2f\x2f\x2f\x2f'
+    b'\x38\x31\x1f\x31\x38\x35\x35\x35\x38\x39\x3a\x39\x1f\x3d\x1f\x3d'
+    # 23: Thraustochytrium Mitochondrial
+    b'\x0b\x0c\x0b\x0c\x07\x07\x07\x07\x13\x05\x13\x05\x02\x02\x03\x02'
+    b'\x0d\x0e\x0d\x0e\x06\x06\x06\x06\x13\x13\x13\x13\x01\x01\x01\x01'
+    b'\x0a\x09\x0a\x09\x08\x08\x08\x08\x14\x14\x14\x14\x04\x04\x04\x04'
+    b'\x0f\x10\x0f\x10\x05\x05\x05\x05\x0f\x11\x12\x11\x0f\x00\x01\x00'
+    b'\x02\x02\x02\x02\x04\x04\x04\x04\x06\x06\x06\x06\x03\x03\x01\x03'
+    b'\x02\x02\x02\x02\x04\x04\x04\x04\x06\x06\x06\x06\x05\x05\x05\x05'
+    b'\x02\x02\x02\x02\x04\x04\x04\x04\x04\x04\x04\x04\x04\x04\x04\x04'
+    b'\x02\x02\x02\x02\x06\x06\x06\x06\x02\x02\x01\x02\x02\x02\x05\x02'
+    b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x05\x01'
+    b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00'
+    b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x01\x00'
+    b'\x02\x00\x02\x00\x00\x00\x00\x00\x02\x00\x00\x00\x02\x00\x00\x00'
+    b'\x00\x03\x00\x03\x07\x07\x07\x07\x1b\x37\x1b\x37\x0f\x0f\x0e\x0f'
+    b'\x10\x13\x10\x13\x17\x17\x17\x17\x1b\x1b\x1b\x1b\x1f\x1f\x1f\x1f'
+    b'\x20\x23\x20\x23\x27\x27\x27\x27\x2b\x2b\x2b\x2b\x2f\x2f\x2f\x2f'
+    b'\x30\x33\x30\x33\x37\x37\x37\x37\x30\x3b\x3a\x3b\x30\x3f\x1f\x3f'
+    b'\x02\x01\x02\x01\x07\x07\x07\x07\x1b\x37\x1b\x37\x0d\x0d\x0e\x0d'
+    b'\x12\x11\x12\x11\x17\x17\x17\x17\x1b\x1b\x1b\x1b\x1f\x1f\x1f\x1f'
+    b'\x22\x21\x22\x21\x27\x27\x27\x27\x2b\x2b\x2b\x2b\x2f\x2f\x2f\x2f'
+    b'\x32\x31\x32\x31\x37\x37\x37\x37\x32\x39\x3a\x39\x32\x3d\x1f\x3d'
+    # 24: Rhabdopleuridae Mitochondrial
+    b'\x0b\x0c\x0b\x0c\x07\x07\x07\x07\x05\x05\x0b\x05\x02\x02\x03\x02'
+    b'\x0d\x0e\x0d\x0e\x06\x06\x06\x06\x13\x13\x13\x13\x01\x01\x01\x01'
+    b'\x0a\x09\x0a\x09\x08\x08\x08\x08\x14\x14\x14\x14\x04\x04\x04\x04'
+    b'\x0f\x10\x0f\x10\x05\x05\x05\x05\x12\x11\x12\x11\x01\x00\x01\x00'
+    b'\x03\x02\x03\x02\x04\x04\x04\x04\x07\x07\x03\x07\x03\x03\x01\x03'
+    b'\x02\x02\x02\x02\x04\x04\x04\x04\x04\x04\x04\x04\x06\x06\x06\x06'
+    b'\x02\x02\x02\x02\x04\x04\x04\x04\x04\x04\x04\x04\x04\x04\x04\x04'
+    b'\x02\x02\x02\x02\x07\x07\x07\x07\x02\x02\x02\x02\x06\x02\x06\x02'
+    b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x05\x00'
+    b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x01\x00'
+    b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x01\x00'
+    b'\x02\x00\x02\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x01\x00'
+    b'\x00\x03\x00\x03\x07\x07\x07\x07\x37\x37\x00\x37\x0f\x0f\x0e\x0f'
+    b'\x10\x13\x10\x13\x17\x17\x17\x17\x1b\x1b\x1b\x1b\x1f\x1f\x1f\x1f'
+    b'\x20\x23\x20\x23\x27\x27\x27\x27\x2b\x2b\x2b\x2b\x2f\x2f\x2f\x2f'
+    b'\x30\x33\x30\x33\x37\x37\x37\x37\x3a\x3b\x3a\x3b\x1f\x3f\x1f\x3f'
+    b'\x02\x01\x02\x01\x07\x07\x07\x07\x37\x37\x02\x37\x0d\x0d\x0e\x0d'
+    b'\x12\x11\x12\x11\x17\x17\x17\x17\x1b\x1b\x1b\x1b\x1f\x1f\x1f\x1f'
+    b'\x22\x21\x22\x21\x27\x27\x27\x27\x2b\x2b\x2b\x2b\x2f\x2f\x2f\x2f'
+    b'\x32\x31\x32\x31\x37\x37\x37\x37\x38\x39\x38\x39\x1f\x3d\x1f\x3d'
+    # 25: Candidate Division SR1 and Gracilibacteria
+    b'\x0b\x0c\x0b\x0c\x07\x07\x07\x07\x13\x05\x13\x05\x02\x02\x03\x02'
+    b'\x0d\x0e\x0d\x0e\x06\x06\x06\x06\x13\x13\x13\x13\x01\x01\x01\x01'
+    b'\x0a\x09\x0a\x09\x08\x08\x08\x08\x14\x14\x14\x14\x04\x04\x04\x04'
+    b'\x0f\x10\x0f\x10\x05\x05\x05\x05\x14\x11\x12\x11\x01\x00\x01\x00'
+    b'\x02\x02\x02\x02\x04\x04\x04\x04\x06\x06\x06\x06\x03\x03\x01\x03'
+    b'\x02\x02\x02\x02\x04\x04\x04\x04\x06\x06\x06\x06\x06\x06\x06\x06'
+    b'\x02\x02\x02\x02\x04\x04\x04\x04\x05\x05\x05\x05\x04\x04\x04\x04'
+    b'\x02\x02\x02\x02\x06\x06\x06\x06\x05\x02\x01\x02\x06\x02\x06\x02'
+    b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x05\x00'
+    b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00'
+    b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x01\x00'
+    b'\x02\x00\x02\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x01\x00'
+    b'\x00\x03\x00\x03\x07\x07\x07\x07\x1b\x37\x1b\x37\x0f\x0f\x0e\x0f'
+    b'\x10\x13\x10\x13\x17\x17\x17\x17\x1b\x1b\x1b\x1b\x1f\x1f\x1f\x1f'
+    b'\x20\x23\x20\x23\x27\x27\x27\x27\x2b\x2b\x2b\x2b\x2f\x2f\x2f\x2f'
+    b'\x30\x33\x30\x33\x37\x37\x37\x37\x2b\x3b\x3a\x3b\x1f\x3f\x1f\x3f'
+    b'\x02\x01\x02\x01\x07\x07\x07\x07\x1b\x37\x1b\x37\x0d\x0d\x0e\x0d'
+    b'\x12\x11\x12\x11\x17\x17\x17\x17\x1b\x1b\x1b\x1b\x1f\x1f\x1f\x1f'
+    b'\x22\x21\x22\x21\x27\x27\x27\x27\x2b\x2b\x2b\x2b\x2f\x2f\x2f\x2f'
+    b'\x32\x31\x32\x31\x37\x37\x37\x37\x2b\x39\x3a\x39\x1f\x3d\x1f\x3d'
+    # 26: Pachysolen tannophilus Nuclear
+    b'\x0b\x0c\x0b\x0c\x07\x07\x07\x07\x13\x05\x13\x05\x02\x02\x03\x02'
+    b'\x0d\x0e\x0d\x0e\x06\x06\x06\x06\x13\x13\x13\x13\x01\x01\x08\x01'
+    b'\x0a\x09\x0a\x09\x08\x08\x08\x08\x14\x14\x14\x14\x04\x04\x04\x04'
+    b'\x0f\x10\x0f\x10\x05\x05\x05\x05\x0f\x11\x12\x11\x01\x00\x01\x00'
+    b'\x02\x02\x02\x02\x04\x04\x04\x04\x06\x06\x06\x06\x03\x03\x01\x03'
+    b'\x02\x02\x02\x02\x04\x04\x04\x04\x06\x06\x06\x06\x02\x02\x05\x02'
+    b'\x02\x02\x02\x02\x05\x05\x05\x05\x04\x04\x04\x04\x04\x04\x04\x04'
+    b'\x03\x02\x03\x02\x06\x06\x06\x06\x03\x02\x01\x02\x02\x02\x02\x02'
+    b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x05\x00'
+    b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x01\x00'
+    b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00'
+    b'\x02\x00\x02\x00\x00\x00\x00\x00\x02\x00\x00\x00\x00\x00\x00\x00'
+    b'\x00\x03\x00\x03\x07\x07\x07\x07\x1b\x37\x1b\x37\x0f\x0f\x0e\x0f'
+    b'\x10\x13\x10\x13\x17\x17\x17\x17\x1b\x1b\x1b\x1b\x3c\x3c\x27\x3c'
+    b'\x20\x23\x20\x23\x27\x27\x27\x27\x2b\x2b\x2b\x2b\x2f\x2f\x2f\x2f'
+    b'\x30\x33\x30\x33\x37\x37\x37\x37\x30\x3b\x3a\x3b\x3c\x3f\x3c\x3f'
+    b'\x02\x01\x02\x01\x07\x07\x07\x07\x1b\x37\x1b\x37\x0d\x0d\x0e\x0d'
+    b'\x12\x11\x12\x11\x17\x17\x17\x17\x1b\x1b\x1b\x1b\x3e\x3e\x27\x3e'
+    b'\x22\x21\x22\x21\x27\x27\x27\x27\x2b\x2b\x2b\x2b\x2f\x2f\x2f\x2f'
+    b'\x32\x31\x32\x31\x37\x37\x37\x37\x32\x39\x3a\x39\x3e\x3d\x3e\x3d'
+    # 29: Mesodinium Nuclear
+    b'\x0b\x0c\x0b\x0c\x07\x07\x07\x07\x13\x05\x13\x05\x02\x02\x03\x02'
+    b'\x0d\x0e\x0d\x0e\x06\x06\x06\x06\x13\x13\x13\x13\x01\x01\x01\x01'
+    b'\x0a\x09\x0a\x09\x08\x08\x08\x08\x14\x14\x14\x14\x04\x04\x04\x04'
+    b'\x10\x10\x10\x10\x05\x05\x05\x05\x0f\x11\x12\x11\x01\x00\x01\x00'
+    b'\x02\x02\x02\x02\x04\x04\x04\x04\x06\x06\x06\x06\x03\x03\x01\x03'
+    b'\x02\x02\x02\x02\x04\x04\x04\x04\x06\x06\x06\x06\x06\x06\x06\x06'
+    b'\x02\x02\x02\x02\x04\x04\x04\x04\x04\x04\x04\x04\x04\x04\x04\x04'
+    b'\x04\x04\x04\x04\x06\x06\x06\x06\x01\x02\x01\x02\x06\x02\x06\x02'
+    b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x05\x00'
+    b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00'
+    b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00'
+    b'\x00\x00\x00\x00\x00\x00\x00\x00\x02\x00\x00\x00\x00\x00\x00\x00'
+    b'\x00\x03\x00\x03\x07\x07\x07\x07\x1b\x37\x1b\x37\x0f\x0f\x0e\x0f'
+    b'\x10\x13\x10\x13\x17\x17\x17\x17\x1b\x1b\x1b\x1b\x1f\x1f\x1f\x1f'
+    b'\x20\x23\x20\x23\x27\x27\x27\x27\x2b\x2b\x2b\x2b\x2f\x2f\x2f\x2f'
+    b'\x33\x33\x33\x33\x37\x37\x37\x37\x38\x3b\x3a\x3b\x1f\x3f\x1f\x3f'
+    b'\x02\x01\x02\x01\x07\x07\x07\x07\x1b\x37\x1b\x37\x0d\x0d\x0e\x0d'
+    b'\x12\x11\x12\x11\x17\x17\x17\x17\x1b\x1b\x1b\x1b\x1f\x1f\x1f\x1f'
+    b'\x22\x21\x22\x21\x27\x27\x27\x27\x2b\x2b\x2b\x2b\x2f\x2f\x2f\x2f'
+    b'\x33\x33\x33\x33\x37\x37\x37\x37\x38\x39\x3a\x39\x1f\x3d\x1f\x3d'
+    # 30: Peritrich Nuclear
+    b'\x0b\x0c\x0b\x0c\x07\x07\x07\x07\x13\x05\x13\x05\x02\x02\x03\x02'
+    b'\x0d\x0e\x0d\x0e\x06\x06\x06\x06\x13\x13\x13\x13\x01\x01\x01\x01'
+    b'\x0a\x09\x0a\x09\x08\x08\x08\x08\x14\x14\x14\x14\x04\x04\x04\x04'
+    b'\x0a\x10\x0a\x10\x05\x05\x05\x05\x0f\x11\x12\x11\x01\x00\x01\x00'
+    b'\x02\x02\x02\x02\x04\x04\x04\x04\x06\x06\x06\x06\x03\x03\x01\x03'
+    b'\x02\x02\x02\x02\x04\x04\x04\x04\x06\x06\x06\x06\x06\x06\x06\x06'
+    b'\x02\x02\x02\x02\x04\x04\x04\x04\x04\x04\x04\x04\x04\x04\x04\x04'
+    b'\x02\x02\x02\x02\x06\x06\x06\x06\x01\x02\x01\x02\x06\x02\x06\x02'
+    b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x05\x00'
+    b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00'
+    b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00'
+    b'\x00\x00\x00\x00\x00\x00\x00\x00\x02\x00\x00\x00\x00\x00\x00\x00'
+    b'\x00\x03\x00\x03\x07\x07\x07\x07\x1b\x37\x1b\x37\x0f\x0f\x0e\x0f'
+    b'\x10\x13\x10\x13\x17\x17\x17\x17\x1b\x1b\x1b\x1b\x1f\x1f\x1f\x1f'
+    b'\x20\x23\x20\x23\x27\x27\x27\x27\x2b\x2b\x2b\x2b\x2f\x2f\x2f\x2f'
+    b'\x20\x33\x20\x33\x37\x37\x37\x37\x38\x3b\x3a\x3b\x1f\x3f\x1f\x3f'
+    b'\x02\x01\x02\x01\x07\x07\x07\x07\x1b\x37\x1b\x37\x0d\x0d\x0e\x0d'
+    b'\x12\x11\x12\x11\x17\x17\x17\x17\x1b\x1b\x1b\x1b\x1f\x1f\x1f\x1f'
+    b'\x22\x21\x22\x21\x27\x27\x27\x27\x2b\x2b\x2b\x2b\x2f\x2f\x2f\x2f'
+    b'\x22\x31\x22\x31\x37\x37\x37\x37\x38\x39\x3a\x39\x1f\x3d\x1f\x3d'
+    # 33: Cephalodiscidae Mitochondrial
+    b'\x0b\x0c\x0b\x0c\x07\x07\x07\x07\x05\x05\x0b\x05\x02\x02\x03\x02'
+    b'\x0d\x0e\x0d\x0e\x06\x06\x06\x06\x13\x13\x13\x13\x01\x01\x01\x01'
+    b'\x0a\x09\x0a\x09\x08\x08\x08\x08\x14\x14\x14\x14\x04\x04\x04\x04'
+    b'\x10\x10\x0f\x10\x05\x05\x05\x05\x12\x11\x12\x11\x01\x00\x01\x00'
+    b'\x03\x02\x03\x02\x04\x04\x04\x04\x07\x07\x03\x07\x03\x03\x01\x03'
+    b'\x02\x02\x02\x02\x04\x04\x04\x04\x04\x04\x04\x04\x06\x06\x06\x06'
+    b'\x02\x02\x02\x02\x04\x04\x04\x04\x04\x04\x04\x04\x04\x04\x04\x04'
+    b'\x03\x03\x01\x03\x07\x07\x07\x07\x02\x02\x02\x02\x06\x02\x06\x02'
+    b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x05\x00'
+    b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x01\x00'
+    b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x01\x00'
+    b'\x00\x00\x02\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x01\x00'
+    b'\x00\x03\x00\x03\x07\x07\x07\x07\x37\x37\x00\x37\x0f\x0f\x0e\x0f'
+    b'\x10\x13\x10\x13\x17\x17\x17\x17\x1b\x1b\x1b\x1b\x1f\x1f\x1f\x1f'
+    b'\x20\x23\x20\x23\x27\x27\x27\x27\x2b\x2b\x2b\x2b\x2f\x2f\x2f\x2f'
+    b'\x33\x33\x32\x33\x37\x37\x37\x37\x3a\x3b\x3a\x3b\x1f\x3f\x1f\x3f'
+    b'\x02\x01\x02\x01\x07\x07\x07\x07\x37\x37\x02\x37\x0d\x0d\x0e\x0d'
+    b'\x12\x11\x12\x11\x17\x17\x17\x17\x1b\x1b\x1b\x1b\x1f\x1f\x1f\x1f'
+    b'\x22\x21\x22\x21\x27\x27\x27\x27\x2b\x2b\x2b\x2b\x2f\x2f\x2f\x2f'
+    b'\x31\x31\x32\x31\x37\x37\x37\x37\x38\x39\x38\x39\x1f\x3d\x1f\x3d'
+)
@@ -4,7 +4,10 @@ This module contains the general helper functions for the application.
 import json
 import string
 import random
-import scipy.io
+from helpers import resource_path
+
+# Parsed dataset directory files keyed by absolute path.
+_directory_cache = {}
 
 
 def generate_secret_key(length=32):
@@ -29,8 +32,11 @@ def dna_from_mat(filename=None, file_path=None):
     :param path: fully qualified path e.g. /folder/subfolder/filename.mat
     :return: string object containing DNA String.
     """
+    # scipy is only needed for .mat files, import it on first use so that
+    # importing this module (e.g. from config.py) stays cheap.
+    import scipy.io
     if file_path is not None:
-        data = scipy.io.loadmat(file_path)
+        data = scipy.io.loadmat(resource_path(file_path))
         filename = file_path.split('/')[-1].split('.')[0]
         try:
             return str(data.get(filename)[0])
@@ -42,7 +48,7 @@ def dna_from_mat(filename=None, file_path=None):
             raise FileNotFoundError
     elif filename is not None:
         # Read file from default folder
-        data = scipy.io.loadmat('dataset/mat/' + filename)
+        data = scipy.io.loadmat(resource_path('dataset', 'mat', filename))
         seq_id = filename.split('.')[0]    # Expected_filename= filename.mat
         try:
             return str(data.get(seq_id)[0])
@@ -67,7 +73,7 @@ def dna_from_json(filename=None, file_path=None):
     """
     if file_path is not None:
         try:
-            with open(file_path) as dna_file:
+            with open(resource_path(file_path)) as dna_file:
                 data = json.load(dna_file)
             return data
         except TypeError:
@@ -80,7 +86,8 @@ def dna_from_json(filename=None, file_path=None):
     elif filename is not None:
         try:
             # Read file from default folder
-            with open('dataset/json/' + filename) as dna_file:
+            with open(resource_path('dataset', 'json', filename)) as \
+                    dna_file:
                 data = json.load(dna_file)
             return data
         except TypeError as e:
@@ -155,7 +162,7 @@ def get_filenames_from_directory(directory='dataset/json'):
     """
     from os import walk
     files = []
-    for (dirpath, dirnames, filenames) in walk(directory):
+    for (dirpath, dirnames, filenames) in walk(resource_path(directory)):
         files.extend(filenames)
         break
     return files
@@ -169,8 +176,7 @@ def load_sequence_choices(file_path='dataset/json/directory.json'):
     :return:
     """
     try:
-        with open(file_path) as directory_file:
-            data = json.load(directory_file)
+        data = load_directory(file_path)
         choices = []
         for key in data:
             choices.append((key, data.get(key)['name']))
@@ -189,8 +195,7 @@ def get_chosen_file_path(file_path='dataset/json/directory.json', key=None):
     :return: path to the file (relative to app directory tree.)
     """
     try:
-        with open(file_path) as data_file:
-            data = json.load(data_file)
+        data = load_directory(file_path)
         return data.get(key)['filePath']
     except FileNotFoundError:
         return None
@@ -208,8 +213,7 @@ def get_chosen_file_name(file_path='dataset/json/directory.json', key=None):
     :return: path to the file (relative to app directory tree.)
     """
     try:
-        with open(file_path) as data_file:
-            data = json.load(data_file)
+        data = load_directory(file_path)
         return data.get(key)['fileName']
     except FileNotFoundError:
         return None
@@ -217,3 +221,18 @@ def get_chosen_file_name(file_path='dataset/json/directory.json', key=None):
         return None
 
 
+def load_directory(file_path='dataset/json/directory.json'):
+    """
+    This function reads the dataset directory file, using cached copy if the
+    file has been read before. Returned dictionary must not be modified by
+    the caller.
+    :param file_path: path of directory file
+    :return: dictionary object containing the dataset catalog.
+    """
+    file_path = resource_path(file_path)
+    data = _directory_cache.get(file_path)
+    if data is None:
+        with open(file_path) as directory_file:
+            data = json.load(directory_file)
+        _directory_cache[file_path] = data
+    return data
@@ -0,0 +1,507 @@
+"""
+This module implements the load test of the json api: it starts the
+application under gunicorn (or uses a running server), replays a mix of
+embed, extract and capacity requests built from dataset samples and
+synthetic sequences, and reports throughput, latency percentiles, error rate
+and memory (RSS) of every gunicorn worker.
+
+Load is generated either at fixed concurrency (each client sends its next
+request when the previous one finishes) or at fixed rate. In rate mode
+latency is measured from the time a request was scheduled, so requests
+delayed by a saturated server are not under-reported.
+
+usage: python manage.py loadtest -d 30 -c 16 -o summary.json
+"""
+import os
+import sys
+import json
+import time
+import bisect
+import random
+import signal
+import threading
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import requests
+from helpers import BASE_DIR
+from helpers.helper_functions import load_directory
+from helpers.codon_helpers import coding_sequence
+
+# Operations of the json api which can be load tested.
+OPERATIONS = ('embed', 'extract', 'capacity')
+
+# Message embedded by embed requests and in sequences used by extract.
+MESSAGE = 'loadtest'
+
+
+def parse_mix(mix):
+    """
+    This function parses the request mix e.g. 'embed:5,extract:3,capacity:2'
+    :param mix: string of operation:weight pairs.
+    :return: dictionary object, weight of each operation.
+    """
+    weights = {}
+    for item in mix.split(','):
+        name, _, weight = item.strip().partition(':')
+        if name not in OPERATIONS:
+            raise ValueError('Unknown operation: ' + name)
+        weights[name] = float(weight or 1)
+    return weights
+
+
+def build_sources(sizes, samples, seed=1):
+    """
+    This function builds sequences used in requests.
+    :param sizes: lengths (bases) of synthetic sequences.
+    :param samples: keys of dataset samples, None for all samples.
+    :param seed: seed of random generator.
+    :return: list of tuples (label, json fields selecting the sequence)
+    """
+    rnd = random.Random(seed)
+    # start codon, random codons and stop codon of about `size` bases.
+    sources = [('synthetic-{0}'.format(size),
+                {'sequence': coding_sequence(max(size // 3 - 2, 1), rnd)})
+               for size in sizes]
+    if samples is None:
+        samples = sorted(load_directory().keys())
+    sources.extend(('sample-' + key, {'sample': key}) for key in samples)
+    return sources
+
+
+def build_requests(base_url, weights, sources, timeout=60):
+    """
+    This function builds requests of the load test. Sources are watermarked
+    once, so that extract requests carry a message.
+    :param base_url: url of the api e.g. http://127.0.0.1:8000/api/v1.0
+    :param weights: weight of each operation (see parse_mix)
+    :param sources: list returned by build_sources.
+    :param timeout: seconds to wait for a response.
+    :return: list of tuples (operation, label, url, json body, weight)
+    """
+    items = []
+    for label, fields in sources:
+        for operation, weight in sorted(weights.items()):
+            if operation == 'extract':
+                response = requests.post(
+                    base_url + '/embed', timeout=timeout,
+                    json=dict(fields, message=MESSAGE))
+                if response.status_code != 200:
+                    # sequence can not hold the message.
+                    continue
+                body = {'sequence': response.json()['sequence']}
+            elif operation == 'embed':
+                body = dict(fields, message=MESSAGE)
+            else:
+                body = dict(fields)
+            items.append((operation, label, base_url + '/' + operation, body,
+                          weight / len(sources)))
+    if not items:
+        raise ValueError('No requests could be built.')
+    return items
+
+
+class _Picker(object):
+    """
+    Picks requests at random according to their weights.
+    """
+    def __init__(self, items, seed=None):
+        self.items = items
+        self.totals = np.cumsum([item[-1] for item in items]).tolist()
+        self.rnd = random.Random(seed)
+        self.lock = threading.Lock()
+
+    def pick(self):
+        with self.lock:
+            value = self.rnd.random() * self.totals[-1]
+        return self.items[bisect.bisect_right(self.totals, value)]
+
+
+def _send(session, item, timeout):
+    """
+    This function sends a request.
+    :param session: requests.Session object.
+    :param item: request (see build_requests)
+    :param timeout: seconds to wait for a response.
+    :return: status code, 0 for connection errors and timeouts.
+    """
+    try:
+        response = session.post(item[2], json=item[3], timeout=timeout)
+        # latency includes reading the whole response.
+        response.content
+        return response.status_code
+    except requests.RequestException:
+        return 0
+
+
+def run_concurrency(items, concurrency, duration, timeout=60):
+    """
+    This function sends requests from concurrent clients, each sending its
+    next request when the previous one finishes.
+    :param items: requests (see build_requests)
+    :param concurrency: number of clients.
+    :param duration: seconds.
+    :param timeout: seconds to wait for a response.
+    :return: list of tuples (operation, label, status, latency in seconds)
+    """
+    picker = _Picker(items)
+    results = []
+    deadline = time.perf_counter() + duration
+
+    def client():
+        session = requests.Session()
+        while time.perf_counter() < deadline:
+            item = picker.pick()
+            started = time.perf_counter()
+            status = _send(session, item, timeout)
+            results.append((item[0], item[1], status,
+                            time.perf_counter() - started))
+        session.close()
+
+    threads = [threading.Thread(target=client) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def run_rate(items, rate, duration, concurrency, timeout=60):
+    """
+    This function sends requests at fixed rate. Requests are queued when all
+    clients are busy, their latency includes time spent in the queue.
+    :param items: requests (see build_requests)
+    :param rate: requests per second.
+    :param duration: seconds.
+    :param concurrency: maximum number of requests in flight.
+    :param timeout: seconds to wait for a response.
+    :return: list of tuples (operation, label, status, latency in seconds)
+    """
+    picker = _Picker(items)
+    results = []
+    local = threading.local()
+
+    def send(item, scheduled):
+        if not hasattr(local, 'session'):
+            local.session = requests.Session()
+        status = _send(local.session, item, timeout)
+        results.append((item[0], item[1], status,
+                        time.perf_counter() - scheduled))
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for i in range(int(rate * duration)):
+            scheduled = started + i / rate
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            executor.submit(send, picker.pick(), scheduled)
+    return results
+
+
+def _percentiles(latencies):
+    """
+    This function summarizes latencies.
+    :param latencies: list of seconds.
+    :return: dictionary object, milliseconds.
+    """
+    if not latencies:
+        return dict(p50=None, p95=None, p99=None, mean=None, max=None)
+    values = np.asarray(latencies) * 1000
+    p50, p95, p99 = np.percentile(values, [50, 95, 99]).tolist()
+    return dict(p50=round(p50, 2), p95=round(p95, 2), p99=round(p99, 2),
+                mean=round(float(values.mean()), 2),
+                max=round(float(values.max()), 2))
+
+
+def _group_stats(results, elapsed):
+    ok = [r[3] for r in results if 200 <= r[2] < 300]
+    failed = [r[3] for r in results if not 200 <= r[2] < 300]
+    return dict(requests=len(results), errors=len(failed),
+                error_rate=round(len(failed) / len(results), 4) if results
+                else 0,
+                throughput=round(len(ok) / elapsed, 2) if elapsed else 0,
+                latency=_percentiles(ok),
+                # rejected requests (429, 503) and timeouts have latencies
+                # of their own, e.g. time until the server gave up.
+                error_latency=_percentiles(failed))
+
+
+def summarize(results, elapsed):
+    """
+    This function computes statistics of a load test, overall, per
+    operation and per sequence.
+    :param results: list returned by run_concurrency or run_rate.
+    :param elapsed: duration of the test (seconds)
+    :return: dictionary object.
+    """
+    summary = _group_stats(results, elapsed)
+    summary['statuses'] = {}
+    latencies = {}
+    for result in results:
+        key = str(result[2])
+        summary['statuses'][key] = summary['statuses'].get(key, 0) + 1
+        latencies.setdefault(key, []).append(result[3])
+    summary['status_latency'] = dict(
+        (key, _percentiles(values)) for key, values in latencies.items())
+    for index, name in ((0, 'operations'), (1, 'sequences')):
+        groups = {}
+        for result in results:
+            groups.setdefault(result[index], []).append(result)
+        summary[name] = dict((key, _group_stats(group, elapsed))
+                             for key, group in sorted(groups.items()))
+    return summary
+
+
+def _read_proc(pid, filename):
+    try:
+        with open('/proc/{0}/{1}'.format(pid, filename)) as proc_file:
+            return proc_file.read()
+    except OSError:
+        return ''
+
+
+def child_pids(pid):
+    """
+    This function returns ids of child processes (e.g. gunicorn workers).
+    :param pid: process id.
+    :return: list of process ids.
+    """
+    children = []
+    for name in os.listdir('/proc'):
+        if name.isdigit():
+            stat = _read_proc(name, 'stat')
+            # ppid is the second field after the parenthesized command name.
+            fields = stat[stat.rfind(')') + 2:].split()
+            if len(fields) > 1 and fields[1] == str(pid):
+                children.append(int(name))
+    return sorted(children)
+
+
+def memory_usage(pid):
+    """
+    This function reads memory usage of a process from /proc.
+    :param pid: process id.
+    :return: dictionary object with 'rss' and 'pss' (kB, pss counts shared
+    pages in proportion to the number of processes sharing them), None
+    for values which can not be read.
+    """
+    usage = dict(rss=None, pss=None)
+    for line in _read_proc(pid, 'status').splitlines():
+        if line.startswith('VmRSS:'):
+            usage['rss'] = int(line.split()[1])
+    for line in _read_proc(pid, 'smaps_rollup').splitlines():
+        if line.startswith('Pss:'):
+            usage['pss'] = int(line.split()[1])
+    return usage
+
+
+class MemorySampler(object):
+    """
+    Samples memory usage of gunicorn workers in a background thread.
+    """
+    def __init__(self, master_pid, interval=1.0):
+        """
+        :param master_pid: process id of gunicorn master.
+        :param interval: seconds between samples.
+        """
+        self.master_pid = master_pid
+        self.interval = interval
+        self.workers = {}
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run)
+        self._thread.daemon = True
+
+    def sample(self):
+        for pid in child_pids(self.master_pid):
+            usage = memory_usage(pid)
+            if usage['rss'] is None:
+                continue
+            worker = self.workers.setdefault(pid, dict(
+                pid=pid, rss_max=0, pss_max=None, samples=0))
+            worker['rss_max'] = max(worker['rss_max'], usage['rss'])
+            worker['rss_last'] = usage['rss']
+            if usage['pss'] is not None:
+                worker['pss_max'] = max(worker['pss_max'] or 0, usage['pss'])
+            worker['samples'] += 1
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.sample()
+
+    def start(self):
+        self.sample()
+        self._thread.start()
+
+    def stop(self):
+        """
+        This function stops sampling.
+        :return: list of dictionaries, memory usage (kB) of each worker.
+        """
+        self._stop.set()
+        self._thread.join()
+        self.sample()
+        return [self.workers[pid] for pid in sorted(self.workers)]
+
+
+def start_server(bind='127.0.0.1:8765', workers=2, worker_class=None,
+                 env=None, timeout=60):
+    """
+    This function starts the application under gunicorn (with
+    gunicorn_config.py) and waits until it answers requests.
+    :param bind: address of the server.
+    :param workers: number of gunicorn workers.
+    :param worker_class: gunicorn worker class, 'asgi' serves asgi.py with
+    uvicorn workers, default=None i.e. sync workers.
+    :param env: additional environment variables.
+    :param timeout: seconds to wait for the server.
+    :return: subprocess.Popen object of gunicorn master.
+    """
+    command = [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn_config.py',
+               '-b', bind, '-w', str(workers)]
+    if worker_class == 'asgi':
+        command += ['-k', 'uvicorn.workers.UvicornWorker', 'asgi:app']
+    else:
+        if worker_class:
+            command += ['-k', worker_class]
+        command.append('manage:app')
+    process = subprocess.Popen(command, cwd=BASE_DIR,
+                               env=dict(os.environ, **(env or {})))
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError('gunicorn exited with status {0}'.format(
+                process.returncode))
+        try:
+            requests.get('http://{0}/'.format(bind), timeout=1)
+            if len(child_pids(process.pid)) >= workers:
+                return process
+        except requests.RequestException:
+            pass
+        time.sleep(0.2)
+    stop_server(process)
+    raise RuntimeError('gunicorn did not start in {0} seconds'.format(
+        timeout))
+
+
+def stop_server(process):
+    """
+    This function stops gunicorn started by start_server.
+    :param process: subprocess.Popen object.
+    :return:
+    """
+    if process.poll() is None:
+        process.send_signal(signal.SIGTERM)
+        try:
+            process.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+
+
+def _git_revision():
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', 'HEAD'], cwd=BASE_DIR,
+            stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(mix='embed:1,extract:1,capacity:1', sizes=(1000, 10000, 100000),
+        samples=None, duration=30, concurrency=8, rate=None, url=None,
+        bind='127.0.0.1:8765', workers=2, worker_class=None, timeout=60,
+        seed=1):
+    """
+    This function runs a load test.
+    :param mix: request mix (see parse_mix)
+    :param sizes: lengths (bases) of synthetic sequences.
+    :param samples: keys of dataset samples, None for all, [] for none.
+    :param duration: seconds.
+    :param concurrency: number of concurrent clients (maximum number of
+    requests in flight in rate mode)
+    :param rate: requests per second, default=None i.e. fixed concurrency.
+    :param url: url of a running server, default=None i.e. start gunicorn.
+    :param bind: address of started server.
+    :param workers: number of gunicorn workers of started server.
+    :param worker_class: gunicorn worker class of started server (see
+    start_server)
+    :param timeout: seconds to wait for a response.
+    :param seed: seed of random generator.
+    :return: dictionary object, summary of the test.
+    """
+    weights = parse_mix(mix)
+    process = None
+    sampler = None
+    if url is None:
+        process = start_server(bind, workers, worker_class)
+        url = 'http://' + bind
+    try:
+        base_url = url.rstrip('/') + '/api/v1.0'
+        items = build_requests(base_url, weights,
+                               build_sources(sizes, samples, seed), timeout)
+        if process is not None:
+            sampler = MemorySampler(process.pid)
+            sampler.start()
+        started = time.perf_counter()
+        if rate:
+            results = run_rate(items, rate, duration, concurrency, timeout)
+        else:
+            results = run_concurrency(items, concurrency, duration, timeout)
+        elapsed = time.perf_counter() - started
+        workers_memory = sampler.stop() if sampler is not None else []
+    finally:
+        if process is not None:
+            stop_server(process)
+    summary = summarize(results, elapsed)
+    summary.update(
+        revision=_git_revision(), duration=round(elapsed, 3),
+        workers=workers_memory,
+        config=dict(mix=weights, sizes=list(sizes), samples=samples,
+                    concurrency=concurrency, rate=rate, url=url,
+                    workers=workers if process is not None else None,
+                    worker_class=worker_class, seed=seed))
+    return summary
+
+
+def format_summary(summary):
+    """
+    This function formats summary of a load test as a table.
+    :param summary: dictionary object returned by run.
+    :return: string
+    """
+    lines = ['{0:<24}{1:>9}{2:>9}{3:>10}{4:>10}{5:>10}{6:>10}{7:>12}'.format(
+        '', 'requests', 'errors', 'req/s', 'p50 ms', 'p95 ms', 'p99 ms',
+        'err p99 ms')]
+
+    def row(name, stats):
+        latency = stats['latency']
+        lines.append('{0:<24}{1:>9}{2:>9.2%}{3:>10}{4!s:>10}{5!s:>10}{6!s:>10}'
+                     '{7!s:>12}'.format(
+                         name[:23], stats['requests'], stats['error_rate'],
+                         stats['throughput'], latency['p50'], latency['p95'],
+                         latency['p99'], stats['error_latency']['p99']))
+
+    row('total', summary)
+    for group in ('operations', 'sequences'):
+        for name, stats in summary[group].items():
+            row(name, stats)
+    for status, latency in sorted(summary['status_latency'].items()):
+        lines.append('status {0}: {1} requests, p50 {p50} ms, p99 {p99} ms, '
+                     'max {max} ms'.format(status, summary['statuses'][status],
+                                           **latency))
+    for worker in summary['workers']:
+        lines.append('worker {pid}: max rss {rss_max} kB, max pss '
+                     '{pss_max} kB'.format(**worker))
+    return '\n'.join(lines)
+
+
+def write_summary(summary, path):
+    """
+    This function writes summary of a load test as json.
+    :param summary: dictionary object returned by run.
+    :param path: path of json file.
+    :return:
+    """
+    with open(path, 'w') as summary_file:
+        json.dump(summary, summary_file, indent=2, sort_keys=True)
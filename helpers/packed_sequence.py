@@ -0,0 +1,294 @@
+"""
+This module implements a DNA sequence packed at 2 bits per base.
+
+Bases are numbered A=0, C=1, G=2, T=3 (see codon_helpers) and stored four
+per byte, first base in the most significant bits. Frame views and reverse
+complement share the packed buffer of the sequence they are taken from,
+bases are unpacked only in blocks while computing codon indexes and text
+is produced only when the sequence is written out.
+"""
+import numpy as np
+from helpers.codon_helpers import BASES, clean_bases, frame_length
+
+# Number of bases unpacked (or packed) at a time, keeps temporary arrays
+# small for long sequences. Multiple of 12 so blocks hold whole codons and
+# whole bytes.
+BLOCK_SIZE = 3 * 4 * 2 ** 18
+
+_SHIFTS = np.array([6, 4, 2, 0], dtype=np.uint8)
+_BASE_CHARS = np.frombuffer(BASES.encode('ascii'), dtype=np.uint8)
+
+
+def pack_bases(bases):
+    """
+    This function packs an array of base indexes, 4 bases per byte.
+    :param bases: numpy array of base indexes.
+    :return: numpy array (uint8) of packed bytes, last byte is padded with
+    A (0) bases.
+    """
+    padded = np.zeros((len(bases) + 3) // 4 * 4, dtype=np.uint8)
+    padded[:len(bases)] = bases
+    quads = padded.reshape(-1, 4)
+    return (quads[:, 0] << 6) | (quads[:, 1] << 4) | (quads[:, 2] << 2) | \
+        quads[:, 3]
+
+
+def unpack_bytes(data):
+    """
+    This function unpacks bytes to an array of base indexes.
+    :param data: numpy array (uint8) of packed bytes.
+    :return: numpy array (uint8) of 4 base indexes per byte.
+    """
+    return ((data[:, None] >> _SHIFTS) & 3).reshape(-1)
+
+
+class PackedSequence(object):
+    """
+    DNA sequence stored at 2 bits per base. An object is a view of length
+    bases starting at offset of packed data, read on reverse complement
+    strand if reverse is set. Packed data is never modified, so views can
+    be shared between requests and threads.
+    """
+    __slots__ = ('data', 'offset', 'length', 'reverse')
+
+    def __init__(self, data, length, offset=0, reverse=False):
+        """
+        :param data: numpy array (uint8) of packed bytes.
+        :param length: number of bases in the view.
+        :param offset: position of first base of the view in packed data.
+        :param reverse: True if view reads the reverse complement.
+        """
+        if data.flags.writeable:
+            data = data.view()
+            data.flags.writeable = False
+        self.data = data
+        self.offset = offset
+        self.length = length
+        self.reverse = reverse
+
+    @classmethod
+    def from_bases(cls, bases):
+        """
+        This function packs an array of base indexes.
+        :param bases: numpy array of base indexes (see clean_bases).
+        :return: PackedSequence object.
+        """
+        return cls(pack_bases(bases), len(bases))
+
+    @classmethod
+    def from_string(cls, dna_seq):
+        """
+        This function packs a DNA sequence, any character other than A, G,
+        C, T is removed (same as _clean_dna). Sequence is cleaned block by
+        block so only a block is held unpacked at a time.
+        :param dna_seq: DNA sequence (string or bytes)
+        :return: PackedSequence object.
+        """
+        if isinstance(dna_seq, cls):
+            return dna_seq
+        chunks = []
+        length = 0
+        carry = np.zeros(0, dtype=np.uint8)
+        for i in range(0, len(dna_seq), BLOCK_SIZE):
+            bases = clean_bases(dna_seq[i:i + BLOCK_SIZE])
+            length += len(bases)
+            if len(carry):
+                bases = np.concatenate((carry, bases))
+            whole = len(bases) - len(bases) % 4
+            chunks.append(pack_bases(bases[:whole]))
+            carry = bases[whole:]
+        chunks.append(pack_bases(carry))
+        return cls(np.concatenate(chunks), length)
+
+    @classmethod
+    def from_packed(cls, data, length):
+        """
+        This function creates a sequence from packed bytes (see
+        packed_blocks).
+        :param data: packed bytes (bytes, bytearray or numpy array)
+        :param length: number of bases.
+        :return: PackedSequence object.
+        """
+        data = np.frombuffer(data, dtype=np.uint8)
+        if len(data) < (length + 3) // 4:
+            raise ValueError('Packed data is shorter than sequence length.')
+        return cls(data[:(length + 3) // 4], length)
+
+    def __len__(self):
+        return self.length
+
+    def __eq__(self, other):
+        if not isinstance(other, PackedSequence):
+            return NotImplemented
+        if self.length != other.length:
+            return False
+        for start in range(0, self.length, BLOCK_SIZE):
+            stop = min(start + BLOCK_SIZE, self.length)
+            if not np.array_equal(self.bases(start, stop),
+                                  other.bases(start, stop)):
+                return False
+        return True
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    __hash__ = None
+
+    def __repr__(self):
+        return 'PackedSequence(length={0}, strand={1})'.format(
+            self.length, '-' if self.reverse else '+')
+
+    def __str__(self):
+        return self.to_string()
+
+    @property
+    def nbytes(self):
+        """Size (bytes) of packed data of the view."""
+        return (self.length + 3) // 4
+
+    def slice(self, start=0, stop=None):
+        """
+        This function returns a view of part of the sequence, packed data is
+        not copied.
+        :param start: first base of the view.
+        :param stop: position after last base of the view, default=None i.e.
+        end of sequence.
+        :return: PackedSequence object.
+        """
+        stop = self.length if stop is None else min(stop, self.length)
+        start = min(max(start, 0), stop)
+        if self.reverse:
+            offset = self.offset + self.length - stop
+        else:
+            offset = self.offset + start
+        return PackedSequence(self.data, stop - start, offset, self.reverse)
+
+    def frame(self, frame=1):
+        """
+        This function returns a view of complete codons of given reading
+        frame, negative frames (-1, -2, -3) are read on reverse complement.
+        :param frame: reading frame number 1, 2, 3, -1, -2, -3 default=1
+        :return: PackedSequence object.
+        """
+        seq = self.reverse_complement() if frame < 0 else self
+        frame = abs(frame)
+        start = frame - 1
+        return seq.slice(start, start + 3 * frame_length(seq.length, frame))
+
+    def reverse_complement(self):
+        """
+        This function returns reverse complement of the sequence, packed data
+        is not copied.
+        :return: PackedSequence object.
+        """
+        return PackedSequence(self.data, self.length, self.offset,
+                              not self.reverse)
+
+    def bases(self, start=0, stop=None):
+        """
+        This function unpacks bases of the sequence.
+        :param start: first base.
+        :param stop: position after last base, default=None i.e. end of
+        sequence.
+        :return: numpy array (uint8) of base indexes.
+        """
+        view = self.slice(start, stop)
+        first = view.offset
+        last = view.offset + view.length
+        unpacked = unpack_bytes(self.data[first // 4:(last + 3) // 4])
+        bases = unpacked[first % 4:first % 4 + view.length]
+        if view.reverse:
+            return 3 - bases[::-1]
+        return bases
+
+    def blocks(self, size=BLOCK_SIZE):
+        """
+        This function unpacks the sequence block by block.
+        :param size: number of bases per block.
+        :return: generator of numpy arrays of base indexes.
+        """
+        for start in range(0, self.length, size):
+            yield self.bases(start, start + size)
+
+    def codon_indexes(self, frame=1):
+        """
+        This function returns codon indexes of complete codons in given
+        reading frame, without unpacking the whole sequence at once.
+        :param frame: reading frame number 1, 2, 3, -1, -2, -3 default=1
+        :return: numpy array (uint8) of codon indexes.
+        """
+        view = self.frame(frame)
+        codons = np.empty(view.length // 3, dtype=np.uint8)
+        done = 0
+        for bases in view.blocks():
+            triplets = bases.reshape(-1, 3)
+            codons[done:done + len(triplets)] = \
+                (triplets[:, 0] << 4) | (triplets[:, 1] << 2) | triplets[:, 2]
+            done += len(triplets)
+        return codons
+
+    def with_codons(self, codons, frame=1):
+        """
+        This function returns a copy of the sequence in which codons of given
+        reading frame are replaced.
+        :param codons: numpy array of codon indexes, one for each complete
+        codon of the frame (see codon_indexes).
+        :param frame: reading frame number 1, 2, 3 default=1
+        :return: PackedSequence object.
+        """
+        start = frame - 1
+        end = start + 3 * len(codons)
+        shifts = np.array([4, 2, 0], dtype=np.uint8)
+        packed = np.empty(self.nbytes, dtype=np.uint8)
+        # blocks start at multiples of 4 bases i.e. at byte boundaries.
+        for first in range(0, self.length, BLOCK_SIZE):
+            bases = self.bases(first, first + BLOCK_SIZE)
+            lo = max(first, start)
+            hi = min(first + len(bases), end)
+            if lo < hi:
+                positions = np.arange(lo - start, hi - start)
+                bases[lo - first:hi - first] = \
+                    (codons[positions // 3] >> shifts[positions % 3]) & 3
+            block = pack_bases(bases)
+            packed[first // 4:first // 4 + len(block)] = block
+        return PackedSequence(packed, self.length)
+
+    def packed_blocks(self, size=BLOCK_SIZE):
+        """
+        This function returns packed bytes of the sequence block by block,
+        last byte is padded with A (0) bases. Packed data is not copied if
+        the sequence starts at a byte boundary of its data.
+        :param size: number of bases per block (multiple of 4)
+        :return: generator of bytes-like objects.
+        """
+        if not self.reverse and self.offset % 4 == 0:
+            first = self.offset // 4
+            data = self.data[first:first + self.nbytes]
+            for i in range(0, len(data), size // 4):
+                block = data[i:i + size // 4]
+                if i + size // 4 >= len(data) and self.length % 4:
+                    # clear bases past the end of the view.
+                    block = block.copy()
+                    block[-1] &= (0xff << (8 - 2 * (self.length % 4))) & 0xff
+                yield memoryview(block)
+        else:
+            for bases in self.blocks(size):
+                yield memoryview(pack_bases(bases))
+
+    def to_string(self):
+        """
+        This function converts the sequence to (lower case) text.
+        :return: DNA sequence (string)
+        """
+        return ''.join(self.iter_text())
+
+    def iter_text(self, size=BLOCK_SIZE):
+        """
+        This function converts the sequence to (lower case) text block by
+        block, e.g. for writing long sequences to a file.
+        :param size: number of bases per block.
+        :return: generator of strings.
+        """
+        for bases in self.blocks(size):
+            yield _BASE_CHARS[bases].tobytes().decode('ascii')
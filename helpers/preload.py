@@ -0,0 +1,65 @@
+"""
+This module contains the warm up routine which loads genetic code tables,
+dataset catalog and the shared sample corpus before the application starts
+serving requests.
+
+When application is served with gunicorn (see gunicorn_config.py), warm up
+runs once in the master process before workers are forked, so the loaded
+data is shared copy-on-write by all the workers.
+"""
+import gc as pygc
+import time
+from helpers.gc_data_helpers import load_all_gc_tables
+from helpers.gc_registry import load_all_codes
+from helpers.helper_functions import load_directory, load_sequence_choices
+from helpers.shared_corpus import create_corpus
+
+
+def warm_up(freeze=True, corpus=True):
+    """
+    This function loads all the genetic code tables and dataset catalog into
+    the module level caches, creates the shared corpus file and reports the
+    time spent on each step.
+    :param freeze: move the loaded objects to permanent generation of garbage
+    collector (python 3.7+), so that collections in forked workers do not
+    touch (and copy) the shared memory pages.
+    :param corpus: create shared corpus of sample sequences (see
+    helpers/shared_corpus.py).
+    :return: dictionary object containing time (seconds) for each step and
+    total time.
+    """
+    timings = {}
+    started = time.time()
+
+    step = time.time()
+    load_all_gc_tables()
+    load_all_codes()
+    timings['gc_tables'] = time.time() - step
+
+    step = time.time()
+    load_directory()
+    load_sequence_choices()
+    timings['catalog'] = time.time() - step
+
+    if corpus:
+        step = time.time()
+        create_corpus()
+        timings['corpus'] = time.time() - step
+
+    if freeze and hasattr(pygc, 'freeze'):
+        pygc.collect()
+        pygc.freeze()
+    timings['total'] = time.time() - started
+    return timings
+
+
+def within_budget(timings, budget):
+    """
+    This function checks the warm up timings against startup time budget.
+    :param timings: dictionary object returned by warm_up
+    :param budget: startup time budget in seconds. None or 0 disables check.
+    :return: True if total time is within budget, False otherwise.
+    """
+    if not budget:
+        return True
+    return timings.get('total', 0) <= budget
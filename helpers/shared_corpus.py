@@ -0,0 +1,220 @@
+"""
+This module keeps the sample sequences of dataset/ and their codon index
+arrays in a single memory mapped file.
+
+The file is created once at startup (in gunicorn master, see
+helpers/preload.py) and every worker maps it read-only, so the memory used by
+the corpus does not grow with the number of workers. File layout:
+    8 bytes     magic (b'DNACORP1')
+    8 bytes     length of json header (little endian unsigned integer)
+    header      json object {key: {"dna": [offset, length],
+                                   "codons": [[offset, length] x 3 frames]}}
+    data        cleaned sequences (ascii) and codon indexes (uint8), offsets
+                in header are relative to start of this section.
+"""
+import os
+import json
+import mmap
+import struct
+import tempfile
+from helpers.helper_functions import load_directory, dna_from_json, \
+    get_chosen_file_path
+
+_MAGIC = b'DNACORP1'
+_PREAMBLE = struct.Struct('<8sQ')
+
+# Environment variable used for passing corpus file path to workers.
+CORPUS_PATH_ENV = 'DNA_CORPUS_PATH'
+
+# Corpus attached by this process.
+_corpus = None
+
+
+class SharedCorpus(object):
+    """
+    Read-only view of corpus file.
+    """
+    __slots__ = ('path', '_file', '_map', '_index', '_data_start')
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'rb')
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, header_len = _PREAMBLE.unpack_from(self._map, 0)
+        if magic != _MAGIC:
+            self.close()
+            raise ValueError('Invalid corpus file: ' + path)
+        start = _PREAMBLE.size
+        self._index = json.loads(
+            self._map[start:start + header_len].decode('utf-8'))
+        self._data_start = start + header_len
+
+    def __contains__(self, key):
+        return key in self._index
+
+    def keys(self):
+        return list(self._index.keys())
+
+    def sequence_bytes(self, key):
+        """
+        This function returns cleaned sequence without copying it.
+        :param key: key of sequence in dataset directory.
+        :return: memoryview object of ascii bases.
+        """
+        offset, length = self._index[key]['dna']
+        offset += self._data_start
+        return memoryview(self._map)[offset:offset + length]
+
+    def sequence(self, key):
+        """
+        This function returns cleaned sequence as string.
+        :param key: key of sequence in dataset directory.
+        :return: DNA sequence (string)
+        """
+        return self.sequence_bytes(key).tobytes().decode('ascii')
+
+    def codon_indexes(self, key, frame=1):
+        """
+        This function returns precomputed codon indexes of a sequence.
+        :param key: key of sequence in dataset directory.
+        :param frame: open reading frame number e.g. 1, 2, 3
+        :return: read-only numpy array (uint8) backed by the shared memory.
+        """
+        import numpy as np
+        offset, length = self._index[key]['codons'][frame - 1]
+        offset += self._data_start
+        return np.frombuffer(self._map, dtype=np.uint8, count=length,
+                             offset=offset)
+
+    def close(self):
+        try:
+            self._map.close()
+        except (BufferError, ValueError):
+            # arrays exported from the map are still alive, leave it to gc.
+            pass
+        self._file.close()
+
+
+def build_corpus_file(path, sequences):
+    """
+    This function writes the corpus file for given sequences.
+    :param path: path of corpus file.
+    :param sequences: dictionary object mapping key to DNA sequence (string)
+    :return: path of corpus file.
+    """
+    from helpers.codon_helpers import clean_bases, bases_to_str, \
+        codon_indexes
+    blobs = []
+    index = {}
+    offset = 0
+    for key in sorted(sequences):
+        bases = clean_bases(sequences[key])
+        dna = bases_to_str(bases).encode('ascii')
+        entry = {'dna': [offset, len(dna)], 'codons': []}
+        blobs.append(dna)
+        offset += len(dna)
+        for frame in (1, 2, 3):
+            codons = codon_indexes(bases, frame).tobytes()
+            entry['codons'].append([offset, len(codons)])
+            blobs.append(codons)
+            offset += len(codons)
+        index[key] = entry
+
+    header = json.dumps(index).encode('utf-8')
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as corpus_file:
+        corpus_file.write(_PREAMBLE.pack(_MAGIC, len(header)))
+        corpus_file.write(header)
+        for blob in blobs:
+            corpus_file.write(blob)
+    os.rename(tmp_path, path)
+    return path
+
+
+def create_corpus(path=None):
+    """
+    This function loads all sequences listed in dataset directory, writes
+    them to corpus file and attaches it to this process. Path of the file is
+    exported through environment so that forked workers (and their children)
+    can attach the same file.
+    :param path: path of corpus file, default is a file in /dev/shm (or temp
+    directory if /dev/shm is not available).
+    :return: SharedCorpus object.
+    """
+    if path is None:
+        directory = '/dev/shm' if os.path.isdir('/dev/shm') else \
+            tempfile.gettempdir()
+        path = os.path.join(directory,
+                            'dna-lceb-corpus-{0}.bin'.format(os.getpid()))
+    sequences = {}
+    for key, entry in load_directory().items():
+        try:
+            sequences[key] = dna_from_json(file_path=entry['filePath'])['dna']
+        except (FileNotFoundError, KeyError, TypeError, ValueError):
+            # skip broken entries, they are served from json files (if at
+            # all).
+            continue
+    build_corpus_file(path, sequences)
+    os.environ[CORPUS_PATH_ENV] = path
+    return attach(path)
+
+
+def attach(path=None):
+    """
+    This function attaches corpus file (read-only) to this process.
+    :param path: path of corpus file, default is read from environment.
+    :return: SharedCorpus object or None if there is no corpus file.
+    """
+    global _corpus
+    path = path or os.environ.get(CORPUS_PATH_ENV)
+    if not path or not os.path.exists(path):
+        return None
+    if _corpus is not None and _corpus.path == path:
+        return _corpus
+    _corpus = SharedCorpus(path)
+    return _corpus
+
+
+def get_corpus():
+    """
+    This function returns corpus attached to this process, attaching it if
+    corpus file has been created by the parent process.
+    :return: SharedCorpus object or None
+    """
+    if _corpus is not None:
+        return _corpus
+    return attach()
+
+
+def release(unlink=False):
+    """
+    This function detaches corpus from this process.
+    :param unlink: remove corpus file as well (only done by the process which
+    created it).
+    :return:
+    """
+    global _corpus
+    if _corpus is None:
+        return
+    path = _corpus.path
+    _corpus.close()
+    _corpus = None
+    if unlink:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+        os.environ.pop(CORPUS_PATH_ENV, None)
+
+
+def load_sample_sequence(key):
+    """
+    This function returns sample sequence from dataset, using the shared
+    corpus if it is available.
+    :param key: key of sequence in dataset directory.
+    :return: DNA sequence (string)
+    """
+    corpus = get_corpus()
+    if corpus is not None and key in corpus:
+        return corpus.sequence(key)
+    return dna_from_json(file_path=get_chosen_file_path(key=key))['dna']
@@ -0,0 +1,124 @@
+"""
+This module implements encoder and decoder of the 2 bit binary transfer
+format for DNA sequences (content type application/x-dna-2bit).
+
+A message is an 8 byte magic string, sequence length (bases) as unsigned 64
+bit little endian integer and the bases packed 4 per byte, first base in the
+most significant bits, A=0, C=1, G=2, T=3 (see packed_sequence). Last byte is
+padded with A bases. Characters other than A, C, G, T are not transferred.
+"""
+import struct
+from helpers.packed_sequence import PackedSequence, pack_bases
+from helpers.codon_helpers import clean_bases
+
+MIMETYPE = 'application/x-dna-2bit'
+MAGIC = b'DNA2BIT\x01'
+
+_LENGTH = struct.Struct('<Q')
+HEADER_SIZE = len(MAGIC) + _LENGTH.size
+
+
+class FormatError(ValueError):
+    """
+    Raised when data is not a valid 2 bit encoded sequence.
+    """
+    pass
+
+
+def header(length):
+    """
+    This function returns header of an encoded sequence.
+    :param length: sequence length (bases)
+    :return: bytes
+    """
+    return MAGIC + _LENGTH.pack(length)
+
+
+def iter_encode(seq):
+    """
+    This function encodes a sequence piece by piece.
+    :param seq: DNA sequence (PackedSequence or string)
+    :return: generator of bytes-like objects.
+    """
+    seq = PackedSequence.from_string(seq)
+    yield header(len(seq))
+    for block in seq.packed_blocks():
+        yield block
+
+
+def encode(seq):
+    """
+    This function encodes a sequence.
+    :param seq: DNA sequence (PackedSequence or string)
+    :return: bytes
+    """
+    return b''.join(bytes(block) for block in iter_encode(seq))
+
+
+def iter_encode_text(stream, length, size=1 << 20):
+    """
+    This function encodes a sequence read from a text file containing only
+    bases (e.g. a stored result) without reading it at once.
+    :param stream: text file object.
+    :param length: number of bases in the file.
+    :param size: number of characters read at a time (multiple of 4)
+    :return: generator of bytes-like objects.
+    """
+    yield header(length)
+    while True:
+        piece = stream.read(size)
+        if not piece:
+            break
+        yield pack_bases(clean_bases(piece)).tobytes()
+
+
+def decode(data):
+    """
+    This function decodes an encoded sequence.
+    :param data: encoded sequence (bytes-like object)
+    :return: PackedSequence object.
+    :except FormatError: if data is not a valid encoded sequence.
+    """
+    data = memoryview(data)
+    length = _read_header(data[:HEADER_SIZE])
+    if len(data) - HEADER_SIZE != (length + 3) // 4:
+        raise FormatError('Size of 2 bit data does not match its length.')
+    return PackedSequence.from_packed(data[HEADER_SIZE:], length)
+
+
+def read(stream, max_length=None):
+    """
+    This function reads an encoded sequence from a binary file object.
+    :param stream: binary file object.
+    :param max_length: maximum length of sequence (bases), default=None i.e.
+    unlimited.
+    :return: PackedSequence object.
+    :except FormatError: if data is not a valid encoded sequence.
+    :except SequenceTooLong: if sequence exceeds max_length.
+    """
+    from helpers.fasta_helpers import SequenceTooLong
+    length = _read_header(stream.read(HEADER_SIZE))
+    if max_length is not None and length > max_length:
+        raise SequenceTooLong('Sequence is longer than {0} bases.'.format(
+            max_length))
+    size = (length + 3) // 4
+    data = bytearray(size)
+    done = 0
+    while done < size:
+        block = stream.read(min(size - done, 1 << 20))
+        if not block:
+            raise FormatError('2 bit data is shorter than its length.')
+        data[done:done + len(block)] = block
+        done += len(block)
+    return PackedSequence.from_packed(data, length)
+
+
+def _read_header(data):
+    """
+    This function checks header of an encoded sequence.
+    :param data: first HEADER_SIZE bytes.
+    :return: sequence length (bases)
+    """
+    if len(data) < HEADER_SIZE or bytes(data[:len(MAGIC)]) != MAGIC:
+        raise FormatError('Data is not a 2 bit encoded sequence.')
+    return _LENGTH.unpack(bytes(data[len(MAGIC):]))[0]
@@ -32,5 +32,190 @@ def test():
 def deploy():
     """Run deployment tasks."""
 
+
+@manager.option('-o', '--original', dest='original', required=True,
+                help='directory of original sequences')
+@manager.option('-w', '--watermarked', dest='watermarked', required=True,
+                help='directory of watermarked sequences (same file names)')
+@manager.option('-f', '--frame', dest='frame', type=int, default=1)
+@manager.option('-g', '--gc', dest='gc', type=int, default=1)
+def verify(original, watermarked, frame, gc):
+    """
+    This function verifies that watermarked sequences (FASTA files) code the
+    same proteins as original sequences and prints one line per file.
+    :return:
+    """
+    import sys
+    from app.common.verifier import verify_directory
+    failed = 0
+    print('file\tstatus\tcodons\tchanged\tmismatches\tfirst_mismatch')
+    for filename, result in verify_directory(original, watermarked,
+                                             frame=frame, gc=gc):
+        if result is None:
+            failed += 1
+            print('{0}\tmissing original'.format(filename))
+            continue
+        if not result['preserved']:
+            failed += 1
+        print('{name}\t{status}\t{codons}\t{changed_codons}\t'
+              '{mismatches}\t{first_mismatch}'.format(
+                  name=filename,
+                  status='ok' if result['preserved'] else 'FAILED',
+                  **result))
+    if failed:
+        sys.exit(1)
+
+
+@manager.command
+def compile_gc():
+    """
+    This function compiles NCBI translation tables to gc table files and
+    helpers/gc_tables_compiled.py (see helpers/build_gc_tables.py).
+    :return:
+    """
+    from helpers.build_gc_tables import build
+    print('Built genetic codes: ' + ', '.join(build()))
+
+
+@manager.command
+def warmup():
+    """
+    This function runs the warm up routine (which is run in gunicorn master
+    before forking workers) and checks its time against startup time budget.
+    :return:
+    """
+    import sys
+    from helpers.preload import warm_up, within_budget
+    from helpers.shared_corpus import release
+    timings = warm_up(freeze=False)
+    release(unlink=True)
+    for step in sorted(timings):
+        print('{step}: {time:.3f}s'.format(step=step, time=timings[step]))
+    budget = app.config.get('STARTUP_TIME_BUDGET')
+    if not within_budget(timings, budget):
+        print('Warm up exceeds startup time budget of {0:.3f}s'.format(budget))
+        sys.exit(1)
+
+
+@manager.option('-m', '--mix', dest='mix',
+                default='embed:1,extract:1,capacity:1',
+                help='request mix, operation:weight pairs')
+@manager.option('-s', '--sizes', dest='sizes', default='1000,10000,100000',
+                help='lengths (bases) of synthetic sequences')
+@manager.option('--samples', dest='samples', default=None,
+                help='keys of dataset samples (default: all, "" for none)')
+@manager.option('-d', '--duration', dest='duration', type=float, default=30)
+@manager.option('-c', '--concurrency', dest='concurrency', type=int,
+                default=8)
+@manager.option('-r', '--rate', dest='rate', type=float, default=None,
+                help='requests per second instead of fixed concurrency')
+@manager.option('-u', '--url', dest='url', default=None,
+                help='url of a running server (default: start gunicorn)')
+@manager.option('-w', '--workers', dest='workers', type=int, default=2)
+@manager.option('-k', '--worker-class', dest='worker_class', default=None,
+                help='gunicorn worker class, "asgi" for asgi.py')
+@manager.option('-o', '--output', dest='output', default=None,
+                help='path of json summary')
+def loadtest(mix, sizes, samples, duration, concurrency, rate, url, workers,
+             worker_class, output):
+    """
+    This function load tests the json api (see helpers/loadtest.py) and
+    prints throughput, latency percentiles, error rate and worker memory.
+    :return:
+    """
+    from helpers.loadtest import run, format_summary, write_summary
+    summary = run(mix=mix, sizes=[int(size) for size in sizes.split(',')
+                                  if size],
+                  samples=None if samples is None else
+                  [key for key in samples.split(',') if key],
+                  duration=duration, concurrency=concurrency, rate=rate,
+                  url=url, workers=workers, worker_class=worker_class)
+    print(format_summary(summary))
+    if output:
+        write_summary(summary, output)
+
+
+@manager.option('-u', '--update', dest='update', action='store_true',
+                help='write measurements as new budget')
+def membench(update):
+    """
+    This function measures peak memory per base of the engine stages (see
+    app/common/memory_benchmark.py) and checks it against the budget in
+    tests/memory_budget.json.
+    :return:
+    """
+    import sys
+    from app.common.memory_benchmark import run, load_budget, \
+        check_budget, update_budget, format_results
+    budget = load_budget()
+    results = run(budget['sizes'])
+    print(format_results(results))
+    if update:
+        update_budget(results, budget)
+        return
+    failures = check_budget(results, budget)
+    for failure in failures:
+        print(failure)
+    if failures:
+        sys.exit(1)
+
+
+@manager.option('operation', choices=('capacity', 'embed', 'extract'))
+@manager.option('-i', '--input', dest='path', default=None,
+                help='multi-FASTA file, may be gzip compressed')
+@manager.option('-d', '--dataset', dest='dataset', default=None,
+                choices=('json', 'mat'),
+                help='process dataset samples instead of a FASTA file')
+@manager.option('-o', '--output', dest='output', default='-',
+                help='FASTA (embed) or TSV output file, "-" for stdout')
+@manager.option('-e', '--errors', dest='errors', default=None,
+                help='TSV file of failed records (default: stderr)')
+@manager.option('-m', '--message', dest='message', default=None)
+@manager.option('-f', '--frame', dest='frame', type=int, default=1)
+@manager.option('-g', '--gc', dest='gc', type=int, default=1)
+@manager.option('-b', '--backend', dest='backend', default=None,
+                help='compute backend (default: ENGINE_BACKEND)')
+@manager.option('-w', '--workers', dest='workers', type=int, default=None,
+                help='worker processes (default: number of CPUs)')
+@manager.option('--window', dest='window', type=int, default=None,
+                help='maximum records in flight (default: 4 per worker)')
+@manager.option('--interval', dest='interval', type=float, default=10,
+                help='seconds between progress reports')
+def batch(operation, path, dataset, output, errors, message, frame, gc,
+          backend, workers, window, interval):
+    """
+    This function runs capacity, embed or extract over all records of a
+    multi-FASTA file or of the dataset (see app/common/batch.py) and
+    reports progress and throughput on stderr.
+    :return:
+    """
+    import sys
+    from app.common import batch as batch_run
+    if (path is None) == (dataset is None):
+        print('Choose either --input or --dataset.', file=sys.stderr)
+        sys.exit(2)
+    records = batch_run.fasta_records(path) if path is not None else \
+        batch_run.dataset_records(dataset)
+    out = sys.stdout if output == '-' else open(output, 'w')
+    err = sys.stderr if errors is None else open(errors, 'w')
+    try:
+        progress = batch_run.run(
+            records, operation, out, frame=frame, gc=gc, message=message,
+            backend=backend or app.config.get('ENGINE_BACKEND'),
+            workers=workers, window=window,
+            width=app.config['FASTA_LINE_WIDTH'],
+            progress=batch_run.Progress(sys.stderr, interval), errors=err)
+    except ValueError as e:
+        print(str(e), file=sys.stderr)
+        sys.exit(2)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+        if err is not sys.stderr:
+            err.close()
+    print(progress.format(), file=sys.stderr)
+    if progress.failed:
+        sys.exit(1)
+
 if __name__ == "__main__":
     manager.run()
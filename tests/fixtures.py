@@ -0,0 +1,34 @@
+"""
+Helpers shared by the tests: random payloads and a test case posting json
+to the restapi.
+"""
+import json
+import random
+import unittest
+from app import create_app
+
+
+def random_payload(size, seed=1):
+    """
+    This function generates a random binary payload.
+    :param size: number of bytes.
+    :param seed: seed of random generator.
+    :return: bytes
+    """
+    rnd = random.Random(seed)
+    return bytes(rnd.randint(0, 255) for _ in range(size))
+
+
+class ApiTestCase(unittest.TestCase):
+    """
+    Test case running requests against an application created with the
+    testing configuration.
+    """
+
+    def setUp(self):
+        self.app = create_app('testing')
+        self.client = self.app.test_client()
+
+    def _post(self, path, **data):
+        return self.client.post('/api/v1.0/' + path, data=json.dumps(data),
+                                content_type='application/json')
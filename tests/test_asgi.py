@@ -0,0 +1,222 @@
+"""
+Tests for the asgi server (see app/asgi.py): api requests handled on the
+event loop must be answered like the Flask views answer them, other
+requests must be passed to Flask.
+"""
+import io
+import gzip
+import json
+import asyncio
+import unittest
+from unittest import mock
+from helpers import twobit_format
+from helpers.packed_sequence import PackedSequence
+from app import create_app
+from app.asgi import AsgiApp
+from app.common.logging import current_request_id
+from app.common.memory_benchmark import synthetic_input
+
+SEQUENCE = synthetic_input(3000)
+
+
+class AsgiTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app('testing')
+        self.app.config['MAX_CONTENT_LENGTH'] = 100000
+        self.app.config['MAX_SEQUENCE_LENGTH'] = 20000
+        self.client = self.app.test_client()
+        self.asgi = AsgiApp(self.app)
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+
+    def tearDown(self):
+        self.asgi.shutdown()
+        self.loop.close()
+        asyncio.set_event_loop(None)
+
+    def _asgi(self, path, body=b'', headers=None, method='POST',
+              query_string=b'', pieces=3):
+        """
+        This function sends a request to the asgi application, body is
+        received in a few pieces.
+        :return: tuple (status, headers (lower case names), body)
+        """
+        size = max(1, -(-len(body) // pieces))
+        messages = [{'type': 'http.request', 'body': body[i:i + size],
+                     'more_body': i + size < len(body)}
+                    for i in range(0, len(body), size)] or \
+            [{'type': 'http.request', 'body': b''}]
+        sent = []
+
+        async def receive():
+            return messages.pop(0)
+
+        async def send(message):
+            sent.append(message)
+
+        scope = {'type': 'http', 'method': method, 'path': path,
+                 'root_path': '', 'query_string': query_string,
+                 'headers': [(name.lower().encode('latin-1'),
+                              value.encode('latin-1'))
+                             for name, value in (headers or {}).items()]}
+        self.loop.run_until_complete(self.asgi(scope, receive, send))
+        response_headers = dict((name.decode('latin-1'),
+                                 value.decode('latin-1'))
+                                for name, value in sent[0]['headers'])
+        data = b''.join(message.get('body', b'') for message in sent[1:])
+        if response_headers.get('content-encoding') == 'gzip':
+            data = gzip.decompress(data)
+        return sent[0]['status'], response_headers, data
+
+    def _both(self, path, body, content_type='application/json',
+              headers=None, query_string=b''):
+        """
+        This function sends the same request to the asgi application and to
+        the Flask application.
+        :return: tuple of tuples (status, body) (asgi, Flask)
+        """
+        headers = dict(headers or {}, **{'Content-Type': content_type})
+        status, response_headers, data = self._asgi(
+            path, body, headers, query_string=query_string)
+        response = self.client.post(path, data=body, headers=headers,
+                                    query_string=query_string.decode())
+        flask_data = response.get_data()
+        if response.headers.get('Content-Encoding') == 'gzip':
+            flask_data = gzip.decompress(flask_data)
+        return (status, data), (response.status_code, flask_data)
+
+    def _json(self, path, **data):
+        (status, body), (flask_status, flask_body) = self._both(
+            path, json.dumps(data).encode('utf-8'))
+        self.assertEqual(status, flask_status)
+        result = json.loads(body.decode('utf-8'))
+        self.assertEqual(result, json.loads(flask_body.decode('utf-8')))
+        return status, result
+
+    def test_operations(self):
+        with mock.patch.object(self.asgi, '_call_flask',
+                               wraps=self.asgi._call_flask) as call_flask:
+            status, result = self._json('/api/v1.0/capacity',
+                                        sequence=SEQUENCE)
+            self.assertEqual(status, 200)
+            self.assertTrue(result['capacity'] > 0)
+            status, result = self._json('/api/v1.0/embed',
+                                        sequence=SEQUENCE, message='asgi')
+            self.assertEqual(status, 200)
+            status, result = self._json('/api/v1.0/extract',
+                                        sequence=result['sequence'], gc=1)
+            self.assertEqual((status, result['message']), (200, 'asgi'))
+            self.assertFalse(call_flask.called)
+
+    def test_twobit(self):
+        seq = PackedSequence.from_string(SEQUENCE)
+        (status, body), (flask_status, flask_body) = self._both(
+            '/api/v1.0/embed', twobit_format.encode(seq),
+            content_type=twobit_format.MIMETYPE,
+            headers={'Accept': twobit_format.MIMETYPE},
+            query_string=b'message=asgi')
+        self.assertEqual((status, flask_status), (200, 200))
+        self.assertEqual(body, flask_body)
+        wm_seq = twobit_format.read(io.BytesIO(body))
+        self.assertEqual(self._json('/api/v1.0/extract',
+                                    sequence=wm_seq.to_string())[1]
+                         ['message'], 'asgi')
+
+    def test_gzip(self):
+        body = gzip.compress(json.dumps(dict(sequence=SEQUENCE,
+                                             message='gzip')).encode())
+        (status, data), (flask_status, flask_data) = self._both(
+            '/api/v1.0/embed', body, headers={'Content-Encoding': 'gzip',
+                                              'Accept-Encoding': 'gzip'})
+        self.assertEqual((status, flask_status), (200, 200))
+        self.assertEqual(json.loads(data.decode()),
+                         json.loads(flask_data.decode()))
+        (status, data), (flask_status, flask_data) = self._both(
+            '/api/v1.0/embed', body[:-10],
+            headers={'Content-Encoding': 'gzip'})
+        self.assertEqual((status, flask_status), (400, 400))
+
+    def test_errors(self):
+        # validation errors.
+        self.assertEqual(self._json('/api/v1.0/embed',
+                                    sequence=SEQUENCE)[0], 400)
+        self.assertEqual(self._json('/api/v1.0/extract',
+                                    sequence='acgt' * 100)[0], 400)
+        self.assertEqual(self._json('/api/v1.0/capacity')[0], 400)
+        (status, body), (flask_status, flask_body) = self._both(
+            '/api/v1.0/capacity', b'[1, 2]')
+        self.assertEqual((status, flask_status), (400, 400))
+        self.assertEqual(json.loads(body.decode()),
+                         json.loads(flask_body.decode()))
+        # uploaded sequence exceeds MAX_SEQUENCE_LENGTH.
+        (status, body), (flask_status, flask_body) = self._both(
+            '/api/v1.0/capacity', '>seq\n{0}\n'.format(
+                synthetic_input(30000)).encode(), content_type='text/x-fasta')
+        self.assertEqual((status, flask_status), (413, 413))
+        self.assertEqual(json.loads(body.decode()),
+                         json.loads(flask_body.decode()))
+        # body exceeds MAX_CONTENT_LENGTH, also once decompressed.
+        body = json.dumps(dict(sequence='a' * 200000)).encode()
+        (status, data), (flask_status, flask_data) = self._both(
+            '/api/v1.0/capacity', body)
+        self.assertEqual((status, flask_status), (413, 413))
+        self.assertEqual(self._asgi('/api/v1.0/capacity', gzip.compress(body),
+                                    {'Content-Type': 'application/json',
+                                     'Content-Encoding': 'gzip'})[0], 413)
+
+    def test_request_id(self):
+        body = json.dumps(dict(sequence=SEQUENCE)).encode()
+        headers = {'Content-Type': 'application/json',
+                   'X-Request-ID': 'asgi-1'}
+        self.assertEqual(self._asgi('/api/v1.0/capacity', body, headers)[1]
+                         ['x-request-id'], 'asgi-1')
+        generated = self._asgi('/api/v1.0/capacity', body,
+                               {'Content-Type': 'application/json'})[1]
+        self.assertTrue(generated['x-request-id'])
+        # steps of the request run in threads logging with its id.
+        ids = []
+
+        def failing(*args):
+            ids.append(current_request_id())
+            raise RuntimeError('failed')
+
+        with mock.patch('app.asgi.read_operation', side_effect=failing):
+            status, headers, data = self._asgi('/api/v1.0/capacity', body,
+                                               headers)
+        self.assertEqual((status, ids), (500, ['asgi-1']))
+        self.assertIsNone(current_request_id())
+
+    def test_flask_fallback(self):
+        with mock.patch.object(self.asgi, '_call_flask',
+                               wraps=self.asgi._call_flask) as call_flask:
+            # multipart upload.
+            boundary = 'asgi-boundary'
+            body = ('--{0}\r\nContent-Disposition: form-data; name="file"; '
+                    'filename="seq.fa"\r\nContent-Type: text/plain\r\n\r\n'
+                    '>seq\n{1}\n\r\n--{0}--\r\n').format(
+                        boundary, SEQUENCE).encode()
+            status, headers, data = self._asgi(
+                '/api/v1.0/capacity', body,
+                {'Content-Type': 'multipart/form-data; boundary=' +
+                 boundary})
+            self.assertEqual(call_flask.call_count, 1)
+            self.assertEqual(status, 200)
+            self.assertEqual(
+                json.loads(data.decode()),
+                self._json('/api/v1.0/capacity', sequence=SEQUENCE)[1])
+            # job submission.
+            status, headers, data = self._asgi(
+                '/api/v1.0/capacity', json.dumps(dict(
+                    sequence=SEQUENCE, **{'async': True})).encode(),
+                {'Content-Type': 'application/json'})
+            self.assertEqual(call_flask.call_count, 2)
+            self.assertEqual(status, 202)
+            # other requests.
+            status, headers, data = self._asgi('/', method='GET')
+            self.assertEqual(call_flask.call_count, 3)
+            self.assertEqual(status, 200)
+
+
+if __name__ == '__main__':
+    unittest.main()
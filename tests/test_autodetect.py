@@ -0,0 +1,56 @@
+"""
+Tests for extraction with automatic detection of reading frame, strand and
+genetic code (see app/common/autodetect.py).
+"""
+import unittest
+from helpers.packed_sequence import PackedSequence
+from app.common.autodetect import detect_and_extract, _rank
+from app.common.vector_engine import embed
+
+SEQUENCE = 'atg' + 'gctaaattt' * 40 + 'taa'
+
+# Default AUTODETECT_GCS (see config.py)
+GCS = (1, 2, 4, 6, 10, 11)
+
+
+def _candidate(message, gc=1, capacity=160):
+    return dict(frame=1, strand='+', gc=gc, length=len(message),
+                capacity=capacity, message=message, score=1.0)
+
+
+class AutodetectTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.wm_seq = embed(PackedSequence.from_string(SEQUENCE), 'hi')
+
+    def test_default_codes(self):
+        # genetic code 2 decodes a single printable character here.
+        candidates = detect_and_extract(self.wm_seq, gcs=GCS)
+        self.assertIn('4', [c['message'] for c in candidates])
+        self.assertEqual((candidates[0]['message'], candidates[0]['gc'],
+                          candidates[0]['frame'], candidates[0]['strand']),
+                         ('hi', 1, 1, '+'))
+
+    def test_requested_code(self):
+        candidates = detect_and_extract(self.wm_seq, gcs=GCS, gc=4)
+        self.assertEqual((candidates[0]['message'], candidates[0]['gc']),
+                         ('hi', 4))
+
+    def test_ranking(self):
+        # longer printable messages are less likely to be decoded from
+        # random codons.
+        self.assertLess(_rank(_candidate('hello'), 1),
+                        _rank(_candidate('hi'), 1))
+        # as are messages fitting in a smaller capacity.
+        self.assertLess(_rank(_candidate('hi', capacity=100), 1),
+                        _rank(_candidate('hi', capacity=1000), 1))
+        self.assertLess(_rank(_candidate('hi', gc=11), 1),
+                        _rank(_candidate('4'), 1))
+        self.assertLess(_rank(_candidate('hi'), 4),
+                        _rank(_candidate('hi', gc=11), 4))
+        self.assertLess(_rank(_candidate('hi', gc=4), 4),
+                        _rank(_candidate('hi'), 4))
+
+
+if __name__ == '__main__':
+    unittest.main()
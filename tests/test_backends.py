@@ -0,0 +1,67 @@
+"""
+Tests for selection of compute backends (see app/common/backends), results
+of the backends are compared in test_differential.py.
+"""
+import json
+import unittest
+from unittest import mock
+from app.common import backends
+from app.common.backends import NumpyBackend
+from fixtures import ApiTestCase
+
+SEQUENCE = 'atg' + 'gctaaattt' * 20 + 'taa'
+
+
+class BackendSelectionTestCase(unittest.TestCase):
+
+    def test_auto(self):
+        self.assertEqual(backends.get_backend().name, 'numpy')
+        self.assertIs(backends.get_backend('auto'),
+                      backends.get_backend('numpy'))
+
+    def test_unavailable(self):
+        # a backend which can not run in current environment is skipped.
+        with mock.patch.object(NumpyBackend, 'is_available',
+                               return_value=False):
+            self.assertEqual(backends.available_backends(), ['reference'])
+            self.assertEqual(backends.get_backend().name, 'reference')
+            with self.assertRaises(backends.BackendUnavailable):
+                backends.get_backend('numpy')
+
+    def test_unknown(self):
+        with self.assertRaises(backends.BackendUnavailable):
+            backends.get_backend('gpu')
+
+
+class BackendOverrideTestCase(ApiTestCase):
+
+    def test_override(self):
+        results = {}
+        for name in ('numpy', 'reference'):
+            response = self._post('embed', sequence=SEQUENCE,
+                                  message='hi', backend=name)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.headers['X-Engine-Backend'], name)
+            results[name] = json.loads(response.get_data(as_text=True))
+        self.assertEqual(results['numpy']['sequence'],
+                         results['reference']['sequence'])
+        response = self._post('capacity', sequence=SEQUENCE,
+                              backend='reference')
+        self.assertEqual(response.headers['X-Engine-Backend'], 'reference')
+        self.assertEqual(
+            json.loads(response.get_data(as_text=True))['capacity'],
+            backends.get_backend('numpy').capacity(SEQUENCE))
+
+    def test_invalid_override(self):
+        response = self._post('extract', sequence=SEQUENCE, backend='gpu')
+        self.assertEqual(response.status_code, 400)
+        self.app.config['ENGINE_BACKEND_OVERRIDE'] = False
+        response = self._post('extract', sequence=SEQUENCE,
+                              backend='reference')
+        self.assertEqual(response.status_code, 400)
+        response = self._post('extract', sequence=SEQUENCE)
+        self.assertEqual(response.headers['X-Engine-Backend'], 'numpy')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+"""
+Tests for batch processing of multi-FASTA files (see app/common/batch.py).
+"""
+import io
+import gzip
+import os
+import shutil
+import tempfile
+import unittest
+from helpers.packed_sequence import PackedSequence
+from app.common import batch
+from app.common.memory_benchmark import synthetic_input
+
+MESSAGE = 'batch\tmessage'
+
+
+class BatchTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'records.fa.gz')
+        self.records = [('record_{0}'.format(i), synthetic_input(length))
+                        for i, length in enumerate((3000, 600, 9000, 30))]
+        with gzip.open(self.path, 'wt') as fasta:
+            for header, seq in self.records:
+                fasta.write('>{0}\n{1}\n'.format(header, seq))
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def _run(self, records, operation, **kwargs):
+        out = io.StringIO()
+        errors = io.StringIO()
+        progress = batch.run(records, operation, out, errors=errors,
+                             **kwargs)
+        return progress, out.getvalue(), errors.getvalue()
+
+    def test_embed_extract(self):
+        for workers in (0, 2):
+            progress, fasta, errors = self._run(
+                batch.fasta_records(self.path), 'embed', message=MESSAGE,
+                workers=workers, window=2)
+            # the shortest record is too short for the message.
+            self.assertEqual((progress.records, progress.failed), (4, 1))
+            self.assertEqual(errors.split('\t')[0], 'record_3')
+            path = os.path.join(self.directory, 'watermarked.fa')
+            with open(path, 'w') as out:
+                out.write(fasta)
+            progress, tsv, errors = self._run(batch.fasta_records(path),
+                                              'extract', workers=workers)
+            lines = tsv.splitlines()
+            self.assertEqual(lines[0], 'name\tlength\tstatus\tmessage')
+            self.assertEqual([line.split('\t')[0] for line in lines[1:]],
+                             ['record_0', 'record_1', 'record_2'])
+            for line in lines[1:]:
+                self.assertTrue(line.endswith('\tok\tbatch\\tmessage'))
+
+    def test_capacity(self):
+        progress, tsv, errors = self._run(batch.fasta_records(self.path),
+                                          'capacity', workers=0)
+        rows = [line.split('\t') for line in tsv.splitlines()[1:]]
+        lengths = [len(PackedSequence.from_string(seq))
+                   for header, seq in self.records]
+        self.assertEqual([int(row[1]) for row in rows], lengths)
+        self.assertEqual(progress.bases, sum(lengths))
+        self.assertTrue(int(rows[2][3]) > int(rows[0][3]))
+
+    def test_fasta_output(self):
+        seq = batch.process_record('embed', 'auto', self.records[0][1],
+                                   message='hi')[1]
+        out = io.StringIO()
+        batch.write_fasta(out, 'wm', seq, width=70)
+        lines = out.getvalue().splitlines()
+        self.assertEqual(lines[0], '>wm')
+        self.assertTrue(all(len(line) == 70 for line in lines[1:-1]))
+        self.assertEqual(''.join(lines[1:]), seq.to_string())
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            self._run(iter([]), 'embed')
+        with self.assertRaises(ValueError):
+            self._run(iter([]), 'translate')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,40 @@
+"""
+Tests for the capacity index (see app/common/capacity_index.py).
+"""
+import unittest
+from helpers.packed_sequence import PackedSequence
+from app.common.capacity_index import build_capacity_index, \
+    get_capacity_index
+from app.common.memory_benchmark import synthetic_input
+
+
+class CapacityIndexTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.seq = synthetic_input(3000)
+        self.index = build_capacity_index(self.seq)
+
+    def test_min_span(self):
+        prefix = self.index.prefix
+        for bits in (1, 2, 17, 100, self.index.total):
+            # shortest range of codons by brute force.
+            shortest = min(last - first
+                           for first in range(len(prefix))
+                           for last in range(first, len(prefix))
+                           if prefix[last] - prefix[first] >= bits)
+            start, end = self.index.min_span(bits)
+            self.assertEqual((end - start) // 3, shortest)
+            self.assertGreaterEqual(self.index.capacity(start, end), bits)
+            self.assertEqual(self.index.min_span(bits), (start, end))
+        self.assertIsNone(self.index.min_span(self.index.total + 1))
+
+    def test_packed_sequence(self):
+        packed = PackedSequence.from_string(self.seq)
+        index = get_capacity_index(packed, frame=2)
+        self.assertIs(get_capacity_index(self.seq, frame=2), index)
+        self.assertEqual(index.total,
+                         build_capacity_index(self.seq, frame=2).total)
+
+
+if __name__ == '__main__':
+    unittest.main()
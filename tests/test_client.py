@@ -0,0 +1,102 @@
+"""
+Tests for dna_lceb_client against a local instance of the application.
+"""
+import random
+import threading
+import unittest
+from werkzeug.serving import make_server
+from helpers.codon_helpers import coding_sequence
+from app import create_app
+from dna_lceb_client import Client, ClientError
+
+class ClientTestCase(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = create_app('testing')
+        cls.server = make_server('127.0.0.1', 0, cls.app, threaded=True)
+        cls.thread = threading.Thread(target=cls.server.serve_forever)
+        cls.thread.daemon = True
+        cls.thread.start()
+        cls.base_url = 'http://127.0.0.1:{0}/api/v1.0'.format(
+            cls.server.server_port)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.thread.join()
+
+    def setUp(self):
+        self.client = Client(self.base_url, max_workers=4, poll_interval=0.05,
+                             timeout=30)
+
+    def tearDown(self):
+        self.client.close()
+
+    def test_embed_extract(self):
+        seq = coding_sequence(300, random.Random(1))
+        result = self.client.embed(seq, 'hello', verify=True)
+        self.assertEqual(len(result['sequence']), len(seq))
+        self.assertTrue(result['verification']['preserved'])
+        self.assertEqual(self.client.extract(result['sequence'])['message'],
+                         'hello')
+
+    def test_capacity(self):
+        result = self.client.capacity(coding_sequence(300, random.Random(1)))
+        self.assertGreater(result['capacity'], 16 + 8 * 5)
+        self.assertEqual(result['frame'], 1)
+
+    def test_large_sequences_use_jobs(self):
+        seq = coding_sequence(300, random.Random(2))
+        direct = self.client.embed(seq, 'job')
+        self.client.job_threshold = 100
+        job = self.client.embed(seq, 'job')
+        self.assertEqual(job['sequence'], direct['sequence'])
+        self.assertEqual(self.client.extract(job['sequence'])['message'],
+                         'job')
+        with Client(self.base_url) as direct_client:
+            self.assertEqual(self.client.capacity(seq)['capacity'],
+                             direct_client.capacity(seq)['capacity'])
+            # no coding region, both paths raise the same error.
+            with self.assertRaises(ClientError) as context:
+                direct_client.extract('acgt' * 100)
+        with self.assertRaises(ClientError) as job_context:
+            self.client.extract('acgt' * 100)
+        self.assertEqual(str(job_context.exception), str(context.exception))
+        self.assertEqual(job_context.exception.status_code, 400)
+        with self.assertRaises(ValueError):
+            self.client.embed(seq, 'job', verify=True)
+
+    def test_compressed_requests(self):
+        self.client.compress_threshold = 0
+        seq = coding_sequence(300, random.Random(3))
+        wm = self.client.embed(seq, 'gzip')['sequence']
+        self.assertEqual(self.client.extract(wm)['message'], 'gzip')
+
+    def test_map(self):
+        seqs = [coding_sequence(200, random.Random(seed))
+                for seed in range(10)]
+        messages = ['msg{0}'.format(i) for i in range(10)]
+        embedded = self.client.map('embed', [
+            dict(sequence=seq, message=msg)
+            for seq, msg in zip(seqs, messages)])
+        extracted = self.client.map('extract', [
+            dict(sequence=result['sequence']) for result in embedded])
+        self.assertEqual([result['message'] for result in extracted],
+                         messages)
+
+    def test_translate(self):
+        self.assertEqual(self.client.translate(['atgttttaa', 'atgaaa']),
+                         ['MF*', 'MK'])
+
+    def test_errors(self):
+        with self.assertRaises(ClientError) as context:
+            self.client.embed(coding_sequence(10, random.Random(1)),
+                              'too long message ' * 10)
+        self.assertEqual(context.exception.status_code, 400)
+        with self.assertRaises(ClientError):
+            self.client.extract('acgt', gc=999)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+"""
+Tests for gzip encoded request bodies (see app/common/compression.py).
+"""
+import io
+import gzip
+import unittest
+from app.common.compression import GzipRequestMiddleware
+
+
+class _SocketStream(io.BytesIO):
+    """
+    Request body of a keep-alive connection: reading past the body would
+    wait for the next request.
+    """
+    def read(self, size=-1):
+        if size != 0 and self.tell() >= len(self.getvalue()):
+            raise AssertionError('read past end of request body')
+        return super(_SocketStream, self).read(size)
+
+
+def _echo(environ, start_response):
+    body = environ['wsgi.input'].read(int(environ['CONTENT_LENGTH']))
+    start_response('200 OK', [('Content-Type', 'text/plain')])
+    return [body]
+
+
+class GzipRequestTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.middleware = GzipRequestMiddleware(_echo, max_size=1000)
+
+    def _call(self, body, **environ):
+        statuses = []
+        environ = dict({'HTTP_CONTENT_ENCODING': 'gzip',
+                        'CONTENT_LENGTH': str(len(body)),
+                        'wsgi.input': _SocketStream(body)}, **environ)
+        result = b''.join(self.middleware(
+            environ, lambda status, headers: statuses.append(status)))
+        return statuses[0].split()[0], result
+
+    def test_decompress(self):
+        self.assertEqual(self._call(gzip.compress(b'sequence')),
+                         ('200', b'sequence'))
+
+    def test_errors(self):
+        body = gzip.compress(b'sequence')
+        self.assertEqual(self._call(body[:-4])[0], '400')
+        self.assertEqual(self._call(body, CONTENT_LENGTH=str(len(body) + 5))
+                         [0], '400')
+        self.assertEqual(self._call(b'not gzip')[0], '400')
+        self.assertEqual(self._call(gzip.compress(b'a' * 2000))[0], '413')
+        self.assertEqual(self._call(body, CONTENT_LENGTH='')[0], '411')
+        self.assertEqual(self._call(body, HTTP_TRANSFER_ENCODING='chunked')
+                         [0], '411')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,397 @@
+"""
+Differential tests of the compute backends (see app/common/backends)
+against the reference implementation (_clean_dna, find_coding_region,
+embed_data, extract_data etc. of app_helpers), which serves as the oracle.
+
+Cases (sequence, message, frame, genetic code) are generated at random and
+from adversarial pieces: trailing partial codons, regions without stop
+codon, runs of 2/3 fold codons ending on 4 fold codons (one bit left for a
+4 fold codon), mixed case and characters which are not bases. A failing case
+is shrunk to a minimal reproducer which is shown in the failure message.
+
+Number of cases and seed can be set with DIFFERENTIAL_CASES and
+DIFFERENTIAL_SEED environment variables.
+"""
+import os
+import random
+import unittest
+from collections import namedtuple
+from helpers.codon_helpers import STOP_CODONS, random_codons
+from helpers.gc_file_helpers import gc_file_associations
+from helpers.gc_data_helpers import get_gc_table, get_aa_using_codon_gct
+from helpers.gc_tables_compiled import AA_KEYS, AA_SYMBOLS
+from app.common import app_helpers, backends
+
+Case = namedtuple('Case', 'seq message frame gc')
+
+CASES = int(os.environ.get('DIFFERENTIAL_CASES') or 300)
+SEED = int(os.environ.get('DIFFERENTIAL_SEED') or 20161201)
+
+GCS = sorted(gc_file_associations.keys(), key=int)
+
+# 2/3 fold codons (carrying 1 bit each) and 4 fold codons (carrying 2 bits)
+# of the standard genetic code.
+_TWO_FOLD = ('ttt', 'ttc', 'tat', 'tac', 'cat', 'cac', 'caa', 'cag', 'aat',
+             'aac', 'aaa', 'aag', 'gat', 'gac', 'gaa', 'gag', 'tgt', 'tgc')
+_FOUR_FOLD = ('gct', 'gcc', 'gca', 'gcg', 'ggt', 'ggc', 'gga', 'ggg', 'cct',
+              'ccc', 'cca', 'ccg', 'act', 'acc', 'aca', 'acg', 'gtt', 'gtc',
+              'gta', 'gtg')
+
+
+def _piece(rnd):
+    """
+    This function generates a piece of a sequence.
+    :param rnd: random.Random object.
+    :return: string
+    """
+    kind = rnd.randint(0, 5)
+    if kind == 0:
+        # random bases, may contain start and stop codons.
+        return ''.join(rnd.choice('acgt') for _ in range(rnd.randint(0, 40)))
+    if kind == 1:
+        # terminated coding region.
+        return 'atg' + random_codons(rnd, rnd.randint(0, 30)) + \
+            rnd.choice(STOP_CODONS)
+    if kind == 2:
+        # coding region without stop codon.
+        return 'atg' + random_codons(rnd, rnd.randint(0, 30))
+    if kind == 3:
+        # 2/3 fold codons followed by 4 fold codons, so that a 4 fold codon
+        # is left with a single bit.
+        return 'atg' + random_codons(rnd, rnd.randint(1, 9), _TWO_FOLD) + \
+            random_codons(rnd, rnd.randint(1, 4), _FOUR_FOLD) + \
+            rnd.choice(('', 'taa'))
+    if kind == 4:
+        # start and stop codons only.
+        return ''.join(rnd.choice(('atg',) + STOP_CODONS)
+                       for _ in range(rnd.randint(1, 6)))
+    # characters which are not bases.
+    return ''.join(rnd.choice('nNx-\n 01') for _ in range(rnd.randint(1, 3)))
+
+
+def random_case(rnd):
+    """
+    This function generates a test case.
+    :param rnd: random.Random object.
+    :return: Case object.
+    """
+    seq = ''.join(_piece(rnd) for _ in range(rnd.randint(0, 8)))
+    # trailing partial codon.
+    seq += ''.join(rnd.choice('acgt') for _ in range(rnd.randint(0, 2)))
+    if rnd.random() < 0.3:
+        seq = ''.join(c.upper() if rnd.random() < 0.5 else c for c in seq)
+    length = rnd.choice((0, 1, 1, 2, rnd.randint(1, 6), rnd.randint(1, 40)))
+    message = ''.join(chr(rnd.choice((rnd.randint(32, 126),
+                                      rnd.randint(0, 255))))
+                      for _ in range(length))
+    gc = rnd.choice(('1', '1', rnd.choice(GCS)))
+    return Case(seq, message, rnd.randint(1, 3), gc)
+
+
+EDGE_CASES = [
+    Case('', 'a', 1, '1'),
+    Case('atg', 'a', 1, '1'),
+    Case('atgtaa', 'a', 1, '1'),
+    Case('atgaaa', 'a', 1, '1'),
+    Case('atgaaat', 'a', 2, '1'),
+    Case('aatgaaagcttaa', 'a', 2, '1'),
+    Case('atgaaagctgcttaa', 'a', 1, '1'),
+    Case('atgttttttttttttttttttttttttttttttttttgcttaa', 'a', 1, '1'),
+    Case('ATGCCCCCCTAGNNatgaaa\n', 'hi', 1, '1'),
+    Case('atg' + 'gct' * 20 + 'taa', '', 1, '1'),
+    Case('atg' + 'gct' * 20 + 'taa', 'x' * 40, 1, '11'),
+]
+
+
+def _frame_length(seq, frame):
+    """
+    This function returns length of the reading frame as sliced by
+    embed_data.
+    :param seq: cleaned sequence.
+    :param frame: reading frame number.
+    :return: integer
+    """
+    return len(seq[frame - 1:len(seq) - len(seq) % 3 + frame - 1])
+
+
+def _call(fn, *args, **kwargs):
+    try:
+        return fn(*args, **kwargs)
+    except Exception:
+        # reference functions raise for some invalid inputs, e.g. empty
+        # message, where the engines return None.
+        return None
+
+
+def reference_regions(case):
+    return _call(app_helpers.find_coding_region, case.seq, case.frame,
+                 case.gc)
+
+
+def reference_capacity(case):
+    """
+    This function returns number of bits which embed_data can embed, i.e.
+    capacity of codons of coding regions without their stop codons. Stop
+    codons are counted by find_capacity, so it is not compared with the
+    backends.
+    :param case: Case object.
+    :return: capacity (bits) or None.
+    """
+    region = reference_regions(case)
+    if region is None:
+        return None
+    gct = get_gc_table(gc_file_associations.get(str(case.gc)))
+    seq = app_helpers._clean_dna(case.seq)
+    dna = seq[case.frame - 1:len(seq) - len(seq) % 3 + case.frame - 1]
+    bits = 0
+    for rc in range(len(region)):
+        # same codons as visited by embed_data.
+        for j in range(region.starts[rc], region.stop(rc, len(dna)) - 3, 3):
+            fold = app_helpers._fold(
+                get_aa_using_codon_gct(gct, dna[j:j + 3]))
+            bits += 2 if fold > 3 else 1 if fold > 1 else 0
+    return bits
+
+
+def reference_encode(message):
+    return _call(lambda: app_helpers._int_to_bin_str(len(message)) +
+                 app_helpers.str_to_bin(message))
+
+
+def reference_translate(case):
+    """
+    This function translates reading frame of a case codon by codon with
+    the genetic code table.
+    :param case: Case object.
+    :return: protein (string, 1 letter notation)
+    """
+    gct = get_gc_table(gc_file_associations.get(str(case.gc)))
+    seq = app_helpers._clean_dna(case.seq)
+    protein = ''
+    for i in range(case.frame - 1, len(seq) - 2, 3):
+        aa = get_aa_using_codon_gct(gct, seq[i:i + 3])
+        protein += AA_SYMBOLS[AA_KEYS.index(aa['key'])]
+    return protein
+
+
+def _oracle(prop, case):
+    """
+    This function computes expected result of a property.
+    :param prop: name of property (see PROPERTIES)
+    :param case: Case object.
+    :return: expected result.
+    """
+    if prop == 'clean':
+        return app_helpers._clean_dna(case.seq)
+    if prop == 'encode':
+        return reference_encode(case.message)
+    if prop == 'translate':
+        return reference_translate(case)
+    if prop == 'regions':
+        return reference_regions(case)
+    if prop == 'capacity':
+        return reference_capacity(case)
+    region = reference_regions(case)
+    if region is None:
+        return None
+    if prop == 'embed':
+        return _call(app_helpers.embed_data, case.seq, case.message,
+                     case.frame, region, case.gc)
+    return _call(app_helpers.extract_data, case.seq, case.frame, region,
+                 case.gc)
+
+
+def run_backend(backend, prop, case):
+    """
+    This function computes result of a property with a backend, in the same
+    form as the reference.
+    :param backend: Backend object.
+    :param prop: name of property (see PROPERTIES)
+    :param case: Case object.
+    :return: result.
+    """
+    if prop == 'clean':
+        return str(backend.clean(case.seq))
+    if prop == 'encode':
+        return backend.encode(case.message)
+    if prop == 'translate':
+        return backend.translate(case.seq, case.frame, case.gc)
+    if prop == 'regions':
+        return backend.find_regions(case.seq, case.frame, case.gc)
+    if prop == 'capacity':
+        return backend.capacity(case.seq, case.frame, case.gc)
+    if prop == 'embed':
+        wm_seq = backend.embed(case.seq, case.message, case.frame, case.gc)
+        return None if wm_seq is None else str(wm_seq)
+    return backend.extract(case.seq, case.frame, case.gc)
+
+
+# Backends compared with the reference: all backends which can run here.
+BACKENDS = dict((name, backends.get_backend(name))
+                for name in backends.available_backends())
+
+PROPERTIES = ('clean', 'encode', 'translate', 'regions', 'capacity', 'embed',
+              'extract')
+
+
+# Properties computed on the reading frame.
+_FRAME_PROPERTIES = ('regions', 'capacity', 'embed', 'extract')
+
+
+def oracle_case(case):
+    """
+    This function returns the case given to the reference functions. They
+    slice frames 2 and 3 past the end of the sequence and fail on a
+    trailing partial codon, so such a case is replaced by the complete
+    codons of its reading frame as frame 1 (as ReferenceBackend does).
+    :param case: Case object.
+    :return: Case object.
+    """
+    seq = app_helpers._clean_dna(case.seq)
+    if _frame_length(seq, case.frame) % 3 == 0:
+        return case
+    start = case.frame - 1
+    end = start + max(len(seq) - start, 0) // 3 * 3
+    return case._replace(seq=seq[start:end], frame=1)
+
+
+def check(backend, prop, case):
+    """
+    This function compares result of a backend with the reference.
+    :param backend: name of backend (see BACKENDS)
+    :param prop: name of property (see PROPERTIES)
+    :param case: Case object.
+    :return: None if results match, otherwise description of mismatch.
+    """
+    reference = oracle_case(case) if prop in _FRAME_PROPERTIES else case
+    expected = _oracle(prop, reference)
+    actual = run_backend(BACKENDS[backend], prop, case)
+    if prop == 'embed' and expected is not None and actual is not None:
+        # reference drops bases in front of the reading frame and shifts
+        # the rest of the sequence, engines keep them in place: compare the
+        # codons of the reading frame.
+        length = _frame_length(expected, reference.frame)
+        expected = expected[:length]
+        actual = actual[case.frame - 1:case.frame - 1 + length]
+    if actual == expected:
+        return None
+    return '{0} {1}: expected {2!r}, got {3!r}'.format(backend, prop,
+                                                       expected, actual)
+
+
+def _smaller(case):
+    """
+    This function generates smaller variants of a case, largest reductions
+    first.
+    :param case: Case object.
+    :return: generator of Case objects.
+    """
+    seq = case.seq
+    size = len(seq)
+    while size >= 1:
+        for start in range(0, len(seq), size):
+            yield case._replace(seq=seq[:start] + seq[start + size:])
+        size //= 2
+    message = case.message
+    size = len(message)
+    while size >= 1:
+        for start in range(0, len(message), size):
+            yield case._replace(
+                message=message[:start] + message[start + size:])
+        size //= 2
+    for i, c in enumerate(message):
+        if c != 'a':
+            yield case._replace(message=message[:i] + 'a' + message[i + 1:])
+    for i, c in enumerate(seq):
+        if c not in 'acgt':
+            yield case._replace(seq=seq[:i] + c.lower() + seq[i + 1:])
+    if case.frame != 1:
+        yield case._replace(frame=1)
+    if case.gc != '1':
+        yield case._replace(gc='1')
+
+
+def shrink(case, fails):
+    """
+    This function shrinks a failing case to a minimal case which still
+    fails.
+    :param case: failing Case object.
+    :param fails: function telling whether a case fails.
+    :return: minimal failing Case object.
+    """
+    progress = True
+    while progress:
+        progress = False
+        for smaller in _smaller(case):
+            if fails(smaller):
+                case = smaller
+                progress = True
+                break
+    return case
+
+
+class DifferentialTestCase(unittest.TestCase):
+
+    def _check_cases(self, prop, cases):
+        for backend in sorted(BACKENDS):
+            for case in cases:
+                if check(backend, prop, case) is None:
+                    continue
+                minimal = shrink(case, lambda smaller: check(
+                    backend, prop, smaller) is not None)
+                self.fail('{0}\nminimal reproducer: {1!r}'.format(
+                    check(backend, prop, minimal), minimal))
+
+    def _random_cases(self, prop):
+        rnd = random.Random('{0}-{1}'.format(SEED, prop))
+        return [random_case(rnd) for _ in range(CASES)]
+
+    def test_clean(self):
+        self._check_cases('clean', EDGE_CASES)
+        self._check_cases('clean', self._random_cases('clean'))
+
+    def test_encode(self):
+        self._check_cases('encode', EDGE_CASES)
+        self._check_cases('encode', self._random_cases('encode'))
+
+    def test_translate(self):
+        self._check_cases('translate', EDGE_CASES)
+        self._check_cases('translate', self._random_cases('translate'))
+
+    def test_regions(self):
+        self._check_cases('regions', EDGE_CASES)
+        self._check_cases('regions', self._random_cases('regions'))
+
+    def test_capacity(self):
+        self._check_cases('capacity', EDGE_CASES)
+        self._check_cases('capacity', self._random_cases('capacity'))
+
+    def test_embed(self):
+        self._check_cases('embed', EDGE_CASES)
+        self._check_cases('embed', self._random_cases('embed'))
+
+    def test_extract(self):
+        self._check_cases('extract', EDGE_CASES)
+        self._check_cases('extract', self._random_cases('extract'))
+
+    def test_watermarked_extract(self):
+        # extract from sequences watermarked by the reference, so that the
+        # header carries a real message length.
+        rnd = random.Random('{0}-watermarked'.format(SEED))
+        cases = []
+        for case in self._random_cases('watermarked') + EDGE_CASES:
+            case = oracle_case(case)
+            wm_seq = _oracle('embed', case)
+            if wm_seq:
+                cases.append(case._replace(seq=wm_seq))
+        rnd.shuffle(cases)
+        self._check_cases('extract', cases)
+
+    def test_shrink(self):
+        minimal = shrink(Case('ggatgcccTAAgg' * 3, 'message', 3, '11'),
+                         lambda case: 'taa' in case.seq.lower())
+        self.assertEqual(minimal, Case('taa', '', 1, '1'))
+
+
+if __name__ == '__main__':
+    unittest.main()
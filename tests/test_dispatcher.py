@@ -0,0 +1,160 @@
+"""
+Tests for dispatching engine calls inline or to the worker pool, load
+shedding and jobs (see app/common/dispatcher.py).
+"""
+import os
+import time
+import shutil
+import operator
+import tempfile
+import unittest
+from unittest import mock
+from app import dispatcher
+from app.common.dispatcher import Dispatcher, Overloaded, read_job
+from fixtures import ApiTestCase
+
+# Seconds a blocking call holds its slot of the pool.
+BLOCK = 0.5
+
+
+class _App(object):
+    """
+    Application object with the settings used by the dispatcher.
+    """
+    def __init__(self, directory, **config):
+        self.config = dict(DISPATCH_POOL_SIZE=1,
+                           DISPATCH_INLINE_THRESHOLD=1000,
+                           DISPATCH_MAX_PENDING=1,
+                           RESULT_STORE_DIR=directory, **config)
+        self.extensions = {}
+
+
+class DispatcherTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.app = _App(self.directory)
+        self.dispatcher = Dispatcher(self.app)
+
+    def tearDown(self):
+        self.dispatcher.shutdown()
+        shutil.rmtree(self.directory)
+
+    def _wait_for_job(self, job_id, timeout=10):
+        deadline = time.time() + timeout
+        state = read_job(self.app, job_id)
+        while state['status'] == 'pending' and time.time() < deadline:
+            time.sleep(0.01)
+            state = read_job(self.app, job_id)
+        return state
+
+    def _wait_idle(self, timeout=10):
+        # done callbacks run right after the result is set.
+        deadline = time.time() + timeout
+        while self.dispatcher.pending and time.time() < deadline:
+            time.sleep(0.01)
+        return self.dispatcher.pending
+
+    def test_inline(self):
+        self.assertIs(self.app.extensions['dispatcher'], self.dispatcher)
+        self.assertTrue(self.dispatcher.is_inline('embed', 1000))
+        self.assertFalse(self.dispatcher.is_inline('embed', 1001))
+        # reference operations cost more per base.
+        self.assertFalse(self.dispatcher.is_inline('reference', 100))
+        self.assertEqual(self.dispatcher.run('embed', 1000, os.getpid),
+                         os.getpid())
+        self.assertIsNone(self.dispatcher._pool)
+        self.assertNotEqual(self.dispatcher.run('reference', 100, os.getpid),
+                            os.getpid())
+        self.assertEqual(self.dispatcher.map('capacity', 1000, len,
+                                             ['a', 'ac']), [1, 2])
+        self.assertEqual(self.dispatcher.map('capacity', 5000, len,
+                                             ['a', 'ac']), [1, 2])
+        self.assertEqual(self.dispatcher.pending, 0)
+
+    def test_overloaded(self):
+        future = self.dispatcher.submit('embed', 5000, time.sleep, BLOCK)
+        self.assertEqual(self.dispatcher.pending, 1)
+        with self.assertRaises(Overloaded) as context:
+            self.dispatcher.submit('embed', 5000, time.sleep, BLOCK)
+        self.assertEqual((context.exception.status_code,
+                          context.exception.retry_after), (503, 5))
+        with self.assertRaises(Overloaded):
+            self.dispatcher.map('embed', 5000, len, ['a'])
+        # cheap calls do not wait for the pool.
+        self.assertEqual(self.dispatcher.run('embed', 10, len, 'acgt'), 4)
+        # jobs are rejected with 429.
+        with self.assertRaises(Overloaded) as context:
+            self.dispatcher.submit_job(self.app, 'capacity', 'capacity',
+                                       5000, len, 'acgt')
+        self.assertEqual(context.exception.status_code, 429)
+        self.assertEqual(self.dispatcher.pending, 1)
+        future.result()
+        self.assertEqual(self._wait_idle(), 0)
+        self.assertEqual(self.dispatcher.run('embed', 5000, len, 'acgt'), 4)
+
+    def test_failed_calls(self):
+        future = self.dispatcher.submit('embed', 5000, operator.truediv, 1, 0)
+        self.assertIsInstance(future.exception(), ZeroDivisionError)
+        self.assertEqual(self._wait_idle(), 0)
+        with self.assertRaises(ZeroDivisionError):
+            self.dispatcher.map('embed', 5000, operator.truediv, [1], [0])
+        self.assertEqual(self.dispatcher.pending, 0)
+        with mock.patch.object(self.dispatcher, '_executor',
+                               side_effect=RuntimeError('no pool')):
+            with self.assertRaises(RuntimeError):
+                self.dispatcher.submit('embed', 5000, len, 'acgt')
+            with self.assertRaises(RuntimeError):
+                self.dispatcher.map('embed', 5000, len, ['acgt'])
+        self.assertEqual(self.dispatcher.pending, 0)
+        # inline calls raise when their result is read.
+        future = self.dispatcher.submit('embed', 10, operator.truediv, 1, 0)
+        self.assertIsInstance(future.exception(), ZeroDivisionError)
+
+    def test_jobs(self):
+        blocking = self.dispatcher.submit('embed', 5000, time.sleep, BLOCK)
+        self.dispatcher.max_pending = 2
+        job_id = self.dispatcher.submit_job(self.app, 'capacity', 'capacity',
+                                            5000, len, 'acgt')
+        self.assertEqual(read_job(self.app, job_id),
+                         dict(status='pending', operation='capacity'))
+        blocking.result()
+        self.assertEqual(self._wait_for_job(job_id),
+                         dict(status='done', operation='capacity', result=4))
+        # watermarked sequences are kept in the result store.
+        job_id = self.dispatcher.submit_job(self.app, 'embed', 'embed', 5000,
+                                            str, 'acgt')
+        state = self._wait_for_job(job_id)
+        self.assertEqual((state['status'], state['result']['length']),
+                         ('done', 4))
+        with open(os.path.join(self.directory, state['result']['token'] +
+                               '.txt')) as result_file:
+            self.assertEqual(result_file.read(), 'acgt')
+        job_id = self.dispatcher.submit_job(self.app, 'extract', 'extract',
+                                            5000, operator.truediv, 1, 0)
+        self.assertEqual(self._wait_for_job(job_id)['status'], 'failed')
+        self.assertIsNone(read_job(self.app, '0' * 32))
+        self.assertIsNone(read_job(self.app, '../job'))
+        self.assertEqual(self.dispatcher.pending, 0)
+
+
+class OverloadedApiTestCase(ApiTestCase):
+
+    def test_status(self):
+        sequence = 'atg' + 'gctaaattt' * 40 + 'taa'
+        with mock.patch.object(dispatcher, 'inline_threshold', 0), \
+                mock.patch.object(dispatcher, '_pending',
+                                  dispatcher.max_pending):
+            response = self._post('capacity', sequence=sequence)
+            self.assertEqual((response.status_code,
+                              response.headers['Retry-After']), (503, '5'))
+            response = self._post('capacity', sequence=sequence,
+                                  **{'async': True})
+            self.assertEqual((response.status_code,
+                              response.headers['Retry-After']), (429, '5'))
+        self.assertEqual(self._post('capacity', sequence=sequence)
+                         .status_code, 200)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+"""
+Tests for framed payloads (see app/common/framing.py).
+"""
+import unittest
+from helpers.packed_sequence import PackedSequence
+from app.common import framing, vector_engine
+from app.common.memory_benchmark import synthetic_input
+from fixtures import random_payload
+
+
+class FramingTestCase(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.seq = PackedSequence.from_string(synthetic_input(200000))
+        cls.payload = random_payload(4000)
+        cls.wm_seq = framing.embed_payload(cls.seq, cls.payload,
+                                           frame_size=250)
+
+    def test_round_trip(self):
+        self.assertIsNotNone(self.wm_seq)
+        self.assertEqual(len(self.wm_seq), len(self.seq))
+        self.assertEqual(framing.extract_payload(self.wm_seq), self.payload)
+        # payload larger than the 16 bit length header allows, in 4 fold
+        # codons (2 bits each)
+        payload = random_payload(70000, seed=2)
+        seq = PackedSequence.from_string('c' + 'atg' + 'gct' * 300000 +
+                                         'taa')
+        wm_seq = framing.embed_payload(seq, payload, frame=2, gc=11)
+        self.assertEqual(framing.extract_payload(wm_seq, frame=2, gc=11),
+                         payload)
+
+    def test_streaming(self):
+        reader = framing.FramedPayload(self.wm_seq)
+        self.assertEqual(len(reader), 16)
+        frames = list(reader)
+        self.assertEqual(frames[0], self.payload[:250])
+        self.assertEqual(b''.join(frames), self.payload)
+
+    def test_random_access(self):
+        reader = framing.FramedPayload(self.wm_seq)
+        for index in (15, 3, 0, 9):
+            self.assertEqual(reader.read_frame(index),
+                             self.payload[index * 250:(index + 1) * 250])
+        with self.assertRaises(IndexError):
+            reader.read_frame(16)
+
+    def test_corrupted_frame(self):
+        bits = framing.encode_payload(self.payload, frame_size=250)
+        reader = framing.FramedPayload(self.wm_seq)
+        bits[reader.frame_offset(5) + 100] ^= 1
+        codons = vector_engine.embed_bits(self.seq.codon_indexes(), bits)
+        reader = framing.FramedPayload(self.seq.with_codons(codons))
+        with self.assertRaises(framing.FramingError):
+            reader.read_frame(5)
+        # other frames are still readable.
+        self.assertEqual(reader.read_frame(6), self.payload[1500:1750])
+
+    def test_header(self):
+        fields = (250, len(self.payload), 3, 7)
+        header = framing.encode_header(len(self.payload), 250, fields[2:])
+        self.assertEqual(framing.decode_header(header + b'\xff'),
+                         (list(fields), len(header)))
+        with self.assertRaises(framing.FramingError):
+            framing.decode_header(header[:-1] + b'\x00')
+
+    def test_not_framed(self):
+        # extract_data reads framed payload as an empty message and framed
+        # reader rejects sequences watermarked by embed_data.
+        self.assertEqual(vector_engine.extract(self.wm_seq), '')
+        with self.assertRaises(framing.FramingError):
+            framing.FramedPayload(vector_engine.embed(self.seq, 'message'))
+
+    def test_too_large(self):
+        seq = self.seq.slice(0, 3000)
+        self.assertIsNone(framing.embed_payload(seq, self.payload))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+"""
+Tests for compiled genetic code tables (see helpers/build_gc_tables.py):
+watermarking must not change the protein in any registered genetic code.
+"""
+import unittest
+import numpy as np
+from helpers.gc_file_helpers import gc_file_associations
+from helpers.gc_registry import get_genetic_code
+from helpers.codon_helpers import index_to_codon
+from app.common import backends
+
+GCS = sorted(gc_file_associations.keys(), key=int)
+
+
+def coding_sequence(gc, repeats=3):
+    """
+    This function returns a coding region using every sense codon of a
+    genetic code.
+    :param gc: genetic code.
+    :param repeats: number of times every codon is used.
+    :return: DNA sequence (string)
+    """
+    code = get_genetic_code(gc)
+    stops = np.flatnonzero(code.stop)
+    sense = [index_to_codon(i) for i in range(64) if not code.stop[i]]
+    return 'atg' + ''.join(sense) * repeats + index_to_codon(stops[0])
+
+
+class GeneticCodeTestCase(unittest.TestCase):
+
+    def test_protein_preserved(self):
+        for name in backends.available_backends():
+            backend = backends.get_backend(name)
+            for gc in GCS:
+                seq = coding_sequence(gc)
+                capacity = backend.capacity(seq, frame=1, gc=gc)
+                message = ''.join(chr(ord('a') + i % 26)
+                                  for i in range((capacity - 16) // 8))
+                wm_seq = backend.embed(seq, message, frame=1, gc=gc)
+                with self.subTest(backend=name, gc=gc):
+                    self.assertIsNotNone(wm_seq)
+                    self.assertEqual(
+                        backend.translate(wm_seq, frame=1, gc=gc),
+                        backend.translate(seq, frame=1, gc=gc))
+                    self.assertEqual(backend.extract(wm_seq, frame=1, gc=gc),
+                                     message)
+
+    def test_four_fold(self):
+        # codons carrying 2 bits are replaced by the prefix of their popular
+        # codon followed by any base.
+        for gc in GCS:
+            code = get_genetic_code(gc)
+            for i in np.flatnonzero(code.capacity == 2):
+                prefix = code.preferred[i] & 0xfc
+                with self.subTest(gc=gc, codon=index_to_codon(i)):
+                    self.assertTrue(all(code.aa[prefix | base] == code.aa[i]
+                                        for base in range(4)))
+
+
+if __name__ == '__main__':
+    unittest.main()
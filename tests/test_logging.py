@@ -0,0 +1,120 @@
+"""
+Tests for json logging through a background thread (see
+app/common/logging.py).
+"""
+import os
+import json
+import shutil
+import logging
+import tempfile
+import unittest
+from app import create_app
+from app.common import logging as app_logging
+
+
+class _ListHandler(logging.Handler):
+
+    def __init__(self):
+        super(_ListHandler, self).__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+class BackgroundQueueTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.target = _ListHandler()
+        self.handler = app_logging.BackgroundQueueHandler([self.target])
+        self.logger = logging.getLogger('tests.logging')
+        self.logger.setLevel(logging.DEBUG)
+        self.logger.propagate = False
+        self.logger.addHandler(self.handler)
+
+    def tearDown(self):
+        self.logger.removeHandler(self.handler)
+        self.handler.stop()
+
+    def test_queue(self):
+        args = ['before']
+        self.logger.info('value %s', args, extra={'request_id': 'abc'})
+        # message is formatted when logged, not when written.
+        args[0] = 'after'
+        self.logger.warning('second')
+        self.handler.stop()
+        self.assertEqual([r.getMessage() for r in self.target.records],
+                         ["value ['before']", 'second'])
+        self.assertEqual(self.target.records[0].request_id, 'abc')
+        # outside of requests there is no request id.
+        self.assertIsNone(self.target.records[1].request_id)
+        entry = json.loads(app_logging.JsonFormatter().format(
+            self.target.records[0]))
+        self.assertEqual((entry['level'], entry['request_id'],
+                          entry['logger']), ('INFO', 'abc', 'tests.logging'))
+
+    def test_sampling(self):
+        self.handler.addFilter(app_logging.SamplingFilter(0.0))
+        self.logger.debug('dropped')
+        self.logger.debug('kept', extra={'sample': 1.0})
+        self.logger.info('info')
+        self.handler.stop()
+        self.assertEqual([r.getMessage() for r in self.target.records],
+                         ['kept', 'info'])
+        sampling = app_logging.SamplingFilter(0.5)
+        record = logging.LogRecord('x', logging.DEBUG, '', 0, 'x', (), None)
+        passed = sum(sampling.filter(record) for _ in range(2000))
+        self.assertTrue(800 < passed < 1200)
+
+
+class AppLoggingTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.app = create_app('testing')
+        self.app.config['LOG_FILE'] = os.path.join(self.directory, 'app.log')
+        self.app.config['LOG_SAMPLE_RATE'] = 0.0
+        # calling again replaces the handler of create_app.
+        self.handler = app_logging.init_app(self.app)
+
+        @self.app.route('/logging-test')
+        def logging_test():
+            logging.getLogger('app.tests').info('in request')
+            logging.getLogger('helpers.tests').debug('sampled out')
+            return 'ok'
+
+    def tearDown(self):
+        self.handler.stop()
+        shutil.rmtree(self.directory)
+
+    def _entries(self):
+        self.handler.stop()
+        with open(self.app.config['LOG_FILE']) as log_file:
+            return [json.loads(line) for line in log_file]
+
+    def test_handlers(self):
+        # app.logger is created by Flask on first use, this must not remove
+        # the handler.
+        self.app.logger.error('flask logger')
+        for name in app_logging.LOGGER_NAMES:
+            handlers = [h for h in logging.getLogger(name).handlers
+                        if isinstance(h, app_logging.BackgroundQueueHandler)]
+            self.assertEqual(handlers, [self.handler])
+        self.assertEqual([e['message'] for e in self._entries()],
+                         ['flask logger'])
+
+    def test_request_id(self):
+        client = self.app.test_client()
+        response = client.get('/logging-test',
+                              headers={'X-Request-ID': 'request-1'})
+        self.assertEqual(response.headers['X-Request-ID'], 'request-1')
+        response = client.get('/logging-test')
+        generated = response.headers['X-Request-ID']
+        entries = [e for e in self._entries() if e['logger'] != 'app']
+        self.assertEqual([(e['message'], e['request_id']) for e in entries],
+                         [('in request', 'request-1'),
+                          ('in request', generated)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,36 @@
+"""
+Tests for peak memory of the engine stages against the committed budget
+(tests/memory_budget.json, see app/common/memory_benchmark.py).
+"""
+import unittest
+from app.common.memory_benchmark import ENGINES, STAGES, run, \
+    load_budget, check_budget
+
+
+class MemoryBudgetTestCase(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.budget = load_budget()
+
+    def _check(self, engine, stage):
+        results = run(self.budget['sizes'], engines=(engine,),
+                      stages=(stage,))
+        self.assertEqual(check_budget(results, self.budget), [])
+
+    def test_budget_covers_all_stages(self):
+        for engine in ENGINES:
+            self.assertEqual(sorted(self.budget['budgets'][engine]),
+                             sorted(STAGES))
+
+    def test_reference_engine(self):
+        for stage in STAGES:
+            self._check('reference', stage)
+
+    def test_vector_engine(self):
+        for stage in STAGES:
+            self._check('vector', stage)
+
+
+if __name__ == '__main__':
+    unittest.main()
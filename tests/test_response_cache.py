@@ -0,0 +1,32 @@
+"""
+Tests for keys of the response cache (see app/common/response_cache.py).
+"""
+import unittest
+from helpers.packed_sequence import PackedSequence
+from app.common.response_cache import cache_key
+
+
+class CacheKeyTestCase(unittest.TestCase):
+
+    def test_parts_do_not_run_into_each_other(self):
+        seq = PackedSequence.from_string('atggcttaa')
+        # parameters joined without length prefixes made these equal.
+        self.assertNotEqual(
+            cache_key('embed', seq, message='a\0x=y'),
+            cache_key('embed', seq, message='a', x='y'))
+        self.assertNotEqual(
+            cache_key('embed', seq, message='hi\u00009'),
+            cache_key('embed', PackedSequence.from_string('atggcttaaa'),
+                      message='hi'))
+        self.assertNotEqual(cache_key('embed', seq, message='x'),
+                            cache_key('extract', seq, message='x'))
+
+    def test_stable(self):
+        seq = PackedSequence.from_string('atggcttaa')
+        self.assertEqual(cache_key('embed', seq, message='m', frame=1, gc='1'),
+                         cache_key('embed', PackedSequence.from_string(
+                             'ATG GCT TAA'), gc=1, frame='1', message='m'))
+
+
+if __name__ == '__main__':
+    unittest.main()
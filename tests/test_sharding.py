@@ -0,0 +1,106 @@
+"""
+Tests for sharding a payload across sequences (see app/common/sharding.py).
+"""
+import json
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from helpers.packed_sequence import PackedSequence
+from app.common import framing, sharding
+from app.common.memory_benchmark import synthetic_input
+from fixtures import random_payload, ApiTestCase
+
+
+class ShardingTestCase(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.sequences = [PackedSequence.from_string(synthetic_input(length))
+                         for length in (80000, 200000, 300, 120000)]
+        cls.payload = random_payload(10000)
+        cls.wm_sequences, cls.shards = sharding.embed_shards(
+            cls.sequences, cls.payload, frame_size=100)
+
+    def test_round_trip(self):
+        self.assertEqual(len(self.wm_sequences), len(self.sequences))
+        # payload does not fit in any single sequence.
+        for seq in self.sequences:
+            self.assertIsNone(framing.embed_payload(seq, self.payload))
+        self.assertEqual(sharding.extract_shards(self.wm_sequences),
+                         self.payload)
+        # shards are reassembled whatever the order of sequences is.
+        self.assertEqual(sharding.extract_shards(self.wm_sequences[::-1]),
+                         self.payload)
+
+    def test_shard_sizes(self):
+        # short sequence gets no shard and is left unchanged.
+        self.assertEqual(self.shards, [0, 1, None, 2])
+        self.assertIs(self.wm_sequences[2], self.sequences[2])
+        sizes = sharding.shard_sizes([20000, 50000, 0, 30000], 5000)
+        self.assertEqual(sum(sizes), 5000)
+        self.assertEqual(sizes[2], 0)
+        self.assertTrue(sizes[0] < sizes[3] < sizes[1])
+        self.assertIsNone(sharding.shard_sizes([20000, 50000], 10 ** 6))
+
+    def test_parallel(self):
+        with ProcessPoolExecutor(max_workers=2) as pool:
+            wm_sequences, shards = sharding.embed_shards(
+                self.sequences, self.payload, frame_size=100,
+                map_fn=pool.map)
+            self.assertEqual(shards, self.shards)
+            self.assertEqual(
+                sharding.extract_shards(wm_sequences, map_fn=pool.map),
+                self.payload)
+
+    def test_missing_shard(self):
+        with self.assertRaises(framing.FramingError):
+            sharding.extract_shards(self.wm_sequences[1:])
+        with self.assertRaises(framing.FramingError):
+            sharding.extract_shards(self.sequences)
+
+    def test_too_large(self):
+        self.assertIsNone(sharding.embed_shards(self.sequences,
+                                                random_payload(10 ** 5)))
+
+
+class ShardedApiTestCase(ApiTestCase):
+
+    def test_round_trip(self):
+        sequences = [synthetic_input(length) for length in (20000, 30000)]
+        message = 'sharded message ' * 40
+        response = self._post('embed/sharded', sequences=sequences,
+                              message=message, frame_size=64)
+        self.assertEqual(response.status_code, 200)
+        result = json.loads(response.get_data(as_text=True))
+        self.assertEqual(result['shards'], 2)
+        wm_sequences = [s['sequence'] for s in result['sequences']]
+        response = self._post('extract/sharded',
+                              sequences=wm_sequences[::-1])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            json.loads(response.get_data(as_text=True))['message'], message)
+
+    def test_invalid(self):
+        response = self._post('embed/sharded', sequences=['atggcttaa'],
+                              message='x' * 1000)
+        self.assertEqual(response.status_code, 400)
+        response = self._post('extract/sharded', sequences=['atggcttaa'])
+        self.assertEqual(response.status_code, 400)
+
+    def test_too_long(self):
+        self.app.config['MAX_SHARDED_BASES'] = 30000
+        sequences = [synthetic_input(length) for length in (20000, 20000)]
+        response = self._post('embed/sharded', sequences=sequences,
+                              message='too long')
+        self.assertEqual(response.status_code, 413)
+        self.app.config['MAX_SHARDED_BASES'] = 10
+        response = self._post('extract/sharded', samples='all')
+        self.assertEqual(response.status_code, 413)
+        response = self.client.post('/api/v1.0/extract/sharded',
+                                    data='>a\n{0}\n>b\n{0}\n'.format(
+                                        'acgt' * 2),
+                                    content_type='text/x-fasta')
+        self.assertEqual(response.status_code, 413)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+"""
+Tests for 2 bit encoded sequence bodies (see helpers/twobit_format.py):
+every endpoint reading a sequence must answer a 2 bit body like the same
+sequence sent as json.
+"""
+import json
+import unittest
+from helpers import twobit_format
+from helpers.packed_sequence import PackedSequence
+from app import create_app
+from app.common.autodetect import detect_and_extract
+from app.common.vector_engine import embed
+
+SEQUENCE = 'atg' + 'gctaaattt' * 40 + 'taa'
+
+
+class TwoBitTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app('testing')
+        self.client = self.app.test_client()
+        self.wm_seq = embed(PackedSequence.from_string(SEQUENCE), 'hi')
+
+    def _post(self, path, seq, **params):
+        """
+        This function posts a sequence both as 2 bit body and as json.
+        :return: tuple of json results (2 bit, json)
+        """
+        results = []
+        for response in (
+                self.client.post('/api/v1.0/' + path,
+                                 data=twobit_format.encode(seq),
+                                 content_type=twobit_format.MIMETYPE,
+                                 query_string=params),
+                self.client.post('/api/v1.0/' + path, data=json.dumps(
+                    dict(params, sequence=PackedSequence.from_string(seq)
+                         .to_string())),
+                    content_type='application/json')):
+            self.assertEqual(response.status_code, 200)
+            results.append(json.loads(response.get_data(as_text=True)))
+        return results
+
+    def test_capacity(self):
+        twobit, text = self._post('capacity', SEQUENCE)
+        self.assertEqual(twobit, text)
+
+    def test_embed(self):
+        twobit, text = self._post('embed', SEQUENCE, message='hi')
+        self.assertEqual(twobit, text)
+        self.assertEqual(twobit['sequence'], self.wm_seq.to_string())
+
+    def test_extract(self):
+        twobit, text = self._post('extract', self.wm_seq)
+        self.assertEqual(twobit['message'], 'hi')
+        self.assertEqual(twobit, text)
+
+    def test_extract_autodetect(self):
+        twobit, text = self._post('extract', self.wm_seq, autodetect='1')
+        self.assertEqual(twobit['candidates'][0]['message'], 'hi')
+        self.assertEqual(twobit, text)
+
+    def test_capacity_index(self):
+        queries = json.dumps([{'start': 0, 'end': 300}, {'bits': 32}])
+        twobit, text = self._post('capacity/index', SEQUENCE,
+                                  queries=queries)
+        self.assertEqual(len(twobit['results']), 2)
+        self.assertEqual(twobit, text)
+
+    def test_profile(self):
+        twobit, text = self._post('profile', SEQUENCE, window=10)
+        self.assertEqual(twobit, text)
+
+
+class PackedAutodetectTestCase(unittest.TestCase):
+
+    def test_packed_sequence(self):
+        wm_seq = embed(PackedSequence.from_string(SEQUENCE), 'hi')
+        self.assertEqual(detect_and_extract(wm_seq),
+                         detect_and_extract(wm_seq.to_string()))
+        self.assertEqual(detect_and_extract(wm_seq)[0]['message'], 'hi')
+
+
+if __name__ == '__main__':
+    unittest.main()